@@ -0,0 +1,337 @@
+"""
+Persistent, cross-run dedup index for scraped listings.
+
+Every listing gets a canonical identity from the keys that can name it:
+
+    id:<source>:<listing id>    vin:<VIN>    url:<normalized url>
+
+Keys are stored as aliases of one identity, so a listing is recognised by
+whichever of them a later crawl sees. Each identity records first/last seen
+times, a hash of its content and its last price; price changes are appended to
+``price_events``.
+
+The index is SQLite (WAL, safe across the API process and ``scrapy crawl``
+subprocesses) with an in-memory Bloom filter in front: a key the filter has
+never seen is new without touching the database, which is the common case for
+fresh search results.
+
+For incremental crawls the same database keeps a row per listing detail page
+(``pages``): HTTP validators (ETag / Last-Modified), the revisit interval and
+next due time chosen by ``accorria_scraper.recrawl``, and the last item so a
+skipped page can still be answered from the index.
+"""
+
+import hashlib
+import json
+import logging
+import math
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+logger = logging.getLogger(__name__)
+
+# Query parameters that never identify a listing
+TRACKING_PARAM_PREFIXES = ('utm_', '_trk', 'trk', 'mkevt', 'mkcid', 'mkrid', 'campid', 'customid', 'toolid')
+TRACKING_PARAMS = {'hash', 'amdata', 'var', 'ref', 'sourcecontext', 'clickid', 'fbclid', 'gclid'}
+
+# Fields that make up a listing's content (a change in any of them is an update)
+CONTENT_FIELDS = (
+    'title', 'price', 'mileage', 'condition', 'location', 'seller_name', 'seller_type',
+    'transmission', 'fuel_type', 'drivetrain', 'body_style', 'engine',
+    'exterior_color', 'interior_color', 'description', 'image_urls',
+)
+
+# Scrapy signal sent when a known listing's price changes: handler(item, previous_price, spider)
+price_changed = object()
+
+
+class BloomFilter:
+    """Fixed-size Bloom filter (no false negatives) over string keys"""
+
+    def __init__(self, capacity: int = 1_000_000, error_rate: float = 0.01):
+        self.size = max(8, int(-capacity * math.log(error_rate) / (math.log(2) ** 2)))
+        self.hashes = max(1, round(self.size / capacity * math.log(2)))
+        self.bits = bytearray((self.size + 7) // 8)
+
+    def _positions(self, key: str) -> Iterable[int]:
+        digest = hashlib.blake2b(key.encode('utf-8'), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], 'little')
+        h2 = int.from_bytes(digest[8:], 'little') | 1
+        return ((h1 + i * h2) % self.size for i in range(self.hashes))
+
+    def add(self, key: str) -> None:
+        for position in self._positions(key):
+            self.bits[position >> 3] |= 1 << (position & 7)
+
+    def __contains__(self, key: str) -> bool:
+        return all(self.bits[position >> 3] & (1 << (position & 7)) for position in self._positions(key))
+
+
+def normalize_url(url: str) -> str:
+    """Lower-case scheme/host, drop www, fragments, tracking params and trailing slashes; sort the rest"""
+    if not url:
+        return ''
+    parts = urlsplit(url.strip())
+    host = parts.netloc.lower()
+    if host.startswith('www.'):
+        host = host[4:]
+    query = sorted(
+        (key, value) for key, value in parse_qsl(parts.query, keep_blank_values=False)
+        if key.lower() not in TRACKING_PARAMS and not key.lower().startswith(TRACKING_PARAM_PREFIXES)
+    )
+    path = parts.path.rstrip('/') or '/'
+    return urlunsplit(('https', host, path, urlencode(query), ''))
+
+
+def listing_keys(item: Dict[str, Any]) -> List[str]:
+    """Identity keys for a listing, most specific first"""
+    keys = []
+    source = (item.get('source') or '').strip().lower()
+    listing_id = str(item.get('listing_id') or '').strip()
+    if source and listing_id:
+        keys.append(f"id:{source}:{listing_id}")
+    vin = (item.get('vin') or '').strip().upper()
+    if len(vin) == 17:
+        keys.append(f"vin:{vin}")
+    url = normalize_url(item.get('url') or '')
+    if url:
+        keys.append(f"url:{url}")
+    return keys
+
+
+def content_hash(item: Dict[str, Any]) -> str:
+    content = {field: item.get(field) for field in CONTENT_FIELDS}
+    return hashlib.blake2b(json.dumps(content, sort_keys=True, default=str).encode('utf-8'), digest_size=16).hexdigest()
+
+
+class DedupIndex:
+    """SQLite-backed listing index with a Bloom filter for fast negative lookups"""
+
+    _instances: Dict[str, 'DedupIndex'] = {}
+    _instances_lock = threading.Lock()
+
+    def __init__(self, path: str, bloom_capacity: int = 1_000_000, commit_every: int = 100):
+        self.path = path
+        self.commit_every = commit_every
+        self._pending = 0
+        self._lock = threading.Lock()
+        self.db = sqlite3.connect(path, timeout=30, check_same_thread=False)
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.execute("PRAGMA synchronous=NORMAL")
+        self.db.executescript("""
+            CREATE TABLE IF NOT EXISTS listings (
+                identity TEXT PRIMARY KEY,
+                source TEXT,
+                url TEXT,
+                content_hash TEXT,
+                price INTEGER,
+                first_seen REAL,
+                last_seen REAL,
+                times_seen INTEGER DEFAULT 1
+            );
+            CREATE TABLE IF NOT EXISTS listing_keys (
+                key TEXT PRIMARY KEY,
+                identity TEXT NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS price_events (
+                identity TEXT NOT NULL,
+                previous_price INTEGER,
+                price INTEGER,
+                seen_at REAL
+            );
+            CREATE INDEX IF NOT EXISTS price_events_seen_at ON price_events (seen_at);
+            CREATE INDEX IF NOT EXISTS price_events_identity ON price_events (identity, seen_at);
+            CREATE TABLE IF NOT EXISTS pages (
+                url TEXT PRIMARY KEY,
+                spider TEXT,
+                identity TEXT,
+                etag TEXT,
+                last_modified TEXT,
+                interval REAL,
+                next_visit_at REAL,
+                last_fetched REAL,
+                item_json TEXT
+            );
+            CREATE INDEX IF NOT EXISTS pages_due ON pages (spider, next_visit_at);
+        """)
+        self.bloom = BloomFilter(capacity=bloom_capacity)
+        for (key,) in self.db.execute("SELECT key FROM listing_keys"):
+            self.bloom.add(key)
+
+    @classmethod
+    def open(cls, path: str, **kwargs) -> 'DedupIndex':
+        """Shared index per database path (one per process)"""
+        with cls._instances_lock:
+            index = cls._instances.get(path)
+            if index is None:
+                index = cls(path, **kwargs)
+                cls._instances[path] = index
+            return index
+
+    def _resolve(self, keys: List[str]) -> Optional[str]:
+        for key in keys:
+            if key not in self.bloom:
+                continue
+            row = self.db.execute("SELECT identity FROM listing_keys WHERE key = ?", (key,)).fetchone()
+            if row:
+                return row[0]
+        return None
+
+    def observe(self, item: Dict[str, Any], now: Optional[float] = None) -> Tuple[str, Dict[str, Any]]:
+        """
+        Record a sighting of a listing.
+
+        Returns:
+            (status, record) where status is "new", "changed" or "unchanged" and record
+            has identity, first_seen, last_seen, times_seen and previous_price (if the price moved)
+        """
+        now = time.time() if now is None else now
+        keys = listing_keys(item)
+        if not keys:
+            return 'new', {'identity': None, 'first_seen': now, 'last_seen': now, 'times_seen': 1}
+
+        digest = content_hash(item)
+        price = item.get('price') or None
+        with self._lock:
+            identity = self._resolve(keys)
+            record: Dict[str, Any]
+            inserted = False
+            if identity is None:
+                # The Bloom filter only knows this process's keys; another crawl may
+                # already have written the row, so let SQLite decide whether it's new
+                identity = keys[0]
+                inserted = self.db.execute(
+                    "INSERT INTO listings (identity, source, url, content_hash, price, first_seen, last_seen, times_seen) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?, 1) ON CONFLICT(identity) DO NOTHING",
+                    (identity, item.get('source'), item.get('url'), digest, price, now, now),
+                ).rowcount > 0
+            if inserted:
+                status = 'new'
+                record = {'identity': identity, 'first_seen': now, 'last_seen': now, 'times_seen': 1}
+            else:
+                row = self.db.execute(
+                    "SELECT content_hash, price, first_seen, times_seen FROM listings WHERE identity = ?", (identity,)
+                ).fetchone()
+                previous_hash, previous_price, first_seen, times_seen = row or (None, None, now, 0)
+                status = 'unchanged' if previous_hash == digest else 'changed'
+                self.db.execute(
+                    "UPDATE listings SET content_hash = ?, price = ?, last_seen = ?, times_seen = times_seen + 1, url = ? "
+                    "WHERE identity = ?",
+                    (digest, price, now, item.get('url'), identity),
+                )
+                record = {'identity': identity, 'first_seen': first_seen, 'last_seen': now, 'times_seen': times_seen + 1}
+                if price and previous_price and price != previous_price:
+                    record['previous_price'] = previous_price
+                    self.db.execute(
+                        "INSERT INTO price_events (identity, previous_price, price, seen_at) VALUES (?, ?, ?, ?)",
+                        (identity, previous_price, price, now),
+                    )
+
+            for key in keys:
+                self.db.execute("INSERT OR IGNORE INTO listing_keys (key, identity) VALUES (?, ?)", (key, identity))
+                self.bloom.add(key)
+
+            self._pending += 1
+            if self._pending >= self.commit_every:
+                self.db.commit()
+                self._pending = 0
+        return status, record
+
+    def price_events(self, since: float = 0.0, limit: int = 500) -> List[Dict[str, Any]]:
+        """Price changes recorded since a timestamp, newest first"""
+        with self._lock:
+            rows = self.db.execute(
+                "SELECT e.identity, l.source, l.url, e.previous_price, e.price, e.seen_at "
+                "FROM price_events e LEFT JOIN listings l ON l.identity = e.identity "
+                "WHERE e.seen_at >= ? ORDER BY e.seen_at DESC LIMIT ?",
+                (since, limit),
+            ).fetchall()
+        return [
+            {'identity': identity, 'source': source, 'url': url, 'previous_price': previous, 'price': price, 'seen_at': seen_at}
+            for identity, source, url, previous, price, seen_at in rows
+        ]
+
+    def price_change_count(self, identity: Optional[str], since: float) -> int:
+        """How many times a listing's price moved since a timestamp"""
+        if identity is None:
+            return 0
+        with self._lock:
+            row = self.db.execute(
+                "SELECT COUNT(*) FROM price_events WHERE identity = ? AND seen_at >= ?", (identity, since)
+            ).fetchone()
+        return row[0] if row else 0
+
+    def page_state(self, url: str) -> Optional[Dict[str, Any]]:
+        """Validators, schedule and last item for a detail page (normalized URL), if known"""
+        with self._lock:
+            row = self.db.execute(
+                "SELECT p.identity, p.etag, p.last_modified, p.interval, p.next_visit_at, p.last_fetched, p.item_json, l.first_seen "
+                "FROM pages p LEFT JOIN listings l ON l.identity = p.identity WHERE p.url = ?",
+                (url,),
+            ).fetchone()
+        if row is None:
+            return None
+        identity, etag, last_modified, interval, next_visit_at, last_fetched, item_json, first_seen = row
+        return {
+            'url': url,
+            'identity': identity,
+            'first_seen': first_seen,
+            'etag': etag,
+            'last_modified': last_modified,
+            'interval': interval,
+            'next_visit_at': next_visit_at or 0.0,
+            'last_fetched': last_fetched,
+            'item': json.loads(item_json) if item_json else None,
+        }
+
+    def remember_validators(self, url: str, spider: str, etag: Optional[str], last_modified: Optional[str], now: Optional[float] = None) -> None:
+        """Store the HTTP validators from a fetched detail page"""
+        now = time.time() if now is None else now
+        with self._lock:
+            self.db.execute(
+                "INSERT INTO pages (url, spider, etag, last_modified, last_fetched) VALUES (?, ?, ?, ?, ?) "
+                "ON CONFLICT(url) DO UPDATE SET spider = excluded.spider, etag = excluded.etag, "
+                "last_modified = excluded.last_modified, last_fetched = excluded.last_fetched",
+                (url, spider, etag, last_modified, now),
+            )
+            self._pending += 1
+
+    def schedule_revisit(
+        self,
+        url: str,
+        spider: Optional[str],
+        interval: float,
+        now: Optional[float] = None,
+        identity: Optional[str] = None,
+        item: Optional[Dict[str, Any]] = None,
+    ) -> None:
+        """Set when a detail page is next due (and, optionally, its latest item)"""
+        now = time.time() if now is None else now
+        item_json = json.dumps(item, default=str) if item is not None else None
+        with self._lock:
+            self.db.execute(
+                "INSERT INTO pages (url, spider, identity, interval, next_visit_at, item_json) VALUES (?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT(url) DO UPDATE SET spider = COALESCE(excluded.spider, pages.spider), "
+                "identity = COALESCE(excluded.identity, pages.identity), interval = excluded.interval, "
+                "next_visit_at = excluded.next_visit_at, item_json = COALESCE(excluded.item_json, pages.item_json)",
+                (url, spider, identity, interval, now + interval, item_json),
+            )
+            self._pending += 1
+
+    def due_pages(self, spider: str, now: Optional[float] = None, limit: int = 500) -> List[str]:
+        """Detail page URLs of a spider whose revisit time has come, most overdue first"""
+        now = time.time() if now is None else now
+        with self._lock:
+            rows = self.db.execute(
+                "SELECT url FROM pages WHERE spider = ? AND next_visit_at <= ? ORDER BY next_visit_at LIMIT ?",
+                (spider, now, limit),
+            ).fetchall()
+        return [url for (url,) in rows]
+
+    def flush(self) -> None:
+        with self._lock:
+            self.db.commit()
+            self._pending = 0
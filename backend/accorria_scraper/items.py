@@ -130,6 +130,14 @@ class CarListingItem(scrapy.Item):
     watchers = Field(output_processor=TakeFirst())
     description = Field(input_processor=MapCompose(clean_text), output_processor=Join(' '))
     
+    # Cross-run dedup index (set by DuplicatesPipeline)
+    listing_key = Field(output_processor=TakeFirst())
+    dedup_status = Field(output_processor=TakeFirst())  # new, changed, unchanged
+    first_seen = Field(output_processor=TakeFirst())
+    last_seen = Field(output_processor=TakeFirst())
+    times_seen = Field(output_processor=TakeFirst())
+    previous_price = Field(output_processor=TakeFirst())
+    
     def __setitem__(self, key, value):
         """Override to set default values"""
         if key == 'scraped_at' and not value:
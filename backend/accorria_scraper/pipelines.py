@@ -4,10 +4,14 @@
 # See: https://docs.scrapy.org/en/latest/topics/item-pipeline.html
 
 import logging
-import hashlib
 from datetime import datetime
 from typing import Dict, Any
 from scrapy.exceptions import DropItem
+from scrapy.utils.project import data_path
+
+from accorria_scraper.dedup_index import DedupIndex, listing_keys, normalize_url, price_changed
+from accorria_scraper.recrawl import next_visit_interval
+from app.utils.pricing_rules import POPULAR_BRANDS
 
 logger = logging.getLogger(__name__)
 
@@ -39,22 +43,96 @@ class ValidationPipeline:
 
 
 class DuplicatesPipeline:
-    """Remove duplicate items"""
+    """
+    Remove duplicate items across crawls using the persistent dedup index
     
-    def __init__(self):
-        self.seen_items = set()
+    Listings are identified by source + listing id, VIN and normalized URL.
+    New and changed listings pass through, annotated with dedup_status,
+    first_seen/last_seen and previous_price (sending the price_changed signal).
+    Unchanged listings are dropped when DEDUP_DROP_UNCHANGED is on, unless the
+    crawl asked for them (spider argument emit_unchanged, used by searches).
+    In incremental crawls it also schedules each listing page's next visit.
+    """
+    
+    def __init__(self, crawler, index_path, bloom_capacity=1_000_000, drop_unchanged=True):
+        self.crawler = crawler
+        self.index_path = index_path
+        self.bloom_capacity = bloom_capacity
+        self.drop_unchanged = drop_unchanged
+        self.index = None
+        self.seen_keys = set()
+    
+    @classmethod
+    def from_crawler(cls, crawler):
+        settings = crawler.settings
+        return cls(
+            crawler,
+            settings.get('DEDUP_INDEX_PATH') or data_path('dedup_index.sqlite3', createdir=True),
+            bloom_capacity=settings.getint('DEDUP_BLOOM_CAPACITY', 1_000_000),
+            drop_unchanged=settings.getbool('DEDUP_DROP_UNCHANGED', True),
+        )
+    
+    def open_spider(self, spider):
+        """Open the shared index; duplicates within this crawl are tracked separately"""
+        self.index = DedupIndex.open(self.index_path, bloom_capacity=self.bloom_capacity)
+        self.seen_keys = set()
+    
+    def close_spider(self, spider):
+        """Commit pending index writes"""
+        if self.index is not None:
+            self.index.flush()
     
     def process_item(self, item, spider):
-        """Check for duplicates based on URL and title"""
-        # Create a unique identifier
-        identifier = f"{item['url']}_{item['title']}"
-        item_hash = hashlib.md5(identifier.encode()).hexdigest()
+        """Check the listing against this crawl and the persistent index"""
+        if item.get('dedup_status') == 'cached':
+            # Served from the index for a page that wasn't due - nothing new to record
+            return item
         
-        if item_hash in self.seen_items:
+        keys = listing_keys(item)
+        if any(key in self.seen_keys for key in keys):
             raise DropItem(f"Duplicate item found: {item['title']}")
+        self.seen_keys.update(keys)
+        
+        status, record = self.index.observe(dict(item))
+        item['listing_key'] = record['identity']
+        item['dedup_status'] = status
+        item['first_seen'] = datetime.fromtimestamp(record['first_seen']).isoformat()
+        item['last_seen'] = datetime.fromtimestamp(record['last_seen']).isoformat()
+        item['times_seen'] = record['times_seen']
         
-        self.seen_items.add(item_hash)
+        if 'previous_price' in record:
+            item['previous_price'] = record['previous_price']
+            logger.info(f"Price change: {item['title']} ${record['previous_price']} -> ${item['price']}")
+            self.crawler.signals.send_catch_log(
+                signal=price_changed, item=item, previous_price=record['previous_price'], spider=spider
+            )
+        
+        if getattr(spider, 'incremental_enabled', None) and spider.incremental_enabled():
+            self._schedule_revisit(item, status, record, spider)
+        
+        if status == 'unchanged' and self.drop_unchanged and not getattr(spider, 'emit_unchanged', False):
+            raise DropItem(f"Unchanged listing: {item['title']}")
         return item
+    
+    def _schedule_revisit(self, item, status, record, spider):
+        """Pick the listing page's next visit from its change history"""
+        url = normalize_url(item.get('url') or '')
+        if not url:
+            return
+        settings = self.crawler.settings
+        state = self.index.page_state(url)
+        price_changes = self.index.price_change_count(
+            record['identity'], record['last_seen'] - settings.getfloat('RECRAWL_VOLATILE_WINDOW', 7 * 24 * 3600)
+        )
+        interval = next_visit_interval(
+            status,
+            state['interval'] if state else None,
+            record['first_seen'],
+            price_changes,
+            settings,
+            now=record['last_seen'],
+        )
+        self.index.schedule_revisit(url, spider.name, interval, now=record['last_seen'], identity=record['identity'], item=dict(item))
 
 
 class CleaningPipeline:
@@ -136,8 +214,7 @@ class CleaningPipeline:
             
             # Popular brands get slight boost
             make = item.get('make', '').lower()
-            popular_brands = ['toyota', 'honda', 'subaru', 'mazda']
-            if make in popular_brands:
+            if make in POPULAR_BRANDS:
                 score += 0.05
             
             return max(0.0, min(1.0, score))
@@ -207,3 +284,14 @@ class JsonExportPipeline:
         self.file.write(',\n')
         
         return item
+
+
+class ItemSinkPipeline:
+    """Hand finished items to an in-process consumer (see app.services.crawler_service)"""
+    
+    def process_item(self, item, spider):
+        """Pass the item to the spider's item_sink callback, if the crawl has one"""
+        sink = getattr(spider, 'item_sink', None)
+        if sink is not None:
+            sink(dict(item))
+        return item
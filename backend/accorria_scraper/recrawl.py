@@ -0,0 +1,168 @@
+"""
+Incremental recrawl: skip listing detail pages that aren't due, revalidate the rest.
+
+With ``INCREMENTAL_CRAWL`` on (or the spider argument ``incremental=1``):
+
+- ``listing_request`` checks the page in the dedup index. Pages that aren't due
+  yet are not fetched; searches that want every match (``emit_unchanged``) get
+  the last stored item instead. Due pages are requested with ``If-None-Match`` /
+  ``If-Modified-Since`` so unchanged pages come back as an empty 304.
+- ``not_modified_items`` handles those 304s in ``parse_listing``.
+- After each item is processed, ``DuplicatesPipeline`` calls
+  ``next_visit_interval`` to pick the revisit interval: reset to the minimum
+  when the listing changed, backed off when it didn't, and kept short for
+  young listings and ones whose price keeps moving.
+- ``revisit_due=1`` makes the spider crawl only the detail pages that are due,
+  instead of search results, for scheduled refreshes.
+"""
+
+import logging
+import time
+from typing import Any, Dict, Iterator, Optional
+
+from scrapy import Request
+
+from accorria_scraper.dedup_index import DedupIndex, normalize_url
+from accorria_scraper.items import CarListingItem
+
+logger = logging.getLogger(__name__)
+
+DAY = 24 * 3600
+
+
+def _truthy(value: Any) -> bool:
+    return str(value).strip().lower() in ('1', 'true', 'yes', 'on')
+
+
+def next_visit_interval(
+    status: str,
+    previous_interval: Optional[float],
+    first_seen: float,
+    price_changes: int,
+    settings,
+    now: Optional[float] = None,
+) -> float:
+    """
+    Seconds until a listing page should be fetched again.
+
+    Args:
+        status: "new", "changed" or "unchanged" (from the dedup index)
+        previous_interval: Interval used for the last visit, if any
+        first_seen: When the listing was first seen (epoch seconds)
+        price_changes: Price moves within RECRAWL_VOLATILE_WINDOW
+        settings: Scrapy settings
+    """
+    now = time.time() if now is None else now
+    minimum = settings.getfloat('RECRAWL_MIN_INTERVAL', 6 * 3600)
+    maximum = settings.getfloat('RECRAWL_MAX_INTERVAL', 7 * DAY)
+
+    if status != 'unchanged' or not previous_interval:
+        interval = minimum
+    else:
+        interval = previous_interval * settings.getfloat('RECRAWL_BACKOFF', 2.0)
+
+    # Young listings get price cuts and sell early; volatile prices deserve a closer eye
+    if now - first_seen < settings.getfloat('RECRAWL_YOUNG_AGE', 2 * DAY):
+        interval = min(interval, minimum * 2)
+    if price_changes >= settings.getint('RECRAWL_VOLATILE_PRICE_CHANGES', 2):
+        interval = min(interval, minimum * 4)
+
+    return max(minimum, min(interval, maximum))
+
+
+class IncrementalCrawlMixin:
+    """Incremental-crawl helpers for listing spiders (mix in before scrapy.Spider)"""
+
+    def incremental_enabled(self) -> bool:
+        return self.settings.getbool('INCREMENTAL_CRAWL') or _truthy(getattr(self, 'incremental', False))
+
+    def recrawl_index(self) -> DedupIndex:
+        from scrapy.utils.project import data_path
+
+        path = self.settings.get('DEDUP_INDEX_PATH') or data_path('dedup_index.sqlite3', createdir=True)
+        return DedupIndex.open(path, bloom_capacity=self.settings.getint('DEDUP_BLOOM_CAPACITY', 1_000_000))
+
+    def start_requests(self):
+        """In revisit_due mode crawl only the listing pages that are due; otherwise the normal start URLs"""
+        if not _truthy(getattr(self, 'revisit_due', False)):
+            yield from super().start_requests()
+            return
+
+        due = self.recrawl_index().due_pages(self.name, limit=int(getattr(self, 'max_results', 500) or 500))
+        logger.info(f"{self.name}: revisiting {len(due)} due listing pages")
+        for url in due:
+            request = self._conditional_request(url, self.parse_listing, {})
+            if request is not None:
+                yield request
+
+    def listing_request(self, response, url: str, callback, meta: Optional[Dict[str, Any]] = None):
+        """
+        Request for a listing detail page, or what to do instead in incremental mode.
+
+        Returns:
+            A Request, a cached CarListingItem (page not due and emit_unchanged is set), or None to skip
+        """
+        meta = dict(meta or {})
+        full_url = response.urljoin(url)
+        if not self.incremental_enabled():
+            return response.follow(full_url, callback, meta=meta)
+
+        state = self.recrawl_index().page_state(normalize_url(full_url))
+        if state is not None and state['next_visit_at'] > time.time():
+            self.crawler.stats.inc_value('recrawl/skipped_not_due')
+            if state['item'] and _truthy(getattr(self, 'emit_unchanged', False)):
+                return self._cached_item(state)
+            return None
+        return self._conditional_request(full_url, callback, meta, state)
+
+    def _conditional_request(self, url: str, callback, meta: Dict[str, Any], state: Optional[Dict[str, Any]] = None) -> Request:
+        if state is None:
+            state = self.recrawl_index().page_state(normalize_url(url))
+        headers = {}
+        if state is not None:
+            if state['etag']:
+                headers['If-None-Match'] = state['etag']
+            if state['last_modified']:
+                headers['If-Modified-Since'] = state['last_modified']
+        meta = {**meta, 'handle_httpstatus_list': [304], 'recrawl_state': state}
+        return Request(url, callback=callback, headers=headers, meta=meta)
+
+    def _cached_item(self, state: Dict[str, Any]) -> CarListingItem:
+        fields = CarListingItem.fields
+        item = CarListingItem({key: value for key, value in state['item'].items() if key in fields})
+        item['dedup_status'] = 'cached'
+        if hasattr(self, 'results_count'):
+            self.results_count += 1
+        return item
+
+    def not_modified_items(self, response) -> Iterator[CarListingItem]:
+        """Handle a 304 for a listing page: push its next visit back and (for searches) return the stored item"""
+        self.crawler.stats.inc_value('recrawl/not_modified')
+        state = response.meta.get('recrawl_state')
+        if state is None:
+            return
+        index = self.recrawl_index()
+        interval = next_visit_interval(
+            'unchanged',
+            state['interval'],
+            state['first_seen'] or time.time(),
+            index.price_change_count(state['identity'], time.time() - self.settings.getfloat('RECRAWL_VOLATILE_WINDOW', 7 * DAY)),
+            self.settings,
+        )
+        index.schedule_revisit(state['url'], self.name, interval, identity=state['identity'])
+        if state['item'] and _truthy(getattr(self, 'emit_unchanged', False)):
+            yield self._cached_item(state)
+
+    def remember_validators(self, response) -> None:
+        """Record ETag / Last-Modified of a fetched listing page for the next conditional request"""
+        if not self.incremental_enabled():
+            return
+        self.crawler.stats.inc_value('recrawl/fetched')
+        etag = response.headers.get('ETag')
+        last_modified = response.headers.get('Last-Modified')
+        self.recrawl_index().remember_validators(
+            normalize_url(response.url),
+            self.name,
+            etag.decode('latin-1') if etag else None,
+            last_modified.decode('latin-1') if last_modified else None,
+        )
@@ -61,8 +61,23 @@ ITEM_PIPELINES = {
     'accorria_scraper.pipelines.ValidationPipeline': 300,
     'accorria_scraper.pipelines.DuplicatesPipeline': 400,
     'accorria_scraper.pipelines.CleaningPipeline': 500,
+    'accorria_scraper.pipelines.ItemSinkPipeline': 900,
 }
 
+# Persistent cross-run dedup index (SQLite under .scrapy/ unless set)
+DEDUP_INDEX_PATH = None
+DEDUP_BLOOM_CAPACITY = 1000000
+DEDUP_DROP_UNCHANGED = True
+
+# Incremental recrawl (see accorria_scraper/recrawl.py); also per crawl with -a incremental=1
+INCREMENTAL_CRAWL = False
+RECRAWL_MIN_INTERVAL = 6 * 3600
+RECRAWL_MAX_INTERVAL = 7 * 24 * 3600
+RECRAWL_BACKOFF = 2.0
+RECRAWL_YOUNG_AGE = 2 * 24 * 3600
+RECRAWL_VOLATILE_WINDOW = 7 * 24 * 3600
+RECRAWL_VOLATILE_PRICE_CHANGES = 2
+
 # Enable and configure the AutoThrottle extension (disabled by default)
 # See https://docs.scrapy.org/en/latest/topics/autothrottle.html
 AUTOTHROTTLE_ENABLED = True
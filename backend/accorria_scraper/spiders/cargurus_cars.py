@@ -3,11 +3,12 @@ import re
 import logging
 from urllib.parse import urljoin, urlparse, parse_qs
 from accorria_scraper.items import CarListingItem
+from accorria_scraper.recrawl import IncrementalCrawlMixin
 
 logger = logging.getLogger(__name__)
 
 
-class CargurusCarsSpider(scrapy.Spider):
+class CargurusCarsSpider(IncrementalCrawlMixin, scrapy.Spider):
     name = 'cargurus_cars'
     allowed_domains = ['cargurus.com']
     
@@ -51,7 +52,9 @@ class CargurusCarsSpider(scrapy.Spider):
             # Make sure it's a car listing URL
             if '/Cars/inventorylisting/' in link or '/Cars/listing/' in link:
                 full_url = urljoin(response.url, link)
-                yield response.follow(full_url, self.parse_listing, meta={'original_url': full_url})
+                request = self.listing_request(response, full_url, self.parse_listing, meta={'original_url': full_url})
+                if request is not None:
+                    yield request
         
         # Follow pagination if needed
         next_page = response.css('.pagination-next a::attr(href)').get()
@@ -103,10 +106,16 @@ class CargurusCarsSpider(scrapy.Spider):
         if self.results_count >= self.max_results:
             return
         
+        # Incremental crawl: unchanged since the last visit
+        if response.status == 304:
+            yield from self.not_modified_items(response)
+            return
+        
         # Check if we got redirected to an error page
         if response.status == 404 or 'error' in response.url.lower():
             logger.warning(f"CarGurus listing returned 404: {response.url}")
             return
+        self.remember_validators(response)
         
         try:
             item = CarListingItem()
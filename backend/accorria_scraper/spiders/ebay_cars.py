@@ -3,11 +3,12 @@ import re
 import logging
 from urllib.parse import urljoin, urlparse, parse_qs
 from accorria_scraper.items import CarListingItem
+from accorria_scraper.recrawl import IncrementalCrawlMixin
 
 logger = logging.getLogger(__name__)
 
 
-class EbayCarsSpider(scrapy.Spider):
+class EbayCarsSpider(IncrementalCrawlMixin, scrapy.Spider):
     name = 'ebay_cars'
     allowed_domains = ['ebay.com', 'ebaymotors.com']
     
@@ -35,7 +36,9 @@ class EbayCarsSpider(scrapy.Spider):
                 
             # Skip sponsored links and non-car listings
             if 'ebay.com/itm/' in link and 'Cars-Trucks' in link:
-                yield response.follow(link, self.parse_listing)
+                request = self.listing_request(response, link, self.parse_listing)
+                if request is not None:
+                    yield request
         
         # Follow pagination if needed
         next_page = response.css('.pagination__next::attr(href)').get()
@@ -47,6 +50,12 @@ class EbayCarsSpider(scrapy.Spider):
         if self.results_count >= self.max_results:
             return
         
+        # Incremental crawl: unchanged since the last visit
+        if response.status == 304:
+            yield from self.not_modified_items(response)
+            return
+        self.remember_validators(response)
+        
         try:
             item = CarListingItem()
             
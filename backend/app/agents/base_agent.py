@@ -9,8 +9,11 @@ from abc import ABC, abstractmethod
 from typing import Any, Dict, List, Optional
 from datetime import datetime
 import logging
+import time
 from pydantic import BaseModel
 
+from app.services.instrumentation import span
+
 logger = logging.getLogger(__name__)
 
 
@@ -111,6 +114,10 @@ class BaseAgent(ABC):
         """
         Main execution method that handles the full processing pipeline.
         
+        The run is timed with a monotonic clock inside an "agent" span, so it
+        lands in the per-agent latency histogram and error counters, and
+        upstream calls made while processing become child spans.
+        
         Args:
             input_data: Input data for processing
             
@@ -119,52 +126,71 @@ class BaseAgent(ABC):
         """
         start_time = datetime.now()
         
-        try:
-            # Validate input
-            if not self.validate_input(input_data):
+        with span(f"agent.{self.name}", kind="agent", agent=self.name) as agent_span:
+            started = time.perf_counter()
+            try:
+                # Validate input
+                if not self.validate_input(input_data):
+                    agent_span.fail("Input validation failed")
+                    agent_span.set_attribute("exception", "validation")
+                    return AgentOutput(
+                        agent_name=self.name,
+                        timestamp=start_time,
+                        success=False,
+                        data={},
+                        confidence=0.0,
+                        processing_time=time.perf_counter() - started,
+                        error_message="Input validation failed"
+                    )
+                
+                # Preprocess
+                processed_input = self.preprocess(input_data)
+                
+                # Main processing
+                result_data = await self.process(processed_input)
+                
+                # Postprocess
+                final_data = self.postprocess(result_data.data)
+                
+                processing_time = time.perf_counter() - started
+                if not result_data.success:
+                    agent_span.fail(result_data.error_message or "Agent reported failure")
+                
+                return AgentOutput(
+                    agent_name=self.name,
+                    timestamp=start_time,
+                    success=result_data.success,
+                    data=final_data,
+                    confidence=result_data.confidence,
+                    processing_time=processing_time,
+                    error_message=result_data.error_message
+                )
+                
+            except Exception as e:
+                processing_time = time.perf_counter() - started
+                self.logger.error(f"Agent {self.name} failed: {str(e)}", exc_info=True)
+                agent_span.fail(str(e))
+                agent_span.set_attribute("exception", type(e).__name__)
+                
                 return AgentOutput(
                     agent_name=self.name,
                     timestamp=start_time,
                     success=False,
                     data={},
                     confidence=0.0,
-                    processing_time=0.0,
-                    error_message="Input validation failed"
+                    processing_time=processing_time,
+                    error_message=str(e)
                 )
-            
-            # Preprocess
-            processed_input = self.preprocess(input_data)
-            
-            # Main processing
-            result_data = await self.process(processed_input)
-            
-            # Postprocess
-            final_data = self.postprocess(result_data.data)
-            
-            processing_time = (datetime.now() - start_time).total_seconds()
-            
-            return AgentOutput(
-                agent_name=self.name,
-                timestamp=start_time,
-                success=result_data.success,
-                data=final_data,
-                confidence=result_data.confidence,
-                processing_time=processing_time
-            )
-            
-        except Exception as e:
-            processing_time = (datetime.now() - start_time).total_seconds()
-            self.logger.error(f"Agent {self.name} failed: {str(e)}", exc_info=True)
-            
-            return AgentOutput(
-                agent_name=self.name,
-                timestamp=start_time,
-                success=False,
-                data={},
-                confidence=0.0,
-                processing_time=processing_time,
-                error_message=str(e)
-            )
+    
+    def span(self, name: str, kind: str = "internal", **attributes: Any) -> span:
+        """
+        Time a stage or upstream call as a child of this agent's run.
+        
+        Usage:
+            async with self.span("gemini.market_search", kind="upstream"):
+                ...
+        """
+        return span(name, kind=kind, **attributes)
     
     def get_status(self) -> Dict[str, Any]:
         """
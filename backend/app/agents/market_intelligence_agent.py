@@ -17,19 +17,40 @@ from typing import Any, Dict, List, Optional
 from datetime import datetime, timedelta
 import json
 import openai
-import httpx
 from .base_agent import BaseAgent, AgentOutput
-from app.services.cache import cache_get, cache_set, _normalize_key
+from app.services.cache import cache_get, cache_set, ttl_for_analysis_type, _normalize_key
+from app.services.single_flight import SingleFlight
+from app.services.http_clients import http_clients
+from app.core.config import settings
+from app.core.logging_config import log_payload
+from app.services.listings_store import listings_store
 from app.utils.pricing_rules import (
+    MALIBU_MARKET_AVERAGE,
+    MALIBU_MARKET_AVERAGE_MIN_AGE,
+    calculate_low_mileage_premium_percent,
+    calculate_midwest_mileage_discount,
     calculate_mileage_penalty_percent,
     detect_trim_tier,
+    get_base_new_price,
+    get_depreciation_bracket,
+    get_midwest_base_discount,
     get_reliability_tier,
     get_trim_adjustment_percent,
+    get_value_retention_multiplier,
+    is_midwest_location,
     normalize_title_status,
 )
 
 logger = logging.getLogger(__name__)
 
+# Overall budget for one grounded search (leaves a buffer before the 60s frontend timeout)
+GROUNDING_SEARCH_TIMEOUT_SEC = 50.0
+
+# Shared across agent instances so concurrent requests for the same query coalesce.
+# A cross-worker follower gives up on a stalled leader well inside the overall
+# budget, leaving ~20s for its own fallback call upstream.
+GROUNDING_SEARCH_FLIGHT = SingleFlight("gemini-grounding", lease_sec=60.0, wait_timeout=30.0)
+
 
 class MarketIntelligenceAgent(BaseAgent):
     """
@@ -53,7 +74,7 @@ class MarketIntelligenceAgent(BaseAgent):
         
         # Initialize OpenAI client if available (fallback)
         if self.openai_api_key:
-            self.openai_client = openai.OpenAI(api_key=self.openai_api_key)
+            self.openai_client = openai.AsyncOpenAI(api_key=self.openai_api_key)
         else:
             self.openai_client = None
             logger.warning("OpenAI API key not set, will use Gemini only")
@@ -115,19 +136,20 @@ class MarketIntelligenceAgent(BaseAgent):
                 raw_title_status = input_data.get("titleStatus")
             normalized_title_status = normalize_title_status(raw_title_status)
 
+            analysis_type = input_data.get("analysis_type", "comprehensive")
             cache_key = _normalize_key({
                 "make": input_data.get("make"),
                 "model": input_data.get("model"),
+                "trim": input_data.get("trim"),
                 "year": input_data.get("year"),
                 "mileage": input_data.get("mileage"),
                 "location": input_data.get("location"),
                 "title_status": normalized_title_status,
-                "analysis_type": input_data.get("analysis_type", "comprehensive"),
+                "analysis_type": analysis_type,
             })
+            cache_ttl = ttl_for_analysis_type(analysis_type)
             
-            # TEMPORARILY: Reduce cache TTL to 0 for testing (disable cache)
-            # This ensures we always get fresh results with the new guardrails
-            cached_result = cache_get(cache_key, ttl_sec=0)  # 0 = no cache (for testing)
+            cached_result = cache_get(cache_key) if cache_ttl > 0 else None
             if cached_result:
                 logger.info(f"[MARKET-INTEL] Cache hit for key: {cache_key}")
                 print(f"[MARKET-INTEL] ✅ Cache hit - skipping API calls")
@@ -141,21 +163,21 @@ class MarketIntelligenceAgent(BaseAgent):
                 )
             
             print(f"[MARKET-INTEL] ❌ Cache miss - running analysis")
-            analysis_type = input_data.get("analysis_type", "comprehensive")
             
-            if analysis_type == "make_model_analysis":
-                result = await self._analyze_make_model(input_data)
-            elif analysis_type == "competitor_research":
-                result = await self._research_competitors(input_data)
-            elif analysis_type == "pricing_analysis":
-                result = await self._analyze_pricing(input_data)
-            elif analysis_type == "threshold_setting":
-                result = await self._set_profit_thresholds(input_data)
-            else:  # comprehensive
-                result = await self._comprehensive_analysis(input_data)
+            async with self.span(f"market_intel.{analysis_type}"):
+                if analysis_type == "make_model_analysis":
+                    result = await self._analyze_make_model(input_data)
+                elif analysis_type == "competitor_research":
+                    result = await self._research_competitors(input_data)
+                elif analysis_type == "pricing_analysis":
+                    result = await self._analyze_pricing(input_data)
+                elif analysis_type == "threshold_setting":
+                    result = await self._set_profit_thresholds(input_data)
+                else:  # comprehensive
+                    result = await self._comprehensive_analysis(input_data)
             
             # Cache the result
-            cache_set(cache_key, result)
+            cache_set(cache_key, result, ttl_sec=cache_ttl)
             
             return AgentOutput(
                 agent_name=self.name,
@@ -216,8 +238,13 @@ class MarketIntelligenceAgent(BaseAgent):
         location = input_data.get("location", "United States")
         radius_miles = input_data.get("radius_miles", 50)
         
-        # Simulate competitor research
-        competitors = await self._find_competitors(make, model, location, radius_miles)
+        competitors = await self._find_competitors(
+            make, model, location, radius_miles,
+            year=input_data.get("year"),
+            mileage=input_data.get("mileage"),
+            latitude=input_data.get("latitude"),
+            longitude=input_data.get("longitude"),
+        )
         
         # Analyze competitor pricing
         pricing_analysis = await self._analyze_competitor_pricing(competitors)
@@ -337,15 +364,17 @@ class MarketIntelligenceAgent(BaseAgent):
         Perform web search using Google Gemini with Google Search Grounding.
         Falls back to OpenAI if Gemini is not available.
         """
-        import asyncio
         # Prefer Gemini with Google Search Grounding (better for real-time data)
         if self.gemini_api_key:
             # Add timeout wrapper to prevent hanging (50 seconds max - gives buffer before 60s frontend timeout)
+            # Concurrent identical queries (in this process or other workers) share one Gemini call
             try:
-                return await asyncio.wait_for(
-                    self._web_search_gemini(query),
-                    timeout=50.0
-                )
+                # Includes waiting on a shared flight; the http.gemini child span is the call itself
+                async with self.span("gemini.grounding_search", kind="upstream"):
+                    return await asyncio.wait_for(
+                        GROUNDING_SEARCH_FLIGHT.do(query, lambda: self._web_search_gemini(query)),
+                        timeout=GROUNDING_SEARCH_TIMEOUT_SEC
+                    )
             except asyncio.TimeoutError:
                 logger.warning(f"Google Search timed out after 50 seconds for query: {query[:100]}")
                 print(f"[MARKET-INTEL] ⚠️  Google Search timed out after 50 seconds - using fallback estimate")
@@ -366,19 +395,19 @@ class MarketIntelligenceAgent(BaseAgent):
             if not self.gemini_api_key:
                 raise ValueError("GEMINI_API_KEY is required for Google Search Grounding")
             
-            async with httpx.AsyncClient() as client:
-                api_url = f"https://generativelanguage.googleapis.com/v1beta/models/gemini-2.5-flash:generateContent?key={self.gemini_api_key}"
-                print(f"[MARKET-INTEL] 🌐 Calling Gemini API: {api_url[:80]}...")
-                
-                # Optimized prompt to get direct AI answers like Google's AI Overview feature
-                # Format: "2015 jeep compass latitude market price" triggers Google's AI Overview
-                # which shows price ranges like "approximately $6,000 to $14,000"
-                # Example AI Overview format:
-                # "The 2021 Chevrolet Trailblazer RS has a current marketplace value (as of late 2024) 
-                #  that is estimated to be between $15,000 and $20,000, depending on the vehicle's 
-                #  condition, mileage, and specific features. Trade-in values are lower, around $14,000, 
-                #  while private party sales and dealer retail prices can be higher."
-                prompt = f"""Search Google for CURRENT USED MARKET pricing data for: {query}
+            client = http_clients.httpx_client("gemini")
+            api_url = f"https://generativelanguage.googleapis.com/v1beta/models/gemini-2.5-flash:generateContent?key={self.gemini_api_key}"
+            print(f"[MARKET-INTEL] 🌐 Calling Gemini API: {api_url[:80]}...")
+            
+            # Optimized prompt to get direct AI answers like Google's AI Overview feature
+            # Format: "2015 jeep compass latitude market price" triggers Google's AI Overview
+            # which shows price ranges like "approximately $6,000 to $14,000"
+            # Example AI Overview format:
+            # "The 2021 Chevrolet Trailblazer RS has a current marketplace value (as of late 2024) 
+            #  that is estimated to be between $15,000 and $20,000, depending on the vehicle's 
+            #  condition, mileage, and specific features. Trade-in values are lower, around $14,000, 
+            #  while private party sales and dealer retail prices can be higher."
+            prompt = f"""Search Google for CURRENT USED MARKET pricing data for: {query}
 
 CRITICAL REQUIREMENTS:
 - ONLY return USED car market prices, NOT MSRP or original/new car prices
@@ -428,110 +457,112 @@ Instructions:
 - Provide specific dollar amounts as numbers, not text
 
 Return ONLY the JSON object, no additional text or markdown formatting."""
+            
+            # Try with Google Search Grounding first
+            try:
+                response = await http_clients.request(
+                    "gemini",
+                    "POST",
+                    api_url,
+                    json={
+                        "contents": [{
+                            "parts": [{
+                                "text": prompt
+                            }]
+                        }],
+                        "tools": [{
+                            "googleSearch": {}  # REAL Google Search Grounding
+                        }],
+                        "generationConfig": {
+                            "maxOutputTokens": 2000,
+                            "temperature": 0  # Deterministic pricing - no randomness
+                            # NOTE: Cannot use responseMimeType with googleSearch tool
+                            # Google Search Grounding returns text with search results embedded
+                        }
+                    },
+                    timeout=60.0  # Increased timeout for Google Search API calls
+                )
+                
+                print(f"[MARKET-INTEL] 📡 API Response Status: {response.status_code}")
                 
-                # Try with Google Search Grounding first
-                try:
+                if response.status_code == 200:
+                    # Success! Continue processing
+                    pass
+                elif response.status_code == 403:
+                    # Google Search Grounding not enabled or not available
+                    print(f"[MARKET-INTEL] ⚠️  Google Search Grounding returned 403 (not enabled or requires setup)")
+                    print(f"[MARKET-INTEL] 🔄 Falling back to Gemini without Google Search Grounding...")
+                    
+                    # Fallback: Use Gemini without Google Search Grounding
+                    # It can still provide market data based on its training data
                     response = await client.post(
                         api_url,
                         json={
                             "contents": [{
                                 "parts": [{
-                                    "text": prompt
+                                    "text": prompt + "\n\nNote: Use your knowledge of current market prices for this vehicle."
                                 }]
                             }],
-                            "tools": [{
-                                "googleSearch": {}  # REAL Google Search Grounding
-                            }],
                             "generationConfig": {
                                 "maxOutputTokens": 2000,
                                 "temperature": 0  # Deterministic pricing - no randomness
-                                # NOTE: Cannot use responseMimeType with googleSearch tool
-                                # Google Search Grounding returns text with search results embedded
                             }
                         },
-                        timeout=60.0  # Increased timeout for Google Search API calls
+                        timeout=60.0
                     )
-                    
-                    print(f"[MARKET-INTEL] 📡 API Response Status: {response.status_code}")
-                    
-                    if response.status_code == 200:
-                        # Success! Continue processing
-                        pass
-                    elif response.status_code == 403:
-                        # Google Search Grounding not enabled or not available
-                        print(f"[MARKET-INTEL] ⚠️  Google Search Grounding returned 403 (not enabled or requires setup)")
-                        print(f"[MARKET-INTEL] 🔄 Falling back to Gemini without Google Search Grounding...")
-                        
-                        # Fallback: Use Gemini without Google Search Grounding
-                        # It can still provide market data based on its training data
-                        response = await client.post(
-                            api_url,
-                            json={
-                                "contents": [{
-                                    "parts": [{
-                                        "text": prompt + "\n\nNote: Use your knowledge of current market prices for this vehicle."
-                                    }]
-                                }],
-                                "generationConfig": {
-                                    "maxOutputTokens": 2000,
-                                    "temperature": 0  # Deterministic pricing - no randomness
-                                }
-                            },
-                            timeout=60.0
-                        )
-                        print(f"[MARKET-INTEL] 📡 Fallback API Response Status: {response.status_code}")
-                    else:
-                        logger.error(f"Gemini API error: {response.text}")
-                        print(f"[MARKET-INTEL] ❌ Gemini API error: {response.status_code} - {response.text[:200]}")
-                        return None
-                        
-                except Exception as api_error:
-                    logger.error(f"API call failed: {api_error}")
-                    print(f"[MARKET-INTEL] ❌ API call exception: {type(api_error).__name__}: {str(api_error)}")
-                    return None
-                
-                if response.status_code != 200:
+                    print(f"[MARKET-INTEL] 📡 Fallback API Response Status: {response.status_code}")
+                else:
                     logger.error(f"Gemini API error: {response.text}")
                     print(f"[MARKET-INTEL] ❌ Gemini API error: {response.status_code} - {response.text[:200]}")
                     return None
-                
-                result = response.json()
-                if "candidates" in result and len(result["candidates"]) > 0:
-                    candidate = result["candidates"][0]
-                    if "content" in candidate and "parts" in candidate["content"]:
-                        parts = candidate["content"]["parts"]
-                        # Extract text from all parts
-                        text_parts = []
-                        for part in parts:
-                            if "text" in part:
-                                text_parts.append(part["text"])
-                        if text_parts:
-                            search_result = " ".join(text_parts)
-                            print(f"[MARKET-INTEL] ✅ REAL Google Search Grounding returned {len(search_result)} characters")
-                            print(f"[MARKET-INTEL] 📊 Search result preview: {search_result[:200]}...")
-                            
-                            # Try to parse as JSON first (if Gemini returned structured JSON)
-                            try:
-                                import json
-                                # Extract JSON from response (might be wrapped in markdown code blocks)
-                                json_text = search_result
-                                if "```json" in json_text:
-                                    json_text = json_text.split("```json")[1].split("```")[0].strip()
-                                elif "```" in json_text:
-                                    json_text = json_text.split("```")[1].split("```")[0].strip()
-                                
-                                parsed_json = json.loads(json_text)
-                                print(f"[MARKET-INTEL] ✅ Parsed structured JSON from Gemini response")
-                                # Store parsed JSON in a special format for later extraction
-                                return f"__STRUCTURED_JSON__{json.dumps(parsed_json)}__END_JSON__"
-                            except (json.JSONDecodeError, ValueError) as e:
-                                print(f"[MARKET-INTEL] ⚠️ Could not parse as JSON, using text extraction: {e}")
-                                # Fall back to text extraction
-                                return search_result
-                
-                print(f"[MARKET-INTEL] ⚠️ No results from Gemini API (empty response)")
+                    
+            except Exception as api_error:
+                logger.error(f"API call failed: {api_error}")
+                print(f"[MARKET-INTEL] ❌ API call exception: {type(api_error).__name__}: {str(api_error)}")
                 return None
-                
+            
+            if response.status_code != 200:
+                logger.error(f"Gemini API error: {response.text}")
+                print(f"[MARKET-INTEL] ❌ Gemini API error: {response.status_code} - {response.text[:200]}")
+                return None
+            
+            result = response.json()
+            if "candidates" in result and len(result["candidates"]) > 0:
+                candidate = result["candidates"][0]
+                if "content" in candidate and "parts" in candidate["content"]:
+                    parts = candidate["content"]["parts"]
+                    # Extract text from all parts
+                    text_parts = []
+                    for part in parts:
+                        if "text" in part:
+                            text_parts.append(part["text"])
+                    if text_parts:
+                        search_result = " ".join(text_parts)
+                        print(f"[MARKET-INTEL] ✅ REAL Google Search Grounding returned {len(search_result)} characters")
+                        print(f"[MARKET-INTEL] 📊 Search result preview: {search_result[:200]}...")
+                        
+                        # Try to parse as JSON first (if Gemini returned structured JSON)
+                        try:
+                            import json
+                            # Extract JSON from response (might be wrapped in markdown code blocks)
+                            json_text = search_result
+                            if "```json" in json_text:
+                                json_text = json_text.split("```json")[1].split("```")[0].strip()
+                            elif "```" in json_text:
+                                json_text = json_text.split("```")[1].split("```")[0].strip()
+                            
+                            parsed_json = json.loads(json_text)
+                            print(f"[MARKET-INTEL] ✅ Parsed structured JSON from Gemini response")
+                            # Store parsed JSON in a special format for later extraction
+                            return f"__STRUCTURED_JSON__{json.dumps(parsed_json)}__END_JSON__"
+                        except (json.JSONDecodeError, ValueError) as e:
+                            print(f"[MARKET-INTEL] ⚠️ Could not parse as JSON, using text extraction: {e}")
+                            # Fall back to text extraction
+                            return search_result
+            
+            print(f"[MARKET-INTEL] ⚠️ No results from Gemini API (empty response)")
+            return None
+            
         except Exception as e:
             logger.error(f"Gemini web search failed: {e}", exc_info=True)
             print(f"[MARKET-INTEL] ❌ REAL API call failed: {type(e).__name__}: {str(e)}")
@@ -545,20 +576,22 @@ Return ONLY the JSON object, no additional text or markdown formatting."""
         try:
             # Note: OpenAI's web_search tool may not be available in all models
             # This is a fallback option
-            response = self.openai_client.chat.completions.create(
-                model="gpt-4o",
-                messages=[
-                    {
-                        "role": "system",
-                        "content": "You are a market research assistant. Provide current market information based on your knowledge."
-                    },
-                    {
-                        "role": "user",
-                        "content": f"Provide current market information for: {query}. Include pricing trends and recent data if available."
-                    }
-                ],
-                max_tokens=500
-            )
+            # Not on the pooled OpenAI transport, so trace the call explicitly
+            async with self.span("openai.chat", kind="upstream", model="gpt-4o"):
+                response = await self.openai_client.chat.completions.create(
+                    model="gpt-4o",
+                    messages=[
+                        {
+                            "role": "system",
+                            "content": "You are a market research assistant. Provide current market information based on your knowledge."
+                        },
+                        {
+                            "role": "user",
+                            "content": f"Provide current market information for: {query}. Include pricing trends and recent data if available."
+                        }
+                    ],
+                    max_tokens=500
+                )
             
             return response.choices[0].message.content if response.choices else None
             
@@ -651,8 +684,51 @@ Return ONLY the JSON object, no additional text or markdown formatting."""
             "risk_factors": ["market volatility", "seasonal changes"]
         }
     
-    async def _find_competitors(self, make: str, model: str, location: str, radius_miles: int) -> List[Dict[str, Any]]:
-        """Find competitors in the local area."""
+    async def _find_competitors(
+        self,
+        make: str,
+        model: str,
+        location: str,
+        radius_miles: int,
+        year: Optional[int] = None,
+        mileage: Optional[int] = None,
+        latitude: Optional[float] = None,
+        longitude: Optional[float] = None,
+    ) -> List[Dict[str, Any]]:
+        """Find competitors in the local area (local listings store first, simulated otherwise)."""
+        try:
+            comps = await listings_store.comparables(
+                make, model,
+                year=year,
+                mileage=mileage,
+                location=location,
+                radius_miles=radius_miles,
+                latitude=latitude,
+                longitude=longitude,
+                limit=25,
+            )
+        except Exception as e:
+            logger.warning(f"Local listings store query failed: {e}")
+            comps = []
+        if len(comps) >= settings.LISTINGS_STORE_MIN_COMPS:
+            now = datetime.now().timestamp()
+            return [
+                {
+                    "id": comp["listing_key"],
+                    "title": comp["title"] or f"{comp['year']} {comp['make']} {comp['model']}",
+                    "price": comp["price"],
+                    "mileage": comp["mileage"],
+                    "year": comp["year"],
+                    "location": comp["location"],
+                    "platform": comp["source"],
+                    "url": comp["url"],
+                    "days_since_seen": int((now - comp["scraped_at"]) // 86400),
+                    "condition": comp["condition"],
+                    "data_source": "local_listings",
+                }
+                for comp in comps
+            ]
+        
         # Simulate competitor search
         competitors = []
         for i in range(5):  # Simulate 5 competitors
@@ -846,17 +922,11 @@ Return ONLY the JSON object, no additional text or markdown formatting."""
             return base_price
         
         # For older vehicles, low mileage premium is capped
-        if mileage < 20000:
-            # CRITICAL: For 8+ year old vehicles, max premium is 10%
-            # For 5-7 year old vehicles, max premium is 15%
+        # CRITICAL: For 8+ year old vehicles, max premium is 10%; for 5-7 year old vehicles, 15%
+        mileage_premium, max_premium = calculate_low_mileage_premium_percent(mileage, vehicle_age)
+        if max_premium:
             if vehicle_age >= 8:
-                max_premium = 0.10  # 10% max for 8+ year old vehicles
                 print(f"[MARKET-INTEL] 🔒 STRICT MILEAGE CAP (8+ years): Max premium 10%")
-            else:
-                max_premium = 0.15  # 15% max for 5-7 year old vehicles
-            
-            # Calculate premium based on how low mileage is
-            mileage_premium = min(max_premium, (20000 - mileage) / 20000 * max_premium)
             adjusted_price = base_price * (1 + mileage_premium)
             print(f"[MARKET-INTEL] 📊 Mileage premium cap applied: {mileage:,} miles on {year} vehicle (age: {vehicle_age} years) adds {mileage_premium*100:.1f}% premium (capped at {max_premium*100:.0f}%)")
             print(f"[MARKET-INTEL] 📊 Price: ${base_price:,.0f} → ${adjusted_price:,.0f} (premium: ${adjusted_price - base_price:,.0f})")
@@ -869,51 +939,24 @@ Return ONLY the JSON object, no additional text or markdown formatting."""
         Apply Detroit/Michigan Midwest discount curve to market prices.
         
         Discounts:
-        - Sedans: -15% to -22%
+        - Sedans: -15% to -20% (average -17.5%)
         - Coupes: -10%
-        - Trucks/SUVs: -3% to -12%
-        - Luxury brands: -20% to -30%
+        - Trucks/SUVs: -5% to -10% (average -7.5%)
+        - Luxury brands: -20% to -30% (average -25%)
         - High mileage (>150k): additional -3% to -7%
         """
-        location_lower = (location or "").lower()
-        is_detroit_michigan = any(term in location_lower for term in ["detroit", "michigan", "mi", "flint", "redford", "warren", "troy", "dearborn"])
-        
-        if not is_detroit_michigan:
+        if not is_midwest_location(location):
             return price  # No discount for non-Midwest locations
         
-        make_lower = (make or "").lower()
-        model_lower = (model or "").lower()
-        
-        # Determine vehicle type and base discount
-        base_discount = 0.0
-        
-        # Luxury brands: -20% to -30%
-        luxury_brands = ["bmw", "mercedes", "mercedes-benz", "audi", "lexus", "infiniti", "acura", "cadillac", "lincoln", "porsche", "jaguar", "land rover"]
-        if any(brand in make_lower for brand in luxury_brands):
-            base_discount = 0.25  # Average -25% for luxury
-        # Trucks/SUVs: -3% to -12%
-        elif any(term in model_lower for term in ["truck", "pickup", "f-150", "f150", "silverado", "ram", "tundra", "tacoma", "ranger", "colorado"]):
-            base_discount = 0.075  # Average -7.5% for trucks
-        elif any(term in model_lower for term in ["suv", "explorer", "escape", "cr-v", "rav4", "highlander", "pilot", "pathfinder", "tahoe", "suburban", "yukon", "escalade"]):
-            base_discount = 0.075  # Average -7.5% for SUVs
-        # Coupes: -10%
-        elif any(term in model_lower for term in ["coupe", "camaro", "mustang", "challenger", "charger"]):
-            base_discount = 0.10
-        # Sedans: -15% to -22% (default)
-        else:
-            base_discount = 0.185  # Average -18.5% for sedans
-        
-        # High mileage additional discount: -3% to -7%
-        mileage_discount = 0.0
-        if mileage and mileage > 150000:
-            # Scale from -3% at 150k to -7% at 200k+
-            mileage_discount = min(0.07, 0.03 + ((mileage - 150000) / 50000) * 0.04)
+        # Vehicle type discount, plus -3% to -7% above 150k miles
+        base_discount, category = get_midwest_base_discount(make, model)
+        mileage_discount = calculate_midwest_mileage_discount(mileage)
         
         total_discount = base_discount + mileage_discount
         discounted_price = price * (1 - total_discount)
         
         print(f"[MARKET-INTEL] 🏭 Midwest discount applied: {make} {model} in {location}")
-        print(f"[MARKET-INTEL]   Base discount: -{base_discount*100:.1f}% ({'luxury' if any(brand in make_lower for brand in luxury_brands) else 'truck/suv' if base_discount == 0.075 else 'coupe' if base_discount == 0.10 else 'sedan'})")
+        print(f"[MARKET-INTEL]   Base discount: -{base_discount*100:.1f}% ({category})")
         if mileage_discount > 0:
             print(f"[MARKET-INTEL]   High mileage discount: -{mileage_discount*100:.1f}% ({mileage:,} miles)")
         print(f"[MARKET-INTEL]   Total discount: -{total_discount*100:.1f}%")
@@ -935,69 +978,20 @@ Return ONLY the JSON object, no additional text or markdown formatting."""
         vehicle_age = current_year - year
         
         # Base new car price (adjust by make/model)
-        base_new_price = 25000  # Conservative base for average car
-        
-        make_lower = (make or "").lower()
-        model_lower = (model or "").lower()
-        
-        # Adjust base price for make/model (what it cost new)
-        if "jeep" in make_lower:
-            if "wrangler" in model_lower:
-                base_new_price = 30000  # Wranglers cost more new
-            elif "compass" in model_lower:
-                base_new_price = 22000  # Compass was cheaper new
-            else:
-                base_new_price = 25000
-        elif "honda" in make_lower:
-            if "accord" in model_lower:
-                base_new_price = 23000  # Accord base price when new
-                if "sport" in model_lower or "ex" in model_lower:
-                    base_new_price = 26000  # Sport/EX trim was more expensive
-            elif "civic" in model_lower:
-                base_new_price = 20000
-            else:
-                base_new_price = 25000
-        elif "toyota" in make_lower:
-            if "camry" in model_lower:
-                base_new_price = 24000
-            else:
-                base_new_price = 25000
-        elif "chevrolet" in make_lower or "chevy" in make_lower:
-            if "malibu" in model_lower:
-                base_new_price = 23000  # Malibu base price when new
-                if "ltz" in model_lower or "premier" in model_lower:
-                    base_new_price = 28000  # Higher trims cost more new
-            elif "silverado" in model_lower:
-                base_new_price = 30000
-            elif "equinox" in model_lower:
-                base_new_price = 24000
-            else:
-                base_new_price = 25000
-        elif "bmw" in make_lower or "mercedes" in make_lower:
-            base_new_price = 40000
-        else:
-            base_new_price = 25000
+        base_new_price = get_base_new_price(make, model)
         
         # Calculate depreciation
         # For 10+ year old Malibus, use market average as base (AutoTrader shows ~$7,748 for 2014 Malibu)
-        if vehicle_age >= 10 and "malibu" in (model or "").lower():
+        if vehicle_age >= MALIBU_MARKET_AVERAGE_MIN_AGE and "malibu" in (model or "").lower():
             # Market data: 2014 Malibu average ~$7,748 (AutoTrader, all trims/mileages)
             # Use this as starting point instead of depreciation calculation
-            base_price = 7748  # AutoTrader average for 2014 Malibu (all trims/mileages)
+            base_price = MALIBU_MARKET_AVERAGE  # AutoTrader average for 2014 Malibu (all trims/mileages)
             print(f"[MARKET-INTEL] 📊 Using market average base price for {year} Malibu: ${base_price:,.0f} (AutoTrader data)")
-        elif vehicle_age >= 8:
-            # Older vehicles depreciate faster: ~$1200-1500 per year
-            depreciation_per_year = 1300
-            base_price = max(3000, base_new_price - (vehicle_age * depreciation_per_year))
-            print(f"[MARKET-INTEL] 📊 Fallback: {vehicle_age}-year-old vehicle, aggressive depreciation (${depreciation_per_year}/year)")
-        elif vehicle_age >= 5:
-            # 5-7 year old: ~$1000 per year
-            depreciation_per_year = 1000
-            base_price = max(4000, base_new_price - (vehicle_age * depreciation_per_year))
         else:
-            # Newer vehicles: ~$800 per year
-            depreciation_per_year = 800
-            base_price = max(5000, base_new_price - (vehicle_age * depreciation_per_year))
+            min_age, depreciation_per_year, price_floor = get_depreciation_bracket(vehicle_age)
+            base_price = max(price_floor, base_new_price - (vehicle_age * depreciation_per_year))
+            if min_age >= 8:
+                print(f"[MARKET-INTEL] 📊 Fallback: {vehicle_age}-year-old vehicle, aggressive depreciation (${depreciation_per_year}/year)")
         
         # Trim tier adjustment before mileage and title deductions
         trim_tier, trim_matches = detect_trim_tier(trim)
@@ -1015,17 +1009,7 @@ Return ONLY the JSON object, no additional text or markdown formatting."""
         print(f"[MARKET-INTEL] 📊 Mileage adjustment will be applied in Pricing Strategy Agent (not in fallback)")
         
         # Make/model value retention adjustments
-        if "jeep" in make_lower and "wrangler" in model_lower:
-            base_price *= 1.2  # Wranglers hold value well
-        elif "toyota" in make_lower or "honda" in make_lower:
-            base_price *= 1.05  # Reliable brands hold value
-        elif "chevrolet" in make_lower or "chevy" in make_lower:
-            if "malibu" in model_lower:
-                base_price *= 1.0  # Malibu holds average value
-            else:
-                base_price *= 0.98  # Other Chevys slightly below average
-        elif "jeep" in make_lower and "compass" in model_lower:
-            base_price *= 0.95  # Compass doesn't hold value as well
+        base_price *= get_value_retention_multiplier(make, model)
         
         # CRITICAL: DO NOT apply title status adjustment here!
         # Title status adjustment is applied in Pricing Strategy Agent
@@ -1077,14 +1061,9 @@ Return ONLY the JSON object, no additional text or markdown formatting."""
             location_clause = f" near {formatted_location}" if formatted_location else ""
             
             # Log what we're searching for
-            print(f"[MARKET-INTEL] 🔍 Search parameters:")
-            print(f"[MARKET-INTEL]   Year: {year_str.strip()}")
-            print(f"[MARKET-INTEL]   Make: {make}")
-            print(f"[MARKET-INTEL]   Model: {model}")
-            print(f"[MARKET-INTEL]   Trim: {trim_str.strip() if trim_str else 'NOT PROVIDED - may get base model prices!'}")
-            print(f"[MARKET-INTEL]   Mileage: {mileage_str.strip() if mileage_str else 'Unknown'}")
-            print(f"[MARKET-INTEL]   Title: {title_status}")
-            print(f"[MARKET-INTEL]   Location: {formatted_location}")
+            logger.debug("[MARKET-INTEL] 🔍 Search parameters: year=%s, make=%s, model=%s, trim=%s, mileage=%s, title=%s, location=%s",
+                         year_str.strip(), make, model, trim_str.strip() if trim_str else 'NOT PROVIDED - may get base model prices!',
+                         mileage_str.strip() if mileage_str else 'Unknown', title_status, formatted_location)
             
             # STEP 1: LOCAL MARKET QUERY (Detroit/Michigan)
             # Add Detroit-specific phrases to influence Google Search Grounding results
@@ -1128,11 +1107,11 @@ Return ONLY the JSON object, no additional text or markdown formatting."""
                 
                 # Log mileage matching for verification
                 if mileage:
-                    print(f"[MARKET-INTEL] 📊 Mileage matching: Searching for vehicles with ~{mileage:,} miles to get accurate pricing")
-                    print(f"[MARKET-INTEL] 📊 This ensures we compare to similar mileage vehicles (not low-mileage or high-mileage outliers)")
+                    logger.debug("[MARKET-INTEL] 📊 Mileage matching: Searching for vehicles with ~%s miles to get accurate pricing", mileage)
+                    logger.debug("[MARKET-INTEL] 📊 This ensures we compare to similar mileage vehicles (not low-mileage or high-mileage outliers)")
                 
-                print(f"[MARKET-INTEL] 🔍 DETROIT MARKET QUERY (Google Search Grounding): {search_query}")
-                print(f"[MARKET-INTEL] ✅ Using Google Search Grounding ONLY - NO scraping, NO crawling")
+                logger.debug("[MARKET-INTEL] 🔍 DETROIT MARKET QUERY (Google Search Grounding): %s", search_query)
+                logger.debug("[MARKET-INTEL] ✅ Using Google Search Grounding ONLY - NO scraping, NO crawling")
             else:
                 # Default query for other locations
                 search_query = (
@@ -1140,19 +1119,18 @@ Return ONLY the JSON object, no additional text or markdown formatting."""
                     f"current resale value {current_year} at {formatted_location} "
                     f"used value not MSRP not original price used car listings only"
                 )
-            print(f"[MARKET-INTEL] 🔍 Price search query (with MSRP guardrails): {search_query}")
-            logger.info(f"[MARKET-INTEL] Query: {self._redact_query(search_query)}")
+            logger.debug("[MARKET-INTEL] 🔍 Price search query (with MSRP guardrails): %s", search_query)
+            logger.info("[MARKET-INTEL] Query: %s", self._redact_query(search_query))
             
             # CRITICAL: Force Google Search to run - this is the PRIMARY data source
-            print(f"[MARKET-INTEL] 🚀 FORCING Google Search API call (REQUIRED for accurate pricing)...")
+            logger.debug("[MARKET-INTEL] 🚀 FORCING Google Search API call (REQUIRED for accurate pricing)...")
             web_search_result = await self._web_search(search_query)
             
             if not web_search_result:
-                print(f"[MARKET-INTEL] ❌ CRITICAL: Google Search returned NO results!")
-                print(f"[MARKET-INTEL] ❌ This means pricing will use fallback algorithm (less accurate)")
-                print(f"[MARKET-INTEL] ❌ Check: GEMINI_API_KEY is set, Google Search Grounding is enabled")
+                logger.error("[MARKET-INTEL] ❌ CRITICAL: Google Search returned NO results - pricing will use the fallback algorithm "
+                             "(check GEMINI_API_KEY is set and Google Search Grounding is enabled)")
             else:
-                print(f"[MARKET-INTEL] ✅ Google Search returned {len(web_search_result)} characters of data")
+                logger.info("[MARKET-INTEL] ✅ Google Search returned %s characters of data", len(web_search_result))
             debug_info = {
                 "raw_prices": [],
                 "msrp_candidates": [],
@@ -1171,16 +1149,16 @@ Return ONLY the JSON object, no additional text or markdown formatting."""
             # GUARDRAIL 2: Filter out MSRP data from search results
             if web_search_result:
                 if self._contains_msrp_data(web_search_result):
-                    print(f"[MARKET-INTEL] 🚫 REJECTED: Search results contain MSRP data, filtering out...")
+                    logger.debug("[MARKET-INTEL] 🚫 REJECTED: Search results contain MSRP data, filtering out...")
                     # Try to extract only used market portions
                     # Split by sentences and keep only those with used market indicators
                     sentences = web_search_result.split('.')
                     filtered_sentences = [s for s in sentences if self._is_used_market_data(s) and not self._contains_msrp_data(s)]
                     if filtered_sentences:
                         web_search_result = '. '.join(filtered_sentences)
-                        print(f"[MARKET-INTEL] ✅ Filtered to used market data only ({len(filtered_sentences)} sentences)")
+                        logger.debug("[MARKET-INTEL] ✅ Filtered to used market data only (%s sentences)", len(filtered_sentences))
                     else:
-                        print(f"[MARKET-INTEL] ⚠️ All search results contained MSRP data, will use fallback")
+                        logger.warning("[MARKET-INTEL] ⚠️ All search results contained MSRP data, will use fallback")
                         web_search_result = None
             
             # Calculate fallback price using improved algorithm
@@ -1192,12 +1170,11 @@ Return ONLY the JSON object, no additional text or markdown formatting."""
             edmunds_value = base_price_estimate * 1.02
             cargurus_value = base_price_estimate * 0.98
             
-            print(f"[MARKET-INTEL] 📊 Fallback estimate (if Google Search fails): ${base_price_estimate:,.0f}")
+            logger.debug("[MARKET-INTEL] 📊 Fallback estimate (if Google Search fails): $%.0f", base_price_estimate)
             
             if web_search_result:
-                print(f"[MARKET-INTEL] ✅ Google Search returned results - extracting MAIN market sale value ONLY...")
-                print(f"[MARKET-INTEL] 📄 Google Search result preview (first 500 chars): {web_search_result[:500]}...")
-                print(f"[MARKET-INTEL] 📄 Full result length: {len(web_search_result)} characters")
+                logger.debug("[MARKET-INTEL] ✅ Google Search returned results - extracting MAIN market sale value ONLY...")
+                log_payload(logger, "[MARKET-INTEL] 📄 Google Search result (%s chars): %s", len(web_search_result), web_search_result)
                 
                 # NEW EXTRACTION LOGIC: ONLY extract MAIN market sale/private party value
                 # IGNORE: trade-in, wholesale, auction, SEO garbage, unrelated trims/years
@@ -1227,7 +1204,7 @@ Return ONLY the JSON object, no additional text or markdown formatting."""
                                     "type": "private_party",
                                     "priority": 1
                                 })
-                                print(f"[MARKET-INTEL] ✅ Found PRIVATE PARTY range: ${low:,} - ${high:,}")
+                                logger.debug("[MARKET-INTEL] ✅ Found PRIVATE PARTY range: $%s - $%s", low, high)
                         except (ValueError, IndexError):
                             continue
                 
@@ -1253,7 +1230,7 @@ Return ONLY the JSON object, no additional text or markdown formatting."""
                         # REJECT if in trade-in/wholesale/auction context
                         reject_keywords = ['trade-in', 'trade in', 'wholesale', 'auction', 'dealer invoice', 'starting at', 'from \$', 'as low as']
                         if any(keyword in context_before or keyword in context_after for keyword in reject_keywords):
-                            print(f"[MARKET-INTEL] 🚫 REJECTED (trade-in/wholesale/SEO): ${low:,} - ${high:,}")
+                            logger.debug("[MARKET-INTEL] 🚫 REJECTED (trade-in/wholesale/SEO): $%s - $%s", low, high)
                             continue
                         
                         # REJECT if it's clearly SEO garbage ("starting at $3,500", "from $2,999")
@@ -1269,15 +1246,15 @@ Return ONLY the JSON object, no additional text or markdown formatting."""
                                 "type": "market_sale",
                                 "priority": 2
                             })
-                            print(f"[MARKET-INTEL] ✅ Found MARKET SALE range: ${low:,} - ${high:,}")
+                            logger.debug("[MARKET-INTEL] ✅ Found MARKET SALE range: $%s - $%s", low, high)
                     except (ValueError, IndexError):
                         continue
                 
                 # ALWAYS choose the HIGHEST valid private-party/market-value range
                 if all_price_ranges:
-                    print(f"[MARKET-INTEL] 📊 DEBUG: Found {len(all_price_ranges)} valid price ranges:")
+                    logger.debug("[MARKET-INTEL] 📊 DEBUG: Found %s valid price ranges:", len(all_price_ranges))
                     for idx, pr in enumerate(all_price_ranges):
-                        print(f"[MARKET-INTEL]   Range {idx+1}: ${pr['low']:,} - ${pr['high']:,} (avg: ${pr['avg']:,.0f}, type: {pr['type']}, priority: {pr['priority']})")
+                        logger.debug("[MARKET-INTEL]   Range %s: $%s - $%s (avg: $%.0f, type: %s, priority: %s)", idx + 1, pr['low'], pr['high'], pr['avg'], pr['type'], pr['priority'])
                     
                     # Sort by priority (private_party first), then by average price (highest first)
                     all_price_ranges.sort(key=lambda x: (x["priority"], -x["avg"]))
@@ -1287,11 +1264,11 @@ Return ONLY the JSON object, no additional text or markdown formatting."""
                     low_price = selected_range["low"]
                     high_price = selected_range["high"]
                     
-                    print(f"[MARKET-INTEL] ✅ SELECTED HIGHEST MAIN MARKET VALUE: ${low_price:,} - ${high_price:,} (avg: ${market_average:,.0f})")
-                    print(f"[MARKET-INTEL] ✅ Type: {selected_range['type']}, Priority: {selected_range['priority']}")
-                    print(f"[MARKET-INTEL] 🚫 IGNORED {len(all_price_ranges)-1} other ranges (trade-in/wholesale/SEO)")
-                    print(f"[MARKET-INTEL] 📊 DEBUG: Returning market_average=${market_average:,.0f} to pricing strategy agent")
-                    print(f"[MARKET-INTEL] 📊 DEBUG: Vehicle: {year} {make} {model}, Title: {title_status}, Location: {formatted_location}")
+                    logger.info("[MARKET-INTEL] ✅ SELECTED HIGHEST MAIN MARKET VALUE: $%s - $%s (avg: $%.0f)", low_price, high_price, market_average)
+                    logger.debug("[MARKET-INTEL] ✅ Type: %s, Priority: %s", selected_range['type'], selected_range['priority'])
+                    logger.debug("[MARKET-INTEL] 🚫 IGNORED %s other ranges (trade-in/wholesale/SEO)", len(all_price_ranges) - 1)
+                    logger.debug("[MARKET-INTEL] 📊 DEBUG: Returning market_average=$%.0f to pricing strategy agent", market_average)
+                    logger.debug("[MARKET-INTEL] 📊 DEBUG: Vehicle: %s %s %s, Title: %s, Location: %s", year, make, model, title_status, formatted_location)
                     
                     # Return RAW Google price - NO adjustments here (adjustments in Pricing Strategy Agent)
                     debug_info["raw_prices"] = [low_price, high_price, market_average]
@@ -1348,8 +1325,8 @@ Return ONLY the JSON object, no additional text or markdown formatting."""
                             else:
                                 raise ValueError("No usable price in structured JSON")
                         
-                        print(f"[MARKET-INTEL] ✅ Using structured JSON PRIVATE PARTY value: ${low_price:,.0f} - ${high_price:,.0f} (avg: ${market_average:,.0f})")
-                        print(f"[MARKET-INTEL] 🚫 IGNORED trade_in_value from structured JSON")
+                        logger.debug("[MARKET-INTEL] ✅ Using structured JSON PRIVATE PARTY value: $%.0f - $%.0f (avg: $%.0f)", low_price, high_price, market_average)
+                        logger.debug("[MARKET-INTEL] 🚫 IGNORED trade_in_value from structured JSON")
                         
                         debug_info["raw_prices"] = [low_price, high_price, market_average]
                         debug_info["used_candidates"] = [market_average]
@@ -1378,45 +1355,40 @@ Return ONLY the JSON object, no additional text or markdown formatting."""
                             "google_raw_price": round(market_average)
                         }
                     except (json.JSONDecodeError, KeyError, ValueError) as e:
-                        print(f"[MARKET-INTEL] ⚠️ Failed to parse structured JSON: {e}")
+                        logger.warning("[MARKET-INTEL] ⚠️ Failed to parse structured JSON: %s", e)
                 
                 # If we get here, no valid main market value was found
-                print(f"[MARKET-INTEL] ⚠️ No valid MAIN market sale value found in Google Search results")
-                print(f"[MARKET-INTEL] ⚠️ All prices were trade-in/wholesale/SEO garbage or invalid")
-                print(f"[MARKET-INTEL] ⚠️ Google Search completely failed - will use fallback algorithm (LAST RESORT)")
+                logger.warning("[MARKET-INTEL] ⚠️ No valid MAIN market sale value found in Google Search results "
+                               "(all prices were trade-in/wholesale/SEO or invalid) - will use fallback algorithm (LAST RESORT)")
                 market_average = 0  # Signal that Google Search failed
             
             # GUARDRAIL 5: If Google Search didn't return usable prices, use fallback algorithm
             # NOTE: This should RARELY happen - Google Search should be the primary source
             # Fallback ONLY triggers when Google completely fails, NOT for year mismatch or other reasons
             if market_average == 0:
-                print(f"[MARKET-INTEL] ⚠️  ⚠️  ⚠️  CRITICAL WARNING: Google Search didn't return usable prices!")
-                print(f"[MARKET-INTEL] ⚠️  This should NOT happen - Google Search is the PRIMARY data source")
-                print(f"[MARKET-INTEL] ⚠️  Check: GEMINI_API_KEY is set, Google Search Grounding is enabled")
-                print(f"[MARKET-INTEL] ⚠️  Check backend logs for '[MARKET-INTEL] 🔍 Using REAL Google Gemini API' message")
-                print(f"[MARKET-INTEL] 📊 DEBUG: Rejected {len(debug_info.get('msrp_candidates', []))} MSRP candidates: {debug_info.get('msrp_candidates', [])}")
-                print(f"[MARKET-INTEL] 📊 DEBUG: Google Search result length: {len(web_search_result) if web_search_result else 0} characters")
+                logger.error("[MARKET-INTEL] ⚠️  CRITICAL: Google Search didn't return usable prices - it is the PRIMARY data source "
+                             "(check GEMINI_API_KEY is set and Google Search Grounding is enabled)")
+                logger.debug("[MARKET-INTEL] 📊 DEBUG: Rejected %s MSRP candidates: %s", len(debug_info.get('msrp_candidates', [])), debug_info.get('msrp_candidates', []))
+                logger.debug("[MARKET-INTEL] 📊 DEBUG: Google Search result length: %s characters", len(web_search_result) if web_search_result else 0)
                 
                 # Only use fallback if Google Search completely failed
                 market_average = base_price_estimate
                 debug_info["fallback_used"] = True
                 debug_info["data_source"] = "fallback_algorithm"
-                print(f"[MARKET-INTEL] ⚠️  Using FALLBACK pricing algorithm: ${market_average:,.0f} (LAST RESORT - Google Search should be used)")
-                print(f"[MARKET-INTEL] ⚠️  Check: GEMINI_API_KEY is set, Google Search Grounding is enabled")
-                print(f"[MARKET-INTEL] ⚠️  Check backend logs for '[MARKET-INTEL] 🔍 Using REAL Google Gemini API' message")
-                print(f"[MARKET-INTEL] 📊 DEBUG: Rejected {len(debug_info['msrp_candidates'])} MSRP candidates: {debug_info['msrp_candidates']}")
-                print(f"[MARKET-INTEL] 📊 DEBUG: Google Search result length: {len(web_search_result) if web_search_result else 0} characters")
-                print(f"[MARKET-INTEL] 📊 DEBUG: Fallback base_price_estimate: ${base_price_estimate:,.0f}")
+                logger.warning("[MARKET-INTEL] ⚠️  Using FALLBACK pricing algorithm: $%.0f (LAST RESORT - Google Search should be used)", market_average)
+                logger.debug("[MARKET-INTEL] 📊 DEBUG: Rejected %s MSRP candidates: %s", len(debug_info['msrp_candidates']), debug_info['msrp_candidates'])
+                logger.debug("[MARKET-INTEL] 📊 DEBUG: Google Search result length: %s characters", len(web_search_result) if web_search_result else 0)
+                logger.debug("[MARKET-INTEL] 📊 DEBUG: Fallback base_price_estimate: $%.0f", base_price_estimate)
             
             data_source = "estimated" if market_average == base_price_estimate else "google_search_grounding"
             if data_source == "estimated":
                 debug_info["fallback_used"] = True
                 debug_info["data_source"] = "fallback_algorithm"
-                print(f"[MARKET-INTEL] ❌ FINAL RESULT: Using FALLBACK (Google Search failed or returned no data)")
-                print(f"[MARKET-INTEL] 📊 DEBUG: market_average=${market_average:,.0f}, base_price_estimate=${base_price_estimate:,.0f}")
+                logger.warning("[MARKET-INTEL] ❌ FINAL RESULT: Using FALLBACK (Google Search failed or returned no data)")
+                logger.debug("[MARKET-INTEL] 📊 DEBUG: market_average=$%.0f, base_price_estimate=$%.0f", market_average, base_price_estimate)
             else:
-                print(f"[MARKET-INTEL] ✅ FINAL RESULT: Using REAL Google Search data")
-                print(f"[MARKET-INTEL] 📊 DEBUG: market_average=${market_average:,.0f} (from Google Search)")
+                logger.debug("[MARKET-INTEL] ✅ FINAL RESULT: Using REAL Google Search data")
+                logger.debug("[MARKET-INTEL] 📊 DEBUG: market_average=$%.0f (from Google Search)", market_average)
             
             # Ensure debug info is populated
             if not debug_info.get("raw_prices"):
@@ -1450,7 +1422,7 @@ Return ONLY the JSON object, no additional text or markdown formatting."""
                 "debug": debug_info
             }
         except Exception as e:
-            logger.error(f"Market price lookup failed: {e}")
+            logger.error("Market price lookup failed: %s", e)
             # ONLY use estimate if Google Search completely fails - NEVER use user price
             base_price = 20000  # More realistic default
             if year:
@@ -1462,7 +1434,7 @@ Return ONLY the JSON object, no additional text or markdown formatting."""
             model_lower = (model or "").lower()
             if "jeep" in make_lower and "wrangler" in model_lower:
                 base_price *= 1.3  # Wranglers hold value well
-            print(f"[MARKET-INTEL] ⚠️  Google Search failed, using estimate (${base_price:,.0f}) - NOT user price")
+            logger.warning("[MARKET-INTEL] ⚠️  Google Search failed, using estimate ($%.0f) - NOT user price", base_price)
             
             return {
                 "kbb_value": round(base_price * 0.95),
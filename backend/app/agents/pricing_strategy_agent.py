@@ -13,12 +13,16 @@ from typing import Dict, Any, List, Optional
 from .base_agent import BaseAgent, AgentOutput
 import logging
 from app.utils.pricing_rules import (
+    TITLE_STATUS_MULTIPLIERS,
     calculate_feature_bonus,
+    calculate_midwest_mileage_discount,
     calculate_mileage_penalty_percent,
     detect_trim_tier,
     format_trim_tier_label,
+    get_midwest_base_discount,
     get_reliability_tier,
     get_trim_adjustment_percent,
+    is_midwest_location,
     normalize_title_status,
 )
 
@@ -39,13 +43,7 @@ class PricingStrategyAgent(BaseAgent):
         }
         
         # Title status impact on pricing (Step 5: Rebuilt -30%, Salvage -47% to -50%)
-        self.title_status_impact = {
-            "clean": 1.0,
-            "rebuilt": 0.70,   # Rebuilt title = -30% reduction
-            "salvage": 0.515,  # Salvage title = -47% to -50% reduction (avg -48.5%)
-            "junk": 0.3,       # 70% reduction
-            "parts": 0.2       # 80% reduction
-        }
+        self.title_status_impact = dict(TITLE_STATUS_MULTIPLIERS)
         
         # Condition impact on pricing
         self.condition_impact = {
@@ -536,45 +534,18 @@ class PricingStrategyAgent(BaseAgent):
         - Luxury brands: -20% to -30% (average -25%)
         - High mileage (>150k): additional -3% to -7%
         """
-        location_lower = (location or "").lower()
-        is_detroit_michigan = any(term in location_lower for term in ["detroit", "michigan", "mi", "flint", "redford", "warren", "troy", "dearborn"])
-        
-        if not is_detroit_michigan:
+        if not is_midwest_location(location):
             return price  # No discount for non-Midwest locations
         
-        make_lower = (make or "").lower()
-        model_lower = (model or "").lower()
-        
-        # Determine vehicle type and base discount
-        base_discount = 0.0
-        
-        # Luxury brands: -20% to -30% (average -25%)
-        luxury_brands = ["bmw", "mercedes", "mercedes-benz", "audi", "lexus", "infiniti", "acura", "cadillac", "lincoln", "porsche", "jaguar", "land rover"]
-        if any(brand in make_lower for brand in luxury_brands):
-            base_discount = 0.25  # Average -25% for luxury
-        # SUVs/Trucks: -5% to -10% (average -7.5%)
-        elif any(term in model_lower for term in ["truck", "pickup", "f-150", "f150", "silverado", "ram", "tundra", "tacoma"]):
-            base_discount = 0.075  # Average -7.5% for trucks
-        elif any(term in model_lower for term in ["suv", "explorer", "escape", "cr-v", "rav4", "highlander", "pilot", "pathfinder", "tahoe", "suburban", "yukon", "escalade"]):
-            base_discount = 0.075  # Average -7.5% for SUVs
-        # Coupes: -10%
-        elif any(term in model_lower for term in ["coupe", "camaro", "mustang", "challenger", "charger"]):
-            base_discount = 0.10
-        # Sedans: -15% to -20% (average -17.5%)
-        else:
-            base_discount = 0.175  # Average -17.5% for sedans
-        
-        # High mileage additional discount: -3% to -7%
-        mileage_discount = 0.0
-        if mileage and mileage > 150000:
-            # Scale from -3% at 150k to -7% at 200k+
-            mileage_discount = min(0.07, 0.03 + ((mileage - 150000) / 50000) * 0.04)
+        # Vehicle type discount, plus -3% to -7% above 150k miles
+        base_discount, category = get_midwest_base_discount(make, model)
+        mileage_discount = calculate_midwest_mileage_discount(mileage)
         
         total_discount = base_discount + mileage_discount
         discounted_price = price * (1 - total_discount)
         
         print(f"[PRICING-STRATEGY] 🏭 Midwest discount applied (Step 6 - LAST): {make} {model} in {location}")
-        print(f"[PRICING-STRATEGY]   Base discount: -{base_discount*100:.1f}% ({'luxury' if any(brand in make_lower for brand in luxury_brands) else 'truck/suv' if base_discount == 0.075 else 'coupe' if base_discount == 0.10 else 'sedan'})")
+        print(f"[PRICING-STRATEGY]   Base discount: -{base_discount*100:.1f}% ({category})")
         if mileage_discount > 0:
             print(f"[PRICING-STRATEGY]   High mileage discount: -{mileage_discount*100:.1f}% ({mileage:,} miles)")
         print(f"[PRICING-STRATEGY]   Total discount: -{total_discount*100:.1f}%")
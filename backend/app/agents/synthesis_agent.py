@@ -15,11 +15,10 @@ Produces:
 
 import json
 import logging
-import os
-from typing import Any, Dict
-import httpx
-import openai
-from app.core.config import settings
+from typing import Any, AsyncIterator, Dict
+from app.core.logging_config import clip
+from app.services.async_adapters import async_openai_client
+from app.utils.streaming_json import StreamingJSONFieldExtractor
 
 logger = logging.getLogger(__name__)
 
@@ -99,6 +98,28 @@ MARKET:
 {market}
 """
 
+SYNTHESIS_MODEL = "gpt-4o-mini"
+
+# Fields streamed to the client as they're generated
+STREAMED_FIELDS = ("listing_text", "summary_md")
+
+
+def _build_messages(
+    vision_json: Dict[str, Any],
+    market_json: Dict[str, Any],
+    user_meta: Dict[str, Any]
+) -> list:
+    """Format the prompt with all three data sources."""
+    user_prompt = USER_PROMPT_TEMPLATE.format(
+        user_meta=json.dumps(user_meta, indent=2),
+        vision=json.dumps(vision_json, indent=2),
+        market=json.dumps(market_json, indent=2)
+    )
+    return [
+        {"role": "system", "content": SYSTEM_PROMPT},
+        {"role": "user", "content": user_prompt}
+    ]
+
 
 async def synthesize(
     vision_json: Dict[str, Any],
@@ -116,35 +137,19 @@ async def synthesize(
     Returns:
         Dict with: summary_md, listing_text, feature_tags, pricing_reco
     """
-    # Get OpenAI API key
-    openai_api_key = settings.OPENAI_API_KEY or os.getenv("OPENAI_API_KEY")
-    if not openai_api_key:
-        raise RuntimeError("OPENAI_API_KEY is not configured")
-    
-    # Format the prompt with all three data sources
-    user_prompt = USER_PROMPT_TEMPLATE.format(
-        user_meta=json.dumps(user_meta, indent=2),
-        vision=json.dumps(vision_json, indent=2),
-        market=json.dumps(market_json, indent=2)
-    )
+    client = async_openai_client()
+    messages = _build_messages(vision_json, market_json, user_meta)
+    content = ""
     
     logger.info("[SYNTHESIS] Starting OpenAI synthesis of vision + market + user data")
-    print(f"[SYNTHESIS] ===== SYNTHESIS REQUEST =====")
-    print(f"[SYNTHESIS] User Meta: {user_meta.get('make')} {user_meta.get('model')} {user_meta.get('year')}")
-    print(f"[SYNTHESIS] Vision has: {bool(vision_json)}")
-    print(f"[SYNTHESIS] Market has: {bool(market_json)}")
+    logger.debug("[SYNTHESIS] Request for %s %s %s (vision: %s, market: %s)",
+                 user_meta.get('make'), user_meta.get('model'), user_meta.get('year'), bool(vision_json), bool(market_json))
     
     try:
-        # Initialize OpenAI client
-        client = openai.OpenAI(api_key=openai_api_key)
-        
-        # Call OpenAI with JSON response format
-        response = client.chat.completions.create(
-            model="gpt-4o-mini",
-            messages=[
-                {"role": "system", "content": SYSTEM_PROMPT},
-                {"role": "user", "content": user_prompt}
-            ],
+        # Call OpenAI with JSON response format (async - doesn't block the event loop)
+        response = await client.chat.completions.create(
+            model=SYNTHESIS_MODEL,
+            messages=messages,
             temperature=0.2,
             max_tokens=2000,
             response_format={"type": "json_object"}
@@ -155,19 +160,71 @@ async def synthesize(
         result = json.loads(content)
         
         logger.info("[SYNTHESIS] ✅ Synthesis completed successfully")
-        print(f"[SYNTHESIS] ✅ Synthesis completed")
-        print(f"[SYNTHESIS] Summary length: {len(result.get('summary_md', ''))} chars")
-        print(f"[SYNTHESIS] Listing length: {len(result.get('listing_text', ''))} chars")
-        print(f"[SYNTHESIS] Feature tags: {len(result.get('feature_tags', []))} tags")
-        print(f"[SYNTHESIS] ==========================")
+        logger.debug("[SYNTHESIS] Summary: %s chars, listing: %s chars, feature tags: %s",
+                     len(result.get('summary_md', '')), len(result.get('listing_text', '')), len(result.get('feature_tags', [])))
         
         return result
         
     except json.JSONDecodeError as e:
-        logger.error(f"[SYNTHESIS] Failed to parse JSON response: {e}")
-        logger.error(f"[SYNTHESIS] Response content: {content[:500]}")
+        logger.error("[SYNTHESIS] Failed to parse JSON response: %s", e)
+        logger.error("[SYNTHESIS] Response content: %s", clip(content, 500))
         raise RuntimeError(f"Synthesis returned invalid JSON: {str(e)}")
     except Exception as e:
-        logger.error(f"[SYNTHESIS] Synthesis failed: {e}", exc_info=True)
+        logger.error("[SYNTHESIS] Synthesis failed: %s", e, exc_info=True)
         raise RuntimeError(f"Synthesis failed: {str(e)}")
 
+
+async def synthesize_stream(
+    vision_json: Dict[str, Any],
+    market_json: Dict[str, Any],
+    user_meta: Dict[str, Any]
+) -> AsyncIterator[Dict[str, Any]]:
+    """
+    Streaming variant of synthesize().
+    
+    Yields events as the completion streams in:
+    - {"type": "delta", "field": "listing_text" | "summary_md", "text": "..."}
+      as soon as each piece of those fields is generated
+    - {"type": "result", "data": {...}} once, with the full parsed JSON
+    
+    Raises:
+        RuntimeError: if the API call fails or the final JSON is invalid
+    """
+    client = async_openai_client()
+    messages = _build_messages(vision_json, market_json, user_meta)
+    extractor = StreamingJSONFieldExtractor(STREAMED_FIELDS)
+    
+    logger.info("[SYNTHESIS] Starting streaming OpenAI synthesis")
+    logger.debug("[SYNTHESIS] Streaming request for %s %s %s", user_meta.get('make'), user_meta.get('model'), user_meta.get('year'))
+    
+    try:
+        stream = await client.chat.completions.create(
+            model=SYNTHESIS_MODEL,
+            messages=messages,
+            temperature=0.2,
+            max_tokens=2000,
+            response_format={"type": "json_object"},
+            stream=True
+        )
+        async for chunk in stream:
+            if not chunk.choices:
+                continue
+            delta = chunk.choices[0].delta.content
+            if not delta:
+                continue
+            for field, text in extractor.feed(delta):
+                yield {"type": "delta", "field": field, "text": text}
+    except Exception as e:
+        logger.error("[SYNTHESIS] Streaming synthesis failed: %s", e, exc_info=True)
+        raise RuntimeError(f"Synthesis failed: {str(e)}")
+    
+    content = extractor.document
+    try:
+        result = json.loads(content)
+    except json.JSONDecodeError as e:
+        logger.error("[SYNTHESIS] Failed to parse streamed JSON response: %s", e)
+        logger.error("[SYNTHESIS] Response content: %s", clip(content, 500))
+        raise RuntimeError(f"Synthesis returned invalid JSON: {str(e)}")
+    
+    logger.info("[SYNTHESIS] ✅ Streaming synthesis completed (%s listing chars)", len(result.get('listing_text', '')))
+    yield {"type": "result", "data": result}
@@ -2,19 +2,51 @@
 Deals API - Real endpoints for deal discovery and analysis
 """
 
-from fastapi import APIRouter, Depends, HTTPException, Query
-from typing import List, Dict, Any, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from fastapi.responses import StreamingResponse
+from typing import AsyncIterator, List, Dict, Any, Optional
 from sqlalchemy.orm import Session
+from collections import Counter
+import bisect
+import io
 import json
+import logging
 import os
+import time
 
 from ...core.database import get_sync_db as get_db
 from ...services.ai_brain import AIBrain
-from ...services.real_scraper import real_scraper
+from ...services.real_scraper import RealCarScraper
+from ...core.config import settings
+from ...services.async_adapters import run_blocking
 from ...services.real_valuation_service import real_valuation_service
 
+logger = logging.getLogger(__name__)
 router = APIRouter()
 
+
+class DealRanking:
+    """Deals merged across sources as they arrive, kept ranked by deal_score (best first)"""
+    
+    def __init__(self, limit: int):
+        self.limit = limit
+        self.deals: List[Dict[str, Any]] = []
+        self._keys: List[float] = []  # negated scores, ascending
+    
+    def add(self, deal: Dict[str, Any]) -> Optional[int]:
+        """Insert a deal; returns its rank, or None if it doesn't make the top ``limit``"""
+        key = -(deal.get("deal_score") or 0)
+        rank = bisect.bisect_right(self._keys, key)  # ties keep arrival order
+        if rank >= self.limit:
+            return None
+        self._keys.insert(rank, key)
+        self.deals.insert(rank, deal)
+        if len(self.deals) > self.limit:
+            self._keys.pop()
+            self.deals.pop()
+        return rank
+
+
 @router.get("/deals/discover")
 async def discover_deals(
     search_term: str = Query("Honda Civic", description="Search term for cars"),
@@ -23,38 +55,213 @@ async def discover_deals(
 ):
     """
     Discover real car deals from live marketplaces
+    
+    Sources are scraped concurrently, each with its own deadline; slow or failing
+    sources are reported in ``source_status`` and the response is marked ``partial``.
     """
     try:
-        # Use real scraper to get live data
-        async with real_scraper as scraper:
-            # Scrape from multiple sources
-            ebay_results = await scraper.scrape_ebay_motors(search_term, max_results // 3)
-            cargurus_results = await scraper.scrape_cargurus(search_term, max_results // 3)
-            google_results = await scraper.scrape_google_car_listings(search_term, max_results // 3)
-            
-            # Combine results
-            all_deals = ebay_results + cargurus_results + google_results
-            
-            # Sort by deal score
-            all_deals.sort(key=lambda x: x.get("deal_score", 0), reverse=True)
-            
-            # Limit results
-            all_deals = all_deals[:max_results]
+        ranking = DealRanking(max_results)
+        source_status: Dict[str, Dict[str, Any]] = {}
+        
+        # Fresh scraper per request - sessions are cheap (pooled connector) and not shared between requests
+        async with RealCarScraper() as scraper:
+            async for result in scraper.fan_out(search_term, max(1, max_results // 3)):
+                source_status[result.source] = result.to_dict()
+                for deal in result.deals:
+                    ranking.add(deal)
+        
+        return {
+            "success": True,
+            "deals": ranking.deals,
+            "total_found": len(ranking.deals),
+            "sources": {source: status["count"] for source, status in source_status.items()},
+            "source_status": source_status,
+            "partial": any(status["status"] != "ok" for status in source_status.values()),
+            "search_term": search_term
+        }
+        
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error discovering deals: {str(e)}")
+
+
+@router.get("/deals/discover/stream")
+async def discover_deals_stream(
+    search_term: str = Query("Honda Civic", description="Search term for cars"),
+    max_results: int = Query(20, description="Maximum number of results"),
+    format: str = Query("ndjson", description="ndjson or sse")
+):
+    """
+    Streaming variant of /deals/discover - deals are sent as each source returns
+    
+    Events (one JSON object per line for ndjson, named events for sse):
+    - deal: {"rank", "source", "deal"} - insert at ``rank`` and keep the first max_results
+    - source: {"source", "status", "count", "elapsed_ms", "error"} when a source finishes or misses its deadline
+    - done: {"total_found", "sources", "partial", "search_term"}
+    - error: {"error"} if discovery fails mid-stream
+    """
+    use_sse = format.lower() == "sse"
+    
+    def encode(event: str, data: Dict[str, Any]) -> str:
+        if use_sse:
+            return f"event: {event}\ndata: {json.dumps(data, default=str)}\n\n"
+        return json.dumps({"type": event, **data}, default=str) + "\n"
+    
+    async def event_stream() -> AsyncIterator[str]:
+        ranking = DealRanking(max_results)
+        source_status: Dict[str, Dict[str, Any]] = {}
+        try:
+            async with RealCarScraper() as scraper:
+                async for result in scraper.fan_out(search_term, max(1, max_results // 3)):
+                    source_status[result.source] = result.to_dict()
+                    # Best-first within a source so early ranks settle quickly on the client
+                    for deal in sorted(result.deals, key=lambda d: d.get("deal_score") or 0, reverse=True):
+                        rank = ranking.add(deal)
+                        if rank is not None:
+                            yield encode("deal", {"rank": rank, "source": result.source, "deal": deal})
+                    yield encode("source", source_status[result.source])
             
-            return {
-                "success": True,
-                "deals": all_deals,
-                "total_found": len(all_deals),
-                "sources": {
-                    "ebay_motors": len(ebay_results),
-                    "cargurus": len(cargurus_results),
-                    "google_search": len(google_results)
-                },
+            yield encode("done", {
+                "total_found": len(ranking.deals),
+                "sources": {source: status["count"] for source, status in source_status.items()},
+                "partial": any(status["status"] != "ok" for status in source_status.values()),
                 "search_term": search_term
-            }
+            })
+        except Exception as e:
+            # Headers are already sent, so errors are reported in-band
+            logger.error(f"Streaming deal discovery failed: {e}")
+            yield encode("error", {"error": str(e)})
+    
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream" if use_sse else "application/x-ndjson",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+ARROW_CONTENT_TYPES = ("application/vnd.apache.arrow.stream", "application/vnd.apache.arrow.file")
+SCORE_STREAM_CHUNK_ROWS = 1000
+
+
+def _read_listing_feed(body: bytes, content_type: str) -> Any:
+    """Listings from an Arrow IPC body (stream or file) or JSON lines / a JSON array"""
+    if content_type.split(";")[0].strip().lower() in ARROW_CONTENT_TYPES:
+        import numpy as np
+        import pyarrow as pa
+        import pyarrow.compute as pc
         
+        try:
+            table = pa.ipc.open_stream(pa.py_buffer(body)).read_all()
+        except pa.ArrowInvalid:
+            table = pa.ipc.open_file(pa.py_buffer(body)).read_all()
+        columns = {}
+        for name, column in zip(table.column_names, table.columns):
+            if pa.types.is_string(column.type) or pa.types.is_large_string(column.type):
+                # Decode each distinct string once instead of once per row
+                encoded = pc.dictionary_encode(pc.fill_null(column, "")).combine_chunks()
+                columns[name] = np.array(encoded.dictionary.to_pylist(), dtype=str)[encoded.indices.to_numpy()]
+            else:
+                columns[name] = column.to_numpy(zero_copy_only=False)
+        return columns
+    
+    text = body.decode("utf-8")
+    if text.lstrip().startswith("["):
+        return json.loads(text)
+    # One decoder pass over the whole feed is faster than a json.loads per line
+    return json.loads("[" + ",".join(line for line in text.splitlines() if line.strip()) + "]")
+
+
+def _score_feed(body: bytes, content_type: str):
+    from ...utils.batch_deal_scoring import score_batch
+    
+    listings = _read_listing_feed(body, content_type)
+    rows = len(next(iter(listings.values()))) if isinstance(listings, dict) and listings else len(listings)
+    if rows > settings.BATCH_SCORING_MAX_ROWS:
+        raise HTTPException(status_code=413, detail=f"At most {settings.BATCH_SCORING_MAX_ROWS} listings per request")
+    return score_batch(listings)
+
+
+@router.post("/deals/score-batch")
+async def score_deal_batch(
+    request: Request,
+    format: str = Query("ndjson", description="Response format: ndjson or arrow"),
+    limit: Optional[int] = Query(None, description="Return only the top N deals"),
+    min_score: float = Query(0.0, description="Drop deals with a lower deal_score")
+):
+    """
+    Score a scraped listing feed in one request and stream the deals back ranked
+    
+    Body: JSON lines (or a JSON array) of listings, or an Arrow IPC stream/file
+    (Content-Type: application/vnd.apache.arrow.stream / .file). Listing fields:
+    price, make, model, year, mileage, and optionally condition, location,
+    title_status, trim, features, urgency_indicators, market_value, plus id/url/
+    title/source to identify results.
+    
+    ndjson response: a "summary" line, then one "deal" line per listing, best first.
+    arrow response: an Arrow IPC stream with one row per listing, best first.
+    Listings whose price/year/mileage/market_value isn't a number are skipped and
+    counted ("skipped_invalid" / X-Skipped-Invalid).
+    """
+    started = time.perf_counter()
+    body = await request.body()
+    if not body.strip():
+        raise HTTPException(status_code=400, detail="Empty listing feed")
+    try:
+        # Parsing and scoring are CPU-bound - keep them off the event loop
+        scores = await run_blocking(_score_feed, body, request.headers.get("content-type", ""))
+    except HTTPException:
+        raise
     except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Error discovering deals: {str(e)}")
+        raise HTTPException(status_code=400, detail=f"Could not score listing feed: {str(e)}")
+    
+    ranked = scores.ranking(min_score=min_score, limit=limit)
+    skipped_invalid = int(scores.invalid.sum())
+    scored_ms = round((time.perf_counter() - started) * 1000, 1)
+    logger.info(f"Scored {len(scores)} listings in {scored_ms}ms")
+    
+    if format.lower() == "arrow":
+        import pyarrow as pa
+        
+        def arrow_stream():
+            sink = io.BytesIO()
+            writer = None
+            for start in range(0, max(len(ranked), 1), SCORE_STREAM_CHUNK_ROWS):
+                batch = pa.RecordBatch.from_pydict(scores.columns(ranked[start:start + SCORE_STREAM_CHUNK_ROWS]))
+                if writer is None:
+                    writer = pa.ipc.new_stream(sink, batch.schema)
+                writer.write_batch(batch)
+                yield sink.getvalue()
+                sink.seek(0)
+                sink.truncate()
+            writer.close()
+            yield sink.getvalue()
+        
+        return StreamingResponse(
+            arrow_stream(),
+            media_type="application/vnd.apache.arrow.stream",
+            headers={
+                "X-Scored-Count": str(len(scores)),
+                "X-Scoring-Ms": str(scored_ms),
+                "X-Skipped-Invalid": str(skipped_invalid),
+            },
+        )
+    
+    def ndjson_stream():
+        recommendations = dict(Counter(scores.recommendation[ranked].tolist()))
+        yield json.dumps({
+            "type": "summary",
+            "scored": len(scores),
+            "returned": len(ranked),
+            "skipped_invalid": skipped_invalid,
+            "scoring_ms": scored_ms,
+            "recommendations": recommendations
+        }) + "\n"
+        for start in range(0, len(ranked), SCORE_STREAM_CHUNK_ROWS):
+            records = scores.to_records(ranked[start:start + SCORE_STREAM_CHUNK_ROWS])
+            yield "".join(
+                json.dumps({"type": "deal", "rank": start + offset, **record}, default=str) + "\n"
+                for offset, record in enumerate(records)
+            )
+    
+    return StreamingResponse(ndjson_stream(), media_type="application/x-ndjson")
 
 @router.get("/deals/{deal_id}")
 async def get_deal_details(
@@ -79,7 +286,7 @@ async def get_deal_details(
             raise HTTPException(status_code=404, detail="Deal not found")
         
         # Re-scrape to get the deal
-        async with real_scraper as scraper:
+        async with RealCarScraper() as scraper:
             if source == "ebay_motors":
                 deals = await scraper.scrape_ebay_motors(search_term, 50)
             else:
@@ -162,7 +369,7 @@ async def search_deals(
         search_term = " ".join(search_terms) if search_terms else "Honda Civic"
         
         # Get deals
-        async with real_scraper as scraper:
+        async with RealCarScraper() as scraper:
             ebay_results = await scraper.scrape_ebay_motors(search_term, limit)
             cargurus_results = await scraper.scrape_cargurus(search_term, limit)
             
@@ -223,7 +430,7 @@ async def get_deal_recommendations(
         popular_searches = ["Honda Civic", "Toyota Camry", "Ford F-150", "BMW 3 Series"]
         all_deals = []
         
-        async with real_scraper as scraper:
+        async with RealCarScraper() as scraper:
             for search_term in popular_searches:
                 ebay_results = await scraper.scrape_ebay_motors(search_term, 5)
                 cargurus_results = await scraper.scrape_cargurus(search_term, 5)
@@ -270,7 +477,7 @@ async def get_market_insights(
         search_term = " ".join(search_terms) if search_terms else "Honda Civic"
         
         # Get deals for analysis
-        async with real_scraper as scraper:
+        async with RealCarScraper() as scraper:
             ebay_results = await scraper.scrape_ebay_motors(search_term, 50)
             cargurus_results = await scraper.scrape_cargurus(search_term, 50)
             
@@ -4,14 +4,24 @@ Enhanced Analysis API Endpoint
 Provides comprehensive car analysis using enhanced image processing
 """
 
-from fastapi import APIRouter, UploadFile, File, Form, HTTPException
-from fastapi.responses import JSONResponse
+from fastapi import APIRouter, UploadFile, File, Form, Header, HTTPException, Request
+from fastapi.responses import JSONResponse, StreamingResponse
 from typing import List, Optional
+import asyncio
 import logging
 import json
 from datetime import datetime
 
+from app.core.config import settings
+from app.core.logging_config import clip, log_payload
 from app.services.smart_image_analysis import SmartImageAnalysis
+from app.services import analysis_jobs
+from app.services.ai_quota import AIQuotaExceeded, Admission, CostEstimate, ai_quota, estimate_cost, estimate_enhanced_analysis_cost
+from app.services.async_adapters import async_openai_client, run_blocking
+from app.services.http_clients import http_clients
+from app.services.image_ingestion import GeminiStreamingBody, ImageTooLargeError, dedupe_ingested, ingest_uploads, ingestion_stats
+from app.services.key_image_selector import select_key_ingested_images
+from app.services.vision_cache import get_cached_vision_result, set_cached_vision_result, vision_cache_key
 from app.utils.pricing_rules import (
     calculate_mileage_penalty_percent,
     detect_trim_tier,
@@ -22,6 +32,52 @@ from app.utils.pricing_rules import (
 logger = logging.getLogger(__name__)
 router = APIRouter()
 
+GEMINI_VISION_MODEL = "gemini-2.0-flash-exp"
+# Bump whenever the Pass-1 prompt template or its JSON schema changes (invalidates the vision cache)
+VISION_PROMPT_VERSION = "pass1-v1"
+
+
+async def _admit_ai_request(request: Optional[Request], cost: CostEstimate, hold_slot: bool = True) -> Optional[Admission]:
+    """
+    Charge an AI request against the caller's and global quotas.
+    
+    Returns None when there is no request to charge (queued jobs were charged at submit).
+    """
+    if request is None:
+        return None
+    try:
+        return await ai_quota.admit(request, cost, hold_slot=hold_slot)
+    except AIQuotaExceeded as exceeded:
+        logger.warning("[AI-QUOTA] 🚦 Rejected %s (%s units): %s", request.url.path, cost.units, exceeded.detail)
+        raise HTTPException(status_code=exceeded.status_code, detail=exceeded.detail, headers=exceeded.headers)
+
+
+def _log_vision_detection(analysis_json: dict) -> None:
+    """DEBUG summary of what Gemini Vision detected (callers check the level first)."""
+    vehicle = analysis_json.get('vehicle', {})
+    features = analysis_json.get('features', {})
+    details = analysis_json.get('specific_details', {})
+    present = {name: round(data.get('confidence', 0), 2) for name, data in features.items() if data.get('present', False)}
+    logger.debug(
+        "[ENHANCED-ANALYZE] 🔍 Vision detected %s %s %s; %s of %s features present",
+        vehicle.get('make', {}).get('value'), vehicle.get('model', {}).get('value'), vehicle.get('year_guess', {}).get('value'),
+        len(present), len(features),
+        extra={
+            "features_present": present,
+            "features_absent": [name for name in features if name not in present],
+            "badges_seen": analysis_json.get('badges_seen', []),
+            "colors": {
+                part: vehicle.get(part, {}).get('value')
+                for part in ('exterior_color', 'interior_color', 'drivetrain')
+            },
+            "specific_details": {
+                name: details[name].get('value')
+                for name in ('wheel_description', 'window_tint_description', 'interior_material')
+                if details.get(name, {}).get('value')
+            },
+        },
+    )
+
 
 @router.post("/enhanced-analyze")
 async def enhanced_analyze_car(
@@ -36,25 +92,23 @@ async def enhanced_analyze_car(
     titleStatus: Optional[str] = Form(None),
     aboutVehicle: Optional[str] = Form(None),
     vin: Optional[str] = Form(None),
-    titleRebuildReason: Optional[str] = Form(None)
+    titleRebuildReason: Optional[str] = Form(None),
+    request: Request = None
 ):
     """
     Enhanced car analysis endpoint - REAL IMAGE PROCESSING
     
     Uses OpenAI Vision API to actually analyze the uploaded images
     """
+    admission = None
     try:
         import time
         start_time = time.time()
-        logger.info(f"REAL: Enhanced analysis request received for {len(images)} images")
-        print(f"[ENHANCED-ANALYZE] ===== REQUEST RECEIVED =====")
-        print(f"[ENHANCED-ANALYZE] Images: {len(images)}")
-        print(f"[ENHANCED-ANALYZE] Car: {year} {make} {model} {trim}".strip())
-        print(f"[ENHANCED-ANALYZE] Mileage: {mileage}, Price: ${price}")
-        print(f"[ENHANCED-ANALYZE] Title Status: {titleStatus}")
-        print(f"[ENHANCED-ANALYZE] About Vehicle: {aboutVehicle[:100] if aboutVehicle else 'None'}...")
-        print(f"[ENHANCED-ANALYZE] VIN: {vin or 'None'}")
-        print(f"[ENHANCED-ANALYZE] =============================")
+        logger.info("REAL: Enhanced analysis request received for %s images", len(images))
+        logger.debug(
+            "[ENHANCED-ANALYZE] Request: %s %s %s %s, mileage=%s, price=$%s, title=%s, vin=%s, about=%s",
+            year, make, model, trim or '', mileage, price, titleStatus, vin or 'None', clip(aboutVehicle or 'None', 100)
+        )
         
         original_trim_input = trim
 
@@ -73,49 +127,64 @@ async def enhanced_analyze_car(
             for pattern, replacement in spelling_fixes_input.items():
                 corrected_about = re.sub(pattern, replacement, corrected_about, flags=re.IGNORECASE)
             if corrected_about != aboutVehicle:
-                print(f"[ENHANCED-ANALYZE] ✅ Applied spelling correction to aboutVehicle")
+                logger.debug("[ENHANCED-ANALYZE] ✅ Applied spelling correction to aboutVehicle")
                 aboutVehicle = corrected_about
         
-        # Process ALL images with OpenAI Vision API (not just the first one)
+        # Ingest ALL images once: bounded read, downscale/re-encode, single base64 encode, shared by every pass
+        # (queued jobs were ingested at submit time)
         image_processing_start = time.time()
-        all_image_contents = []
-        for image in images:
-            image_content = await image.read()
-            import base64
-            image_b64 = base64.b64encode(image_content).decode('utf-8')
-            all_image_contents.append({
-                "type": "image_url",
-                "image_url": {
-                    "url": f"data:image/jpeg;base64,{image_b64}"
-                }
-            })
+        job = analysis_jobs.current_job()
+        if job is not None and job.images is not None:
+            ingested_images = job.images
+        else:
+            try:
+                ingested_images = await ingest_uploads(images)
+            except ImageTooLargeError as size_error:
+                raise HTTPException(status_code=413, detail=str(size_error))
+        received_image_count = len(ingested_images)
         image_processing_time = time.time() - image_processing_start
-        logger.info(f"⏱️ Image processing (base64 encoding) took {image_processing_time:.2f}s for {len(images)} images")
-        print(f"[ENHANCED-ANALYZE] ✅ Images processed: {len(all_image_contents)} images encoded in {image_processing_time:.2f}s")
+        image_preprocessing_stats = ingestion_stats(ingested_images).to_dict()
+        await analysis_jobs.report_progress("images_ingested", {"images": received_image_count, "preprocessing": image_preprocessing_stats})
+        logger.info("[ENHANCED-ANALYZE] ✅ Images processed: %s images encoded in %.2fs (%.1f MB -> %.1f MB, saved %s%%)", len(ingested_images), image_processing_time, image_preprocessing_stats['bytes_in'] / 1e6, image_preprocessing_stats['bytes_out'] / 1e6, image_preprocessing_stats['reduction_percent'])
+        
+        # Collapse near-duplicate shots so the model doesn't pay for the same photo twice
+        ingested_images, duplicate_images = dedupe_ingested(ingested_images)
+        if duplicate_images:
+            logger.debug("[ENHANCED-ANALYZE] 🧹 Collapsed %s near-duplicate photo(s): %s", len(duplicate_images),
+                         [(dropped + 1, kept + 1) for dropped, kept in duplicate_images])
+        
+        # Send only the most informative photos (exterior, dashboard, interior, close-ups) - classified locally
+        unique_image_count = len(ingested_images)
+        ingested_images, key_image_selection = await select_key_ingested_images(ingested_images, settings.VISION_MAX_IMAGES)
+        if len(ingested_images) < unique_image_count:
+            logger.debug("[ENHANCED-ANALYZE] 🎯 Selected %s of %s photos for vision: %s", len(ingested_images), unique_image_count, key_image_selection.coverage)
+        
+        # Charge the upstream cost (photos actually sent, LLM + grounded calls) before any AI call
+        admission = await _admit_ai_request(request, estimate_enhanced_analysis_cost(len(ingested_images), aboutVehicle, vin))
+        if admission is not None:
+            logger.debug("[ENHANCED-ANALYZE] 🚦 Admitted at %s cost units (queued: %s, waited %.0fms)",
+                         admission.cost.units, admission.queued, admission.waited_ms)
         
         # TWO-PASS SYSTEM: Pass-1 - Analyze images with Gemini Vision → strict JSON
         # Pass-2 - Format with OpenAI for multiple platforms
-        import openai
-        import httpx
         import asyncio
-        from app.core.config import settings
         
         # Initialize Gemini for Vision analysis
-        print(f"[ENHANCED-ANALYZE] Initializing Gemini Vision API...")
+        logger.debug("[ENHANCED-ANALYZE] Initializing Gemini Vision API...")
         if not settings.GEMINI_API_KEY:
-            print(f"[ENHANCED-ANALYZE] ❌ ERROR: Gemini API Key is not set!")
-            print(f"[ENHANCED-ANALYZE] ❌ Cannot proceed without REAL Gemini Vision API - NO MOCKS ALLOWED")
+            logger.error("[ENHANCED-ANALYZE] ❌ ERROR: Gemini API Key is not set!")
+            logger.error("[ENHANCED-ANALYZE] ❌ Cannot proceed without REAL Gemini Vision API - NO MOCKS ALLOWED")
             raise HTTPException(status_code=500, detail="Gemini API key is not configured. Please set GEMINI_API_KEY environment variable for real API calls.")
         
         # Initialize OpenAI for formatting (Pass-2)
         openai_client = None
         if not settings.OPENAI_API_KEY:
-            print(f"[ENHANCED-ANALYZE] ⚠️  WARNING: OpenAI API Key is not set - will not be able to format for multiple platforms")
+            logger.warning("[ENHANCED-ANALYZE] ⚠️  WARNING: OpenAI API Key is not set - will not be able to format for multiple platforms")
         else:
-            openai_client = openai.OpenAI(api_key=settings.OPENAI_API_KEY)
-            print(f"[ENHANCED-ANALYZE] ✅ OpenAI client initialized for multi-platform formatting")
+            openai_client = async_openai_client()
+            logger.debug("[ENHANCED-ANALYZE] ✅ OpenAI client initialized for multi-platform formatting")
         
-        print(f"[ENHANCED-ANALYZE] ✅ Using REAL Gemini Vision API - NO MOCKS OR FALLBACKS")
+        logger.debug("[ENHANCED-ANALYZE] ✅ Using REAL Gemini Vision API - NO MOCKS OR FALLBACKS")
         
         # OPTIMIZATION: Prepare basic listing context from user input (for parallel Google Search)
         user_entered_price = None
@@ -141,7 +210,7 @@ Look carefully at ALL visible features, buttons, screens, badges, and controls a
 Be generous with confidence scores for clearly visible features (0.7-0.9).
 Only set confidence ≤0.4 if you truly cannot see the feature.
 
-IMPORTANT: You are analyzing {len(images)} photos of the same car. Look at ALL images to find features.
+IMPORTANT: You are analyzing {len(ingested_images)} photos of the same car. Look at ALL images to find features.
 
 CRITICAL: DETECT MAKE AND MODEL FROM PHOTOS - PRIORITIZE WHAT YOU SEE OVER USER INPUT
 - ALWAYS trust what you see in the photos over any user-provided make/model
@@ -257,82 +326,83 @@ Return ONLY this JSON structure:
         
         # OPTIMIZATION: Run Gemini Vision and Google Search in PARALLEL
         parallel_start = time.time()
-        logger.info(f"⏱️ Starting PARALLEL analysis: Gemini Vision + Google Search...")
-        print(f"[ENHANCED-ANALYZE] 🚀 OPTIMIZATION: Running Gemini Vision and Google Search in PARALLEL")
-        print(f"[ENHANCED-ANALYZE] ⏱️  Expected time: 20-30 seconds (first request) or 8-12 seconds (cached)")
-        print(f"[ENHANCED-ANALYZE] 📊 Analyzing {len(images)} images for comprehensive feature detection")
-        
-        # Prepare images for Gemini Vision API
-        gemini_parts = [{"text": analysis_prompt}]
-        for image in images:
-            await image.seek(0)  # Reset file pointer
-            image_content = await image.read()
-            import base64
-            image_b64 = base64.b64encode(image_content).decode('utf-8')
-            gemini_parts.append({
-                "inline_data": {
-                    "mime_type": "image/jpeg",
-                    "data": image_b64
+        logger.info("⏱️ Starting PARALLEL analysis: Gemini Vision + Google Search...")
+        logger.debug("[ENHANCED-ANALYZE] 🚀 OPTIMIZATION: Running Gemini Vision and Google Search in PARALLEL")
+        logger.debug("[ENHANCED-ANALYZE] ⏱️  Expected time: 20-30 seconds (first request) or 8-12 seconds (cached)")
+        logger.debug("[ENHANCED-ANALYZE] 📊 Analyzing %s images for comprehensive feature detection", len(ingested_images))
+        
+        # Prepare Gemini Vision request body - streams the already-encoded images, no extra copies
+        gemini_body = GeminiStreamingBody(
+            [analysis_prompt],
+            ingested_images,
+            {
+                "generationConfig": {
+                    "maxOutputTokens": 2000,
+                    "temperature": 0.0,
+                    "responseMimeType": "application/json"
                 }
-            })
+            }
+        )
+        
+        vision_key = vision_cache_key(ingested_images, analysis_prompt, GEMINI_VISION_MODEL, VISION_PROMPT_VERSION)
+        vision_cache_hit = False
         
         # Define async functions for parallel execution
         async def call_gemini_vision():
-            """Call Gemini Vision API to analyze images"""
+            """Call Gemini Vision API to analyze images (served from the vision cache for repeat photo sets)"""
+            nonlocal vision_cache_hit
             gemini_start = time.time()
+            cached_analysis = get_cached_vision_result(vision_key)
+            if cached_analysis is not None:
+                vision_cache_hit = True
+                logger.debug("[ENHANCED-ANALYZE] ⚡ Vision cache HIT - reusing analysis for this photo set (%.0fms)", (time.time() - gemini_start) * 1000)
+                await analysis_jobs.report_progress("vision_done", {"seconds": round(time.time() - gemini_start, 2), "cache_hit": True})
+                return cached_analysis
             try:
-                print(f"[ENHANCED-ANALYZE] 📸 Starting Gemini Vision API (timeout: 60s)...")
-                async with httpx.AsyncClient() as client:
-                    gemini_response = await client.post(
-                        f"https://generativelanguage.googleapis.com/v1beta/models/gemini-2.0-flash-exp:generateContent?key={settings.GEMINI_API_KEY}",
-                        json={
-                            "contents": [{
-                                "parts": gemini_parts
-                            }],
-                            "generationConfig": {
-                                "maxOutputTokens": 2000,
-                                "temperature": 0.0,
-                                "responseMimeType": "application/json"
-                            }
-                        },
-                        timeout=60.0
-                    )
-                    
-                    if gemini_response.status_code != 200:
-                        error_text = gemini_response.text
-                        print(f"[ENHANCED-ANALYZE] ❌ Gemini Vision API error: {gemini_response.status_code} - {error_text[:200]}")
-                        logger.error(f"Gemini Vision API error: {error_text}")
-                        raise HTTPException(status_code=500, detail=f"Gemini Vision API call failed: {error_text[:200]}")
-                    
-                    gemini_result = gemini_response.json()
-                    if "candidates" not in gemini_result or len(gemini_result["candidates"]) == 0:
-                        print(f"[ENHANCED-ANALYZE] ❌ Gemini Vision API returned no candidates")
-                        raise HTTPException(status_code=500, detail="Gemini Vision API returned no results")
-                    
-                    candidate = gemini_result["candidates"][0]
-                    if "content" not in candidate or "parts" not in candidate["content"]:
-                        print(f"[ENHANCED-ANALYZE] ❌ Gemini Vision API returned invalid response structure")
-                        raise HTTPException(status_code=500, detail="Gemini Vision API returned invalid response")
-                    
-                    # Extract JSON from response
-                    analysis_text = candidate["content"]["parts"][0]["text"]
-                    gemini_time = time.time() - gemini_start
-                    print(f"[ENHANCED-ANALYZE] ✅ Gemini Vision API call completed successfully in {gemini_time:.1f}s")
-                    print(f"[ENHANCED-ANALYZE] 📊 API Response: {len(analysis_text)} characters")
-                    return analysis_text
-                    
+                logger.debug("[ENHANCED-ANALYZE] 📸 Starting Gemini Vision API (timeout: 60s)...")
+                gemini_response = await http_clients.request(
+                    "gemini",
+                    "POST",
+                    f"https://generativelanguage.googleapis.com/v1beta/models/{GEMINI_VISION_MODEL}:generateContent?key={settings.GEMINI_API_KEY}",
+                    content=gemini_body,
+                    headers=gemini_body.headers,
+                    timeout=60.0
+                )
+                
+                if gemini_response.status_code != 200:
+                    error_text = gemini_response.text
+                    logger.error("[ENHANCED-ANALYZE] ❌ Gemini Vision API error: %s - %s", gemini_response.status_code, clip(error_text, 200))
+                    raise HTTPException(status_code=500, detail=f"Gemini Vision API call failed: {error_text[:200]}")
+                
+                gemini_result = gemini_response.json()
+                if "candidates" not in gemini_result or len(gemini_result["candidates"]) == 0:
+                    logger.error("[ENHANCED-ANALYZE] ❌ Gemini Vision API returned no candidates")
+                    raise HTTPException(status_code=500, detail="Gemini Vision API returned no results")
+                
+                candidate = gemini_result["candidates"][0]
+                if "content" not in candidate or "parts" not in candidate["content"]:
+                    logger.error("[ENHANCED-ANALYZE] ❌ Gemini Vision API returned invalid response structure")
+                    raise HTTPException(status_code=500, detail="Gemini Vision API returned invalid response")
+                
+                # Extract JSON from response
+                analysis_text = candidate["content"]["parts"][0]["text"]
+                gemini_time = time.time() - gemini_start
+                logger.info("[ENHANCED-ANALYZE] ✅ Gemini Vision API call completed successfully in %.1fs", gemini_time)
+                logger.debug("[ENHANCED-ANALYZE] 📊 API Response: %s characters", len(analysis_text))
+                await analysis_jobs.report_progress("vision_done", {"seconds": round(gemini_time, 2), "cache_hit": False})
+                return analysis_text
+                
             except HTTPException:
                 raise
             except Exception as api_error:
-                print(f"[ENHANCED-ANALYZE] ❌ ERROR calling Gemini Vision API: {type(api_error).__name__}: {str(api_error)}")
-                logger.error(f"Gemini Vision API call failed: {api_error}", exc_info=True)
+                logger.error("Gemini Vision API call failed: %s", api_error, exc_info=True)
                 raise HTTPException(status_code=500, detail=f"Gemini Vision API call failed: {str(api_error)}")
         
         async def call_google_search():
             """Call Google Search (via Market Intelligence Agent) to get market data"""
             google_start = time.time()
             try:
-                print(f"[ENHANCED-ANALYZE] 🔍 Starting market search in parallel (timeout: 40s, optimized for speed)...")
+                logger.debug("[ENHANCED-ANALYZE] 🔍 Starting market search in parallel (timeout: 40s, optimized for speed)...")
                 from app.agents.market_intelligence_agent import MarketIntelligenceAgent
                 market_agent = MarketIntelligenceAgent()
                 
@@ -357,13 +427,14 @@ Return ONLY this JSON structure:
                 })
                 
                 google_time = time.time() - google_start
-                print(f"[ENHANCED-ANALYZE] ✅ Market search completed in parallel in {google_time:.1f}s")
+                logger.info("[ENHANCED-ANALYZE] ✅ Market search completed in parallel in %.1fs", google_time)
+                await analysis_jobs.report_progress("market_done", {"seconds": round(google_time, 2), "available": bool(market_result)})
                 return market_result
                 
             except Exception as e:
                 google_time = time.time() - google_start
-                print(f"[ENHANCED-ANALYZE] ⚠️  Market search failed after {google_time:.1f}s (will continue without market data): {e}")
-                logger.warning(f"Google Search failed in parallel execution: {e}")
+                logger.warning("[ENHANCED-ANALYZE] ⚠️  Market search failed after %.1fs (will continue without market data): %s", google_time, e)
+                await analysis_jobs.report_progress("market_done", {"seconds": round(google_time, 2), "available": False})
                 return None
         
         # Run both calls in parallel
@@ -378,26 +449,24 @@ Return ONLY this JSON structure:
             if isinstance(analysis_text, Exception):
                 raise analysis_text
             if isinstance(market_result, Exception):
-                print(f"[ENHANCED-ANALYZE] ⚠️  Google Search exception (will continue without market data): {market_result}")
+                logger.warning("[ENHANCED-ANALYZE] ⚠️  Google Search exception (will continue without market data): %s", market_result)
                 market_result = None
             
             parallel_time = time.time() - parallel_start
             pass1_time = parallel_time  # PASS-1 is the Gemini Vision analysis (completed in parallel)
-            logger.info(f"⏱️ PARALLEL execution completed in {parallel_time:.2f}s (Gemini Vision + Google Search)")
-            print(f"[ENHANCED-ANALYZE] ✅ PARALLEL execution completed in {parallel_time:.2f}s")
+            logger.info("⏱️ PARALLEL execution completed in %.2fs (Gemini Vision + Google Search)", parallel_time)
             if parallel_time > 50:
-                print(f"[ENHANCED-ANALYZE] ⚠️  WARNING: Analysis took {parallel_time:.1f}s - longer than expected (35-45s)")
-                print(f"[ENHANCED-ANALYZE] ⚠️  This may indicate Google Search is timing out or slow")
+                logger.warning("[ENHANCED-ANALYZE] ⚠️  WARNING: Analysis took %.1fs - longer than expected (35-45s)", parallel_time)
+                logger.warning("[ENHANCED-ANALYZE] ⚠️  This may indicate Google Search is timing out or slow")
             elif parallel_time > 45:
-                print(f"[ENHANCED-ANALYZE] ⚠️  Analysis took {parallel_time:.1f}s - slightly longer than ideal (35-45s)")
+                logger.warning("[ENHANCED-ANALYZE] ⚠️  Analysis took %.1fs - slightly longer than ideal (35-45s)", parallel_time)
             else:
-                print(f"[ENHANCED-ANALYZE] ✅ Analysis completed in expected time range ({parallel_time:.1f}s)")
+                logger.debug("[ENHANCED-ANALYZE] ✅ Analysis completed in expected time range (%.1fs)", parallel_time)
             
         except HTTPException:
             raise
         except Exception as e:
-            print(f"[ENHANCED-ANALYZE] ❌ ERROR in parallel execution: {type(e).__name__}: {str(e)}")
-            logger.error(f"Parallel execution failed: {e}", exc_info=True)
+            logger.error("Parallel execution failed: %s", e, exc_info=True)
             raise HTTPException(status_code=500, detail=f"Parallel execution failed: {str(e)}")
         
         # Parse JSON response from Gemini
@@ -405,43 +474,18 @@ Return ONLY this JSON structure:
             analysis_json = json.loads(analysis_text)
             
             # DEBUG: Log what Gemini Vision ACTUALLY detected from the photos
-            print(f"[ENHANCED-ANALYZE] 🔍 ===== GEMINI VISION DETECTION RESULTS =====")
-            print(f"[ENHANCED-ANALYZE] 📋 Vehicle detected: {analysis_json.get('vehicle', {}).get('make', {}).get('value')} {analysis_json.get('vehicle', {}).get('model', {}).get('value')} {analysis_json.get('vehicle', {}).get('year_guess', {}).get('value')}")
-            print(f"[ENHANCED-ANALYZE] 📋 Features detected: {list(analysis_json.get('features', {}).keys())}")
-            
-            # Log each feature with its status
-            detected_features_count = 0
-            for feature_name, feature_data in analysis_json.get('features', {}).items():
-                if feature_data.get('present', False):
-                    detected_features_count += 1
-                    print(f"[ENHANCED-ANALYZE]   ✅ {feature_name}: present={feature_data.get('present')}, confidence={feature_data.get('confidence', 0):.2f}")
-                else:
-                    print(f"[ENHANCED-ANALYZE]   ❌ {feature_name}: present={feature_data.get('present')}, confidence={feature_data.get('confidence', 0):.2f}")
-            
-            print(f"[ENHANCED-ANALYZE] 📊 Total features detected: {detected_features_count} out of {len(analysis_json.get('features', {}))}")
-            print(f"[ENHANCED-ANALYZE] 📋 Badges seen: {analysis_json.get('badges_seen', [])}")
-            print(f"[ENHANCED-ANALYZE] 📋 Exterior color: {analysis_json.get('vehicle', {}).get('exterior_color', {}).get('value')} (confidence: {analysis_json.get('vehicle', {}).get('exterior_color', {}).get('confidence', 0):.2f})")
-            print(f"[ENHANCED-ANALYZE] 📋 Interior color: {analysis_json.get('vehicle', {}).get('interior_color', {}).get('value')} (confidence: {analysis_json.get('vehicle', {}).get('interior_color', {}).get('confidence', 0):.2f})")
-            print(f"[ENHANCED-ANALYZE] 📋 Drivetrain: {analysis_json.get('vehicle', {}).get('drivetrain', {}).get('value')} (confidence: {analysis_json.get('vehicle', {}).get('drivetrain', {}).get('confidence', 0):.2f})")
-            print(f"[ENHANCED-ANALYZE] 📋 Specific details keys: {list(analysis_json.get('specific_details', {}).keys())}")
-            
-            # Log specific details
-            details = analysis_json.get('specific_details', {})
-            if details.get('wheel_description', {}).get('value'):
-                print(f"[ENHANCED-ANALYZE]   📋 Wheel description: {details['wheel_description']['value']} (confidence: {details['wheel_description'].get('confidence', 0):.2f})")
-            if details.get('window_tint_description', {}).get('value'):
-                print(f"[ENHANCED-ANALYZE]   📋 Window tint: {details['window_tint_description']['value']} (confidence: {details['window_tint_description'].get('confidence', 0):.2f})")
-            if details.get('interior_material', {}).get('value'):
-                print(f"[ENHANCED-ANALYZE]   📋 Interior material: {details['interior_material']['value']} (confidence: {details['interior_material'].get('confidence', 0):.2f})")
+            if logger.isEnabledFor(logging.DEBUG):
+                _log_vision_detection(analysis_json)
             
-            print(f"[ENHANCED-ANALYZE] 🔍 ===== END GEMINI VISION RESULTS =====")
+            # Only cache responses that parsed - a truncated/garbled response should be retried next time
+            if not vision_cache_hit:
+                set_cached_vision_result(vision_key, analysis_text)
             
         except json.JSONDecodeError as json_error:
-            print(f"[ENHANCED-ANALYZE] ❌ Failed to parse Gemini JSON response: {json_error}")
-            print(f"[ENHANCED-ANALYZE] 📄 Raw response (first 1000 chars): {analysis_text[:1000]}")
-            logger.error(f"JSON parsing failed: {json_error}\nResponse: {analysis_text[:500]}")
+            logger.error("[ENHANCED-ANALYZE] ❌ Failed to parse Gemini JSON response: %s", json_error)
+            log_payload(logger, "[ENHANCED-ANALYZE] 📄 Raw Gemini response: %s", analysis_text)
             raise HTTPException(status_code=500, detail=f"Failed to parse Gemini Vision API response as JSON: {str(json_error)}")
-        logger.info(f"PASS-1: Analysis JSON extracted: {analysis_json}")
+        log_payload(logger, "PASS-1: Analysis JSON extracted: %s", analysis_json)
         
         # CRITICAL: Extract detected make/model from Gemini Vision - PRIORITIZE OVER USER INPUT
         detected_vehicle = analysis_json.get("vehicle", {})
@@ -456,10 +500,9 @@ Return ONLY this JSON structure:
         model_confidence = detected_vehicle.get("model", {}).get("confidence", 0)
         
         # Log what we detected vs what user provided
-        print(f"[ENHANCED-ANALYZE] 🔍 VEHICLE DETECTION:")
-        print(f"  User provided: {year} {make} {model} {trim}")
-        print(f"  Gemini detected: {detected_year_from_photos} {detected_make_from_photos} {detected_model_from_photos} {detected_trim_from_photos}")
-        print(f"  Confidence: Make={make_confidence:.2f}, Model={model_confidence:.2f}")
+        logger.debug("[ENHANCED-ANALYZE] 🔍 Vehicle: user provided %s %s %s %s, Gemini detected %s %s %s %s (make %.2f, model %.2f)",
+                     year, make, model, trim, detected_year_from_photos, detected_make_from_photos,
+                     detected_model_from_photos, detected_trim_from_photos, make_confidence, model_confidence)
         
         # Use detected values if confidence >= 0.6, otherwise use user input
         # Lower threshold for trim (0.5) to catch more trims like Pacifica, Airflow, etc.
@@ -469,7 +512,7 @@ Return ONLY this JSON structure:
         final_trim = detected_trim_from_photos if (detected_trim_from_photos and detected_vehicle.get("trim", {}).get("confidence", 0) >= 0.5) else (trim or None)
         final_drivetrain = detected_drivetrain_from_photos if detected_drivetrain_from_photos else None
         
-        print(f"[ENHANCED-ANALYZE] ✅ USING: {final_year} {final_make} {final_model} {final_trim or ''}")
+        logger.info("[ENHANCED-ANALYZE] ✅ USING: %s %s %s %s", final_year, final_make, final_model, final_trim or '')
         
         # Build full listing context (use DETECTED values, not user input)
         listing_context = {
@@ -508,11 +551,11 @@ Return ONLY this JSON structure:
             if details.get("interior_material", {}).get("confidence", 0) >= 0.7:
                 interior_material_detected = details["interior_material"]["value"]
         
-        print(f"[ENHANCED-ANALYZE] 🔍 Checking features from Gemini Vision analysis: {list(analysis_json.get('features', {}).keys())}")
+        logger.debug("[ENHANCED-ANALYZE] 🔍 Checking features from Gemini Vision analysis: %s", list(analysis_json.get('features', {}).keys()))
         for feature, data in analysis_json.get("features", {}).items():
             confidence = data.get("confidence", 0)
             present = data.get("present", False)
-            print(f"[ENHANCED-ANALYZE] 🔍 Feature '{feature}': present={present}, confidence={confidence:.2f}")
+            logger.debug("[ENHANCED-ANALYZE] 🔍 Feature '%s': present=%s, confidence=%.2f", feature, present, confidence)
             # Only add features with high confidence (0.7+) - actually visible in photos
             if present and confidence >= 0.7:
                 feature_name = feature.replace("_", " ").title()
@@ -532,7 +575,7 @@ Return ONLY this JSON structure:
                     # HALLUCINATION PREVENTION: Skip "Leather Seats" if interior_material already contains "leather"
                     # e.g., if we have "Black Leather", don't also add "Leather Seats"
                     if interior_material_detected and "leather" in interior_material_detected.lower():
-                        print(f"[ENHANCED-ANALYZE] ⚠️ Skipping duplicate 'Leather Seats' - already have '{interior_material_detected}'")
+                        logger.debug("[ENHANCED-ANALYZE] ⚠️ Skipping duplicate 'Leather Seats' - already have '%s'", interior_material_detected)
                         continue
                     feature_name = "Leather Seats"
                 elif feature == "heated_seats":
@@ -562,30 +605,30 @@ Return ONLY this JSON structure:
                     # Exact match
                     if feature_lower == existing_lower:
                         is_duplicate = True
-                        print(f"[ENHANCED-ANALYZE] ⚠️ Skipping duplicate feature: '{feature_name}' (already exists as '{existing_feature}')")
+                        logger.debug("[ENHANCED-ANALYZE] ⚠️ Skipping duplicate feature: '%s' (already exists as '%s')", feature_name, existing_feature)
                         break
                     # Check for "alloy wheels" duplicates (can appear as "Alloy Wheels", "Alloy", "Wheels", etc.)
                     if "alloy" in feature_lower and "wheel" in feature_lower:
                         if "alloy" in existing_lower and "wheel" in existing_lower:
                             is_duplicate = True
-                            print(f"[ENHANCED-ANALYZE] ⚠️ Skipping duplicate alloy wheels feature: '{feature_name}' (similar to '{existing_feature}')")
+                            logger.debug("[ENHANCED-ANALYZE] ⚠️ Skipping duplicate alloy wheels feature: '%s' (similar to '%s')", feature_name, existing_feature)
                             break
                     # Check for "tinted windows" duplicates
                     if "tint" in feature_lower and "window" in feature_lower:
                         if "tint" in existing_lower and "window" in existing_lower:
                             is_duplicate = True
-                            print(f"[ENHANCED-ANALYZE] ⚠️ Skipping duplicate tinted windows feature: '{feature_name}' (similar to '{existing_feature}')")
+                            logger.debug("[ENHANCED-ANALYZE] ⚠️ Skipping duplicate tinted windows feature: '%s' (similar to '%s')", feature_name, existing_feature)
                             break
                     # Partial match prevention (e.g., "Leather Seats" vs "Black Leather")
                     if "leather" in feature_lower and "leather" in existing_lower:
                         if feature_lower in existing_lower or existing_lower in feature_lower:
                             is_duplicate = True
-                            print(f"[ENHANCED-ANALYZE] ⚠️ Skipping duplicate leather feature: '{feature_name}' (similar to '{existing_feature}')")
+                            logger.debug("[ENHANCED-ANALYZE] ⚠️ Skipping duplicate leather feature: '%s' (similar to '%s')", feature_name, existing_feature)
                             break
                 
                 if not is_duplicate:
                     listing_context["features_list"].append(feature_name)
-                    print(f"[ENHANCED-ANALYZE] ✅ Added photo-detected feature: {feature_name} (confidence: {confidence:.2f})")
+                    logger.debug("[ENHANCED-ANALYZE] ✅ Added photo-detected feature: %s (confidence: %.2f)", feature_name, confidence)
         
         # Extract specific visual details from photos (high confidence only)
         if "specific_details" in analysis_json:
@@ -599,9 +642,9 @@ Return ONLY this JSON structure:
                     is_duplicate = any(wheel_desc.lower() in f.lower() or f.lower() in wheel_desc.lower() for f in listing_context["features_list"])
                     if not is_duplicate:
                         listing_context["features_list"].append(wheel_desc)
-                        print(f"[ENHANCED-ANALYZE] ✅ Added wheel description from photo: {wheel_desc}")
+                        logger.debug("[ENHANCED-ANALYZE] ✅ Added wheel description from photo: %s", wheel_desc)
                     else:
-                        print(f"[ENHANCED-ANALYZE] ⚠️ Skipping duplicate wheel description: {wheel_desc}")
+                        logger.debug("[ENHANCED-ANALYZE] ⚠️ Skipping duplicate wheel description: %s", wheel_desc)
             
             # Add window tint description if clearly visible
             if details.get("window_tint_description", {}).get("confidence", 0) >= 0.7:
@@ -611,9 +654,9 @@ Return ONLY this JSON structure:
                     is_duplicate = any("tint" in f.lower() and "tint" in tint_desc.lower() for f in listing_context["features_list"])
                     if not is_duplicate:
                         listing_context["features_list"].append(tint_desc)
-                        print(f"[ENHANCED-ANALYZE] ✅ Added tint description from photo: {tint_desc}")
+                        logger.debug("[ENHANCED-ANALYZE] ✅ Added tint description from photo: %s", tint_desc)
                     else:
-                        print(f"[ENHANCED-ANALYZE] ⚠️ Skipping duplicate tint description: {tint_desc}")
+                        logger.debug("[ENHANCED-ANALYZE] ⚠️ Skipping duplicate tint description: %s", tint_desc)
             
             # Add interior material if clearly visible (e.g., "Black Leather", "Tan Cloth")
             if details.get("interior_material", {}).get("confidence", 0) >= 0.7:
@@ -628,19 +671,19 @@ Return ONLY this JSON structure:
                         if "leather" in interior_lower and "leather" in existing_lower:
                             if "seats" in existing_lower or "seats" in interior_lower:
                                 is_duplicate = True
-                                print(f"[ENHANCED-ANALYZE] ⚠️ Skipping duplicate interior material: '{interior_desc}' (similar to '{existing_feature}')")
+                                logger.debug("[ENHANCED-ANALYZE] ⚠️ Skipping duplicate interior material: '%s' (similar to '%s')", interior_desc, existing_feature)
                                 break
                         # Exact or partial match
                         if interior_lower == existing_lower or (interior_lower in existing_lower or existing_lower in interior_lower):
                             is_duplicate = True
-                            print(f"[ENHANCED-ANALYZE] ⚠️ Skipping duplicate interior material: '{interior_desc}' (already exists)")
+                            logger.debug("[ENHANCED-ANALYZE] ⚠️ Skipping duplicate interior material: '%s' (already exists)", interior_desc)
                             break
                     
                     if not is_duplicate:
                         listing_context["features_list"].append(interior_desc)
-                        print(f"[ENHANCED-ANALYZE] ✅ Added interior material from photo: {interior_desc}")
+                        logger.debug("[ENHANCED-ANALYZE] ✅ Added interior material from photo: %s", interior_desc)
         
-        print(f"[ENHANCED-ANALYZE] 📋 Photo-detected features so far: {len(listing_context['features_list'])} - {listing_context['features_list']}")
+        logger.debug("[ENHANCED-ANALYZE] 📋 Photo-detected features so far: %s - %s", len(listing_context['features_list']), listing_context['features_list'])
         
         # VIN LOOKUP: Extract and decode VIN to get real vehicle specifications
         from app.services.vin_decoder import VINDecoder
@@ -658,7 +701,7 @@ Return ONLY this JSON structure:
             if extracted_vin:
                 vin_to_decode = extracted_vin
                 vin_source = "text"
-                print(f"[ENHANCED-ANALYZE] 🔍 Extracted VIN from aboutVehicle: {vin_to_decode}")
+                logger.debug("[ENHANCED-ANALYZE] 🔍 Extracted VIN from aboutVehicle: %s", vin_to_decode)
         
         # Also check if VIN is visible in images
         if analysis_json.get("vehicle", {}).get("vin_visible", {}).get("confidence", 0) >= 0.7:
@@ -679,7 +722,7 @@ Return ONLY this JSON structure:
                 vin_kb = VINKnowledgeBase()
                 vin_kb_record = await vin_kb.get_vin_features(vin_to_decode)
                 if vin_kb_record:
-                    print(f"[ENHANCED-ANALYZE] ✅ Found VIN {vin_to_decode} in knowledge base (used {vin_kb_record.get('usage_count', 0)} times)")
+                    logger.debug("[ENHANCED-ANALYZE] ✅ Found VIN %s in knowledge base (used %s times)", vin_to_decode, vin_kb_record.get('usage_count', 0))
                     vin_kb_features = vin_kb.get_all_features_from_record(vin_kb_record)
                     # Use stored data if available
                     if vin_kb_record.get('nhtsa_data'):
@@ -689,11 +732,10 @@ Return ONLY this JSON structure:
                         for feature in vin_kb_features:
                             if feature and feature not in listing_context["features_list"]:
                                 listing_context["features_list"].append(feature)
-                        print(f"[ENHANCED-ANALYZE] ✅ Added {len(vin_kb_features)} features from knowledge base")
+                        logger.debug("[ENHANCED-ANALYZE] ✅ Added %s features from knowledge base", len(vin_kb_features))
                         listing_context["vin_attributes"] = vin_kb_features.copy()
             except Exception as kb_error:
-                logger.warning(f"VIN knowledge base lookup failed: {kb_error}")
-                print(f"[ENHANCED-ANALYZE] ⚠️  Knowledge base lookup failed: {kb_error}")
+                logger.warning("VIN knowledge base lookup failed: %s", kb_error)
         
         # If not in knowledge base, decode VIN via API
         if vin_to_decode and not vin_kb_features:
@@ -701,35 +743,35 @@ Return ONLY this JSON structure:
                 vin_data = await vin_decoder.decode_vin(vin_to_decode)
                 
                 if vin_data:
-                    print(f"[ENHANCED-ANALYZE] ✅ VIN decoded successfully: {vin_data.get('make')} {vin_data.get('model')} {vin_data.get('year')}")
+                    logger.debug("[ENHANCED-ANALYZE] ✅ VIN decoded successfully: %s %s %s", vin_data.get('make'), vin_data.get('model'), vin_data.get('year'))
                     
                     # Use VIN data to enhance listing context if missing or uncertain
                     if not listing_context.get("make") or listing_context.get("make") == "Unknown":
                         if vin_data.get("make"):
                             listing_context["make"] = vin_data["make"]
-                            print(f"[ENHANCED-ANALYZE] 📝 Updated make from VIN: {vin_data['make']}")
+                            logger.debug("[ENHANCED-ANALYZE] 📝 Updated make from VIN: %s", vin_data['make'])
                             listing_context["reliability_tier"] = get_reliability_tier(listing_context["make"])
                     
                     if not listing_context.get("model") or listing_context.get("model") == "Unknown":
                         if vin_data.get("model"):
                             listing_context["model"] = vin_data["model"]
-                            print(f"[ENHANCED-ANALYZE] 📝 Updated model from VIN: {vin_data['model']}")
+                            logger.debug("[ENHANCED-ANALYZE] 📝 Updated model from VIN: %s", vin_data['model'])
                     
                     if not listing_context.get("year") or listing_context.get("year") == 0:
                         if vin_data.get("year"):
                             listing_context["year"] = vin_data["year"]
-                            print(f"[ENHANCED-ANALYZE] 📝 Updated year from VIN: {vin_data['year']}")
+                            logger.debug("[ENHANCED-ANALYZE] 📝 Updated year from VIN: %s", vin_data['year'])
                     
                     if not listing_context.get("trim") and vin_data.get("trim"):
                         listing_context["trim"] = vin_data["trim"]
-                        print(f"[ENHANCED-ANALYZE] 📝 Updated trim from VIN: {vin_data['trim']}")
+                        logger.debug("[ENHANCED-ANALYZE] 📝 Updated trim from VIN: %s", vin_data['trim'])
                         trim_tier, trim_matches = detect_trim_tier(listing_context["trim"])
                         listing_context["trim_tier"] = trim_tier
                         listing_context["trim_keywords"] = trim_matches
                     
                     if not listing_context.get("drivetrain") and vin_data.get("drivetrain"):
                         listing_context["drivetrain"] = vin_data["drivetrain"]
-                        print(f"[ENHANCED-ANALYZE] 📝 Updated drivetrain from VIN: {vin_data['drivetrain']}")
+                        logger.debug("[ENHANCED-ANALYZE] 📝 Updated drivetrain from VIN: %s", vin_data['drivetrain'])
                     
                     # CRITICAL: Add ALL NHTSA VIN attributes to features_list for description
                     # These are pure NHTSA data - must be included in the listing description
@@ -770,7 +812,7 @@ Return ONLY this JSON structure:
                     #         vin_attributes_added.append(body_feature)
                     
                     if vin_attributes_added:
-                        print(f"[ENHANCED-ANALYZE] ✅ Added {len(vin_attributes_added)} NHTSA VIN attributes to features: {vin_attributes_added}")
+                        logger.debug("[ENHANCED-ANALYZE] ✅ Added %s NHTSA VIN attributes to features: %s", len(vin_attributes_added), vin_attributes_added)
                         # Store VIN attributes separately for description generation
                         listing_context["vin_attributes"] = vin_attributes_added
                         
@@ -778,7 +820,7 @@ Return ONLY this JSON structure:
                         try:
                             from app.services.vin_knowledge_base import VINKnowledgeBase
                             vin_kb = VINKnowledgeBase()
-                            print(f"[ENHANCED-ANALYZE] 🔍 Attempting to store NHTSA VIN data in knowledge base...")
+                            logger.debug("[ENHANCED-ANALYZE] 🔍 Attempting to store NHTSA VIN data in knowledge base...")
                             storage_result = await vin_kb.store_vin_features(
                                 vin=vin_to_decode,
                                 make=vin_data.get("make"),
@@ -791,20 +833,17 @@ Return ONLY this JSON structure:
                                 confidence_score=0.95
                             )
                             if storage_result:
-                                print(f"[ENHANCED-ANALYZE] ✅ Stored NHTSA VIN data in knowledge base")
+                                logger.debug("[ENHANCED-ANALYZE] ✅ Stored NHTSA VIN data in knowledge base")
                             else:
-                                print(f"[ENHANCED-ANALYZE] ⚠️  Failed to store NHTSA VIN data (storage_result=False)")
+                                logger.warning("[ENHANCED-ANALYZE] ⚠️  Failed to store NHTSA VIN data (storage_result=False)")
                         except Exception as kb_error:
-                            logger.warning(f"Failed to store NHTSA VIN in knowledge base: {kb_error}")
-                            print(f"[ENHANCED-ANALYZE] ❌ ERROR storing NHTSA VIN: {kb_error}")
-                            import traceback
-                            print(f"[ENHANCED-ANALYZE] ❌ Traceback: {traceback.format_exc()}")
+                            logger.error("[ENHANCED-ANALYZE] ❌ ERROR storing NHTSA VIN: %s", kb_error, exc_info=True)
                     
                     # ENHANCED: Search Google for detailed VIN features (like adaptive cruise control, LED headlights, etc.)
                     # This pulls the same type of detailed feature list that Google shows when searching "{VIN} features"
                     # Use AI/LLM to extract features from Google Search results (more accurate than keyword matching)
                     try:
-                        print(f"[ENHANCED-ANALYZE] 🔍 Searching Google for detailed features for VIN: {vin_to_decode}")
+                        logger.debug("[ENHANCED-ANALYZE] 🔍 Searching Google for detailed features for VIN: %s", vin_to_decode)
                         from app.agents.market_intelligence_agent import MarketIntelligenceAgent
                         market_agent = MarketIntelligenceAgent()
                         
@@ -813,7 +852,7 @@ Return ONLY this JSON structure:
                         vin_features_search = await market_agent._web_search(vin_features_query)
                         
                         if vin_features_search:
-                            print(f"[ENHANCED-ANALYZE] ✅ Google Search returned {len(vin_features_search)} characters of VIN feature data")
+                            logger.debug("[ENHANCED-ANALYZE] ✅ Google Search returned %s characters of VIN feature data", len(vin_features_search))
                             
                             # Use OpenAI to extract features from Google Search results (more accurate than keyword matching)
                             if openai_client:
@@ -886,7 +925,7 @@ IMPORTANT:
 
 Return ONLY the JSON object, nothing else."""
 
-                                    extraction_response = openai_client.chat.completions.create(
+                                    extraction_response = await openai_client.chat.completions.create(
                                         model="gpt-4o-mini",
                                         messages=[
                                             {"role": "user", "content": extraction_prompt}
@@ -930,8 +969,8 @@ Return ONLY the JSON object, nothing else."""
                                                 listing_context["features_list"].append(feature)
                                         
                                         if vin_features_found:
-                                            print(f"[ENHANCED-ANALYZE] ✅ AI extracted {len(vin_features_found)} categorized features from Google Search")
-                                            print(f"[ENHANCED-ANALYZE]   Interior: {len(features_interior)}, Exterior: {len(features_exterior)}, Safety: {len(features_safety)}, Tech: {len(features_technology)}")
+                                            logger.debug("[ENHANCED-ANALYZE] ✅ AI extracted %s categorized features from Google Search", len(vin_features_found))
+                                            logger.debug("[ENHANCED-ANALYZE]   Interior: %s, Exterior: %s, Safety: %s, Tech: %s", len(features_interior), len(features_exterior), len(features_safety), len(features_technology))
                                             # Add to vin_attributes for tracking
                                             if "vin_attributes" not in listing_context:
                                                 listing_context["vin_attributes"] = []
@@ -941,7 +980,7 @@ Return ONLY the JSON object, nothing else."""
                                             try:
                                                 from app.services.vin_knowledge_base import VINKnowledgeBase
                                                 vin_kb = VINKnowledgeBase()
-                                                print(f"[ENHANCED-ANALYZE] 🔍 Attempting to store AI-extracted VIN features in knowledge base...")
+                                                logger.debug("[ENHANCED-ANALYZE] 🔍 Attempting to store AI-extracted VIN features in knowledge base...")
                                                 storage_result = await vin_kb.store_vin_features(
                                                     vin=vin_to_decode,
                                                     make=vin_data.get("make") if vin_data else listing_context.get("make"),
@@ -961,18 +1000,15 @@ Return ONLY the JSON object, nothing else."""
                                                     confidence_score=0.9
                                                 )
                                                 if storage_result:
-                                                    print(f"[ENHANCED-ANALYZE] ✅ Stored VIN features in knowledge base for future use")
+                                                    logger.debug("[ENHANCED-ANALYZE] ✅ Stored VIN features in knowledge base for future use")
                                                 else:
-                                                    print(f"[ENHANCED-ANALYZE] ⚠️  Failed to store VIN features (storage_result=False)")
+                                                    logger.warning("[ENHANCED-ANALYZE] ⚠️  Failed to store VIN features (storage_result=False)")
                                             except Exception as kb_error:
-                                                logger.warning(f"Failed to store VIN in knowledge base: {kb_error}")
-                                                print(f"[ENHANCED-ANALYZE] ❌ ERROR storing VIN features: {kb_error}")
-                                                import traceback
-                                                print(f"[ENHANCED-ANALYZE] ❌ Traceback: {traceback.format_exc()}")
+                                                logger.error("[ENHANCED-ANALYZE] ❌ ERROR storing VIN features: %s", kb_error, exc_info=True)
                                         else:
-                                            print(f"[ENHANCED-ANALYZE] ⚠️  AI extraction returned no features")
+                                            logger.warning("[ENHANCED-ANALYZE] ⚠️  AI extraction returned no features")
                                     except json.JSONDecodeError as json_error:
-                                        print(f"[ENHANCED-ANALYZE] ⚠️  Could not parse JSON from AI extraction response: {json_error}")
+                                        logger.warning("[ENHANCED-ANALYZE] ⚠️  Could not parse JSON from AI extraction response: %s", json_error)
                                         # Try to extract JSON object using regex as fallback
                                         import re
                                         json_match = re.search(r'\{.*\}', extracted_text, re.DOTALL)
@@ -981,11 +1017,10 @@ Return ONLY the JSON object, nothing else."""
                                                 features_by_category = json.loads(json_match.group(0))
                                                 # Process same as above...
                                             except:
-                                                print(f"[ENHANCED-ANALYZE] ⚠️  Regex fallback also failed")
+                                                logger.warning("[ENHANCED-ANALYZE] ⚠️  Regex fallback also failed")
                                         
                                 except Exception as ai_error:
-                                    logger.warning(f"AI feature extraction failed, falling back to keyword matching: {ai_error}")
-                                    print(f"[ENHANCED-ANALYZE] ⚠️  AI extraction failed: {ai_error}, using keyword fallback")
+                                    logger.warning("AI feature extraction failed, falling back to keyword matching: %s", ai_error)
                                     
                                     # Fallback to keyword matching if AI extraction fails
                                     vin_feature_keywords = [
@@ -1007,17 +1042,16 @@ Return ONLY the JSON object, nothing else."""
                                                     listing_context["features_list"].append(formatted_feature)
                                     
                                     if vin_features_found:
-                                        print(f"[ENHANCED-ANALYZE] ✅ Keyword fallback found {len(vin_features_found)} features: {vin_features_found}")
+                                        logger.debug("[ENHANCED-ANALYZE] ✅ Keyword fallback found %s features: %s", len(vin_features_found), vin_features_found)
                                         if "vin_attributes" not in listing_context:
                                             listing_context["vin_attributes"] = []
                                         listing_context["vin_attributes"].extend(vin_features_found)
                             else:
-                                print(f"[ENHANCED-ANALYZE] ⚠️  OpenAI client not available for AI feature extraction")
+                                logger.warning("[ENHANCED-ANALYZE] ⚠️  OpenAI client not available for AI feature extraction")
                         else:
-                            print(f"[ENHANCED-ANALYZE] ⚠️  Google Search returned no results for VIN features")
+                            logger.warning("[ENHANCED-ANALYZE] ⚠️  Google Search returned no results for VIN features")
                     except Exception as e:
-                        logger.warning(f"Failed to enrich VIN features via Google Search: {e}")
-                        print(f"[ENHANCED-ANALYZE] ⚠️  VIN feature enrichment failed: {e}")
+                        logger.warning("Failed to enrich VIN features via Google Search: %s", e)
                     
                     vin_status = {
                         "state": "decoded",
@@ -1028,8 +1062,7 @@ Return ONLY the JSON object, nothing else."""
                     }
                 
             except Exception as e:
-                logger.warning(f"VIN decode failed: {e}")
-                print(f"[ENHANCED-ANALYZE] ⚠️  VIN decode failed: {e}")
+                logger.warning("VIN decode failed: %s", e)
                 vin_status = {
                     "state": "error",
                     "vin": vin_to_decode,
@@ -1043,7 +1076,7 @@ Return ONLY the JSON object, nothing else."""
                 "state": "missing",
                 "message": f"{reason}. Upload a VIN photo to unlock equipment decode.",
             }
-            print(f"[ENHANCED-ANALYZE] ⚠️ {vin_status['message']}")
+            logger.warning("[ENHANCED-ANALYZE] ⚠️ %s", vin_status['message'])
             listing_context.setdefault("alerts", []).append(vin_status["message"])
         
         listing_context["vin_status"] = vin_status
@@ -1052,7 +1085,7 @@ Return ONLY the JSON object, nothing else."""
         final_trim_value = listing_context.get("trim")
         trim_changed = ((original_trim_input or "").strip().lower() != (final_trim_value or "").strip().lower())
         if trim_changed:
-            print(f"[ENHANCED-ANALYZE] 🔁 Trim updated from '{original_trim_input}' to '{final_trim_value}' after VIN/photo analysis - refreshing market search")
+            logger.debug("[ENHANCED-ANALYZE] 🔁 Trim updated from '%s' to '%s' after VIN/photo analysis - refreshing market search", original_trim_input, final_trim_value)
             try:
                 from app.agents.market_intelligence_agent import MarketIntelligenceAgent
                 refresh_agent = MarketIntelligenceAgent()
@@ -1071,9 +1104,9 @@ Return ONLY the JSON object, nothing else."""
                 })
                 if refreshed_result and refreshed_result.success and refreshed_result.data:
                     market_result = refreshed_result
-                    print(f"[ENHANCED-ANALYZE] ✅ Market search refreshed with detected trim {final_trim_value}")
+                    logger.debug("[ENHANCED-ANALYZE] ✅ Market search refreshed with detected trim %s", final_trim_value)
             except Exception as refresh_error:
-                logger.warning(f"Trim refresh market search failed: {refresh_error}")
+                logger.warning("Trim refresh market search failed: %s", refresh_error)
         
         # Extract exterior and interior colors - add to features if clearly visible
         if analysis_json.get("vehicle", {}).get("exterior_color", {}).get("confidence", 0) >= 0.7:
@@ -1085,7 +1118,7 @@ Return ONLY the JSON object, nothing else."""
                     color_feature = f"{color.title()} Exterior"
                     if color_feature not in listing_context["features_list"]:
                         listing_context["features_list"].append(color_feature)
-                print(f"[ENHANCED-ANALYZE] ✅ Detected exterior color: {color}")
+                logger.debug("[ENHANCED-ANALYZE] ✅ Detected exterior color: %s", color)
         
         if analysis_json.get("vehicle", {}).get("interior_color", {}).get("confidence", 0) >= 0.7:
             color = analysis_json["vehicle"]["interior_color"].get("value")
@@ -1104,18 +1137,18 @@ Return ONLY the JSON object, nothing else."""
                         # If interior_material already exists as a feature, skip the combination
                         if interior_material.lower() in existing_lower or existing_lower in interior_material.lower():
                             is_duplicate = True
-                            print(f"[ENHANCED-ANALYZE] ⚠️ Skipping duplicate color+material: '{color_material_feature}' (interior material already exists as '{existing_feature}')")
+                            logger.debug("[ENHANCED-ANALYZE] ⚠️ Skipping duplicate color+material: '%s' (interior material already exists as '%s')", color_material_feature, existing_feature)
                             break
                         # Exact or partial match
                         if color_material_lower == existing_lower or (color_material_lower in existing_lower or existing_lower in color_material_lower):
                             is_duplicate = True
-                            print(f"[ENHANCED-ANALYZE] ⚠️ Skipping duplicate color+material: '{color_material_feature}' (already exists)")
+                            logger.debug("[ENHANCED-ANALYZE] ⚠️ Skipping duplicate color+material: '%s' (already exists)", color_material_feature)
                             break
                     
                     if not is_duplicate:
                         listing_context["features_list"].append(color_material_feature)
-                        print(f"[ENHANCED-ANALYZE] ✅ Added interior color+material: {color_material_feature}")
-                print(f"[ENHANCED-ANALYZE] ✅ Detected interior color: {color}")
+                        logger.debug("[ENHANCED-ANALYZE] ✅ Added interior color+material: %s", color_material_feature)
+                logger.debug("[ENHANCED-ANALYZE] ✅ Detected interior color: %s", color)
         
         # Extract badges and visible features from photos (high confidence only)
         if "badges_seen" in analysis_json:
@@ -1125,10 +1158,10 @@ Return ONLY the JSON object, nothing else."""
                 badge_upper = badge.upper()
                 if badge_upper in ["AWD", "4WD", "4X4"] and "All-Wheel Drive" not in listing_context["features_list"]:
                     listing_context["features_list"].append("All-Wheel Drive")
-                    print(f"[ENHANCED-ANALYZE] ✅ Detected AWD from badge: {badge}")
+                    logger.debug("[ENHANCED-ANALYZE] ✅ Detected AWD from badge: %s", badge)
                 elif badge_upper in ["SPORT", "SPORT PACKAGE"] and "Sport Package" not in listing_context["features_list"]:
                     listing_context["features_list"].append("Sport Package")
-                    print(f"[ENHANCED-ANALYZE] ✅ Detected Sport Package from badge: {badge}")
+                    logger.debug("[ENHANCED-ANALYZE] ✅ Detected Sport Package from badge: %s", badge)
         
         # Extract roof rails, alloy wheels, tinted windows from specific_details (high confidence only)
         if "specific_details" in analysis_json:
@@ -1136,7 +1169,7 @@ Return ONLY the JSON object, nothing else."""
             if details.get("roof_rails", {}).get("confidence", 0) >= 0.7 or details.get("roof_rack", {}).get("confidence", 0) >= 0.7:
                 if "Roof Rails" not in listing_context["features_list"]:
                     listing_context["features_list"].append("Roof Rails")
-                    print(f"[ENHANCED-ANALYZE] ✅ Detected Roof Rails from photo")
+                    logger.debug("[ENHANCED-ANALYZE] ✅ Detected Roof Rails from photo")
         
         # FINAL DEDUPLICATION PASS: Remove any remaining duplicates and hallucinations
         # This catches any duplicates that might have been missed
@@ -1155,7 +1188,7 @@ Return ONLY the JSON object, nothing else."""
             
             # Check for exact duplicates
             if feature_lower in seen_features_lower:
-                print(f"[ENHANCED-ANALYZE] ⚠️ Removing duplicate feature: '{feature}'")
+                logger.debug("[ENHANCED-ANALYZE] ⚠️ Removing duplicate feature: '%s'", feature)
                 continue
             
             # Check for similar/partial duplicates (e.g., "Leather Seats" vs "Black Leather")
@@ -1165,12 +1198,12 @@ Return ONLY the JSON object, nothing else."""
                 if "leather" in feature_lower and "leather" in seen_feature:
                     if feature_lower in seen_feature or seen_feature in feature_lower:
                         is_duplicate = True
-                        print(f"[ENHANCED-ANALYZE] ⚠️ Removing similar duplicate: '{feature}' (similar to existing feature)")
+                        logger.debug("[ENHANCED-ANALYZE] ⚠️ Removing similar duplicate: '%s' (similar to existing feature)", feature)
                         break
                 # Check for other common duplicates (e.g., "AWD" vs "All-Wheel Drive")
                 if ("awd" in feature_lower or "all-wheel" in feature_lower) and ("awd" in seen_feature or "all-wheel" in seen_feature):
                     is_duplicate = True
-                    print(f"[ENHANCED-ANALYZE] ⚠️ Removing duplicate drivetrain: '{feature}' (similar to existing feature)")
+                    logger.debug("[ENHANCED-ANALYZE] ⚠️ Removing duplicate drivetrain: '%s' (similar to existing feature)", feature)
                     break
             
             if not is_duplicate:
@@ -1183,9 +1216,9 @@ Return ONLY the JSON object, nothing else."""
         removed_count = original_count - len(deduplicated_features)
         
         if removed_count > 0:
-            print(f"[ENHANCED-ANALYZE] 🧹 Deduplication removed {removed_count} duplicate features")
+            logger.debug("[ENHANCED-ANALYZE] 🧹 Deduplication removed %s duplicate features", removed_count)
         
-        print(f"[ENHANCED-ANALYZE] 📋 FINAL features list before listing generation: {len(listing_context['features_list'])} features - {listing_context['features_list']}")
+        logger.debug("[ENHANCED-ANALYZE] 📋 FINAL features list before listing generation: %s features - %s", len(listing_context['features_list']), listing_context['features_list'])
         
         # REMOVED: Feature inference from touchscreen, drivetrain, etc.
         # Only use features from NHTSA VIN data or user-typed "About The Vehicle"
@@ -1204,8 +1237,8 @@ Return ONLY the JSON object, nothing else."""
         # Store condition notes separately for AI context (not in condition_blurbs which might get added to descriptions)
         listing_context["condition_notes_ai_only"] = condition_notes_for_ai
         if condition_notes_for_ai:
-            print(f"[ENHANCED-ANALYZE] 📝 Condition notes stored for AI context only (NOT in listing): {len(condition_notes_for_ai)} notes")
-            print(f"[ENHANCED-ANALYZE] 📝 Notes: {', '.join(condition_notes_for_ai[:3])}...")
+            logger.debug("[ENHANCED-ANALYZE] 📝 Condition notes stored for AI context only (NOT in listing): %s notes", len(condition_notes_for_ai))
+            logger.debug("[ENHANCED-ANALYZE] 📝 Notes: %s...", ', '.join(condition_notes_for_ai[:3]))
         
         # REAL MARKET DATA INTEGRATION - Use market data from parallel Google Search
         # Market data was already fetched in parallel above
@@ -1227,31 +1260,31 @@ Return ONLY the JSON object, nothing else."""
                 # No longer rejecting prices due to year mismatch or "too high" values
                 # Google Search is the source of truth - we only adjust, not reject
                 
-                print(f"[ENHANCED-ANALYZE] 📊 Market average: ${market_average:,.0f} (source: {data_source})")
-                print(f"[ENHANCED-ANALYZE] 📊 RAW Google Search price (before adjustments): ${market_average:,.0f}")
+                logger.debug("[ENHANCED-ANALYZE] 📊 Market average: $%.0f (source: %s)", market_average, data_source)
+                logger.debug("[ENHANCED-ANALYZE] 📊 RAW Google Search price (before adjustments): $%.0f", market_average)
                 
                 # Show what Google actually found
                 price_range = market_prices.get("price_range", {})
                 if price_range.get("low") and price_range.get("high"):
-                    print(f"[ENHANCED-ANALYZE] 📊 Google Search found price range: ${price_range['low']:,} - ${price_range['high']:,}")
+                    logger.debug("[ENHANCED-ANALYZE] 📊 Google Search found price range: $%s - $%s", price_range['low'], price_range['high'])
                 
                 search_query = market_prices.get("search_query", "")
                 if search_query:
-                    print(f"[ENHANCED-ANALYZE] 🔍 Google Search query used: {search_query}")
+                    logger.debug("[ENHANCED-ANALYZE] 🔍 Google Search query used: %s", search_query)
                 
                 trim_used = market_prices.get("trim_used", "")
                 if trim_used:
-                    print(f"[ENHANCED-ANALYZE] ✅ Trim included in search: {trim_used}")
+                    logger.debug("[ENHANCED-ANALYZE] ✅ Trim included in search: %s", trim_used)
                 else:
-                    print(f"[ENHANCED-ANALYZE] ⚠️  WARNING: Trim NOT included in search - may have gotten base model prices!")
+                    logger.warning("[ENHANCED-ANALYZE] ⚠️  WARNING: Trim NOT included in search - may have gotten base model prices!")
                 
                 if data_source == "google_search_grounding":
                     prices_found = market_prices.get("prices_found", 0)
-                    print(f"[ENHANCED-ANALYZE] ✅ REAL MARKET DATA: Found {prices_found} prices from Google Search")
+                    logger.debug("[ENHANCED-ANALYZE] ✅ REAL MARKET DATA: Found %s prices from Google Search", prices_found)
                 elif data_source == "rejected_msrp":
-                    print(f"[ENHANCED-ANALYZE] 🚫 Market average rejected as MSRP - will use fallback")
+                    logger.warning("[ENHANCED-ANALYZE] 🚫 Market average rejected as MSRP - will use fallback")
                 else:
-                    print(f"[ENHANCED-ANALYZE] ⚠️  WARNING: Using estimated data - Google Search may have failed")
+                    logger.warning("[ENHANCED-ANALYZE] ⚠️  WARNING: Using estimated data - Google Search may have failed")
                 
                 # Call Pricing Strategy Agent to calculate 3-tier pricing
                 if market_average > 0:
@@ -1266,7 +1299,7 @@ Return ONLY the JSON object, nothing else."""
                     # Add title rebuild reason for damage severity assessment
                     if titleRebuildReason:
                         vehicle_data_with_location["title_rebuild_reason"] = titleRebuildReason
-                        print(f"[ENHANCED-ANALYZE] 📝 Title rebuild reason: {titleRebuildReason[:100]}...")
+                        logger.debug("[ENHANCED-ANALYZE] 📝 Title rebuild reason: %s", clip(titleRebuildReason, 100))
                     
                     pricing_result = await pricing_agent.process({
                         "vehicle_data": vehicle_data_with_location,
@@ -1276,7 +1309,7 @@ Return ONLY the JSON object, nothing else."""
                     
                     if pricing_result and pricing_result.success and pricing_result.data:
                         pricing_strategy_data = pricing_result.data
-                        print(f"[ENHANCED-ANALYZE] ✅ Pricing strategy calculated")
+                        logger.debug("[ENHANCED-ANALYZE] ✅ Pricing strategy calculated")
                     
                     # Calculate price warnings - ChatGPT-style feedback based on REAL market data
                     # NOTE: All adjustments are now done in Pricing Strategy Agent
@@ -1382,16 +1415,15 @@ Return ONLY the JSON object, nothing else."""
                                     "data_source": market_prices.get("data_source", "google_search")
                                 }
                         
-                        print(f"[ENHANCED-ANALYZE] ⚠️  Price validation: {price_warnings['type']}")
-                        print(f"[ENHANCED-ANALYZE] 📊 Raw market data: ${market_average:,.0f} (clean title)")
+                        logger.warning("[ENHANCED-ANALYZE] ⚠️  Price validation: %s", price_warnings['type'])
+                        logger.debug("[ENHANCED-ANALYZE] 📊 Raw market data: $%.0f (clean title)", market_average)
                         if adjustment_factors:
-                            print(f"[ENHANCED-ANALYZE] 🔧 Adjustments applied: {', '.join(adjustment_factors)}")
-                        print(f"[ENHANCED-ANALYZE] 📊 Adjusted market data: ${market_average_for_comparison:,.0f} (from ${market_low:,.0f} to ${market_high:,.0f})")
-                        print(f"[ENHANCED-ANALYZE] 💰 User price: ${user_price:,.0f} ({price_diff_pct:+.1f}% vs adjusted market)")
+                            logger.debug("[ENHANCED-ANALYZE] 🔧 Adjustments applied: %s", ', '.join(adjustment_factors))
+                        logger.debug("[ENHANCED-ANALYZE] 📊 Adjusted market data: $%.0f (from $%.0f to $%.0f)", market_average_for_comparison, market_low, market_high)
+                        logger.debug("[ENHANCED-ANALYZE] 💰 User price: $%.0f (%+.1f%% vs adjusted market)", user_price, price_diff_pct)
         
         except Exception as market_error:
-            logger.warning(f"Market intelligence failed (using fallback): {market_error}")
-            print(f"[ENHANCED-ANALYZE] ⚠️  Market intelligence failed: {market_error}")
+            logger.warning("Market intelligence failed (using fallback): %s", market_error)
             # Continue with fallback pricing if market intelligence fails
         
         # Build pricing tiers from real data or fallback to estimated
@@ -1418,7 +1450,7 @@ Return ONLY the JSON object, nothing else."""
                 },
                 "breakdown": pricing_breakdown  # Add detailed breakdown
             }
-            print(f"[ENHANCED-ANALYZE] ✅ Using REAL pricing tiers from market data")
+            logger.debug("[ENHANCED-ANALYZE] ✅ Using REAL pricing tiers from market data")
         else:
                 # Fallback to estimated pricing if market intelligence failed
             market_avg = market_intelligence_data.get("pricing_analysis", {}).get("market_prices", {}).get("market_average", 0) if market_intelligence_data else 0
@@ -1443,7 +1475,7 @@ Return ONLY the JSON object, nothing else."""
                     max_reasonable = clean_title_estimate * 1.1
                     
                     if market_avg > max_reasonable:
-                        print(f"[ENHANCED-ANALYZE] 🚫 REJECTING fallback market_avg ${market_avg:,.0f} - exceeds max reasonable ${max_reasonable:,.0f}")
+                        logger.warning("[ENHANCED-ANALYZE] 🚫 REJECTING fallback market_avg $%.0f - exceeds max reasonable $%.0f", market_avg, max_reasonable)
                         market_avg = 0  # Force fallback calculation
             
             if market_avg > 0:
@@ -1465,7 +1497,7 @@ Return ONLY the JSON object, nothing else."""
                         "estimated_days_to_sell": 60
                     }
                 }
-                print(f"[ENHANCED-ANALYZE] ✅ Using market average-based pricing: ${market_avg:,.0f}")
+                logger.debug("[ENHANCED-ANALYZE] ✅ Using market average-based pricing: $%.0f", market_avg)
             else:
                 # Final fallback: Use improved fallback algorithm (same as Market Intelligence Agent)
                 # Import the fallback calculation from Market Intelligence Agent
@@ -1481,7 +1513,7 @@ Return ONLY the JSON object, nothing else."""
                 
                 # Use the same fallback algorithm as Market Intelligence Agent
                 base_price = market_agent._calculate_fallback_price(make, model, year, mileage, trim, title_status)
-                print(f"[ENHANCED-ANALYZE] ⚠️  WARNING: Using fallback pricing algorithm (${base_price:,.0f}) - Google Search failed or returned MSRP")
+                logger.warning("[ENHANCED-ANALYZE] ⚠️  WARNING: Using fallback pricing algorithm ($%.0f) - Google Search failed or returned MSRP", base_price)
                 
                 pricing = {
                     "quick_sale": {
@@ -1504,8 +1536,8 @@ Return ONLY the JSON object, nothing else."""
         # PASS-2: COMPOSE - Generate platform-specific SEO-optimized listings using OpenAI
         # Now that we have market intelligence data, generate platform-specific listings
         pass2_start = time.time()
-        logger.info(f"⏱️ Starting PASS-2 (platform-specific SEO formatting) using OpenAI...")
-        print(f"[ENHANCED-ANALYZE] 🔍 Generating platform-specific SEO-optimized descriptions...")
+        logger.info("⏱️ Starting PASS-2 (platform-specific SEO formatting) using OpenAI...")
+        logger.debug("[ENHANCED-ANALYZE] 🔍 Generating platform-specific SEO-optimized descriptions...")
         
         # Generate listings for multiple platforms with SEO optimization
         platforms = ["facebook_marketplace", "craigslist", "offerup", "autotrader", "cars_com"]
@@ -1620,7 +1652,7 @@ Format the response as a complete, ready-to-post listing for {platform} with org
             try:
                 if not openai_client:
                     raise ValueError("OpenAI client not initialized")
-                compose_response = openai_client.chat.completions.create(
+                compose_response = await openai_client.chat.completions.create(
                     model="gpt-4o-mini",  # Use gpt-4o-mini for cost efficiency
                     messages=[
                         {
@@ -1632,14 +1664,15 @@ Format the response as a complete, ready-to-post listing for {platform} with org
                     temperature=0.3  # Lower temperature for more consistent, SEO-focused output
                 )
                 platform_listings[platform] = compose_response.choices[0].message.content
-                print(f"[ENHANCED-ANALYZE] ✅ Generated {platform} listing")
+                logger.debug("[ENHANCED-ANALYZE] ✅ Generated %s listing", platform)
             except Exception as e:
-                logger.warning(f"Failed to generate {platform} listing: {e}")
+                logger.warning("Failed to generate %s listing: %s", platform, e)
                 # Fallback to a basic listing if generation fails
                 platform_listings[platform] = f"{listing_context.get('year', '')} {listing_context.get('make', '')} {listing_context.get('model', '')} - {listing_context.get('mileage', '')} miles"
         
         pass2_time = time.time() - pass2_start
-        logger.info(f"⏱️ PASS-2 (platform-specific SEO formatting) completed in {pass2_time:.2f}s")
+        logger.info("⏱️ PASS-2 (platform-specific SEO formatting) completed in %.2fs", pass2_time)
+        await analysis_jobs.report_progress("listing_formatted", {"seconds": round(pass2_time, 2), "platforms": list(platform_listings)})
         
         # Use Facebook Marketplace as default (most common)
         final_listing_text = platform_listings.get("facebook_marketplace", "Listing generated successfully")
@@ -1647,7 +1680,7 @@ Format the response as a complete, ready-to-post listing for {platform} with org
         # CRITICAL: If features were detected but not included in the listing, add them explicitly
         if listing_context.get("features_list") and len(listing_context["features_list"]) > 0:
             features_text = ", ".join(listing_context["features_list"])
-            print(f"[ENHANCED-ANALYZE] 🔍 Checking if {len(listing_context['features_list'])} features are in listing: {listing_context['features_list']}")
+            logger.debug("[ENHANCED-ANALYZE] 🔍 Checking if %s features are in listing: %s", len(listing_context['features_list']), listing_context['features_list'])
             
             # Check if features are already mentioned in the listing (more lenient check)
             features_mentioned = any(
@@ -1659,8 +1692,8 @@ Format the response as a complete, ready-to-post listing for {platform} with org
             has_empty_features_section = bool(re.search(r'Features & Equipment:.*?(?:🔑|Rebuilt|professionally|ready to drive)', final_listing_text, re.IGNORECASE | re.DOTALL))
             
             if not features_mentioned or has_empty_features_section:
-                print(f"[ENHANCED-ANALYZE] ⚠️  Features detected but not properly in listing - adding them explicitly")
-                print(f"[ENHANCED-ANALYZE] 📋 Features to add: {listing_context['features_list']}")
+                logger.warning("[ENHANCED-ANALYZE] ⚠️  Features detected but not properly in listing - adding them explicitly")
+                logger.debug("[ENHANCED-ANALYZE] 📋 Features to add: %s", listing_context['features_list'])
                 
                 # Format features as bullet points
                 features_bullets = "\n".join([f"• {feature}" for feature in listing_context["features_list"]])
@@ -1671,7 +1704,7 @@ Format the response as a complete, ready-to-post listing for {platform} with org
                     pattern = r'(🔧 Features & Equipment:)\s*\n?\s*.*?(?=\n\n📱|\n\n🔑|$)'
                     replacement = f'\\1\n\n{features_bullets}\n'
                     final_listing_text = re.sub(pattern, replacement, final_listing_text, flags=re.IGNORECASE | re.DOTALL)
-                    print(f"[ENHANCED-ANALYZE] ✅ Replaced empty features section with detected features")
+                    logger.debug("[ENHANCED-ANALYZE] ✅ Replaced empty features section with detected features")
                 else:
                     # Add features section before the closing message
                     features_section = f"\n\n🔧 Features & Equipment:\n\n{features_bullets}\n\n"
@@ -1681,28 +1714,20 @@ Format the response as a complete, ready-to-post listing for {platform} with org
                         final_listing_text = '\n'.join(lines[:-1]) + features_section + lines[-1]
                     else:
                         final_listing_text += features_section
-                    print(f"[ENHANCED-ANALYZE] ✅ Added new features section with detected features")
+                    logger.debug("[ENHANCED-ANALYZE] ✅ Added new features section with detected features")
                 
-                print(f"[ENHANCED-ANALYZE] ✅ Final listing now includes features: {features_text}")
+                logger.debug("[ENHANCED-ANALYZE] ✅ Final listing now includes features: %s", features_text)
         else:
-            print(f"[ENHANCED-ANALYZE] ⚠️  WARNING: No features detected! features_list is empty or missing")
-            print(f"[ENHANCED-ANALYZE] 📋 listing_context keys: {list(listing_context.keys())}")
-            print(f"[ENHANCED-ANALYZE] 📋 analysis_json features: {list(analysis_json.get('features', {}).keys())}")
+            logger.warning("[ENHANCED-ANALYZE] ⚠️  WARNING: No features detected! features_list is empty or missing")
+            logger.debug("[ENHANCED-ANALYZE] 📋 listing_context keys: %s", list(listing_context.keys()))
+            logger.debug("[ENHANCED-ANALYZE] 📋 analysis_json features: %s", list(analysis_json.get('features', {}).keys()))
         
         # DEBUG: Log final listing text to verify features are included
-        print(f"[ENHANCED-ANALYZE] 🔍 ===== FINAL LISTING TEXT CHECK =====")
-        print(f"[ENHANCED-ANALYZE] 📋 Final listing text length: {len(final_listing_text)} characters")
-        print(f"[ENHANCED-ANALYZE] 📋 Contains 'Features & Equipment': {('Features & Equipment' in final_listing_text)}")
-        if 'Features & Equipment' in final_listing_text:
-            # Extract features section
+        if logger.isEnabledFor(logging.DEBUG):
             features_match = re.search(r'Features & Equipment:.*?(?=\n\n📱|\n\n🔑|$)', final_listing_text, re.DOTALL | re.IGNORECASE)
-            if features_match:
-                features_section = features_match.group(0)
-                print(f"[ENHANCED-ANALYZE] 📋 Features section found: {features_section[:200]}...")
-            else:
-                print(f"[ENHANCED-ANALYZE] ⚠️  Features section header found but content not extracted")
-        print(f"[ENHANCED-ANALYZE] 📋 Features list that should be included: {listing_context.get('features_list', [])}")
-        print(f"[ENHANCED-ANALYZE] 🔍 ===== END FINAL LISTING TEXT CHECK =====")
+            logger.debug("[ENHANCED-ANALYZE] 📋 Final listing: %s chars, features section: %s; expected features: %s",
+                         len(final_listing_text), clip(features_match.group(0) if features_match else None, 200),
+                         listing_context.get('features_list', []))
         
         # Apply spelling correction to final listing text
         spelling_fixes = {
@@ -1748,13 +1773,13 @@ Format the response as a complete, ready-to-post listing for {platform} with org
             for pattern, replacement in spelling_fixes.items():
                 platform_listings[platform] = re.sub(pattern, replacement, platform_listings[platform], flags=re.IGNORECASE)
         
-        logger.info(f"PASS-2: Generated {len(platform_listings)} platform-specific listings")
+        logger.info("PASS-2: Generated %s platform-specific listings", len(platform_listings))
         
         total_time = time.time() - start_time
-        logger.info(f"⏱️ TOTAL analysis time: {total_time:.2f}s (PASS-1: {pass1_time:.2f}s, PASS-2: {pass2_time:.2f}s, image processing: {image_processing_time:.2f}s)")
+        logger.info("⏱️ TOTAL analysis time: %.2fs (PASS-1: %.2fs, PASS-2: %.2fs, image processing: %.2fs)", total_time, pass1_time, pass2_time, image_processing_time)
         
         ai_analysis = f"Two-pass analysis completed. Raw JSON: {json.dumps(analysis_json, indent=2)}"
-        logger.info(f"REAL: OpenAI analysis completed: {ai_analysis[:100]}...")
+        logger.info("REAL: OpenAI analysis completed: %s", clip(ai_analysis, 100))
         
         # Parse the AI response to extract car details
         detected_make = make or "Infiniti"
@@ -1822,7 +1847,12 @@ Format the response as a complete, ready-to-post listing for {platform} with org
             "platform_listings": platform_listings,  # Platform-specific SEO-optimized listings
             "timestamp": datetime.now().isoformat(),
             "demo_mode": False,
-            "images_processed": len(images),
+            "images_processed": received_image_count,
+            "image_preprocessing": image_preprocessing_stats,
+            "duplicate_images_collapsed": len(duplicate_images),
+            "vision_cache_hit": vision_cache_hit,
+            "key_image_selection": key_image_selection.to_dict(unique_image_count),
+            "ai_quota": admission.to_dict() if admission is not None else None,
             "openai_tokens_used": sum(len(v) for v in platform_listings.values()) * 4,  # Estimate tokens for platform listings (OpenAI Pass-2)
             "processing_times": {
                 "total_seconds": round(total_time, 2),
@@ -1836,32 +1866,179 @@ Format the response as a complete, ready-to-post listing for {platform} with org
         logger.info("REAL: Analysis completed successfully with OpenAI Vision API")
         
         # Print result summary for debugging
-        print(f"[ENHANCED-ANALYZE] ===== ANALYSIS COMPLETE =====")
-        print(f"[ENHANCED-ANALYZE] Success: {analysis_result.get('success')}")
-        print(f"[ENHANCED-ANALYZE] Has description: {bool(analysis_result.get('description'))}")
-        print(f"[ENHANCED-ANALYZE] Has post_text: {bool(analysis_result.get('post_text'))}")
-        if analysis_result.get('post_text'):
-            post_text = analysis_result.get('post_text', '')
-            print(f"[ENHANCED-ANALYZE] Post text length: {len(post_text)} chars")
-            print(f"[ENHANCED-ANALYZE] Post text preview: {post_text[:200]}...")
-        if analysis_result.get('description'):
-            desc = analysis_result.get('description', '')
-            print(f"[ENHANCED-ANALYZE] Description length: {len(desc)} chars")
-            print(f"[ENHANCED-ANALYZE] Description preview: {desc[:200]}...")
-        print(f"[ENHANCED-ANALYZE] =============================")
+        logger.info(
+            "[ENHANCED-ANALYZE] Analysis complete: success=%s, post_text=%s chars, description=%s chars",
+            analysis_result.get('success'), len(analysis_result.get('post_text') or ''), len(analysis_result.get('description') or ''),
+            extra={"elapsed_ms": round((time.time() - start_time) * 1000)},
+        )
+        log_payload(logger, "[ENHANCED-ANALYZE] Post text: %s", analysis_result.get('post_text') or '')
         
         return JSONResponse(content=analysis_result, status_code=200)
         
+    except HTTPException as http_error:
+        if http_error.status_code in (413, 429, 503):
+            raise
+        error_msg = str(http_error.detail)
+        logger.error("REAL: Enhanced analysis failed: %s", http_error.detail)
+        raise HTTPException(status_code=500, detail=f"Analysis failed: {error_msg}")
     except Exception as e:
         error_msg = str(e)
-        logger.error(f"REAL: Enhanced analysis failed: {e}")
-        print(f"[ENHANCED-ANALYZE] ===== ERROR OCCURRED =====")
-        print(f"[ENHANCED-ANALYZE] Error type: {type(e).__name__}")
-        print(f"[ENHANCED-ANALYZE] Error message: {error_msg}")
-        import traceback
-        print(f"[ENHANCED-ANALYZE] Traceback: {traceback.format_exc()}")
-        print(f"[ENHANCED-ANALYZE] =============================")
+        logger.error("[ENHANCED-ANALYZE] Enhanced analysis failed: %s: %s", type(e).__name__, error_msg, exc_info=True)
         raise HTTPException(status_code=500, detail=f"Analysis failed: {error_msg}")
+    finally:
+        if admission is not None:
+            admission.release()
+
+
+# Background tasks for jobs run in-process (no Celery broker); kept referenced until done
+_inline_job_tasks = set()
+
+
+async def run_enhanced_analysis_job(job_id: str) -> None:
+    """
+    Run a queued analysis job and store its result (called by the Celery task).
+    
+    Args:
+        job_id: Id returned by POST /enhanced-analyze/jobs
+    """
+    try:
+        form, ingested_images = await analysis_jobs.load_job_input(job_id)
+    except KeyError as missing:
+        logger.warning("[ENHANCED-ANALYZE-JOB] ❌ Job %s input missing: %s", job_id, missing)
+        await analysis_jobs.fail_job(job_id, "Job input expired before it could run", 410)
+        return
+    
+    logger.info("[ENHANCED-ANALYZE-JOB] ▶️  Running job %s (%s images)", job_id, len(ingested_images))
+    await analysis_jobs.append_event(job_id, "running", status="running")
+    token = analysis_jobs.set_current_job(analysis_jobs.AnalysisJobContext(job_id, ingested_images))
+    try:
+        response = await enhanced_analyze_car(images=[], **form)
+        await analysis_jobs.complete_job(job_id, json.loads(response.body))
+        logger.info("[ENHANCED-ANALYZE-JOB] ✅ Job %s completed", job_id)
+    except HTTPException as http_error:
+        await analysis_jobs.fail_job(job_id, str(http_error.detail), http_error.status_code)
+        logger.warning("[ENHANCED-ANALYZE-JOB] ❌ Job %s failed: %s", job_id, http_error.detail)
+    except Exception as e:
+        logger.exception("[ENHANCED-ANALYZE-JOB] ❌ Job %s failed: %s", job_id, e)
+        await analysis_jobs.fail_job(job_id, f"Analysis failed: {e}", 500)
+    finally:
+        analysis_jobs.reset_current_job(token)
+
+
+async def _enqueue_analysis_job(job_id: str) -> str:
+    """Hand the job to Celery; fall back to an in-process task if the broker is unavailable."""
+    if not settings.ANALYSIS_JOBS_INLINE:
+        try:
+            from app.services.tasks import run_enhanced_analysis_job_task
+            # apply_async talks to the broker synchronously - keep it off the event loop
+            await asyncio.to_thread(run_enhanced_analysis_job_task.apply_async, args=[job_id], retry=False)
+            return "celery"
+        except Exception as e:
+            logger.warning("[ENHANCED-ANALYZE-JOB] ⚠️  Celery unavailable, running job %s in-process: %s", job_id, e)
+    
+    task = asyncio.create_task(run_enhanced_analysis_job(job_id))
+    _inline_job_tasks.add(task)
+    task.add_done_callback(_inline_job_tasks.discard)
+    return "inline"
+
+
+@router.post("/enhanced-analyze/jobs", status_code=202)
+async def submit_enhanced_analysis_job(
+    images: List[UploadFile] = File(...),
+    make: Optional[str] = Form(None),
+    model: Optional[str] = Form(None),
+    trim: Optional[str] = Form(None),
+    year: Optional[str] = Form(None),
+    mileage: Optional[str] = Form(None),
+    price: Optional[str] = Form(None),
+    lowestPrice: Optional[str] = Form(None),
+    titleStatus: Optional[str] = Form(None),
+    aboutVehicle: Optional[str] = Form(None),
+    vin: Optional[str] = Form(None),
+    titleRebuildReason: Optional[str] = Form(None),
+    request: Request = None
+):
+    """
+    Queue an enhanced analysis and return immediately with a job id
+    
+    Same inputs as /enhanced-analyze. Poll GET /enhanced-analyze/jobs/{job_id}
+    or follow GET /enhanced-analyze/jobs/{job_id}/events (Server-Sent Events).
+    The job's AI cost is charged to the submitter's quota here.
+    """
+    try:
+        ingested_images = await ingest_uploads(images)
+    except ImageTooLargeError as size_error:
+        raise HTTPException(status_code=413, detail=str(size_error))
+    
+    await _admit_ai_request(request, estimate_enhanced_analysis_cost(len(ingested_images), aboutVehicle, vin), hold_slot=False)
+    
+    form = {
+        "make": make,
+        "model": model,
+        "trim": trim,
+        "year": year,
+        "mileage": mileage,
+        "price": price,
+        "lowestPrice": lowestPrice,
+        "titleStatus": titleStatus,
+        "aboutVehicle": aboutVehicle,
+        "vin": vin,
+        "titleRebuildReason": titleRebuildReason,
+    }
+    try:
+        job_id = await analysis_jobs.create_job(form, ingested_images)
+    except analysis_jobs.JobStoreUnavailable as unavailable:
+        raise HTTPException(status_code=503, detail=f"{unavailable}; use /enhanced-analyze instead")
+    
+    runner = await _enqueue_analysis_job(job_id)
+    logger.info("[ENHANCED-ANALYZE-JOB] 📥 Queued job %s (%s images, runner: %s)", job_id, len(ingested_images), runner)
+    
+    return {
+        "job_id": job_id,
+        "status": "queued",
+        "status_url": f"/api/v1/enhanced-analyze/jobs/{job_id}",
+        "events_url": f"/api/v1/enhanced-analyze/jobs/{job_id}/events",
+    }
+
+
+@router.get("/enhanced-analyze/jobs/{job_id}")
+async def get_enhanced_analysis_job(job_id: str):
+    """Job status, current stage, and the analysis result once completed"""
+    try:
+        job = await analysis_jobs.get_job(job_id)
+    except analysis_jobs.JobStoreUnavailable as unavailable:
+        raise HTTPException(status_code=503, detail=str(unavailable))
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found or expired")
+    return job
+
+
+@router.get("/enhanced-analyze/jobs/{job_id}/events")
+async def stream_enhanced_analysis_job(
+    job_id: str,
+    last_event_id: Optional[int] = None,
+    last_event_id_header: Optional[str] = Header(None, alias="Last-Event-ID")
+):
+    """
+    Server-Sent Events stream of job stages (vision_done, market_done, listing_formatted, ...)
+    
+    The final ``completed`` event carries the full result. Browsers resume after a
+    dropped connection via the Last-Event-ID header (or pass ``last_event_id``).
+    """
+    if last_event_id is None and last_event_id_header and last_event_id_header.isdigit():
+        last_event_id = int(last_event_id_header)
+    try:
+        if await analysis_jobs.get_job(job_id) is None:
+            raise HTTPException(status_code=404, detail="Job not found or expired")
+    except analysis_jobs.JobStoreUnavailable as unavailable:
+        raise HTTPException(status_code=503, detail=str(unavailable))
+    
+    start = last_event_id + 1 if last_event_id is not None else 0
+    return StreamingResponse(
+        analysis_jobs.stream_job_events(job_id, start=start),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
 
 
 @router.post("/debug-analyze")
@@ -1939,8 +2116,6 @@ async def enhanced_analyze_debug(
     """
     try:
         import time
-        import base64
-        import httpx
         from app.core.config import settings
         
         print(f"[DEBUG] ===== DEBUG ANALYSIS REQUEST =====")
@@ -1975,77 +2150,69 @@ Return ONLY this JSON structure:
   }}
 }}"""}]
         
-        for image in images:
-            await image.seek(0)
-            image_content = await image.read()
-            image_b64 = base64.b64encode(image_content).decode('utf-8')
-            gemini_parts.append({
-                "inline_data": {
-                    "mime_type": "image/jpeg",
-                    "data": image_b64
-                }
-            })
+        for ingested_image in await ingest_uploads(images):
+            gemini_parts.append(ingested_image.to_gemini_part())
         
         # Call Gemini Vision API
-        async with httpx.AsyncClient() as client:
-            gemini_response = await client.post(
-                f"https://generativelanguage.googleapis.com/v1beta/models/gemini-2.0-flash-exp:generateContent?key={settings.GEMINI_API_KEY}",
-                json={
-                    "contents": [{"parts": gemini_parts}],
-                    "generationConfig": {
-                        "maxOutputTokens": 2000,
-                        "temperature": 0.0,
-                        "responseMimeType": "application/json"
-                    }
-                },
-                timeout=60.0
-            )
-            
-            if gemini_response.status_code != 200:
-                return JSONResponse(content={
-                    "error": "Gemini API failed",
-                    "status": gemini_response.status_code,
-                    "response": gemini_response.text[:500]
-                }, status_code=500)
-            
-            gemini_result = gemini_response.json()
-            analysis_text = gemini_result["candidates"][0]["content"]["parts"][0]["text"]
-            analysis_json = json.loads(analysis_text)
-            
-            # Extract detected values
-            detected_vehicle = analysis_json.get("vehicle", {})
-            detected_make = detected_vehicle.get("make", {}).get("value")
-            detected_model = detected_vehicle.get("model", {}).get("value")
-            detected_year = detected_vehicle.get("year_guess", {}).get("value")
-            detected_trim = detected_vehicle.get("trim", {}).get("value")
-            make_conf = detected_vehicle.get("make", {}).get("confidence", 0)
-            model_conf = detected_vehicle.get("model", {}).get("confidence", 0)
-            
+        client = http_clients.httpx_client("gemini")
+        gemini_response = await client.post(
+            f"https://generativelanguage.googleapis.com/v1beta/models/gemini-2.0-flash-exp:generateContent?key={settings.GEMINI_API_KEY}",
+            json={
+                "contents": [{"parts": gemini_parts}],
+                "generationConfig": {
+                    "maxOutputTokens": 2000,
+                    "temperature": 0.0,
+                    "responseMimeType": "application/json"
+                }
+            },
+            timeout=60.0
+        )
+        
+        if gemini_response.status_code != 200:
             return JSONResponse(content={
-                "user_provided": {
-                    "make": make,
-                    "model": model,
-                    "year": year,
-                    "trim": trim
-                },
-                "gemini_vision_detected": {
-                    "make": detected_make,
-                    "model": detected_model,
-                    "year": detected_year,
-                    "trim": detected_trim,
-                    "confidence": {
-                        "make": make_conf,
-                        "model": model_conf
-                    }
-                },
-                "raw_gemini_response": analysis_json,
-                "match": {
-                    "make_matches": (make or "").lower() == (detected_make or "").lower(),
-                    "model_matches": (model or "").lower() == (detected_model or "").lower(),
-                    "warning": "MISMATCH DETECTED" if ((make or "").lower() != (detected_make or "").lower() or (model or "").lower() != (detected_model or "").lower()) else "MATCH"
+                "error": "Gemini API failed",
+                "status": gemini_response.status_code,
+                "response": gemini_response.text[:500]
+            }, status_code=500)
+        
+        gemini_result = gemini_response.json()
+        analysis_text = gemini_result["candidates"][0]["content"]["parts"][0]["text"]
+        analysis_json = json.loads(analysis_text)
+        
+        # Extract detected values
+        detected_vehicle = analysis_json.get("vehicle", {})
+        detected_make = detected_vehicle.get("make", {}).get("value")
+        detected_model = detected_vehicle.get("model", {}).get("value")
+        detected_year = detected_vehicle.get("year_guess", {}).get("value")
+        detected_trim = detected_vehicle.get("trim", {}).get("value")
+        make_conf = detected_vehicle.get("make", {}).get("confidence", 0)
+        model_conf = detected_vehicle.get("model", {}).get("confidence", 0)
+        
+        return JSONResponse(content={
+            "user_provided": {
+                "make": make,
+                "model": model,
+                "year": year,
+                "trim": trim
+            },
+            "gemini_vision_detected": {
+                "make": detected_make,
+                "model": detected_model,
+                "year": detected_year,
+                "trim": detected_trim,
+                "confidence": {
+                    "make": make_conf,
+                    "model": model_conf
                 }
-            }, status_code=200)
-            
+            },
+            "raw_gemini_response": analysis_json,
+            "match": {
+                "make_matches": (make or "").lower() == (detected_make or "").lower(),
+                "model_matches": (model or "").lower() == (detected_model or "").lower(),
+                "warning": "MISMATCH DETECTED" if ((make or "").lower() != (detected_make or "").lower() or (model or "").lower() != (detected_model or "").lower()) else "MATCH"
+            }
+        }, status_code=200)
+        
     except Exception as e:
         logger.error(f"Debug analysis failed: {e}", exc_info=True)
         return JSONResponse(content={
@@ -2240,11 +2407,13 @@ async def real_analyze_car(
     price: Optional[str] = Form(None),
     lowestPrice: Optional[str] = Form(None),
     titleStatus: Optional[str] = Form(None),
-    aboutVehicle: Optional[str] = Form(None)
+    aboutVehicle: Optional[str] = Form(None),
+    request: Request = None
 ):
     """
     REAL image analysis endpoint that calls OpenAI Vision API
     """
+    admission = await _admit_ai_request(request, estimate_cost(vision_images=1, prompt_chars=len(aboutVehicle or "")))
     try:
         logger.info(f"REAL: Image analysis request received for {len(images)} images")
         
@@ -2280,6 +2449,9 @@ async def real_analyze_car(
     except Exception as e:
         logger.error(f"REAL: Image analysis failed: {e}")
         raise HTTPException(status_code=500, detail=f"Analysis failed: {str(e)}")
+    finally:
+        if admission is not None:
+            admission.release()
 
 @router.post("/enhanced-analyze-with-rag")
 async def enhanced_analyze_with_rag(
@@ -2292,7 +2464,8 @@ async def enhanced_analyze_with_rag(
     price: Optional[str] = Form(None),
     lowestPrice: Optional[str] = Form(None),
     titleStatus: Optional[str] = Form(None),
-    aboutVehicle: Optional[str] = Form(None)
+    aboutVehicle: Optional[str] = Form(None),
+    request: Request = None
 ):
     """
     Enhanced analysis with RAG and Tool Use patterns
@@ -2300,6 +2473,7 @@ async def enhanced_analyze_with_rag(
     - Successful listings database (RAG)
     - OpenAI Vision API analysis
     """
+    admission = await _admit_ai_request(request, estimate_cost(vision_images=1, prompt_chars=len(aboutVehicle or "")))
     try:
         logger.info(f"ENHANCED: RAG + Tool Use analysis request received for {len(images)} images")
         
@@ -2354,8 +2528,9 @@ async def enhanced_analyze_with_rag(
         from app.services.market_data_service import MarketDataService
         market_service = MarketDataService()
         
-        market_data = market_service.get_market_comparison(detected_make, detected_model, year_int, mileage_int)
-        demo_market_data = market_service.get_demo_market_data(detected_make, detected_model, year_int, mileage_int)
+        # Simulated provider calls sleep synchronously - keep them off the event loop
+        market_data = await run_blocking(market_service.get_market_comparison, detected_make, detected_model, year_int, mileage_int)
+        demo_market_data = await run_blocking(market_service.get_demo_market_data, detected_make, detected_model, year_int, mileage_int)
         
         # Combine all results
         enhanced_result = {
@@ -2383,6 +2558,9 @@ async def enhanced_analyze_with_rag(
     except Exception as e:
         logger.error(f"ENHANCED: RAG + Tool Use analysis failed: {e}")
         raise HTTPException(status_code=500, detail=f"Enhanced analysis failed: {str(e)}")
+    finally:
+        if admission is not None:
+            admission.release()
 
 @router.post("/mock-post")
 async def mock_post_to_platforms(
@@ -2396,8 +2574,7 @@ async def mock_post_to_platforms(
         logger.info(f"DEMO: Mock posting request received for platforms: {platforms}")
         
         # Simulate posting delay
-        import time
-        time.sleep(1)
+        await asyncio.sleep(1)
         
         # Generate mock posting results
         posting_results = []
@@ -8,12 +8,17 @@ from sqlalchemy.orm import Session
 import csv
 import io
 import json
+import logging
 from datetime import datetime
 import uuid
 
 from ...core.database import get_sync_db as get_db
 from ...models.inventory import InventoryItem
 from ...services.car_listing_generator import CarListingGenerator
+from ...services import bulk_listing_jobs
+from ...utils.batch_valuation import value_batch
+
+logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
@@ -193,10 +198,16 @@ async def generate_listing_for_item(
 async def bulk_generate_listings(
     dealer_id: str,
     item_ids: Optional[List[str]] = None,
+    location: str = "United States",
+    background: bool = False,
     db: Session = Depends(get_db)
 ):
     """
     Generate AI listings for multiple inventory items
+    
+    Items are generated concurrently (bounded, with per-provider rate limits and
+    retries) and committed in batches. With ``background=true`` the run is queued
+    as a resumable job; poll ``/inventory/bulk-jobs/{job_id}`` for progress.
     """
     try:
         # Get inventory items
@@ -213,52 +224,20 @@ async def bulk_generate_listings(
                 "message": "No active inventory items found"
             }
         
-        # Generate listings for each item
-        listing_generator = CarListingGenerator()
-        results = []
-        
-        for item in items:
-            try:
-                car_details = {
-                    "vin": item.vin,
-                    "year": item.year,
-                    "make": item.make,
-                    "model": item.model,
-                    "mileage": item.mileage,
-                    "price": item.price,
-                    "title_status": item.title_status,
-                    "description": item.description
-                }
-                
-                listing_result = await listing_generator.generate_car_listing(
-                    images=[],
-                    car_details=car_details,
-                    location="United States"
-                )
-                
-                # Update item
-                item.ai_generated_listing = json.dumps(listing_result)
-                item.listing_generated_at = datetime.utcnow()
-                
-                results.append({
-                    "item_id": item.id,
-                    "vin": item.vin,
-                    "make": item.make,
-                    "model": item.model,
-                    "success": True
-                })
-                
-            except Exception as e:
-                results.append({
-                    "item_id": item.id,
-                    "vin": item.vin,
-                    "make": item.make,
-                    "model": item.model,
-                    "success": False,
-                    "error": str(e)
-                })
+        if background:
+            job_id = await bulk_listing_jobs.create_job(dealer_id, [item.id for item in items], location)
+            runner = await bulk_listing_jobs.enqueue_job(job_id)
+            logger.info("[BULK-LISTINGS] Queued job %s (%s items, runner: %s)", job_id, len(items), runner)
+            return {
+                "success": True,
+                "job_id": job_id,
+                "status": "queued",
+                "total_items": len(items),
+                "status_url": f"/api/v1/inventory/bulk-jobs/{job_id}"
+            }
         
-        db.commit()
+        snapshots = [bulk_listing_jobs.snapshot_item(item) for item in items]
+        results = [result.to_dict() for result in await bulk_listing_jobs.generate_listings(snapshots, location)]
         
         successful = len([r for r in results if r.get('success')])
         failed = len(results) - successful
@@ -272,10 +251,109 @@ async def bulk_generate_listings(
             "message": f"Generated listings for {successful} out of {len(items)} items"
         }
         
+    except bulk_listing_jobs.JobStoreUnavailable as unavailable:
+        raise HTTPException(status_code=503, detail=f"{unavailable}; retry without background=true")
     except Exception as e:
         db.rollback()
         raise HTTPException(status_code=500, detail=f"Error bulk generating listings: {str(e)}")
 
+@router.get("/inventory/bulk-jobs/{job_id}")
+async def get_bulk_listing_job(job_id: str):
+    """
+    Progress of a background bulk listing job, with the items that failed
+    """
+    try:
+        job = await bulk_listing_jobs.get_job(job_id)
+    except bulk_listing_jobs.JobStoreUnavailable as unavailable:
+        raise HTTPException(status_code=503, detail=str(unavailable))
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found or expired")
+    return job
+
+@router.post("/inventory/bulk-jobs/{job_id}/resume")
+async def resume_bulk_listing_job(job_id: str):
+    """
+    Resume a stopped bulk listing job: items already generated are skipped and
+    failed items are retried
+    """
+    try:
+        if await bulk_listing_jobs.get_job(job_id) is None:
+            raise HTTPException(status_code=404, detail="Job not found or expired")
+        if not await bulk_listing_jobs.prepare_resume(job_id):
+            raise HTTPException(status_code=409, detail="Job is still running")
+    except bulk_listing_jobs.JobStoreUnavailable as unavailable:
+        raise HTTPException(status_code=503, detail=str(unavailable))
+    
+    runner = await bulk_listing_jobs.enqueue_job(job_id)
+    logger.info("[BULK-LISTINGS] Resumed job %s (runner: %s)", job_id, runner)
+    return {
+        "job_id": job_id,
+        "status": "queued",
+        "status_url": f"/api/v1/inventory/bulk-jobs/{job_id}"
+    }
+
+@router.post("/inventory/{dealer_id}/revalue")
+async def revalue_inventory(
+    dealer_id: str,
+    location: Optional[str] = None,
+    status: str = "active",
+    db: Session = Depends(get_db)
+):
+    """
+    Revalue a dealer's inventory in one batch with the shared pricing rules
+    (depreciation, trim, mileage, title and regional adjustments)
+    """
+    try:
+        rows = db.query(
+            InventoryItem.id,
+            InventoryItem.vin,
+            InventoryItem.year,
+            InventoryItem.make,
+            InventoryItem.model,
+            InventoryItem.mileage,
+            InventoryItem.price,
+            InventoryItem.title_status,
+        ).filter(InventoryItem.dealer_id == dealer_id, InventoryItem.status == status).all()
+        
+        if not rows:
+            return {
+                "success": False,
+                "message": "No inventory items found"
+            }
+        
+        valuation = value_batch({
+            "year": [row.year for row in rows],
+            "make": [row.make for row in rows],
+            "model": [row.model for row in rows],
+            "mileage": [row.mileage for row in rows],
+            "title_status": [row.title_status for row in rows],
+            "location": [location] * len(rows),
+        })
+        
+        results = []
+        for row, values in zip(rows, valuation.to_records()):
+            results.append({
+                "item_id": row.id,
+                "vin": row.vin,
+                "year": row.year,
+                "make": row.make,
+                "model": row.model,
+                "price": row.price,
+                **values,
+                "price_difference": round(values["estimated_value"] - (row.price or 0)),
+            })
+        
+        return {
+            "success": True,
+            "total_items": len(results),
+            "total_estimated_value": round(float(valuation.value.sum())),
+            "total_asking_price": round(sum(row.price or 0 for row in rows)),
+            "results": results
+        }
+        
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error revaluing inventory: {str(e)}")
+
 @router.get("/inventory/{item_id}")
 async def get_inventory_item(
     item_id: str,
@@ -14,6 +14,8 @@ from typing import List, Optional, Dict, Any
 from datetime import datetime
 import logging
 from app.agents import MarketIntelligenceAgent
+from app.agents.market_intelligence_agent import GROUNDING_SEARCH_FLIGHT
+from app.services.cache import cache_stats
 from app.core.database import get_sync_db
 from sqlalchemy.orm import Session
 from app.utils.auth import get_current_user
@@ -27,6 +29,7 @@ class MarketIntelligenceRequest(BaseModel):
     make: str = Field(..., description="Car make")
     model: str = Field(..., description="Car model")
     year: Optional[int] = Field(None, description="Car year")
+    trim: Optional[str] = Field(None, description="Car trim level")
     mileage: Optional[int] = Field(None, description="Car mileage")
     location: str = Field("United States", description="Location for analysis")
     radius_miles: int = Field(50, description="Search radius in miles")
@@ -87,6 +90,7 @@ async def analyze_market_intelligence(
             "make": request.make,
             "model": request.model,
             "year": request.year,
+            "trim": request.trim,
             "mileage": request.mileage,
             "location": request.location,
             "radius_miles": request.radius_miles,
@@ -119,6 +123,19 @@ async def analyze_market_intelligence(
         logger.error(f"Market intelligence analysis exception: {error_msg}", exc_info=True)
         raise HTTPException(status_code=500, detail=f"Market intelligence analysis failed: {error_msg}")
 
+@router.get("/market-intelligence/cache-stats")
+async def get_cache_stats(current_user: dict = Depends(get_current_user)):
+    """
+    Get market intelligence cache and request-coalescing counters.
+    
+    Returns per-layer hit, miss and eviction counts for the in-process LRU and Redis,
+    plus how many Gemini grounding searches were coalesced.
+    """
+    return {
+        "cache": cache_stats(),
+        "grounding_single_flight": GROUNDING_SEARCH_FLIGHT.get_stats()
+    }
+
 @router.get("/market-intelligence/makes")
 async def get_popular_makes(current_user: dict = Depends(get_current_user)):
     """
@@ -1,17 +1,20 @@
 """
 Search History API - Track and retrieve market search history
+
+Searches are persisted by app.services.search_history_store. GET / returns one
+page, newest first; when there are more, the ``X-Next-Cursor`` response header
+holds the cursor for the next page (pass it back as ``?cursor=``).
 """
 
-from fastapi import APIRouter, HTTPException, Depends, Query
+from fastapi import APIRouter, HTTPException, Depends, Query, Response
 from pydantic import BaseModel
 from typing import List, Dict, Any, Optional
 import logging
 from datetime import datetime
-import json
 
+from app.core.config import settings
 from app.core.security import get_current_user
-from app.core.database import get_db
-from sqlalchemy.orm import Session
+from app.services.search_history_store import InvalidCursor, search_history_store
 
 logger = logging.getLogger(__name__)
 
@@ -41,10 +44,10 @@ class SearchHistoryItem(BaseModel):
     summary: Dict[str, Any]
     timestamp: datetime
     user_id: Optional[str] = None
+    resultCount: Optional[int] = None  # results found; ``results`` holds compact summaries of the first few
 
 
-# In-memory storage for demo purposes (replace with database in production)
-search_history_storage = []
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
 
 
 @router.post("/", response_model=SearchHistoryResponse)
@@ -55,34 +58,21 @@ async def save_search_history(
     Save a market search to history
     """
     try:
-        logger.info(f"Saving search history: {request.searchTerm}")
-        
-        # Generate a simple ID
-        search_id = f"search_{len(search_history_storage) + 1}_{int(datetime.now().timestamp())}"
-        
-        # Create search history item
-        history_item = {
-            "id": search_id,
-            "searchTerm": request.searchTerm,
-            "location": request.location,
-            "radius": request.radius,
-            "results": request.results,
-            "summary": request.summary,
-            "timestamp": datetime.now(),
-            "user_id": None  # No auth for demo
-        }
-        
-        # Store in memory (replace with database in production)
-        search_history_storage.append(history_item)
-        
-        # Keep only last 100 searches to prevent memory issues
-        if len(search_history_storage) > 100:
-            search_history_storage.pop(0)
+        logger.info("Saving search history: %s", request.searchTerm)
+        
+        entry = await search_history_store.add(
+            search_term=request.searchTerm,
+            location=request.location,
+            radius=request.radius,
+            results=request.results,
+            summary=request.summary,
+            user_id=None  # No auth for demo
+        )
         
         return SearchHistoryResponse(
             success=True,
             message="Search saved to history successfully",
-            search_id=search_id
+            search_id=entry["id"]
         )
         
     except Exception as e:
@@ -95,39 +85,25 @@ async def save_search_history(
 
 @router.get("/", response_model=List[SearchHistoryItem])
 async def get_search_history(
-    limit: int = Query(20, description="Number of searches to return")
+    response: Response,
+    limit: int = Query(20, ge=1, le=settings.SEARCH_HISTORY_PAGE_MAX, description="Number of searches to return"),
+    cursor: Optional[str] = Query(None, description="X-Next-Cursor from the previous page")
 ):
     """
-    Get search history for the current user
+    Get search history for the current user, newest first
     """
     try:
         logger.info("Retrieving search history")
         
-        # For demo purposes, return all searches
-        user_searches = search_history_storage
-        
-        # Sort by timestamp (newest first)
-        user_searches.sort(key=lambda x: x["timestamp"], reverse=True)
+        # For demo purposes, searches are saved without a user
+        entries, next_cursor = await search_history_store.page(None, limit=limit, cursor=cursor)
+        if next_cursor:
+            response.headers[NEXT_CURSOR_HEADER] = next_cursor
         
-        # Limit results
-        user_searches = user_searches[:limit]
-        
-        # Convert to response format
-        history_items = []
-        for search in user_searches:
-            history_items.append(SearchHistoryItem(
-                id=search["id"],
-                searchTerm=search["searchTerm"],
-                location=search["location"],
-                radius=search["radius"],
-                results=search["results"],
-                summary=search["summary"],
-                timestamp=search["timestamp"],
-                user_id=search.get("user_id")
-            ))
-        
-        return history_items
+        return [SearchHistoryItem(**entry) for entry in entries]
         
+    except InvalidCursor as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         logger.error(f"Failed to get search history: {str(e)}")
         raise HTTPException(
@@ -139,8 +115,7 @@ async def get_search_history(
 @router.get("/{search_id}", response_model=SearchHistoryItem)
 async def get_search_by_id(
     search_id: str,
-    current_user: dict = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user: dict = Depends(get_current_user)
 ):
     """
     Get a specific search by ID
@@ -148,8 +123,7 @@ async def get_search_by_id(
     try:
         logger.info(f"Retrieving search by ID: {search_id}")
         
-        # Find the search
-        search = next((s for s in search_history_storage if s["id"] == search_id), None)
+        search = await search_history_store.get(search_id)
         
         if not search:
             raise HTTPException(
@@ -165,16 +139,7 @@ async def get_search_by_id(
                 detail="Access denied to this search"
             )
         
-        return SearchHistoryItem(
-            id=search["id"],
-            searchTerm=search["searchTerm"],
-            location=search["location"],
-            radius=search["radius"],
-            results=search["results"],
-            summary=search["summary"],
-            timestamp=search["timestamp"],
-            user_id=search.get("user_id")
-        )
+        return SearchHistoryItem(**search)
         
     except HTTPException:
         raise
@@ -189,8 +154,7 @@ async def get_search_by_id(
 @router.delete("/{search_id}", response_model=SearchHistoryResponse)
 async def delete_search(
     search_id: str,
-    current_user: dict = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user: dict = Depends(get_current_user)
 ):
     """
     Delete a search from history
@@ -198,10 +162,9 @@ async def delete_search(
     try:
         logger.info(f"Deleting search: {search_id}")
         
-        # Find the search
-        search_index = next((i for i, s in enumerate(search_history_storage) if s["id"] == search_id), None)
+        search = await search_history_store.get(search_id)
         
-        if search_index is None:
+        if search is None:
             raise HTTPException(
                 status_code=404,
                 detail="Search not found"
@@ -209,15 +172,13 @@ async def delete_search(
         
         # Check if user has access to this search
         user_id = current_user.get("user_id") if current_user else None
-        search = search_history_storage[search_index]
         if user_id and search.get("user_id") != user_id:
             raise HTTPException(
                 status_code=403,
                 detail="Access denied to this search"
             )
         
-        # Remove the search
-        search_history_storage.pop(search_index)
+        await search_history_store.delete(search_id)
         
         return SearchHistoryResponse(
             success=True,
@@ -9,6 +9,7 @@ from typing import Optional, Dict, Any
 import logging
 import openai
 from app.core.config import settings
+from app.services.async_adapters import async_openai_client
 from pydantic import BaseModel
 
 logger = logging.getLogger(__name__)
@@ -40,8 +41,8 @@ async def transcribe_audio(
                 detail="OpenAI API key is not configured. Please set OPENAI_API_KEY environment variable."
             )
         
-        # Initialize OpenAI client
-        client = openai.OpenAI(api_key=settings.OPENAI_API_KEY)
+        # Async OpenAI client - a slow Whisper upload must not block other requests
+        client = async_openai_client()
         
         # Read audio file
         audio_content = await audio.read()
@@ -72,7 +73,7 @@ async def transcribe_audio(
         audio_file.name = audio.filename or "audio.webm"
         
         # Call Whisper API
-        transcription = client.audio.transcriptions.create(
+        transcription = await client.audio.transcriptions.create(
             model="whisper-1",
             file=audio_file,
             language="en",  # Optional: specify language for better accuracy
@@ -145,7 +146,7 @@ async def parse_transcript(
                 detail="OpenAI API key is not configured"
             )
         
-        client = openai.OpenAI(api_key=settings.OPENAI_API_KEY)
+        client = async_openai_client()
         
         # Build prompt for structured extraction
         current_info = ""
@@ -213,7 +214,7 @@ Example response:
 
 Return ONLY valid JSON, no other text."""
 
-        response = client.chat.completions.create(
+        response = await client.chat.completions.create(
             model="gpt-4o-mini",  # Using mini for cost efficiency
             messages=[
                 {"role": "system", "content": "You are a vehicle data extraction assistant. Extract structured data from spoken vehicle descriptions. Return only valid JSON."},
@@ -6,10 +6,12 @@ into final polished output using OpenAI synthesis.
 """
 
 from fastapi import APIRouter, HTTPException, Depends
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel, Field
-from typing import Any, Dict, Optional
+from typing import Any, AsyncIterator, Dict, Optional
+import json
 import logging
-from app.agents.synthesis_agent import synthesize
+from app.agents.synthesis_agent import synthesize, synthesize_stream
 from app.utils.auth import get_current_user
 
 logger = logging.getLogger(__name__)
@@ -71,3 +73,46 @@ async def compose(
         logger.error(f"Synthesis exception: {error_msg}", exc_info=True)
         raise HTTPException(status_code=500, detail=f"Synthesis failed: {error_msg}")
 
+
+def _sse(event: str, data: Dict[str, Any]) -> str:
+    return f"event: {event}\ndata: {json.dumps(data, default=str)}\n\n"
+
+
+@router.post("/synthesis/compose/stream")
+async def compose_stream(
+    request: SynthesisRequest,
+    current_user: dict = Depends(get_current_user)
+):
+    """
+    Streaming variant of /synthesis/compose (Server-Sent Events).
+    
+    Events:
+    - delta: {"field": "listing_text" | "summary_md", "text": "..."} as tokens arrive
+    - result: the same payload /synthesis/compose returns in ``data``
+    - error: {"error": "..."} if synthesis fails mid-stream
+    """
+    user_email = current_user.get("email", "unknown")
+    logger.info(f"Streaming synthesis request from: {user_email}")
+    
+    async def event_stream() -> AsyncIterator[str]:
+        try:
+            async for event in synthesize_stream(
+                vision_json=request.vision_json,
+                market_json=request.market_json,
+                user_meta=request.user_meta
+            ):
+                if event["type"] == "delta":
+                    yield _sse("delta", {"field": event["field"], "text": event["text"]})
+                else:
+                    yield _sse("result", event["data"])
+        except Exception as e:
+            # Headers are already sent, so errors are reported in-band
+            error_msg = str(e) if str(e) else f"Unknown error: {type(e).__name__}"
+            logger.error(f"Streaming synthesis failed: {error_msg}")
+            yield _sse("error", {"error": error_msg})
+    
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
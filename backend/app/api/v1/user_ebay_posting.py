@@ -188,7 +188,7 @@ async def test_ebay_connection(
         auth_token = decrypt_token(connection.access_token)
         
         # Test the connection by getting user info (GetUser API call)
-        import aiohttp
+        from app.services.http_clients import http_clients
         import xml.etree.ElementTree as ET
         
         # Build XML request for GetUser API
@@ -213,7 +213,7 @@ async def test_ebay_connection(
             "Content-Type": "text/xml"
         }
         
-        async with aiohttp.ClientSession() as session:
+        async with http_clients.aiohttp_session("ebay") as session:
             async with session.post(api_url, headers=headers, data=xml_request) as response:
                 if response.status == 200:
                     xml_response = await response.text()
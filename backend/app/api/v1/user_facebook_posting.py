@@ -525,8 +525,8 @@ async def test_facebook_connection(
         access_token = decrypt_token(connection.access_token)
         
         # Test the connection by getting user info
-        import aiohttp
-        async with aiohttp.ClientSession() as session:
+        from app.services.http_clients import http_clients
+        async with http_clients.aiohttp_session("facebook") as session:
             url = "https://graph.facebook.com/v18.0/me"
             params = {
                 "access_token": access_token,
@@ -9,6 +9,7 @@ from datetime import datetime
 import re
 
 from app.core.supabase_config import get_supabase
+from app.services.async_adapters import supabase_execute
 
 router = APIRouter()
 
@@ -50,7 +51,7 @@ async def get_user_presets(
         
         query = query.order("usage_count", desc=True).limit(limit)
         
-        result = query.execute()
+        result = await supabase_execute(query)
         
         return result.data if result.data else []
         
@@ -73,30 +74,30 @@ async def create_or_update_preset(
         supabase = get_supabase()
         
         # Check if preset already exists
-        existing = supabase.table("user_presets").select("*").eq(
+        existing = await supabase_execute(supabase.table("user_presets").select("*").eq(
             "user_id", user_id
         ).eq("preset_type", preset.preset_type).eq(
             "preset_value", preset.preset_value
-        ).execute()
+        ))
         
         if existing.data and len(existing.data) > 0:
             # Update existing preset (increment usage)
-            updated = supabase.table("user_presets").update({
+            updated = await supabase_execute(supabase.table("user_presets").update({
                 "usage_count": existing.data[0]["usage_count"] + 1,
                 "last_used_at": datetime.utcnow().isoformat(),
                 "updated_at": datetime.utcnow().isoformat()
-            }).eq("id", existing.data[0]["id"]).execute()
+            }).eq("id", existing.data[0]["id"]))
             
             return updated.data[0] if updated.data else existing.data[0]
         else:
             # Create new preset
-            new_preset = supabase.table("user_presets").insert({
+            new_preset = await supabase_execute(supabase.table("user_presets").insert({
                 "user_id": user_id,
                 "preset_type": preset.preset_type,
                 "preset_value": preset.preset_value,
                 "usage_count": 1,
                 "last_used_at": datetime.utcnow().isoformat()
-            }).execute()
+            }))
             
             return new_preset.data[0] if new_preset.data else None
             
@@ -160,28 +161,28 @@ async def extract_and_save_presets(
         for phrase in extracted_phrases:
             try:
                 # Check if exists
-                existing = supabase.table("user_presets").select("*").eq(
+                existing = await supabase_execute(supabase.table("user_presets").select("*").eq(
                     "user_id", user_id
                 ).eq("preset_type", "description_phrase").eq(
                     "preset_value", phrase
-                ).execute()
+                ))
                 
                 if existing.data and len(existing.data) > 0:
                     # Increment usage
-                    supabase.table("user_presets").update({
+                    await supabase_execute(supabase.table("user_presets").update({
                         "usage_count": existing.data[0]["usage_count"] + 1,
                         "last_used_at": datetime.utcnow().isoformat(),
                         "updated_at": datetime.utcnow().isoformat()
-                    }).eq("id", existing.data[0]["id"]).execute()
+                    }).eq("id", existing.data[0]["id"]))
                 else:
                     # Create new
-                    supabase.table("user_presets").insert({
+                    await supabase_execute(supabase.table("user_presets").insert({
                         "user_id": user_id,
                         "preset_type": "description_phrase",
                         "preset_value": phrase,
                         "usage_count": 1,
                         "last_used_at": datetime.utcnow().isoformat()
-                    }).execute()
+                    }))
                 
                 saved_count += 1
             except Exception as e:
@@ -213,15 +214,15 @@ async def delete_preset(
         supabase = get_supabase()
         
         # Verify preset belongs to user
-        preset = supabase.table("user_presets").select("*").eq(
+        preset = await supabase_execute(supabase.table("user_presets").select("*").eq(
             "id", preset_id
-        ).eq("user_id", user_id).execute()
+        ).eq("user_id", user_id))
         
         if not preset.data or len(preset.data) == 0:
             raise HTTPException(status_code=404, detail="Preset not found")
         
         # Delete
-        supabase.table("user_presets").delete().eq("id", preset_id).execute()
+        await supabase_execute(supabase.table("user_presets").delete().eq("id", preset_id))
         
         return {"message": "Preset deleted successfully"}
         
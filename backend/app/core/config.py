@@ -1,5 +1,5 @@
 from pydantic_settings import BaseSettings
-from typing import List, Optional
+from typing import Dict, List, Optional
 import os
 
 
@@ -43,6 +43,14 @@ class Settings(BaseSettings):
     RATE_LIMIT_AUTH: int = 5
     RATE_LIMIT_UPLOAD: int = 10
     RATE_LIMIT_CHAT: int = 20
+    RATE_LIMIT_PER_HOUR: int = 1000
+    RATE_LIMIT_BACKEND: str = "auto"  # "memory", "redis" or "auto"
+    RATE_LIMIT_MAX_KEYS: int = 100_000  # per-process counter bound (memory backend)
+    RATE_LIMIT_TIER_MULTIPLIERS: Dict[str, float] = {
+        "anonymous": 1.0,
+        "authenticated": 2.0,
+        "pro": 5.0,
+    }
     
     # Redis Configuration (optional)
     REDIS_HOST: str = ""
@@ -98,6 +106,103 @@ class Settings(BaseSettings):
     FACEBOOK_REDIRECT_URI: Optional[str] = None
     TOKEN_ENCRYPTION_KEY: Optional[str] = None
     
+    # Image preprocessing before vision API calls
+    IMAGE_PREPROCESSING_ENABLED: bool = True
+    IMAGE_MAX_EDGE: int = 1600
+    IMAGE_OUTPUT_FORMAT: str = "JPEG"  # JPEG or WEBP
+    IMAGE_QUALITY: int = 82
+    IMAGE_PREPROCESS_WORKERS: int = 0  # 0 = min(4, cpu count)
+    IMAGE_DEDUP_MAX_DISTANCE: int = 4  # pHash/dHash bits; -1 disables near-duplicate collapse
+    VISION_CACHE_TTL_SEC: int = 7 * 24 * 3600  # 0 disables the vision result cache
+    VISION_MAX_IMAGES: int = 10  # key photos sent to the vision model per listing; 0 = all
+    IMAGE_SELECTOR_MODEL_PATH: Optional[str] = None  # optional ONNX photo classifier
+    
+    # Blocking SDK calls and event loop health
+    BLOCKING_IO_WORKERS: int = 32  # default pool size for run_blocking()
+    LOOP_LAG_MONITOR_ENABLED: bool = True
+    LOOP_LAG_WARN_MS: int = 250
+    
+    # Queued /enhanced-analyze jobs (Celery + Redis)
+    ANALYSIS_JOB_TTL_SEC: int = 24 * 3600
+    ANALYSIS_JOBS_INLINE: bool = False  # run jobs in the API process instead of Celery (local dev)
+    
+    # Cost-weighted quotas for AI endpoints (1 unit ~ one 1k-token completion)
+    AI_COST_WEIGHTS: Dict[str, float] = {
+        "vision_image": 2,
+        "llm_call": 1,
+        "grounding_call": 3,
+        "tokens_per_unit": 1000,
+    }
+    AI_QUOTA_USER_UNITS_PER_HOUR: int = 300
+    AI_QUOTA_GLOBAL_UNITS_PER_MINUTE: int = 600
+    AI_QUOTA_ANONYMOUS_SHARE: float = 0.5  # fraction of the global budget anonymous clients may use together
+    AI_QUOTA_MAX_WAIT_SEC: float = 20.0  # how long a request may queue for global capacity
+    AI_QUOTA_MAX_QUEUE: int = 100  # waiting requests per process before shedding with 503
+    AI_MAX_CONCURRENT: int = 16  # concurrent AI requests per process
+    
+    # Scrapy spiders hosted in-process (falls back to `scrapy crawl` subprocesses)
+    CRAWLER_IN_PROCESS: bool = True
+    CRAWLER_MAX_CONCURRENT: int = 8
+    CRAWLER_TIMEOUT_SEC: float = 60.0
+    
+    # /deals/discover fan-out
+    DEALS_SOURCE_TIMEOUT_SEC: float = 8.0  # per-source deadline; slower sources are reported as partial
+    DEALS_SOURCE_TIMEOUTS: Dict[str, float] = {}  # per-source overrides, e.g. {"google_search": 5}
+    
+    # Local Parquet store of scraped listings for comps (needs pyarrow)
+    LISTINGS_STORE_ENABLED: bool = True
+    LISTINGS_STORE_PATH: Optional[str] = None  # default: backend/data/listings
+    LISTINGS_STORE_FLUSH_ROWS: int = 200  # buffered listings before a background write
+    LISTINGS_STORE_COMPACT_FILES: int = 16  # files per partition before compaction
+    LISTINGS_STORE_RETENTION_DAYS: float = 90
+    LISTINGS_STORE_MILEAGE_BAND: int = 25000  # default +/- miles for comp queries
+    LISTINGS_STORE_MIN_COMPS: int = 3  # fewer local comps than this falls back to the old path
+    
+    # Bulk AI listing generation for dealer inventory
+    BULK_LISTING_CONCURRENCY: int = 8  # items generated in parallel per run
+    BULK_LISTING_COMMIT_BATCH: int = 10  # finished listings per DB commit / progress checkpoint
+    BULK_LISTING_MAX_ATTEMPTS: int = 3
+    BULK_LISTING_RETRY_BASE_SEC: float = 2.0
+    BULK_LISTING_RETRY_MAX_SEC: float = 30.0
+    BULK_LISTING_ITEM_TIMEOUT_SEC: float = 120.0
+    BULK_LISTING_PROVIDER_RPM: Dict[str, int] = {"openai": 60, "gemini": 60}  # shared across workers; 0 = unlimited
+    BULK_LISTING_JOB_TTL_SEC: int = 7 * 24 * 3600
+    BULK_LISTING_JOBS_INLINE: bool = False  # run background jobs in the API process instead of Celery
+    
+    # Search history (app.services.search_history_store)
+    SEARCH_HISTORY_TTL_DAYS: int = 90  # 0 disables pruning
+    SEARCH_HISTORY_PRUNE_INTERVAL_SEC: int = 3600
+    SEARCH_HISTORY_MAX_RESULTS: int = 20  # result summaries kept per saved search
+    SEARCH_HISTORY_PAGE_MAX: int = 100
+    
+    # Logging (app.core.logging_config)
+    LOG_LEVEL: str = "INFO"  # DEBUG=true forces DEBUG
+    LOG_FORMAT: str = "json"  # json (Cloud Logging structured entries) | text
+    LOG_QUEUE_SIZE: int = 10000  # records beyond this are dropped, never block a request
+    LOG_DEBUG_SAMPLE_RATE: float = 0.05  # share of verbose payload dumps (log_payload) kept at DEBUG
+    LOG_PAYLOAD_MAX_CHARS: int = 500
+    
+    # Agent instrumentation (/metrics, /health/agents)
+    AGENT_METRICS_ENABLED: bool = True
+    AGENT_TRACE_EXPORT: str = "none"  # none | file (JSON lines) | otel (needs opentelemetry-sdk)
+    AGENT_TRACE_FILE: Optional[str] = None  # default: backend/data/agent_traces.jsonl
+    
+    # AIBrain deal pipeline
+    AI_BRAIN_CONCURRENT: bool = True  # run independent agents concurrently, partial results on failure
+    AI_BRAIN_DEAL_DEADLINE_SEC: float = 30.0
+    AGENT_PERFORMANCE_ENABLED: bool = True  # persist per-agent timings to agent_performance
+    AGENT_PERFORMANCE_FLUSH_SEC: float = 60.0
+    
+    # POST /deals/score-batch
+    BATCH_SCORING_MAX_ROWS: int = 100000
+    
+    # Per-stage deadlines (seconds) for CarListingGenerator; a late stage falls back to its basic version
+    CAR_LISTING_STAGE_TIMEOUTS: Dict[str, float] = {
+        "image_analysis": 45.0,
+        "market_analysis": 35.0,
+        "formatted_listings": 35.0,
+    }
+    
     # AI Reply Settings
     MIN_REPLY_DELAY_MINUTES: int = 1
     MAX_REPLY_DELAY_MINUTES: int = 30
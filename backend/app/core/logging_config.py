@@ -0,0 +1,236 @@
+"""
+Structured, low-overhead logging.
+
+``configure_logging()`` (called once from ``app.main``) sends every record
+through a ``QueueHandler``. A background ``QueueListener`` thread does the
+formatting and the stdout write, so a log call on the request path costs a
+level check, a ``LogRecord`` and a queue put. When the queue is full, records
+are dropped and counted instead of blocking the request.
+
+With ``LOG_FORMAT="json"`` each line is a Cloud Logging structured entry:
+severity, message, logger, source location, the request id bound by
+``request_context_middleware``, the current instrumentation span, and the
+Cloud Run trace when ``GOOGLE_CLOUD_PROJECT`` is set. Use ``extra={...}`` to
+add searchable fields.
+
+On hot paths:
+- pass values as %-args (``logger.debug("[TAG] %d prices for %s", n, query)``).
+  The string is only built if the record is emitted.
+- wrap long text in ``clip(text)``. It is truncated to ``LOG_PAYLOAD_MAX_CHARS``,
+  and only when formatted.
+- log verbose model outputs with ``log_payload(logger, msg, *args)``. These are
+  DEBUG records sampled at ``LOG_DEBUG_SAMPLE_RATE``.
+- guard multi-line debug dumps with ``if logger.isEnabledFor(logging.DEBUG):``.
+"""
+
+import atexit
+import contextvars
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import random
+import sys
+import uuid
+from datetime import datetime, timezone
+from typing import Any, Dict, Optional, Tuple
+
+from app.core.config import settings
+from app.services.instrumentation import current_span
+
+request_id_var: contextvars.ContextVar[Optional[str]] = contextvars.ContextVar("request_id", default=None)
+cloud_trace_var: contextvars.ContextVar[Optional[str]] = contextvars.ContextVar("cloud_trace", default=None)
+
+# Attributes every LogRecord has; anything else came in through ``extra``
+_RECORD_ATTRIBUTES = set(vars(logging.LogRecord("", 0, "", 0, "", (), None))) | {
+    "message", "asctime", "request_id", "cloud_trace", "trace_id", "span_id",
+}
+
+_listener: Optional[logging.handlers.QueueListener] = None
+_queue_handler: Optional["_NonBlockingQueueHandler"] = None
+
+
+def new_request_id() -> str:
+    return uuid.uuid4().hex
+
+
+def bind_request_context(request_id: str, cloud_trace: Optional[str] = None) -> Tuple[contextvars.Token, contextvars.Token]:
+    """Attach a request id (and Cloud Run trace id) to every record logged in this context."""
+    return request_id_var.set(request_id), cloud_trace_var.set(cloud_trace)
+
+
+def reset_request_context(tokens: Tuple[contextvars.Token, contextvars.Token]) -> None:
+    request_id_var.reset(tokens[0])
+    cloud_trace_var.reset(tokens[1])
+
+
+class clip:
+    """Lazily truncated text for log arguments (nothing is copied unless the record is formatted)."""
+
+    __slots__ = ("value", "limit")
+
+    def __init__(self, value: Any, limit: Optional[int] = None):
+        self.value = value
+        self.limit = limit or settings.LOG_PAYLOAD_MAX_CHARS
+
+    def __str__(self) -> str:
+        text = str(self.value)
+        if len(text) <= self.limit:
+            return text
+        return f"{text[:self.limit]}... (+{len(text) - self.limit} chars)"
+
+    __repr__ = __str__
+
+
+def log_payload(log: logging.Logger, msg: str, *args: Any, rate: Optional[float] = None) -> None:
+    """
+    DEBUG-log a verbose payload (model output, search results) for a sample of calls.
+
+    String arguments are clipped to ``LOG_PAYLOAD_MAX_CHARS``.
+
+    Args:
+        log: Logger to write to
+        msg: %-style message
+        rate: Fraction of calls to keep (default ``LOG_DEBUG_SAMPLE_RATE``)
+    """
+    if not log.isEnabledFor(logging.DEBUG):
+        return
+    rate = settings.LOG_DEBUG_SAMPLE_RATE if rate is None else rate
+    if rate < 1.0 and random.random() >= rate:
+        return
+    args = tuple(clip(arg) if isinstance(arg, str) else arg for arg in args)
+    log.debug(msg, *args, extra={"sample_rate": rate}, stacklevel=2)
+
+
+class RequestContextFilter(logging.Filter):
+    """Stamps records with the request id and span of the logging thread's context."""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        record.request_id = request_id_var.get()
+        record.cloud_trace = cloud_trace_var.get()
+        active = current_span()
+        record.trace_id = active.trace_id if active else None
+        record.span_id = active.span_id if active else None
+        return True
+
+
+class _NonBlockingQueueHandler(logging.handlers.QueueHandler):
+    """Hands records to the listener thread; drops (and counts) them if the queue is full."""
+
+    def __init__(self, log_queue: queue.Queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # Resolve the message now (args may change after the call), but leave the
+        # exception and JSON formatting to the listener thread
+        record.message = record.getMessage()
+        record.msg, record.args = record.message, None
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+class JsonFormatter(logging.Formatter):
+    """One Cloud Logging structured entry per line"""
+
+    def __init__(self, project: Optional[str] = None):
+        super().__init__()
+        self.project = project
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry: Dict[str, Any] = {
+            "severity": record.levelname,
+            "time": datetime.fromtimestamp(record.created, timezone.utc).isoformat(),
+            "message": record.getMessage(),
+            "logger": record.name,
+            "logging.googleapis.com/sourceLocation": {
+                "file": record.pathname,
+                "line": record.lineno,
+                "function": record.funcName,
+            },
+        }
+        request_id = getattr(record, "request_id", None)
+        if request_id:
+            entry["request_id"] = request_id
+            entry["logging.googleapis.com/labels"] = {"request_id": request_id}
+        cloud_trace = getattr(record, "cloud_trace", None)
+        if cloud_trace and self.project:
+            entry["logging.googleapis.com/trace"] = f"projects/{self.project}/traces/{cloud_trace}"
+        if getattr(record, "trace_id", None):
+            entry["trace_id"] = record.trace_id
+            entry["span_id"] = record.span_id
+        for name, value in vars(record).items():
+            if name not in _RECORD_ATTRIBUTES and not name.startswith("_"):
+                entry[name] = value
+        if record.exc_info:
+            entry["stack_trace"] = self.formatException(record.exc_info)
+        elif record.exc_text:
+            entry["stack_trace"] = record.exc_text
+        return json.dumps(entry, default=str, ensure_ascii=False)
+
+
+class TextFormatter(logging.Formatter):
+    """Human-readable lines for local development"""
+
+    def __init__(self):
+        super().__init__("%(asctime)s %(levelname)s %(name)s [%(request_id)s] %(message)s")
+
+    def format(self, record: logging.LogRecord) -> str:
+        if not getattr(record, "request_id", None):
+            record.request_id = "-"
+        return super().format(record)
+
+
+def configure_logging() -> None:
+    """Route all logging through the background queue (idempotent)."""
+    global _listener, _queue_handler
+    if _listener is not None:
+        return
+
+    level = logging.DEBUG if settings.DEBUG else getattr(logging, settings.LOG_LEVEL.upper(), logging.INFO)
+    stream = logging.StreamHandler(sys.stdout)
+    if settings.LOG_FORMAT == "json":
+        stream.setFormatter(JsonFormatter(project=os.getenv("GOOGLE_CLOUD_PROJECT")))
+    else:
+        stream.setFormatter(TextFormatter())
+
+    log_queue: queue.Queue = queue.Queue(maxsize=settings.LOG_QUEUE_SIZE)
+    _queue_handler = _NonBlockingQueueHandler(log_queue)
+    _queue_handler.addFilter(RequestContextFilter())
+    _listener = logging.handlers.QueueListener(log_queue, stream)
+    _listener.start()
+    atexit.register(shutdown_logging)
+
+    root = logging.getLogger()
+    root.handlers = [_queue_handler]
+    root.setLevel(level)
+    # Server loggers configured before the app was imported: send them through the same queue
+    for name in ("uvicorn", "uvicorn.error", "uvicorn.access"):
+        server_logger = logging.getLogger(name)
+        server_logger.handlers = []
+        server_logger.propagate = True
+
+
+def shutdown_logging() -> None:
+    """Write out queued records and stop the listener thread."""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+
+def logging_stats() -> Dict[str, Any]:
+    """Queue depth and records dropped because the queue was full."""
+    if _queue_handler is None:
+        return {"configured": False}
+    return {
+        "configured": True,
+        "queued": _queue_handler.queue.qsize(),
+        "dropped": _queue_handler.dropped,
+    }
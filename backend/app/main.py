@@ -9,16 +9,16 @@ from fastapi import FastAPI, Request, Response, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.middleware.trustedhost import TrustedHostMiddleware
 from fastapi.middleware.gzip import GZipMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, PlainTextResponse
 from slowapi import Limiter, _rate_limit_exceeded_handler
 from slowapi.util import get_remote_address
 from slowapi.errors import RateLimitExceeded
 import logging
-import asyncio
 import time
 from datetime import datetime
 
 from app.core.config import settings
+from app.core.logging_config import configure_logging, logging_stats, shutdown_logging
 from app.core.database import async_engine, Base
 from app.api.v1 import (
     auth as auth_router,
@@ -52,7 +52,15 @@ from app.api.v1.market_search import router as market_search_router
 from app.api.v1.market_search_real_scrape import router as market_search_real_scrape_router
 from app.api.v1.market_search_scrapingbee import router as market_search_scrapingbee_router
 from app.api.v1.market_search_scraping import router as market_search_scraping_router
-from app.middleware import rate_limit_middleware, cleanup_rate_limits
+from app.middleware import auth_context_middleware, rate_limit_middleware, request_context_middleware, REQUEST_ID_HEADER
+from app.services.http_clients import http_clients
+from app.services.async_adapters import loop_lag_monitor, shutdown_blocking_pools
+from app.services.ai_quota import ai_quota
+from app.services.crawler_service import crawler_service
+from app.services.listings_store import listings_store
+from app.services.agent_performance import agent_performance
+from app.services.search_history_store import search_history_store
+from app.services.instrumentation import metrics, shutdown_exporter
 from app.core.security import (
     SecurityConfig, 
     AuthenticationManager, 
@@ -63,8 +71,8 @@ from app.core.security import (
     SECURITY_HEADERS
 )
 
-# Configure logging
-logging.basicConfig(level=logging.INFO)
+# Configure logging (structured, written from a background thread)
+configure_logging()
 logger = logging.getLogger(__name__)
 
 # Rate limiting
@@ -76,18 +84,26 @@ async def lifespan(app: FastAPI):
     # Startup
     print("🚀 Starting Accorria...")
     
-    # Start rate limit cleanup task
-    cleanup_task = asyncio.create_task(cleanup_rate_limits())
+    # Shared outbound HTTP connection pools
+    await http_clients.startup()
+    
+    # Flag handlers that block the event loop
+    if settings.LOOP_LAG_MONITOR_ENABLED:
+        loop_lag_monitor.start()
     
     yield
     
     # Shutdown
     print("🛑 Shutting down Accorria...")
-    cleanup_task.cancel()
-    try:
-        await cleanup_task
-    except asyncio.CancelledError:
-        pass
+    
+    # Stop in-process spiders, then drain and close outbound connection pools
+    await crawler_service.stop()
+    await listings_store.flush()
+    await agent_performance.flush()
+    shutdown_exporter()
+    await http_clients.shutdown()
+    await shutdown_blocking_pools()
+    shutdown_logging()
 
 app = FastAPI(
     title="Accorria API",
@@ -116,15 +132,22 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["GET", "POST", "PUT", "DELETE", "OPTIONS", "PATCH"],
     allow_headers=["*"],
-    expose_headers=["X-Total-Count", "X-Rate-Limit-Remaining"]
+    expose_headers=["X-Total-Count", "X-Rate-Limit-Remaining", REQUEST_ID_HEADER, "X-Next-Cursor"]
 )
 
 # Security middleware stack (after CORS)
 app.add_middleware(TrustedHostMiddleware, allowed_hosts=settings.ALLOWED_HOSTS)
 app.add_middleware(GZipMiddleware, minimum_size=1000)
 
-# Rate limiting middleware (temporarily disabled for debugging)
-# app.middleware("http")(rate_limit_middleware)
+# Rate limiting middleware (sliding-window counters, shared via Redis when available)
+if settings.ENABLE_RATE_LIMITING:
+    app.middleware("http")(rate_limit_middleware)
+
+# Caller identity and tier from the bearer token (registered after rate limiting so it runs first)
+app.middleware("http")(auth_context_middleware)
+
+# Request ids on every log line (registered after rate limiting so it wraps it)
+app.middleware("http")(request_context_middleware)
 
 # Health check endpoint - optimized for speed
 @app.get("/health")
@@ -139,6 +162,64 @@ async def health_check():
         "timestamp": datetime.now().isoformat()
     }
 
+# Outbound HTTP pool utilization
+@app.get("/health/http-pools")
+async def http_pool_stats():
+    """Connection pool utilization and retry counters per upstream"""
+    return {
+        "timestamp": datetime.now().isoformat(),
+        "upstreams": http_clients.stats()
+    }
+
+# Event loop responsiveness
+@app.get("/health/event-loop")
+async def event_loop_stats():
+    """Event loop lag, recent stalls (with the blocking stack) and blocking-pool queues"""
+    return {
+        "timestamp": datetime.now().isoformat(),
+        **loop_lag_monitor.snapshot(),
+        "logging": logging_stats()
+    }
+
+# AI endpoint quotas and admission control
+@app.get("/health/ai-quota")
+async def ai_quota_stats():
+    """Admitted/queued/rejected AI requests, units charged and in-flight slots"""
+    return {
+        "timestamp": datetime.now().isoformat(),
+        **ai_quota.stats()
+    }
+
+@app.get("/health/listings-store")
+async def listings_store_stats():
+    """Local listings store: ingested/flushed rows, files, compactions and queries"""
+    return {
+        "timestamp": datetime.now().isoformat(),
+        **listings_store.stats()
+    }
+
+@app.get("/health/agents")
+async def agent_performance_stats():
+    """Per-agent run counts and success rate, plus latency percentiles per agent and per stage/upstream call"""
+    return {
+        "timestamp": datetime.now().isoformat(),
+        "agents": agent_performance.stats(),
+        "latency": metrics.summary()
+    }
+
+@app.get("/health/search-history")
+async def search_history_stats():
+    """Search history store: saved entries, pages served and TTL pruning"""
+    return {
+        "timestamp": datetime.now().isoformat(),
+        **search_history_store.stats()
+    }
+
+@app.get("/metrics", response_class=PlainTextResponse)
+async def prometheus_metrics():
+    """Agent and upstream latency histograms and error counters (Prometheus text format)"""
+    return metrics.render_prometheus()
+
 # Enhanced security headers middleware
 @app.middleware("http")
 async def add_security_headers(request: Request, call_next):
@@ -4,6 +4,8 @@ Middleware package for Aquaria API
 Provides security and performance middleware components.
 """
 
-from .rate_limiting import rate_limit_middleware, cleanup_rate_limits
+from .auth_context import auth_context_middleware
+from .rate_limiting import rate_limit_middleware, rate_limiter, RateLimiter, RateLimitRule
+from .request_context import request_context_middleware, REQUEST_ID_HEADER
 
-__all__ = ["rate_limit_middleware", "cleanup_rate_limits"] 
\ No newline at end of file
+__all__ = ["auth_context_middleware", "rate_limit_middleware", "rate_limiter", "RateLimiter", "RateLimitRule", "request_context_middleware", "REQUEST_ID_HEADER"] 
\ No newline at end of file
@@ -0,0 +1,38 @@
+"""
+Auth context middleware
+
+Resolves the caller from a Supabase bearer token before rate limiting runs,
+so limits and AI quotas are keyed per user and scaled by tier:
+
+- ``request.state.user_id``: the token's ``sub`` (unset for anonymous callers)
+- ``request.state.user_tier``: ``app_metadata.tier`` when it is a configured
+  rate-limit tier, else "authenticated"
+- ``request.state.identity_resolved``: whether tokens can be verified at all
+  (False without ``SUPABASE_JWT_SECRET``, when every caller looks anonymous)
+
+Invalid or missing tokens are not rejected here; endpoints that require a
+user still do that through ``app.utils.auth.get_current_user``.
+"""
+
+from fastapi import Request
+
+from app.core.config import settings
+from app.utils.auth import SUPABASE_JWT_SECRET, decode_bearer_token
+
+
+def resolve_tier(payload: dict) -> str:
+    """Rate-limit tier for a verified token"""
+    tier = (payload.get("app_metadata") or {}).get("tier")
+    if tier and tier != "anonymous" and tier in settings.RATE_LIMIT_TIER_MULTIPLIERS:
+        return tier
+    return "authenticated"
+
+
+async def auth_context_middleware(request: Request, call_next):
+    """Attach the caller's user id and tier to ``request.state``"""
+    request.state.identity_resolved = bool(SUPABASE_JWT_SECRET)
+    payload = decode_bearer_token(request)
+    if payload and payload.get("sub"):
+        request.state.user_id = payload["sub"]
+        request.state.user_tier = resolve_tier(payload)
+    return await call_next(request)
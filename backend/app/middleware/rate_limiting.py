@@ -2,24 +2,314 @@
 Rate Limiting Middleware for Aquaria API
 
 Provides rate limiting functionality to prevent API abuse and ensure fair usage.
+
+Limits use a sliding-window counter: each (client, rule) pair keeps only the
+count for the current and previous fixed window, and the previous count is
+weighted by how much of it still overlaps the sliding window:
+
+    estimate = previous * (1 - elapsed_fraction) + current
+
+That is O(1) time and memory per check, independent of request volume.
+
+Backends:
+- ``MemoryRateLimitBackend``: per-process, LRU-bounded to ``RATE_LIMIT_MAX_KEYS``
+- ``RedisRateLimitBackend``: shared across workers; all rules for a request are
+  checked and incremented atomically in one Lua script
+
+A request is only counted when every rule allows it, so rejected requests
+don't extend a client's lockout.
 """
 
-from fastapi import Request, HTTPException
+from fastapi import Request
 from fastapi.responses import JSONResponse
+import math
 import time
-import asyncio
-from typing import Dict, Tuple
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Sequence, Tuple
 import logging
 
+from app.core.config import settings
+from app.services.redis_client import get_async_redis
+
 logger = logging.getLogger(__name__)
 
-class RateLimiter:
+KEY_PREFIX = "ratelimit"
+
+# Never limited per request (the AI analysis endpoints are charged by cost in app.services.ai_quota)
+EXEMPT_PATHS = {
+    "/",
+    "/health",
+    "/api/v1/enhanced-analyze",
+    "/api/v1/simple-analyze",
+    "/api/v1/real-analyze",
+    "/api/v1/mock-analyze",
+}
+EXEMPT_PREFIXES = ("/health/", "/docs", "/redoc", "/openapi.json")
+
+
+@dataclass(frozen=True)
+class RateLimitRule:
+    """
+    At most ``limit`` requests (or cost units) per ``window`` seconds, per client.
+
+    A rule with a ``scope`` is shared: every client counts against the single
+    ``scope`` bucket (e.g. a global budget) instead of its own.
+    """
+    name: str
+    limit: int
+    window: int
+    scope: Optional[str] = None
+
+    def bucket(self, client_id: str) -> str:
+        return self.scope or client_id
+
+
+@dataclass
+class RuleStatus:
+    """Outcome of one rule for one request"""
+    rule: RateLimitRule
+    limit: int
+    remaining: int
+    reset_at: int
+    retry_after: int = 0
+    exceeded: bool = False
+
+
+@dataclass
+class RateLimitResult:
+    allowed: bool
+    rules: List[RuleStatus]
+
+    @property
+    def retry_after(self) -> int:
+        return max((status.retry_after for status in self.rules), default=0)
+
+    def headers(self) -> Dict[str, str]:
+        headers: Dict[str, str] = {}
+        for status in self.rules:
+            name = status.rule.name.title()
+            headers[f"X-RateLimit-Limit-{name}"] = str(status.limit)
+            headers[f"X-RateLimit-Remaining-{name}"] = str(status.remaining)
+            headers[f"X-RateLimit-Reset-{name}"] = str(status.reset_at)
+        if not self.allowed:
+            headers["Retry-After"] = str(self.retry_after)
+        return headers
+
+    def to_dict(self) -> Dict[str, int]:
+        """Same shape the API has always returned in the 429 body"""
+        limits: Dict[str, int] = {}
+        for status in self.rules:
+            limits[f"remaining_{status.rule.name}"] = status.remaining
+            limits[f"reset_{status.rule.name}"] = status.reset_at
+        return limits
+
+
+def _window_position(now: float, window: int) -> Tuple[int, float]:
+    """(index of the fixed window containing ``now``, fraction of it elapsed)"""
+    index = int(now // window)
+    return index, (now - index * window) / window
+
+
+def _rule_status(
+    rule: RateLimitRule,
+    limit: int,
+    current: int,
+    previous: int,
+    elapsed: float,
+    now: float,
+    cost: int,
+    allowed: bool,
+) -> RuleStatus:
+    """
+    Remaining allowance and reset/retry times for a rule.
+
+    Args:
+        current: Count in the current window (including this request if it was allowed)
+        previous: Count in the previous window
+        elapsed: Fraction of the current window that has elapsed
+    """
+    estimate = previous * (1 - elapsed) + current
+    window_start = now - elapsed * rule.window
+    window_end = window_start + rule.window
+    remaining = max(0, int(limit - estimate))
+
+    retry_after = 0.0
+    if not allowed and estimate + cost > limit:
+        if current + cost <= limit and previous:
+            # Wait for enough of the previous window to slide out
+            needed = 1 - (limit - current - cost) / previous
+            retry_after = window_start + needed * rule.window - now
+        elif cost <= limit and current:
+            # The current window becomes "previous" and has to slide out instead
+            needed = 1 - (limit - cost) / current
+            retry_after = window_end + max(0.0, needed) * rule.window - now
+        else:
+            retry_after = window_end - now
+
+    return RuleStatus(
+        rule=rule,
+        limit=limit,
+        remaining=remaining,
+        reset_at=int(math.ceil(window_end)),
+        retry_after=int(math.ceil(max(0.0, retry_after))) if not allowed else 0,
+        exceeded=not allowed and estimate + cost > limit,
+    )
+
+
+class MemoryRateLimitBackend:
+    """Per-process sliding-window counters with a bounded number of keys (LRU)"""
+
+    def __init__(self, max_keys: int = 100_000):
+        self.max_keys = max_keys
+        # key -> [window index, current count, previous count]
+        self._counters: "OrderedDict[str, List[int]]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._counters)
+
+    def _counter(self, key: str, index: int) -> List[int]:
+        counter = self._counters.get(key)
+        if counter is None:
+            counter = [index, 0, 0]
+            self._counters[key] = counter
+            if len(self._counters) > self.max_keys:
+                self._counters.popitem(last=False)
+        else:
+            self._counters.move_to_end(key)
+            if counter[0] != index:
+                # Roll forward: the old current window is "previous" only if adjacent
+                counter[2] = counter[1] if counter[0] == index - 1 else 0
+                counter[1] = 0
+                counter[0] = index
+        return counter
+
+    async def hit(
+        self,
+        client_id: str,
+        rules: Sequence[Tuple[RateLimitRule, int]],
+        cost: int = 1,
+        now: Optional[float] = None,
+    ) -> RateLimitResult:
+        now = time.time() if now is None else now
+        positions = []
+        allowed = True
+        for rule, limit in rules:
+            index, elapsed = _window_position(now, rule.window)
+            counter = self._counter(f"{rule.name}:{rule.bucket(client_id)}", index)
+            positions.append((counter, elapsed))
+            if counter[2] * (1 - elapsed) + counter[1] + cost > limit:
+                allowed = False
+
+        if allowed:
+            for counter, _ in positions:
+                counter[1] += cost
+
+        return RateLimitResult(allowed, [
+            _rule_status(rule, limit, counter[1], counter[2], elapsed, now, cost, allowed)
+            for (rule, limit), (counter, elapsed) in zip(rules, positions)
+        ])
+
+
+# KEYS: current_1, previous_1, current_2, previous_2, ...
+# ARGV: cost, then per rule: limit, elapsed fraction, ttl
+_SLIDING_WINDOW_LUA = """
+local cost = tonumber(ARGV[1])
+local rules = #KEYS / 2
+local counts = {}
+local allowed = 1
+for i = 1, rules do
+    local current = tonumber(redis.call('GET', KEYS[2 * i - 1]) or '0')
+    local previous = tonumber(redis.call('GET', KEYS[2 * i]) or '0')
+    local limit = tonumber(ARGV[3 * i - 1])
+    local elapsed = tonumber(ARGV[3 * i])
+    if previous * (1 - elapsed) + current + cost > limit then
+        allowed = 0
+    end
+    counts[2 * i - 1] = current
+    counts[2 * i] = previous
+end
+if allowed == 1 then
+    for i = 1, rules do
+        redis.call('INCRBY', KEYS[2 * i - 1], cost)
+        redis.call('EXPIRE', KEYS[2 * i - 1], tonumber(ARGV[3 * i + 1]))
+        counts[2 * i - 1] = counts[2 * i - 1] + cost
+    end
+end
+table.insert(counts, 1, allowed)
+return counts
+"""
+
+
+class RedisRateLimitBackend:
+    """
+    Sliding-window counters shared by every worker.
+
+    Keys are ``ratelimit:{<client>}:<rule>:<window index>``; the braces keep a
+    client's keys in one Redis Cluster slot so the script stays atomic. (Mixing
+    client and ``scope``d rules in one check needs a non-clustered Redis.)
+    """
+
     def __init__(self):
-        self.requests: Dict[str, list] = {}
-        self.max_requests_per_minute = 100
-        self.max_requests_per_hour = 1000
-        self.cleanup_interval = 3600  # 1 hour
-    
+        self._scripts: Dict[int, object] = {}
+
+    def _script(self, redis):
+        script = self._scripts.get(id(redis))
+        if script is None:
+            script = redis.register_script(_SLIDING_WINDOW_LUA)
+            self._scripts[id(redis)] = script
+        return script
+
+    async def hit(
+        self,
+        redis,
+        client_id: str,
+        rules: Sequence[Tuple[RateLimitRule, int]],
+        cost: int = 1,
+        now: Optional[float] = None,
+    ) -> RateLimitResult:
+        now = time.time() if now is None else now
+        keys: List[str] = []
+        args: List[object] = [cost]
+        positions = []
+        for rule, limit in rules:
+            index, elapsed = _window_position(now, rule.window)
+            base = f"{KEY_PREFIX}:{{{rule.bucket(client_id)}}}:{rule.name}"
+            keys += [f"{base}:{index}", f"{base}:{index - 1}"]
+            args += [limit, repr(elapsed), rule.window * 2]
+            positions.append(elapsed)
+
+        reply = await self._script(redis)(keys=keys, args=args)
+        allowed = bool(int(reply[0]))
+        return RateLimitResult(allowed, [
+            _rule_status(rule, limit, int(reply[2 * i + 1]), int(reply[2 * i + 2]), elapsed, now, cost, allowed)
+            for i, ((rule, limit), elapsed) in enumerate(zip(rules, positions))
+        ])
+
+
+class RateLimiter:
+    def __init__(self, backend: str = "auto", max_keys: int = 100_000):
+        """
+        Args:
+            backend: "memory", "redis" or "auto" (Redis when reachable, else memory)
+            max_keys: Bound on per-process counters for the memory backend
+        """
+        self.backend = backend
+        self.memory = MemoryRateLimitBackend(max_keys=max_keys)
+        self.redis = RedisRateLimitBackend()
+        self.default_rules = [
+            RateLimitRule("minute", settings.RATE_LIMIT_DEFAULT, 60),
+            RateLimitRule("hour", settings.RATE_LIMIT_PER_HOUR, 3600),
+        ]
+        # Extra, stricter rules for route groups (path prefix -> rule)
+        self.route_rules: List[Tuple[str, RateLimitRule]] = [
+            ("/api/v1/auth/", RateLimitRule("auth", settings.RATE_LIMIT_AUTH, 60)),
+            ("/api/v1/chat", RateLimitRule("chat", settings.RATE_LIMIT_CHAT, 60)),
+            ("/api/v1/speech-to-text", RateLimitRule("upload", settings.RATE_LIMIT_UPLOAD, 60)),
+            ("/api/v1/enhanced-analyze/jobs", RateLimitRule("upload", settings.RATE_LIMIT_UPLOAD, 60)),
+        ]
+        self.tier_multipliers: Dict[str, float] = dict(settings.RATE_LIMIT_TIER_MULTIPLIERS)
+
     def _get_client_id(self, request: Request) -> str:
         """Get client identifier for rate limiting"""
         # Use user ID if authenticated, otherwise use IP
@@ -27,112 +317,78 @@ class RateLimiter:
         if user_id:
             return f"user:{user_id}"
         else:
-            return f"ip:{request.client.host}"
-    
-    def _cleanup_old_requests(self):
-        """Clean up old request records"""
-        current_time = time.time()
-        for client_id in list(self.requests.keys()):
-            # Remove requests older than 1 hour
-            self.requests[client_id] = [
-                req_time for req_time in self.requests[client_id]
-                if current_time - req_time < 3600
-            ]
-            # Remove empty client records
-            if not self.requests[client_id]:
-                del self.requests[client_id]
-    
-    def is_rate_limited(self, client_id: str) -> Tuple[bool, Dict[str, int]]:
-        """Check if client is rate limited"""
-        current_time = time.time()
-        
-        # Initialize client record if not exists
-        if client_id not in self.requests:
-            self.requests[client_id] = []
-        
-        # Add current request
-        self.requests[client_id].append(current_time)
-        
-        # Get requests in different time windows
-        requests_last_minute = [
-            req_time for req_time in self.requests[client_id]
-            if current_time - req_time < 60
-        ]
-        
-        requests_last_hour = [
-            req_time for req_time in self.requests[client_id]
-            if current_time - req_time < 3600
-        ]
-        
-        # Check rate limits
-        minute_limit_exceeded = len(requests_last_minute) > self.max_requests_per_minute
-        hour_limit_exceeded = len(requests_last_hour) > self.max_requests_per_hour
-        
-        is_limited = minute_limit_exceeded or hour_limit_exceeded
-        
-        # Calculate remaining requests
-        remaining_minute = max(0, self.max_requests_per_minute - len(requests_last_minute))
-        remaining_hour = max(0, self.max_requests_per_hour - len(requests_last_hour))
-        
-        return is_limited, {
-            "remaining_minute": remaining_minute,
-            "remaining_hour": remaining_hour,
-            "reset_minute": int(current_time + 60),
-            "reset_hour": int(current_time + 3600)
-        }
+            return f"ip:{request.client.host if request.client else 'unknown'}"
+
+    def _get_tier(self, request: Request) -> str:
+        """Tier set by ``auth_context_middleware`` (``request.state.user_tier``), else anonymous/authenticated"""
+        tier = getattr(request.state, 'user_tier', None)
+        if tier:
+            return tier
+        return "authenticated" if getattr(request.state, 'user_id', None) else "anonymous"
+
+    def rules_for(self, path: str, tier: str = "anonymous") -> List[Tuple[RateLimitRule, int]]:
+        """Rules that apply to a path, each with its limit scaled for the tier"""
+        multiplier = self.tier_multipliers.get(tier, 1.0)
+        rules = list(self.default_rules)
+        for prefix, rule in self.route_rules:
+            if path.startswith(prefix):
+                rules.append(rule)
+                break
+        return [(rule, max(1, int(rule.limit * multiplier))) for rule in rules]
+
+    async def check(self, client_id: str, rules: Sequence[Tuple[RateLimitRule, int]], cost: int = 1) -> RateLimitResult:
+        """Count a request against ``rules`` (only if all of them allow it)"""
+        if self.backend != "memory":
+            redis = await get_async_redis()
+            if redis is not None:
+                try:
+                    return await self.redis.hit(redis, client_id, rules, cost)
+                except Exception as e:
+                    logger.warning(f"Redis rate limiting failed, using in-process counters: {e}")
+            elif self.backend == "redis":
+                logger.warning("Redis rate limiting unavailable, using in-process counters")
+        return await self.memory.hit(client_id, rules, cost)
+
+    async def is_rate_limited(self, request: Request, cost: int = 1) -> RateLimitResult:
+        """Check (and count) a request"""
+        client_id = self._get_client_id(request)
+        return await self.check(client_id, self.rules_for(request.url.path, self._get_tier(request)), cost)
 
 # Global rate limiter instance
-rate_limiter = RateLimiter()
+rate_limiter = RateLimiter(backend=settings.RATE_LIMIT_BACKEND, max_keys=settings.RATE_LIMIT_MAX_KEYS)
+
+
+def _is_exempt(request: Request) -> bool:
+    path = request.url.path
+    return request.method == "OPTIONS" or path in EXEMPT_PATHS or path.startswith(EXEMPT_PREFIXES)
+
 
 async def rate_limit_middleware(request: Request, call_next):
     """Rate limiting middleware"""
+    # Skip rate limiting for health checks, docs, CORS preflight and public endpoints
+    if _is_exempt(request):
+        return await call_next(request)
+
     try:
-        # Skip rate limiting for health checks and public endpoints
-        if request.url.path in ["/", "/health", "/api/v1/auth/login", "/api/v1/auth/register", "/api/v1/enhanced-analyze", "/api/v1/simple-analyze", "/api/v1/real-analyze", "/api/v1/mock-analyze"]:
-            return await call_next(request)
-        
-        # Get client identifier
-        client_id = rate_limiter._get_client_id(request)
-        
-        # Check rate limits
-        is_limited, limits = rate_limiter.is_rate_limited(client_id)
-        
-        if is_limited:
-            logger.warning(f"Rate limit exceeded for {client_id}")
-            return JSONResponse(
-                status_code=429,
-                content={
-                    "error": "Rate limit exceeded",
-                    "message": "Too many requests. Please try again later.",
-                    "limits": limits
-                },
-                headers={
-                    "X-RateLimit-Remaining-Minute": str(limits["remaining_minute"]),
-                    "X-RateLimit-Remaining-Hour": str(limits["remaining_hour"]),
-                    "X-RateLimit-Reset-Minute": str(limits["reset_minute"]),
-                    "X-RateLimit-Reset-Hour": str(limits["reset_hour"])
-                }
-            )
-        
-        # Add rate limit headers to response
-        response = await call_next(request)
-        response.headers["X-RateLimit-Remaining-Minute"] = str(limits["remaining_minute"])
-        response.headers["X-RateLimit-Remaining-Hour"] = str(limits["remaining_hour"])
-        response.headers["X-RateLimit-Reset-Minute"] = str(limits["reset_minute"])
-        response.headers["X-RateLimit-Reset-Hour"] = str(limits["reset_hour"])
-        
-        return response
-        
+        result = await rate_limiter.is_rate_limited(request)
     except Exception as e:
         logger.error(f"Rate limiting middleware error: {e}")
         return await call_next(request)
 
-# Periodic cleanup task
-async def cleanup_rate_limits():
-    """Periodic cleanup of old rate limit records"""
-    while True:
-        try:
-            await asyncio.sleep(rate_limiter.cleanup_interval)
-            rate_limiter._cleanup_old_requests()
-        except Exception as e:
-            logger.error(f"Rate limit cleanup error: {e}") 
\ No newline at end of file
+    headers = result.headers()
+    if not result.allowed:
+        logger.warning(f"Rate limit exceeded for {rate_limiter._get_client_id(request)} on {request.url.path}")
+        return JSONResponse(
+            status_code=429,
+            content={
+                "error": "Rate limit exceeded",
+                "message": "Too many requests. Please try again later.",
+                "limits": result.to_dict()
+            },
+            headers=headers
+        )
+
+    # Add rate limit headers to response
+    response = await call_next(request)
+    response.headers.update(headers)
+    return response
@@ -0,0 +1,37 @@
+"""
+Request context middleware
+
+Binds a request id to every log record written while handling a request
+(see app.core.logging_config) and echoes it back in ``X-Request-ID``.
+
+The id is taken from the caller's ``X-Request-ID`` when it looks sane,
+otherwise from the Cloud Run trace header, otherwise generated.
+"""
+
+import re
+
+from fastapi import Request
+
+from app.core.logging_config import bind_request_context, new_request_id, reset_request_context
+
+REQUEST_ID_HEADER = "X-Request-ID"
+CLOUD_TRACE_HEADER = "X-Cloud-Trace-Context"  # "TRACE_ID/SPAN_ID;o=1"
+
+_VALID_REQUEST_ID = re.compile(r"^[A-Za-z0-9._:-]{1,128}$")
+
+
+async def request_context_middleware(request: Request, call_next):
+    """Bind the request id for logging and return it to the caller"""
+    cloud_trace = request.headers.get(CLOUD_TRACE_HEADER, "").split("/", 1)[0] or None
+    request_id = request.headers.get(REQUEST_ID_HEADER, "")
+    if not _VALID_REQUEST_ID.match(request_id):
+        request_id = cloud_trace or new_request_id()
+    request.state.request_id = request_id
+
+    tokens = bind_request_context(request_id, cloud_trace)
+    try:
+        response = await call_next(request)
+    finally:
+        reset_request_context(tokens)
+    response.headers[REQUEST_ID_HEADER] = request_id
+    return response
@@ -5,6 +5,9 @@ from .comprehensive_models import (
     AgentLog, Conversion
 )
 
+# Saved market searches
+from .search_history import SearchHistoryEntry
+
 # Import knowledge graph models (Phase 0)
 from .knowledge_graph import (
     KnowledgeGraphNode,
@@ -31,6 +34,7 @@ __all__ = [
     "Conversion",
     "DealAnalysis",
     "AgentPerformance",
+    "SearchHistoryEntry",
     # Knowledge Graph Models (Phase 0)
     "KnowledgeGraphNode",
     "VINKnowledgeBase",
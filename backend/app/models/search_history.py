@@ -0,0 +1,42 @@
+"""
+Search History Model - saved market searches
+"""
+
+from sqlalchemy import Column, String, Integer, DateTime, JSON, Index
+from sqlalchemy.ext.declarative import declarative_base
+from datetime import datetime
+
+Base = declarative_base()
+
+class SearchHistoryEntry(Base):
+    __tablename__ = "search_history"
+    
+    id = Column(String(64), primary_key=True)
+    user_id = Column(String(255), nullable=True)  # None for anonymous searches
+    search_term = Column(String(200), nullable=False)
+    location = Column(String(200))
+    radius = Column(Integer)
+    result_count = Column(Integer, default=0)
+    results = Column(JSON, default=list)  # compact per-listing summaries, capped
+    summary = Column(JSON, default=dict)
+    timestamp = Column(DateTime, nullable=False, default=datetime.utcnow)
+    
+    __table_args__ = (
+        # Newest-first history pages per user (keyset on timestamp, id)
+        Index("ix_search_history_user_timestamp", "user_id", "timestamp", "id"),
+        # TTL pruning
+        Index("ix_search_history_timestamp", "timestamp"),
+    )
+    
+    def to_dict(self):
+        return {
+            "id": self.id,
+            "searchTerm": self.search_term,
+            "location": self.location or "",
+            "radius": self.radius or 0,
+            "results": self.results or [],
+            "summary": self.summary or {},
+            "timestamp": self.timestamp,
+            "user_id": self.user_id,
+            "resultCount": self.result_count or 0,
+        }
@@ -0,0 +1,123 @@
+"""
+Per-agent timing and success counts, persisted to the ``agent_performance`` table.
+
+``record`` only updates in-process counters, so it is cheap enough to call for
+every agent run of every deal. Every ``AGENT_PERFORMANCE_FLUSH_SEC`` the
+accumulated counts are folded into one ``AgentPerformance`` row per agent type
+(running totals, success rate and average response time) in a background
+write. A failed write keeps the counts for the next flush.
+"""
+
+import asyncio
+import logging
+import threading
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Dict, Optional
+
+from app.core.config import settings
+from app.services.async_adapters import run_blocking
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class _Counts:
+    total: int = 0
+    successful: int = 0
+    total_ms: float = 0.0
+
+    def add(self, other: "_Counts") -> None:
+        self.total += other.total
+        self.successful += other.successful
+        self.total_ms += other.total_ms
+
+
+class AgentPerformanceRecorder:
+    """Aggregates agent runs in memory and writes them out periodically"""
+
+    def __init__(self, flush_interval: Optional[float] = None):
+        self.flush_interval = flush_interval if flush_interval is not None else settings.AGENT_PERFORMANCE_FLUSH_SEC
+        self._pending: Dict[str, _Counts] = {}
+        self._lifetime: Dict[str, _Counts] = {}
+        self._lock = threading.Lock()
+        self._last_flush = time.monotonic()
+        self._flush_task: Optional[asyncio.Task] = None
+
+    def record(self, agent_type: str, elapsed_ms: float, success: bool) -> None:
+        """Count one agent run; schedules a background flush when the interval has passed."""
+        run = _Counts(1, 1 if success else 0, elapsed_ms)
+        with self._lock:
+            self._pending.setdefault(agent_type, _Counts()).add(run)
+            self._lifetime.setdefault(agent_type, _Counts()).add(run)
+            due = time.monotonic() - self._last_flush >= self.flush_interval
+        if due and settings.AGENT_PERFORMANCE_ENABLED and (self._flush_task is None or self._flush_task.done()):
+            try:
+                self._flush_task = asyncio.get_running_loop().create_task(self.flush())
+            except RuntimeError:
+                pass  # no running loop; the next async caller or shutdown flushes
+
+    async def flush(self) -> None:
+        """Write pending counts to the database."""
+        with self._lock:
+            pending, self._pending = self._pending, {}
+            self._last_flush = time.monotonic()
+        if not pending or not settings.AGENT_PERFORMANCE_ENABLED:
+            return
+        try:
+            await run_blocking(self._flush_sync, pending, pool="db")
+        except Exception as e:
+            logger.warning(f"Could not persist agent performance ({len(pending)} agents): {e}")
+            with self._lock:
+                for agent_type, counts in pending.items():
+                    self._pending.setdefault(agent_type, _Counts()).add(counts)
+
+    @staticmethod
+    def _flush_sync(pending: Dict[str, _Counts]) -> None:
+        from app.core.database import SessionLocal
+        from app.models.comprehensive_models import AgentPerformance
+
+        if SessionLocal is None:
+            raise RuntimeError("Database is not configured")
+        db = SessionLocal()
+        try:
+            for agent_type, counts in pending.items():
+                row = db.query(AgentPerformance).filter(
+                    AgentPerformance.agent_type == agent_type,
+                    AgentPerformance.agent_id.is_(None),
+                ).first()
+                if row is None:
+                    row = AgentPerformance(agent_type=agent_type, total_actions=0, successful_actions=0, average_response_time=0)
+                    db.add(row)
+                previous_total = row.total_actions or 0
+                total = previous_total + counts.total
+                row.average_response_time = int(round(
+                    ((row.average_response_time or 0) * previous_total + counts.total_ms) / total
+                ))
+                row.total_actions = total
+                row.successful_actions = (row.successful_actions or 0) + counts.successful
+                row.success_rate = round(row.successful_actions / total, 4)
+                row.last_updated = datetime.utcnow()
+            db.commit()
+        except Exception:
+            db.rollback()
+            raise
+        finally:
+            db.close()
+
+    def stats(self) -> Dict[str, Any]:
+        """In-process counts since startup, per agent type."""
+        with self._lock:
+            return {
+                agent_type: {
+                    "total_actions": counts.total,
+                    "successful_actions": counts.successful,
+                    "success_rate": round(counts.successful / counts.total, 4) if counts.total else None,
+                    "average_response_ms": round(counts.total_ms / counts.total, 1) if counts.total else None,
+                }
+                for agent_type, counts in self._lifetime.items()
+            }
+
+
+agent_performance = AgentPerformanceRecorder()
@@ -9,10 +9,13 @@ from typing import Any, Dict, List, Optional
 from datetime import datetime
 import asyncio
 import logging
+import time
 from ..agents import (
     ScoutAgent, ValuationAgent, InspectionAgent, 
     NegotiatorAgent, OrchestratorAgent, LearningAgent
 )
+from ..core.config import settings
+from .agent_performance import agent_performance
 
 logger = logging.getLogger(__name__)
 
@@ -56,98 +59,200 @@ class AIBrain:
             "orchestrator_agent": self.orchestrator_agent,
             "learning_agent": self.learning_agent
         }
+        self._background_tasks: set = set()
         
         logger.info("AI Brain initialized with all 6 agents")
     
-    async def process_deal(self, listing_data: Dict[str, Any], user_preferences: Dict[str, Any]) -> Dict[str, Any]:
+    async def process_deal(
+        self,
+        listing_data: Dict[str, Any],
+        user_preferences: Dict[str, Any],
+        concurrent: Optional[bool] = None,
+        deadline: Optional[float] = None
+    ) -> Dict[str, Any]:
         """
         Process a car deal through the complete multi-agent workflow.
         
         Args:
             listing_data: Car listing data
             user_preferences: User's preferences and constraints
+            concurrent: Run scout/valuation/inspection/negotiator at the same time
+                (default AI_BRAIN_CONCURRENT); failures there yield a partial result
+            deadline: Seconds for the whole deal in concurrent mode (default AI_BRAIN_DEAL_DEADLINE_SEC)
             
         Returns:
             Complete deal analysis and recommendation
         """
+        if concurrent is None:
+            concurrent = settings.AI_BRAIN_CONCURRENT
+        if concurrent:
+            return await self._process_deal_concurrent(
+                listing_data, user_preferences, deadline or settings.AI_BRAIN_DEAL_DEADLINE_SEC
+            )
+        return await self._process_deal_sequential(listing_data, user_preferences)
+    
+    async def _process_deal_sequential(self, listing_data: Dict[str, Any], user_preferences: Dict[str, Any]) -> Dict[str, Any]:
+        """Run the agents one after another; any agent failure fails the deal."""
         start_time = datetime.now()
         
         try:
             logger.info(f"Processing deal: {listing_data.get('title', 'Unknown')}")
+            results = {}
             
-            # Step 1: Scout Agent - Find and score the deal
-            scout_result = await self._run_scout_agent(listing_data, user_preferences)
-            
-            if not scout_result["success"]:
-                return self._create_error_response("Scout agent failed", str(scout_result.get("error_message", "Unknown error")))
-            
-            # Step 2: Valuation Agent - Analyze market value and profit
-            valuation_result = await self._run_valuation_agent(listing_data, user_preferences)
-            
-            if not valuation_result["success"]:
-                return self._create_error_response("Valuation agent failed", str(valuation_result.get("error_message", "Unknown error")))
-            
-            # Step 3: Inspection Agent - Perform due diligence
-            inspection_result = await self._run_inspection_agent(listing_data, user_preferences)
+            for name, runner in self._independent_agents():
+                results[name] = await self._timed_agent(name, runner(listing_data, user_preferences))
+                if not results[name]["success"]:
+                    label = name.replace("_", " ").capitalize()
+                    return self._create_error_response(f"{label} failed", str(results[name].get("error_message", "Unknown error")))
             
-            if not inspection_result["success"]:
-                return self._create_error_response("Inspection agent failed", str(inspection_result.get("error_message", "Unknown error")))
-            
-            # Step 4: Negotiator Agent - Develop communication strategy
-            negotiator_result = await self._run_negotiator_agent(listing_data, user_preferences)
-            
-            if not negotiator_result["success"]:
-                return self._create_error_response("Negotiator agent failed", str(negotiator_result.get("error_message", "Unknown error")))
-            
-            # Step 5: Orchestrator Agent - Make final recommendation
-            orchestrator_result = await self._run_orchestrator_agent(
-                listing_data, user_preferences, {
-                    "scout_agent": scout_result,
-                    "valuation_agent": valuation_result,
-                    "inspection_agent": inspection_result,
-                    "negotiator_agent": negotiator_result
-                }
+            # Orchestrator Agent - Make final recommendation
+            orchestrator_result = await self._timed_agent(
+                "orchestrator_agent", self._run_orchestrator_agent(listing_data, user_preferences, results)
             )
             
             if not orchestrator_result["success"]:
                 return self._create_error_response("Orchestrator agent failed", str(orchestrator_result.get("error_message", "Unknown error")))
             
-            # Step 6: Learning Agent - Track for optimization
+            # Learning Agent - Track for optimization
             await self._run_learning_agent(listing_data, orchestrator_result)
             
-            # Compile final response with safe data access
-            processing_time = (datetime.now() - start_time).total_seconds()
-            
-            # Handle placeholder agents that don't return full data structure
-            orchestrator_data = orchestrator_result.get("data", {})
-            
-            return {
-                "success": True,
-                "processing_time": processing_time,
-                "timestamp": start_time.isoformat(),
-                "deal_id": listing_data.get("id"),
-                "final_recommendation": orchestrator_data.get("final_recommendation", "Deal analysis complete"),
-                "comprehensive_analysis": orchestrator_data.get("comprehensive_analysis", {
-                    "scout_analysis": scout_result.get("data", {}),
-                    "valuation_analysis": valuation_result.get("data", {}),
-                    "inspection_analysis": inspection_result.get("data", {}),
-                    "negotiator_analysis": negotiator_result.get("data", {})
-                }),
-                "action_plan": orchestrator_data.get("action_plan", "Review deal details and proceed with caution"),
-                "deal_summary": orchestrator_data.get("deal_summary", "Deal processed successfully"),
-                "agent_outputs": {
-                    "scout_agent": scout_result.get("data", {}),
-                    "valuation_agent": valuation_result.get("data", {}),
-                    "inspection_agent": inspection_result.get("data", {}),
-                    "negotiator_agent": negotiator_result.get("data", {}),
-                    "orchestrator_agent": orchestrator_data
-                }
-            }
+            return self._compile_deal_response(start_time, listing_data, results, orchestrator_result)
             
         except Exception as e:
             logger.error(f"Error processing deal: {str(e)}", exc_info=True)
             return self._create_error_response("Processing failed", str(e))
     
+    async def _process_deal_concurrent(
+        self,
+        listing_data: Dict[str, Any],
+        user_preferences: Dict[str, Any],
+        deadline: float
+    ) -> Dict[str, Any]:
+        """
+        Run the agents that only need the listing and preferences concurrently,
+        then the orchestrator on whatever they produced within the deadline.
+        """
+        start_time = datetime.now()
+        logger.info(f"Processing deal concurrently: {listing_data.get('title', 'Unknown')}")
+        
+        tasks: Dict[str, asyncio.Task] = {}
+        orchestrator_result = None
+        try:
+            async with asyncio.timeout(deadline):
+                # _timed_agent never raises, so one failing agent doesn't cancel its siblings
+                async with asyncio.TaskGroup() as group:
+                    for name, runner in self._independent_agents():
+                        tasks[name] = group.create_task(self._timed_agent(name, runner(listing_data, user_preferences)))
+                
+                results = {name: task.result() for name, task in tasks.items()}
+                if not any(result["success"] for result in results.values()):
+                    errors = "; ".join(f"{name}: {result.get('error_message')}" for name, result in results.items())
+                    return self._create_error_response("All agents failed", errors)
+                
+                orchestrator_result = await self._timed_agent(
+                    "orchestrator_agent", self._run_orchestrator_agent(listing_data, user_preferences, results)
+                )
+        except TimeoutError:
+            logger.warning(f"Deal {listing_data.get('id')} hit its {deadline}s deadline; returning partial results")
+        except Exception as e:
+            logger.error(f"Error processing deal: {str(e)}", exc_info=True)
+            return self._create_error_response("Processing failed", str(e))
+        
+        results = {}
+        for name, task in tasks.items():
+            if task.done() and not task.cancelled():
+                results[name] = task.result()
+            else:
+                results[name] = self._agent_failure(name, f"No result within {deadline}s deadline")
+                agent_performance.record(name, deadline * 1000, False)
+        if not any(result["success"] for result in results.values()):
+            return self._create_error_response("Processing failed", f"No agent finished within {deadline}s")
+        
+        if orchestrator_result is not None and orchestrator_result["success"]:
+            # Learning is bookkeeping; don't hold the response for it
+            task = asyncio.create_task(self._run_learning_agent(listing_data, orchestrator_result))
+            self._background_tasks.add(task)
+            task.add_done_callback(self._background_tasks.discard)
+        
+        return self._compile_deal_response(start_time, listing_data, results, orchestrator_result)
+    
+    def _independent_agents(self):
+        """Agents that only need listing_data and user_preferences, in pipeline order"""
+        return [
+            ("scout_agent", self._run_scout_agent),
+            ("valuation_agent", self._run_valuation_agent),
+            ("inspection_agent", self._run_inspection_agent),
+            ("negotiator_agent", self._run_negotiator_agent),
+        ]
+    
+    async def _timed_agent(self, name: str, run) -> Dict[str, Any]:
+        """Await an agent run, time it and record it in AgentPerformance; errors become a failed result."""
+        started = time.perf_counter()
+        try:
+            result = await run
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error(f"{name} failed: {str(e)}")
+            result = self._agent_failure(name, str(e))
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        result["elapsed_ms"] = round(elapsed_ms, 1)
+        agent_performance.record(name, elapsed_ms, bool(result.get("success")))
+        return result
+    
+    def _agent_failure(self, name: str, error: str) -> Dict[str, Any]:
+        return {
+            "agent_name": name,
+            "success": False,
+            "data": {},
+            "confidence": 0.0,
+            "error_message": error
+        }
+    
+    def _compile_deal_response(
+        self,
+        start_time: datetime,
+        listing_data: Dict[str, Any],
+        results: Dict[str, Dict[str, Any]],
+        orchestrator_result: Optional[Dict[str, Any]]
+    ) -> Dict[str, Any]:
+        """Final response with safe data access; failed or missing agents make it partial."""
+        processing_time = (datetime.now() - start_time).total_seconds()
+        
+        # Handle placeholder agents that don't return full data structure
+        orchestrator_ok = bool(orchestrator_result and orchestrator_result.get("success"))
+        orchestrator_data = orchestrator_result.get("data", {}) if orchestrator_ok else {}
+        agent_data = {name: result.get("data", {}) for name, result in results.items()}
+        failed_agents = {
+            name: result.get("error_message") or "Unknown error"
+            for name, result in results.items() if not result.get("success")
+        }
+        if not orchestrator_ok:
+            failed_agents["orchestrator_agent"] = (orchestrator_result or {}).get("error_message") or "Did not run"
+        agent_timings = {name: result.get("elapsed_ms") for name, result in results.items()}
+        if orchestrator_result:
+            agent_timings["orchestrator_agent"] = orchestrator_result.get("elapsed_ms")
+        
+        return {
+            "success": True,
+            "partial": bool(failed_agents),
+            "failed_agents": failed_agents,
+            "processing_time": processing_time,
+            "timestamp": start_time.isoformat(),
+            "deal_id": listing_data.get("id"),
+            "final_recommendation": orchestrator_data.get("final_recommendation", "Deal analysis complete"),
+            "comprehensive_analysis": orchestrator_data.get("comprehensive_analysis", {
+                "scout_analysis": agent_data.get("scout_agent", {}),
+                "valuation_analysis": agent_data.get("valuation_agent", {}),
+                "inspection_analysis": agent_data.get("inspection_agent", {}),
+                "negotiator_analysis": agent_data.get("negotiator_agent", {})
+            }),
+            "action_plan": orchestrator_data.get("action_plan", "Review deal details and proceed with caution"),
+            "deal_summary": orchestrator_data.get("deal_summary", "Deal processed successfully"),
+            "agent_outputs": {**agent_data, "orchestrator_agent": orchestrator_data},
+            "agent_timings_ms": agent_timings
+        }
+    
     async def _run_scout_agent(self, listing_data: Dict[str, Any], user_preferences: Dict[str, Any]) -> Dict[str, Any]:
         """Run the Scout Agent to find and score the deal."""
         input_data = {
@@ -0,0 +1,246 @@
+"""
+Cost-weighted quotas and admission control for endpoints that call Gemini/OpenAI.
+
+Each request is charged by its estimated upstream cost in "units" (roughly one
+~1k-token text completion). Vision images, LLM calls, grounded searches and
+long prompts each carry a weight (``AI_COST_WEIGHTS``). Charges go through the
+sliding-window rate limiter, so they are shared across workers when Redis is
+available:
+
+- per user/IP: ``AI_QUOTA_USER_UNITS_PER_HOUR`` (scaled by rate-limit tier)
+- global: ``AI_QUOTA_GLOBAL_UNITS_PER_MINUTE``
+- anonymous traffic as a whole: ``AI_QUOTA_ANONYMOUS_SHARE`` of the global budget,
+  only when ``auth_context_middleware`` can verify tokens (otherwise signed-in
+  users would look anonymous too)
+
+A client over its own budget gets 429 immediately. When the *global* budget
+is exhausted the request waits in a bounded queue (``AI_QUOTA_MAX_QUEUE``) for
+up to ``AI_QUOTA_MAX_WAIT_SEC`` before giving up with 503. On top of the
+budgets, at most ``AI_MAX_CONCURRENT`` admitted requests run upstream calls
+at once per process, which keeps latency stable under bursts.
+"""
+
+import asyncio
+import math
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
+
+from fastapi import Request
+
+from app.core.config import settings
+from app.middleware.rate_limiting import RateLimitRule, rate_limiter
+
+CHARS_PER_TOKEN = 4
+
+
+class AIQuotaExceeded(Exception):
+    """Request can't be admitted: over the client's budget (429) or the system is saturated (503)"""
+
+    def __init__(self, detail: str, status_code: int = 429, retry_after: int = 1):
+        super().__init__(detail)
+        self.detail = detail
+        self.status_code = status_code
+        self.retry_after = max(1, int(retry_after))
+
+    @property
+    def headers(self) -> Dict[str, str]:
+        return {"Retry-After": str(self.retry_after)}
+
+
+@dataclass
+class CostEstimate:
+    """Estimated upstream cost of one request"""
+    units: int
+    breakdown: Dict[str, int] = field(default_factory=dict)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"units": self.units, "breakdown": self.breakdown}
+
+
+def estimate_cost(
+    vision_images: int = 0,
+    llm_calls: int = 0,
+    grounding_calls: int = 0,
+    prompt_chars: int = 0,
+) -> CostEstimate:
+    """
+    Weight a request's upstream work into cost units.
+
+    Args:
+        vision_images: Images sent to a vision model
+        llm_calls: Text completions (each counted as one base-size call)
+        grounding_calls: Search-grounded model calls
+        prompt_chars: User-supplied text added to prompts (charged per ``tokens_per_unit``)
+    """
+    weights = settings.AI_COST_WEIGHTS
+    tokens = prompt_chars / CHARS_PER_TOKEN
+    breakdown = {
+        "vision_images": int(math.ceil(vision_images * weights.get("vision_image", 2))),
+        "llm_calls": int(math.ceil(llm_calls * weights.get("llm_call", 1))),
+        "grounding_calls": int(math.ceil(grounding_calls * weights.get("grounding_call", 3))),
+        "prompt_tokens": int(math.ceil(tokens / weights.get("tokens_per_unit", 1000))),
+    }
+    return CostEstimate(units=max(1, sum(breakdown.values())), breakdown=breakdown)
+
+
+def estimate_enhanced_analysis_cost(image_count: int, about_vehicle: Optional[str] = None, vin: Optional[str] = None) -> CostEstimate:
+    """/enhanced-analyze: vision pass, market search, extraction + compose, VIN feature lookup"""
+    max_images = settings.VISION_MAX_IMAGES
+    vision_images = min(image_count, max_images) if max_images else image_count
+    return estimate_cost(
+        vision_images=vision_images,
+        llm_calls=2,
+        grounding_calls=1 + (1 if vin else 0),
+        prompt_chars=len(about_vehicle or ""),
+    )
+
+
+@dataclass
+class Admission:
+    """An admitted request; call ``release()`` when its upstream work is done"""
+    cost: CostEstimate
+    waited_ms: float = 0.0
+    queued: bool = False
+    _quota: Optional["AIQuota"] = None
+
+    def release(self) -> None:
+        quota, self._quota = self._quota, None
+        if quota is not None:
+            quota._release_slot()
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {**self.cost.to_dict(), "waited_ms": round(self.waited_ms, 1), "queued": self.queued}
+
+
+class AIQuota:
+    """Budgets plus a per-process concurrency gate for AI endpoints"""
+
+    def __init__(self):
+        self._max_concurrent = settings.AI_MAX_CONCURRENT
+        self._slots: Optional[asyncio.Semaphore] = None
+        self._waiting = 0
+        self.stats_counters: Dict[str, int] = {
+            "admitted": 0,
+            "queued": 0,
+            "rejected_user": 0,
+            "rejected_saturated": 0,
+            "units_charged": 0,
+        }
+
+    def _semaphore(self) -> asyncio.Semaphore:
+        if self._slots is None:
+            self._slots = asyncio.Semaphore(self._max_concurrent)
+        return self._slots
+
+    def _release_slot(self) -> None:
+        self._semaphore().release()
+
+    def rules_for(self, client_id: str, tier: str, identity_resolved: bool = True) -> List[Tuple[RateLimitRule, int]]:
+        """
+        User, global and (for anonymous clients) anonymous-pool budgets.
+
+        Args:
+            client_id: Rate-limit client id (user or IP)
+            tier: Rate-limit tier
+            identity_resolved: Whether an anonymous tier really means "not signed in"
+        """
+        multiplier = rate_limiter.tier_multipliers.get(tier, 1.0)
+        user_limit = max(1, int(settings.AI_QUOTA_USER_UNITS_PER_HOUR * multiplier))
+        global_limit = settings.AI_QUOTA_GLOBAL_UNITS_PER_MINUTE
+        rules = [
+            (RateLimitRule("ai", user_limit, 3600), user_limit),
+            (RateLimitRule("ai_global", global_limit, 60, scope="global"), global_limit),
+        ]
+        if tier == "anonymous" and identity_resolved:
+            anonymous_limit = max(1, int(global_limit * settings.AI_QUOTA_ANONYMOUS_SHARE))
+            rules.append((RateLimitRule("ai_anonymous", anonymous_limit, 60, scope="anonymous"), anonymous_limit))
+        return rules
+
+    async def admit(self, request: Request, cost: CostEstimate, hold_slot: bool = True) -> Admission:
+        """
+        Charge ``cost`` against the caller's budgets, waiting for global capacity if needed.
+
+        Args:
+            request: Incoming request (identifies the client and tier)
+            cost: Estimated upstream cost
+            hold_slot: Also take a concurrency slot (False when the work runs elsewhere, e.g. a queued job)
+
+        Raises:
+            AIQuotaExceeded: 429 when over the client's own budget, 503 when saturated
+        """
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        deadline = started + settings.AI_QUOTA_MAX_WAIT_SEC
+        client_id = rate_limiter._get_client_id(request)
+        identity_resolved = getattr(request.state, "identity_resolved", False)
+        rules = self.rules_for(client_id, rate_limiter._get_tier(request), identity_resolved)
+        # A request larger than a whole budget could never fit - charge it the full budget instead
+        units = min(cost.units, min(limit for _, limit in rules))
+
+        if self._waiting >= settings.AI_QUOTA_MAX_QUEUE:
+            self.stats_counters["rejected_saturated"] += 1
+            raise AIQuotaExceeded("AI analysis is at capacity. Please try again shortly.", 503, 5)
+
+        self._waiting += 1
+        queued = False
+        slot_taken = False
+        try:
+            if hold_slot:
+                if self._semaphore().locked():
+                    queued = True
+                try:
+                    await asyncio.wait_for(self._semaphore().acquire(), timeout=max(0.0, deadline - loop.time()))
+                except asyncio.TimeoutError:
+                    self.stats_counters["rejected_saturated"] += 1
+                    raise AIQuotaExceeded("AI analysis is at capacity. Please try again shortly.", 503, 5)
+                slot_taken = True
+
+            while True:
+                result = await rate_limiter.check(client_id, rules, units)
+                if result.allowed:
+                    break
+                user_status = result.rules[0]
+                if user_status.exceeded:
+                    self.stats_counters["rejected_user"] += 1
+                    raise AIQuotaExceeded(
+                        f"AI usage quota exceeded ({user_status.limit} units per hour). "
+                        f"This request needs {units} units.",
+                        429,
+                        user_status.retry_after,
+                    )
+                # Shared budget exhausted - wait for it to refill if that fits in the deadline
+                remaining = deadline - loop.time()
+                if result.retry_after > remaining:
+                    self.stats_counters["rejected_saturated"] += 1
+                    raise AIQuotaExceeded("AI analysis is at capacity. Please try again shortly.", 503, result.retry_after)
+                queued = True
+                await asyncio.sleep(max(0.05, min(result.retry_after, remaining)))
+        except BaseException:
+            if slot_taken:
+                self._release_slot()
+            raise
+        finally:
+            self._waiting -= 1
+
+        self.stats_counters["admitted"] += 1
+        self.stats_counters["units_charged"] += units
+        if queued:
+            self.stats_counters["queued"] += 1
+        return Admission(
+            cost=CostEstimate(units=units, breakdown=cost.breakdown),
+            waited_ms=(loop.time() - started) * 1000,
+            queued=queued,
+            _quota=self if slot_taken else None,
+        )
+
+    def stats(self) -> Dict[str, Any]:
+        slots = self._slots
+        return {
+            **self.stats_counters,
+            "max_concurrent": self._max_concurrent,
+            "in_flight": self._max_concurrent - slots._value if slots is not None else 0,
+            "waiting": self._waiting,
+        }
+
+
+ai_quota = AIQuota()
@@ -0,0 +1,273 @@
+"""
+Job store for queued /enhanced-analyze runs.
+
+A submit request ingests the photos, stores them with the form fields in
+Redis and returns a job id. A Celery worker (or, without a broker, an
+in-process task) runs the analysis and appends stage events as it goes:
+
+    queued -> running -> images_ingested -> vision_done / market_done
+           -> listing_formatted -> completed | failed
+
+Clients either poll the job or follow the event list over Server-Sent
+Events. Every key expires after ``ANALYSIS_JOB_TTL_SEC``.
+
+The analysis code reports progress through :func:`report_progress`, which is
+a no-op outside a job, so the synchronous endpoint is unaffected.
+"""
+
+import asyncio
+import contextvars
+import json
+import logging
+import time
+import uuid
+from dataclasses import dataclass
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+
+from app.core.config import settings
+from app.services.image_ingestion import IngestedImage
+from app.services.redis_client import get_async_redis
+
+logger = logging.getLogger(__name__)
+
+KEY_PREFIX = "analysis:job"
+TERMINAL_STATUSES = ("completed", "failed")
+
+
+class JobStoreUnavailable(RuntimeError):
+    """Raised when Redis isn't reachable, so jobs can't be stored"""
+
+
+@dataclass
+class AnalysisJobContext:
+    """The job the current task is running, with its pre-ingested photos"""
+    job_id: str
+    images: Optional[List[IngestedImage]] = None
+
+
+_current_job: "contextvars.ContextVar[Optional[AnalysisJobContext]]" = contextvars.ContextVar(
+    "analysis_job", default=None
+)
+
+
+def current_job() -> Optional[AnalysisJobContext]:
+    return _current_job.get()
+
+
+def set_current_job(context: Optional[AnalysisJobContext]) -> contextvars.Token:
+    return _current_job.set(context)
+
+
+def reset_current_job(token: contextvars.Token) -> None:
+    _current_job.reset(token)
+
+
+def _meta_key(job_id: str) -> str:
+    return f"{KEY_PREFIX}:{job_id}"
+
+
+def _input_key(job_id: str) -> str:
+    return f"{KEY_PREFIX}:{job_id}:input"
+
+
+def _events_key(job_id: str) -> str:
+    return f"{KEY_PREFIX}:{job_id}:events"
+
+
+async def _redis():
+    redis = await get_async_redis()
+    if redis is None:
+        raise JobStoreUnavailable("Redis is required for queued analysis jobs")
+    return redis
+
+
+def _image_to_dict(image: IngestedImage) -> Dict[str, Any]:
+    return {
+        "filename": image.filename,
+        "mime_type": image.mime_type,
+        "size_bytes": image.size_bytes,
+        "original_size_bytes": image.original_size_bytes,
+        "b64": image.b64_str,
+        "phash": image.phash,
+        "dhash": image.dhash,
+    }
+
+
+def _image_from_dict(data: Dict[str, Any]) -> IngestedImage:
+    return IngestedImage(
+        filename=data["filename"],
+        mime_type=data["mime_type"],
+        size_bytes=data["size_bytes"],
+        b64=data["b64"].encode("ascii"),
+        original_size_bytes=data.get("original_size_bytes", 0),
+        phash=data.get("phash"),
+        dhash=data.get("dhash"),
+    )
+
+
+async def create_job(form: Dict[str, Any], images: List[IngestedImage]) -> str:
+    """
+    Store a new job's inputs and mark it queued.
+
+    Args:
+        form: Form fields for ``enhanced_analyze_car``
+        images: Already-ingested photos
+
+    Returns:
+        The job id
+    """
+    redis = await _redis()
+    job_id = uuid.uuid4().hex
+    ttl = settings.ANALYSIS_JOB_TTL_SEC
+    now = time.time()
+
+    pipe = redis.pipeline()
+    pipe.hset(_meta_key(job_id), mapping={
+        "status": "queued",
+        "stage": "queued",
+        "images": len(images),
+        "created_at": now,
+        "updated_at": now,
+    })
+    pipe.expire(_meta_key(job_id), ttl)
+    pipe.set(_input_key(job_id), json.dumps({
+        "form": form,
+        "images": [_image_to_dict(image) for image in images],
+    }), ex=ttl)
+    pipe.rpush(_events_key(job_id), json.dumps({"stage": "queued", "status": "queued", "at": now}))
+    pipe.expire(_events_key(job_id), ttl)
+    await pipe.execute()
+    return job_id
+
+
+async def load_job_input(job_id: str) -> Tuple[Dict[str, Any], List[IngestedImage]]:
+    """Form fields and photos for a job (raises KeyError if expired/unknown)."""
+    redis = await _redis()
+    raw = await redis.get(_input_key(job_id))
+    if raw is None:
+        raise KeyError(f"Analysis job {job_id} has no stored input")
+    payload = json.loads(raw)
+    return payload["form"], [_image_from_dict(image) for image in payload["images"]]
+
+
+async def append_event(
+    job_id: str,
+    stage: str,
+    data: Optional[Dict[str, Any]] = None,
+    status: Optional[str] = None,
+) -> None:
+    """Record a stage transition on the job and its event list."""
+    redis = await _redis()
+    now = time.time()
+    event = {"stage": stage, "at": now}
+    if status:
+        event["status"] = status
+    if data:
+        event["data"] = data
+
+    meta = {"stage": stage, "updated_at": now}
+    if status:
+        meta["status"] = status
+
+    pipe = redis.pipeline()
+    pipe.hset(_meta_key(job_id), mapping=meta)
+    pipe.rpush(_events_key(job_id), json.dumps(event, default=str))
+    await pipe.execute()
+
+
+async def report_progress(stage: str, data: Optional[Dict[str, Any]] = None) -> None:
+    """Report a stage for the job running in this context; no-op outside a job."""
+    context = current_job()
+    if context is None:
+        return
+    try:
+        await append_event(context.job_id, stage, data)
+    except Exception as e:
+        # Progress is best-effort - never fail the analysis over it
+        logger.warning("[ANALYSIS-JOBS] Could not record stage '%s' for job %s: %s", stage, context.job_id, e)
+
+
+async def complete_job(job_id: str, result: Dict[str, Any]) -> None:
+    """Store the final result and mark the job completed."""
+    redis = await _redis()
+    await redis.hset(_meta_key(job_id), mapping={"result": json.dumps(result, default=str)})
+    await append_event(job_id, "completed", status="completed")
+    await redis.delete(_input_key(job_id))
+
+
+async def fail_job(job_id: str, error: str, status_code: int = 500) -> None:
+    """Mark the job failed with an error message."""
+    redis = await _redis()
+    await redis.hset(_meta_key(job_id), mapping={"error": error, "error_status_code": status_code})
+    await append_event(job_id, "failed", {"error": error, "status_code": status_code}, status="failed")
+    await redis.delete(_input_key(job_id))
+
+
+async def get_job(job_id: str) -> Optional[Dict[str, Any]]:
+    """Current job state (with ``result`` once completed), or None if unknown/expired."""
+    redis = await _redis()
+    meta = await redis.hgetall(_meta_key(job_id))
+    if not meta:
+        return None
+
+    job: Dict[str, Any] = {
+        "job_id": job_id,
+        "status": meta.get("status"),
+        "stage": meta.get("stage"),
+        "images": int(meta.get("images", 0)),
+        "created_at": float(meta.get("created_at", 0)),
+        "updated_at": float(meta.get("updated_at", 0)),
+    }
+    if "result" in meta:
+        job["result"] = json.loads(meta["result"])
+    if "error" in meta:
+        job["error"] = meta["error"]
+        job["error_status_code"] = int(meta.get("error_status_code", 500))
+    return job
+
+
+async def read_events(job_id: str, start: int = 0) -> List[Dict[str, Any]]:
+    """Events from index ``start`` onwards."""
+    redis = await _redis()
+    return [json.loads(event) for event in await redis.lrange(_events_key(job_id), start, -1)]
+
+
+def _sse(event: Dict[str, Any], event_id: int) -> str:
+    return f"id: {event_id}\nevent: {event['stage']}\ndata: {json.dumps(event, default=str)}\n\n"
+
+
+async def stream_job_events(
+    job_id: str,
+    start: int = 0,
+    poll_interval: float = 0.5,
+    heartbeat_sec: float = 15.0,
+) -> AsyncIterator[str]:
+    """
+    Server-Sent Events for a job: replays past stages, then follows new ones.
+
+    Ends after the ``completed``/``failed`` event (the completed event carries
+    the result). Comment heartbeats keep proxies from closing idle streams.
+    """
+    loop = asyncio.get_running_loop()
+    cursor = start
+    last_sent = loop.time()
+    while True:
+        events = await read_events(job_id, cursor)
+        for event in events:
+            if event.get("stage") == "completed":
+                job = await get_job(job_id)
+                event = {**event, "result": (job or {}).get("result")}
+            yield _sse(event, cursor)
+            cursor += 1
+            last_sent = loop.time()
+            if event.get("status") in TERMINAL_STATUSES:
+                return
+
+        if not events:
+            if not await (await _redis()).exists(_meta_key(job_id)):
+                yield _sse({"stage": "failed", "status": "failed", "data": {"error": "Job expired or not found"}}, cursor)
+                return
+            if loop.time() - last_sent >= heartbeat_sec:
+                yield ": keep-alive\n\n"
+                last_sent = loop.time()
+        await asyncio.sleep(poll_interval)
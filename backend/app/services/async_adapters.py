@@ -0,0 +1,206 @@
+"""
+Event-loop-safe adapters for blocking SDK calls.
+
+Rules for code on the request path:
+
+- Prefer native async clients: ``async_openai_client()`` for OpenAI (shares
+  the pooled "openai" HTTP client), ``http_clients`` for raw HTTP.
+- Anything still synchronous (Supabase ``.execute()``, simulated/legacy
+  services, CPU-bound helpers) goes through ``run_blocking`` /
+  ``supabase_execute``. These run on bounded, named thread pools so one slow
+  dependency can't starve the others (or the default executor).
+
+``LoopLagMonitor`` watches the event loop from a side thread. When the loop
+hasn't ticked for longer than ``LOOP_LAG_WARN_MS`` it logs the loop thread's
+current stack, pointing at the call that is blocking every other request.
+"""
+
+import asyncio
+import contextvars
+import functools
+import logging
+import os
+import sys
+import threading
+import time
+import traceback
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Deque, Dict, Optional, TypeVar
+
+from app.core.config import settings
+from app.services.instrumentation import span
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# Pool name -> max worker threads (unknown names get BLOCKING_IO_WORKERS)
+POOL_SIZES: Dict[str, int] = {
+    "supabase": 16,
+    "sdk": 8,
+    "listings_store": 2,
+    "db": 4,
+}
+
+# Pools whose calls leave the process (traced as upstream calls)
+UPSTREAM_POOLS = ("supabase", "sdk")
+
+_pools: Dict[str, ThreadPoolExecutor] = {}
+_pools_lock = threading.Lock()
+
+
+def get_blocking_pool(name: str = "default") -> ThreadPoolExecutor:
+    """Named, bounded thread pool for blocking calls (created on first use)."""
+    pool = _pools.get(name)
+    if pool is None:
+        with _pools_lock:
+            pool = _pools.get(name)
+            if pool is None:
+                workers = POOL_SIZES.get(name) or settings.BLOCKING_IO_WORKERS or min(32, (os.cpu_count() or 1) + 4)
+                pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix=f"blocking-{name}")
+                _pools[name] = pool
+    return pool
+
+
+async def run_blocking(fn: Callable[..., T], *args: Any, pool: str = "default", **kwargs: Any) -> T:
+    """
+    Run a synchronous callable on a bounded thread pool and await its result.
+
+    Context variables (e.g. the current analysis job) are propagated, and the
+    call is timed as a ``blocking.<pool>`` span.
+
+    Args:
+        fn: Blocking callable
+        pool: Pool name (see ``POOL_SIZES``)
+    """
+    loop = asyncio.get_running_loop()
+    with span(f"blocking.{pool}", kind="upstream" if pool in UPSTREAM_POOLS else "blocking",
+              fn=getattr(fn, "__qualname__", type(fn).__name__)):
+        context = contextvars.copy_context()
+        call = functools.partial(context.run, fn, *args, **kwargs)
+        return await loop.run_in_executor(get_blocking_pool(pool), call)
+
+
+async def supabase_execute(query: Any) -> Any:
+    """Await a Supabase/PostgREST query builder's blocking ``.execute()``."""
+    return await run_blocking(query.execute, pool="supabase")
+
+
+def async_openai_client(api_key: Optional[str] = None):
+    """
+    Native async OpenAI client on the shared pooled "openai" connection pool.
+
+    Raises:
+        RuntimeError: if no API key is configured
+    """
+    import openai
+
+    from app.services.http_clients import http_clients
+
+    api_key = api_key or settings.OPENAI_API_KEY or os.getenv("OPENAI_API_KEY")
+    if not api_key:
+        raise RuntimeError("OPENAI_API_KEY is not configured")
+    return openai.AsyncOpenAI(api_key=api_key, http_client=http_clients.httpx_client("openai"))
+
+
+class LoopLagMonitor:
+    """
+    Detects event-loop stalls and reports what was blocking.
+
+    A heartbeat coroutine stamps the time every ``interval`` seconds; a
+    watchdog thread checks the stamp and, if it's older than the threshold,
+    captures the loop thread's stack (once per stall).
+    """
+
+    def __init__(self, threshold_ms: float = 250.0, interval: float = 0.1, history: int = 20):
+        self.threshold = threshold_ms / 1000.0
+        self.interval = interval
+        self._last_beat = time.monotonic()
+        self._loop_thread_id: Optional[int] = None
+        self._heartbeat_task: Optional[asyncio.Task] = None
+        self._watchdog: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+        self._stall_reported = False
+        self.stats: Dict[str, Any] = {"stalls": 0, "max_lag_ms": 0.0, "last_lag_ms": 0.0}
+        self.recent_stalls: Deque[Dict[str, Any]] = deque(maxlen=history)
+
+    async def _heartbeat(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            expected = loop.time() + self.interval
+            await asyncio.sleep(self.interval)
+            lag = max(0.0, loop.time() - expected)
+            lag_ms = round(lag * 1000, 1)
+            self.stats["last_lag_ms"] = lag_ms
+            if lag_ms > self.stats["max_lag_ms"]:
+                self.stats["max_lag_ms"] = lag_ms
+            if lag >= self.threshold and self.recent_stalls and self._stall_reported:
+                # Watchdog already captured the stack; record the final duration
+                self.recent_stalls[-1]["lag_ms"] = lag_ms
+            self._stall_reported = False
+            self._last_beat = time.monotonic()
+
+    def _watch(self) -> None:
+        while not self._stop.wait(self.interval):
+            stalled_for = time.monotonic() - self._last_beat - self.interval
+            if stalled_for < self.threshold or self._stall_reported:
+                continue
+            self._stall_reported = True
+            frame = sys._current_frames().get(self._loop_thread_id)
+            stack = "".join(traceback.format_stack(frame, limit=12)) if frame else "<unavailable>"
+            self.stats["stalls"] += 1
+            self.recent_stalls.append({
+                "at": time.time(),
+                "lag_ms": round(stalled_for * 1000, 1),
+                "stack": stack,
+            })
+            logger.warning(
+                f"Event loop blocked for >{stalled_for * 1000:.0f}ms (threshold {self.threshold * 1000:.0f}ms). "
+                f"Loop thread is in:\n{stack}"
+            )
+
+    def start(self) -> None:
+        """Start monitoring the running loop (call from inside it)."""
+        if self._heartbeat_task is not None:
+            return
+        self._loop_thread_id = threading.get_ident()
+        self._last_beat = time.monotonic()
+        self._stop.clear()
+        self._heartbeat_task = asyncio.get_running_loop().create_task(self._heartbeat())
+        self._watchdog = threading.Thread(target=self._watch, name="loop-lag-watchdog", daemon=True)
+        self._watchdog.start()
+        logger.info(f"Event loop lag monitor started (threshold {self.threshold * 1000:.0f}ms)")
+
+    async def stop(self) -> None:
+        self._stop.set()
+        if self._heartbeat_task is not None:
+            self._heartbeat_task.cancel()
+            try:
+                await self._heartbeat_task
+            except asyncio.CancelledError:
+                pass
+            self._heartbeat_task = None
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Lag counters, recent stalls and blocking-pool usage."""
+        return {
+            "threshold_ms": round(self.threshold * 1000, 1),
+            **self.stats,
+            "recent_stalls": list(self.recent_stalls),
+            "blocking_pools": {
+                name: {"max_workers": pool._max_workers, "queued": pool._work_queue.qsize()}
+                for name, pool in _pools.items()
+            },
+        }
+
+
+loop_lag_monitor = LoopLagMonitor(threshold_ms=settings.LOOP_LAG_WARN_MS)
+
+
+async def shutdown_blocking_pools() -> None:
+    """Stop the lag monitor and release pool threads (app shutdown)."""
+    await loop_lag_monitor.stop()
+    for pool in list(_pools.values()):
+        pool.shutdown(wait=False, cancel_futures=True)
+    _pools.clear()
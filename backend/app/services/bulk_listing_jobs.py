@@ -0,0 +1,463 @@
+"""
+Bulk AI listing generation for dealer inventory.
+
+``generate_listings`` runs ``CarListingGenerator.generate_car_listing`` over
+many inventory items with a bounded worker pool (``BULK_LISTING_CONCURRENCY``):
+
+- each upstream provider the generator calls is rate limited through the
+  shared sliding-window limiter (``BULK_LISTING_PROVIDER_RPM``, per minute,
+  across workers and processes when Redis is available);
+- a failed item is retried with exponential backoff and jitter up to
+  ``BULK_LISTING_MAX_ATTEMPTS`` times while the other workers keep going;
+- finished listings are committed every ``BULK_LISTING_COMMIT_BATCH`` items,
+  so a crash loses at most one batch.
+
+Large lots run as background jobs (Celery, or an in-process task without a
+broker). Job state lives in Redis: counters for progress, and the state of
+every item, so ``resume`` picks up where a crashed or partially failed run
+stopped instead of starting over.
+"""
+
+import asyncio
+import json
+import logging
+import random
+import time
+import uuid
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Sequence
+
+from app.core.config import settings
+from app.middleware.rate_limiting import RateLimitRule, rate_limiter
+from app.services.analysis_jobs import JobStoreUnavailable
+from app.services.async_adapters import run_blocking
+from app.services.redis_client import get_async_redis
+
+logger = logging.getLogger(__name__)
+
+KEY_PREFIX = "inventory:bulk_listing"
+TERMINAL_STATUSES = ("completed", "failed")
+LOCK_TTL_SEC = 300
+LOCK_HEARTBEAT_SEC = LOCK_TTL_SEC / 3
+
+# Compare-and-delete / compare-and-extend: a runner only touches the lock while it still owns it
+_RELEASE_LOCK_SCRIPT = """
+if redis.call('get', KEYS[1]) == ARGV[1] then
+    return redis.call('del', KEYS[1])
+end
+return 0
+"""
+_EXTEND_LOCK_SCRIPT = """
+if redis.call('get', KEYS[1]) == ARGV[1] then
+    return redis.call('expire', KEYS[1], ARGV[2])
+end
+return 0
+"""
+
+# Fields copied off InventoryItem rows before the workers start (no ORM access off the request thread)
+ITEM_FIELDS = ("id", "vin", "year", "make", "model", "mileage", "price", "title_status", "description")
+
+_inline_job_tasks: set = set()
+
+
+@dataclass
+class BulkItemResult:
+    """Outcome of one inventory item"""
+    item_id: str
+    vin: Optional[str]
+    make: Optional[str]
+    model: Optional[str]
+    success: bool
+    attempts: int
+    elapsed_ms: float = 0.0
+    error: Optional[str] = None
+    listing: Optional[Dict[str, Any]] = field(default=None, repr=False)
+
+    def to_dict(self) -> Dict[str, Any]:
+        result = {
+            "item_id": self.item_id,
+            "vin": self.vin,
+            "make": self.make,
+            "model": self.model,
+            "success": self.success,
+            "attempts": self.attempts,
+        }
+        if self.error:
+            result["error"] = self.error
+        return result
+
+
+def snapshot_item(item: Any) -> Dict[str, Any]:
+    """Plain dict of the InventoryItem fields the generator needs."""
+    return {name: getattr(item, name, None) for name in ITEM_FIELDS}
+
+
+def upstream_providers(generator: Any, has_images: bool = False) -> List[str]:
+    """Providers ``generate_car_listing`` calls for an item (vision/market with photos, copywriting always)."""
+    providers = []
+    if has_images:
+        if generator.gemini_api_key:
+            providers.append("gemini")
+        elif generator.openai_api_key:
+            providers.append("openai")
+    if generator.openai_api_key and "openai" not in providers:
+        providers.append("openai")
+    return providers
+
+
+async def wait_for_providers(providers: Sequence[str]) -> None:
+    """Block until every provider has request budget left this minute (budgets are shared by all workers)."""
+    rules = []
+    for provider in providers:
+        limit = settings.BULK_LISTING_PROVIDER_RPM.get(provider, 0)
+        if limit:
+            rules.append((RateLimitRule(f"bulk_{provider}", limit, 60, scope=f"upstream:{provider}"), limit))
+    if not rules:
+        return
+    while True:
+        result = await rate_limiter.check("bulk-listing", rules, 1)
+        if result.allowed:
+            return
+        # Spread waiting workers out so they don't all retry on the same tick
+        await asyncio.sleep(max(0.05, result.retry_after) * random.uniform(1.0, 1.25))
+
+
+def backoff_delay(attempt: int) -> float:
+    """Exponential backoff with jitter for retry number ``attempt`` (1-based)."""
+    ceiling = min(settings.BULK_LISTING_RETRY_MAX_SEC, settings.BULK_LISTING_RETRY_BASE_SEC * (2 ** (attempt - 1)))
+    return random.uniform(ceiling / 2, ceiling)
+
+
+async def _generate_one(generator: Any, item: Dict[str, Any], location: str) -> BulkItemResult:
+    started = time.perf_counter()
+    car_details = {name: item.get(name) for name in ITEM_FIELDS if name != "id"}
+    providers = upstream_providers(generator)
+    error = None
+    attempt = 0
+    for attempt in range(1, settings.BULK_LISTING_MAX_ATTEMPTS + 1):
+        try:
+            await wait_for_providers(providers)
+            listing = await asyncio.wait_for(
+                generator.generate_car_listing(images=[], car_details=car_details, location=location),
+                timeout=settings.BULK_LISTING_ITEM_TIMEOUT_SEC,
+            )
+            if listing.get("success", True):
+                return BulkItemResult(
+                    item["id"], item.get("vin"), item.get("make"), item.get("model"),
+                    True, attempt, (time.perf_counter() - started) * 1000, listing=listing,
+                )
+            error = listing.get("error") or "Listing generation failed"
+        except asyncio.TimeoutError:
+            error = f"Timed out after {settings.BULK_LISTING_ITEM_TIMEOUT_SEC}s"
+        except Exception as e:
+            error = str(e) or type(e).__name__
+
+        if attempt < settings.BULK_LISTING_MAX_ATTEMPTS:
+            delay = backoff_delay(attempt)
+            logger.warning(f"Listing for inventory item {item['id']} failed (attempt {attempt}): {error}; retrying in {delay:.1f}s")
+            await asyncio.sleep(delay)
+
+    return BulkItemResult(
+        item["id"], item.get("vin"), item.get("make"), item.get("model"),
+        False, attempt, (time.perf_counter() - started) * 1000, error=error,
+    )
+
+
+def _save_listings_sync(results: List[BulkItemResult]) -> None:
+    from app.core.database import SessionLocal
+    from app.models.inventory import InventoryItem
+
+    if SessionLocal is None:
+        raise RuntimeError("Database is not configured")
+    now = datetime.utcnow()
+    db = SessionLocal()
+    try:
+        for result in results:
+            db.query(InventoryItem).filter(InventoryItem.id == result.item_id).update(
+                {
+                    InventoryItem.ai_generated_listing: json.dumps(result.listing),
+                    InventoryItem.listing_generated_at: now,
+                },
+                synchronize_session=False,
+            )
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+
+async def save_listings(results: List[BulkItemResult]) -> None:
+    """Commit the successful listings of one batch in a single transaction."""
+    succeeded = [result for result in results if result.success]
+    if succeeded:
+        await run_blocking(_save_listings_sync, succeeded, pool="db")
+
+
+async def generate_listings(
+    items: List[Dict[str, Any]],
+    location: str = "United States",
+    checkpoint: Optional[Callable[[List[BulkItemResult]], Awaitable[None]]] = None,
+    generator: Any = None,
+) -> List[BulkItemResult]:
+    """
+    Generate listings for inventory items with bounded concurrency, committing in batches.
+
+    Args:
+        items: Item snapshots (see ``snapshot_item``)
+        location: Location for market analysis
+        checkpoint: Called with each finished batch after it is committed (progress/job state)
+        generator: CarListingGenerator to use (one is created if omitted)
+
+    Returns:
+        Per-item results in completion order
+    """
+    if generator is None:
+        from app.services.car_listing_generator import CarListingGenerator
+        generator = CarListingGenerator()
+
+    queue: asyncio.Queue = asyncio.Queue()
+    for item in items:
+        queue.put_nowait(item)
+    results: List[BulkItemResult] = []
+    uncommitted: List[BulkItemResult] = []
+    commit_lock = asyncio.Lock()
+
+    async def commit() -> None:
+        async with commit_lock:
+            if not uncommitted:
+                return
+            batch = uncommitted[:]
+            del uncommitted[:]
+            await save_listings(batch)
+            if checkpoint is not None:
+                await checkpoint(batch)
+
+    async def worker() -> None:
+        while True:
+            try:
+                item = queue.get_nowait()
+            except asyncio.QueueEmpty:
+                return
+            result = await _generate_one(generator, item, location)
+            results.append(result)
+            uncommitted.append(result)
+            if len(uncommitted) >= settings.BULK_LISTING_COMMIT_BATCH:
+                await commit()
+
+    workers = [asyncio.create_task(worker()) for _ in range(min(settings.BULK_LISTING_CONCURRENCY, len(items)))]
+    try:
+        await asyncio.gather(*workers)
+    finally:
+        for task in workers:
+            task.cancel()
+    await commit()
+    return results
+
+
+# ---- background jobs ----
+
+def _meta_key(job_id: str) -> str:
+    return f"{KEY_PREFIX}:{job_id}"
+
+
+def _items_key(job_id: str) -> str:
+    return f"{KEY_PREFIX}:{job_id}:items"
+
+
+def _lock_key(job_id: str) -> str:
+    return f"{KEY_PREFIX}:{job_id}:lock"
+
+
+async def _redis():
+    redis = await get_async_redis()
+    if redis is None:
+        raise JobStoreUnavailable("Redis is required for background bulk listing jobs")
+    return redis
+
+
+async def create_job(dealer_id: str, item_ids: List[str], location: str) -> str:
+    """
+    Record a bulk listing job for ``item_ids`` and mark it queued.
+
+    Returns:
+        The job id
+    """
+    redis = await _redis()
+    job_id = uuid.uuid4().hex
+    ttl = settings.BULK_LISTING_JOB_TTL_SEC
+    now = time.time()
+    pipe = redis.pipeline()
+    pipe.hset(_meta_key(job_id), mapping={
+        "status": "queued",
+        "dealer_id": dealer_id,
+        "location": location,
+        "item_ids": json.dumps(item_ids),
+        "total": len(item_ids),
+        "succeeded": 0,
+        "failed": 0,
+        "created_at": now,
+        "updated_at": now,
+    })
+    pipe.expire(_meta_key(job_id), ttl)
+    await pipe.execute()
+    return job_id
+
+
+async def _record_batch(job_id: str, batch: List[BulkItemResult]) -> None:
+    redis = await _redis()
+    ttl = settings.BULK_LISTING_JOB_TTL_SEC
+    pipe = redis.pipeline()
+    pipe.hset(_items_key(job_id), mapping={
+        result.item_id: json.dumps({
+            "status": "done" if result.success else "failed",
+            "attempts": result.attempts,
+            "error": result.error,
+        })
+        for result in batch
+    })
+    pipe.expire(_items_key(job_id), ttl)
+    succeeded = sum(1 for result in batch if result.success)
+    pipe.hincrby(_meta_key(job_id), "succeeded", succeeded)
+    pipe.hincrby(_meta_key(job_id), "failed", len(batch) - succeeded)
+    pipe.hset(_meta_key(job_id), "updated_at", time.time())
+    await pipe.execute()
+
+
+async def get_job(job_id: str) -> Optional[Dict[str, Any]]:
+    """Job status and progress, with the failed items, or None if unknown/expired."""
+    redis = await _redis()
+    meta = await redis.hgetall(_meta_key(job_id))
+    if not meta:
+        return None
+    total = int(meta.get("total", 0))
+    succeeded = int(meta.get("succeeded", 0))
+    failed = int(meta.get("failed", 0))
+    states = await redis.hgetall(_items_key(job_id))
+    failures = []
+    for item_id, raw in states.items():
+        state = json.loads(raw)
+        if state["status"] == "failed":
+            failures.append({"item_id": item_id, "attempts": state["attempts"], "error": state["error"]})
+    job = {
+        "job_id": job_id,
+        "status": meta.get("status"),
+        "dealer_id": meta.get("dealer_id"),
+        "running": bool(await redis.exists(_lock_key(job_id))),
+        "progress": {
+            "total": total,
+            "succeeded": succeeded,
+            "failed": failed,
+            "remaining": max(0, total - succeeded - failed),
+            "percent": round((succeeded + failed) / total * 100, 1) if total else 100.0,
+        },
+        "failures": failures,
+        "created_at": float(meta.get("created_at", 0)),
+        "updated_at": float(meta.get("updated_at", 0)),
+    }
+    if "error" in meta:
+        job["error"] = meta["error"]
+    return job
+
+
+async def prepare_resume(job_id: str) -> bool:
+    """
+    Queue a stopped job's failed items for another pass.
+
+    Returns:
+        False if the job is currently running (a runner holds its lock)
+    """
+    redis = await _redis()
+    if await redis.exists(_lock_key(job_id)):
+        return False
+    states = await redis.hgetall(_items_key(job_id))
+    failed = [item_id for item_id, raw in states.items() if json.loads(raw)["status"] == "failed"]
+    pipe = redis.pipeline()
+    if failed:
+        pipe.hdel(_items_key(job_id), *failed)
+        pipe.hincrby(_meta_key(job_id), "failed", -len(failed))
+    pipe.hset(_meta_key(job_id), mapping={"status": "queued", "updated_at": time.time()})
+    pipe.hdel(_meta_key(job_id), "error")
+    await pipe.execute()
+    return True
+
+
+async def _keep_lock(job_id: str, token: str) -> None:
+    """Extend the run lock every LOCK_HEARTBEAT_SEC while this runner still owns it."""
+    redis = await _redis()
+    while True:
+        await asyncio.sleep(LOCK_HEARTBEAT_SEC)
+        try:
+            if not await redis.eval(_EXTEND_LOCK_SCRIPT, 1, _lock_key(job_id), token, LOCK_TTL_SEC):
+                logger.warning("Bulk listing job %s lost its run lock", job_id)
+                return
+        except Exception as e:
+            logger.warning("Could not extend the run lock of bulk listing job %s: %s", job_id, e)
+
+
+async def run_job(job_id: str) -> None:
+    """Run (or continue) a bulk listing job; items already done are skipped."""
+    redis = await _redis()
+    token = uuid.uuid4().hex
+    if not await redis.set(_lock_key(job_id), token, nx=True, ex=LOCK_TTL_SEC):
+        logger.info(f"Bulk listing job {job_id} is already running")
+        return
+    heartbeat = asyncio.create_task(_keep_lock(job_id, token))
+    try:
+        meta = await redis.hgetall(_meta_key(job_id))
+        if not meta:
+            logger.warning(f"Bulk listing job {job_id} is unknown or expired")
+            return
+        await redis.hset(_meta_key(job_id), mapping={"status": "running", "updated_at": time.time()})
+
+        states = await redis.hgetall(_items_key(job_id))
+        item_ids = [item_id for item_id in json.loads(meta["item_ids"]) if item_id not in states]
+        items = await run_blocking(_load_items_sync, meta["dealer_id"], item_ids, pool="db")
+        logger.info(f"Bulk listing job {job_id}: {len(items)} of {meta.get('total')} items to generate")
+
+        await generate_listings(items, meta.get("location") or "United States", checkpoint=lambda batch: _record_batch(job_id, batch))
+        await redis.hset(_meta_key(job_id), mapping={"status": "completed", "updated_at": time.time()})
+    except Exception as e:
+        logger.error(f"Bulk listing job {job_id} failed: {e}")
+        await redis.hset(_meta_key(job_id), mapping={"status": "failed", "error": str(e), "updated_at": time.time()})
+    finally:
+        heartbeat.cancel()
+        await redis.eval(_RELEASE_LOCK_SCRIPT, 1, _lock_key(job_id), token)
+
+
+def _load_items_sync(dealer_id: str, item_ids: List[str]) -> List[Dict[str, Any]]:
+    from app.core.database import SessionLocal
+    from app.models.inventory import InventoryItem
+
+    if not item_ids:
+        return []
+    if SessionLocal is None:
+        raise RuntimeError("Database is not configured")
+    db = SessionLocal()
+    try:
+        rows = db.query(InventoryItem).filter(
+            InventoryItem.dealer_id == dealer_id,
+            InventoryItem.id.in_(item_ids),
+        ).all()
+        return [snapshot_item(row) for row in rows]
+    finally:
+        db.close()
+
+
+async def enqueue_job(job_id: str) -> str:
+    """Hand the job to Celery; fall back to an in-process task if the broker is unavailable."""
+    if not settings.BULK_LISTING_JOBS_INLINE:
+        try:
+            from app.services.tasks import run_bulk_listing_job_task
+            # apply_async talks to the broker synchronously - keep it off the event loop
+            await asyncio.to_thread(run_bulk_listing_job_task.apply_async, args=[job_id], retry=False)
+            return "celery"
+        except Exception as e:
+            logger.warning(f"Celery unavailable, running bulk listing job {job_id} in-process: {e}")
+
+    task = asyncio.create_task(run_job(job_id))
+    _inline_job_tasks.add(task)
+    task.add_done_callback(_inline_job_tasks.discard)
+    return "inline"
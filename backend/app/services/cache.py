@@ -1,16 +1,26 @@
 """
-Simple in-memory cache for market intelligence queries.
+Two-tier cache for market intelligence queries.
 
 Reduces duplicate API calls by caching results based on normalized query keys.
-Uses Redis if available, otherwise falls back to in-memory cache.
+
+Layers:
+- L1: bounded in-process LRU (per worker, microsecond lookups)
+- L2: Redis (shared across uvicorn workers and restarts), used when available
+
+Keys are content hashes (blake2b) of the normalized payload so they are
+identical across processes - Python's built-in ``hash()`` is salted per
+process and must not be used for shared cache keys.
 """
 
 import time
 import json
 import os
+import hashlib
+import threading
+from collections import OrderedDict
 from typing import Any, Dict, Tuple, Optional
 
-# Try to use Redis if available, otherwise use in-memory cache
+# Try to use Redis if available, otherwise use in-memory cache only
 _USE_REDIS = False
 _redis_client = None
 
@@ -19,7 +29,7 @@ try:
     redis_host = os.getenv("REDIS_HOST", "localhost")
     redis_port = int(os.getenv("REDIS_PORT", 6379))
     redis_password = os.getenv("REDIS_PASSWORD")
-    
+
     _redis_client = redis.Redis(
         host=redis_host,
         port=redis_port,
@@ -36,127 +46,255 @@ except Exception as e:
     _redis_client = None
     print(f"[CACHE] ⚠️  Redis not available, using in-memory cache: {e}")
 
-# In-memory cache: key -> (timestamp, value) (fallback)
-_CACHE: Dict[str, Tuple[float, Any]] = {}
+# Bump when the normalized payload shape changes so stale entries are ignored
+KEY_VERSION = "v2"
+
+# Default TTL when no explicit TTL is passed (15 minutes)
+DEFAULT_TTL_SEC = 900
+
+# Size bound for the in-process LRU layer
+L1_MAX_ENTRIES = int(os.getenv("CACHE_L1_MAX_ENTRIES", 512))
+
+# Mileage is bucketed so 84,200 and 86,900 miles share a cache entry
+MILEAGE_BUCKET_SIZE = int(os.getenv("CACHE_MILEAGE_BUCKET", 5000))
+
+# Per analysis_type TTLs in seconds. Override with CACHE_TTL_<ANALYSIS_TYPE>,
+# e.g. CACHE_TTL_PRICING_ANALYSIS=3600
+_DEFAULT_ANALYSIS_TTLS: Dict[str, int] = {
+    "comprehensive": 6 * 3600,
+    "pricing_analysis": 6 * 3600,
+    "make_model_analysis": 24 * 3600,
+    "competitor_research": 2 * 3600,
+    "threshold_setting": 24 * 3600,
+}
+
+
+class _LRUCache:
+    """Thread-safe, size-bounded LRU with per-entry expiry."""
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max(1, max_entries)
+        # key -> (stored_at, expires_at, value)
+        self._data: "OrderedDict[str, Tuple[float, float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str, max_age: Optional[int] = None) -> Tuple[bool, Any]:
+        now = time.time()
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                return False, None
+            stored_at, expires_at, value = item
+            if now >= expires_at or (max_age is not None and now - stored_at > max_age):
+                del self._data[key]
+                _STATS["expirations"] += 1
+                return False, None
+            self._data.move_to_end(key)
+            return True, value
+
+    def set(self, key: str, value: Any, ttl_sec: int) -> None:
+        now = time.time()
+        with self._lock:
+            self._data[key] = (now, now + ttl_sec, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+                _STATS["evictions"] += 1
+
+    def pop(self, key: str) -> None:
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
 
+_STATS: Dict[str, int] = {
+    "l1_hits": 0,
+    "l2_hits": 0,
+    "misses": 0,
+    "sets": 0,
+    "evictions": 0,
+    "expirations": 0,
+    "redis_errors": 0,
+}
 
-def cache_get(key: str, ttl_sec: int = 900) -> Optional[Any]:
+_L1 = _LRUCache(L1_MAX_ENTRIES)
+
+
+def ttl_for_analysis_type(analysis_type: Optional[str]) -> int:
+    """
+    Resolve the cache TTL for a market intelligence analysis type.
+
+    Args:
+        analysis_type: e.g. "comprehensive", "pricing_analysis"
+
+    Returns:
+        TTL in seconds (0 disables caching for that type)
+    """
+    analysis_type = (analysis_type or "comprehensive").lower().strip()
+    env_override = os.getenv(f"CACHE_TTL_{analysis_type.upper()}")
+    if env_override is not None:
+        try:
+            return max(0, int(env_override))
+        except ValueError:
+            print(f"[CACHE] ⚠️  Ignoring invalid CACHE_TTL_{analysis_type.upper()}={env_override!r}")
+    return _DEFAULT_ANALYSIS_TTLS.get(analysis_type, DEFAULT_TTL_SEC)
+
+
+def cache_get(key: str, ttl_sec: Optional[int] = None) -> Optional[Any]:
     """
     Get cached value if it exists and hasn't expired.
-    
+
+    Checks the in-process LRU first, then Redis. Redis hits are promoted
+    into the LRU for the remainder of their Redis TTL.
+
     Args:
         key: Cache key
-        ttl_sec: Time-to-live in seconds (default: 15 minutes)
-        
+        ttl_sec: Optional maximum age in seconds for in-process entries
+            (entries already expire using the TTL given to ``cache_set``)
+
     Returns:
         Cached value or None if not found/expired
     """
+    found, value = _L1.get(key, max_age=ttl_sec)
+    if found:
+        _STATS["l1_hits"] += 1
+        return value
+
     if _USE_REDIS and _redis_client:
         try:
-            cached = _redis_client.get(key)
+            pipe = _redis_client.pipeline()
+            pipe.get(key)
+            pipe.ttl(key)
+            cached, remaining = pipe.execute()
             if cached:
-                return json.loads(cached)
-            return None
+                value = json.loads(cached)
+                if remaining and remaining > 0:
+                    _L1.set(key, value, remaining)
+                _STATS["l2_hits"] += 1
+                return value
         except Exception as e:
-            print(f"[CACHE] ⚠️  Redis get failed, falling back to memory: {e}")
-            # Fall through to in-memory cache
-    
-    # In-memory cache fallback
-    item = _CACHE.get(key)
-    if not item:
-        return None
-    
-    timestamp, value = item
-    if time.time() - timestamp > ttl_sec:
-        # Expired - remove it
-        _CACHE.pop(key, None)
-        return None
-    
-    return value
+            _STATS["redis_errors"] += 1
+            print(f"[CACHE] ⚠️  Redis get failed, using memory only: {e}")
 
+    _STATS["misses"] += 1
+    return None
 
-def cache_set(key: str, value: Any, ttl_sec: int = 900) -> None:
+
+def cache_set(key: str, value: Any, ttl_sec: int = DEFAULT_TTL_SEC) -> None:
     """
-    Set a cached value.
-    
+    Set a cached value in both layers.
+
     Args:
         key: Cache key
-        value: Value to cache
-        ttl_sec: Time-to-live in seconds (default: 15 minutes)
+        value: JSON-serializable value to cache
+        ttl_sec: Time-to-live in seconds (default: 15 minutes, <= 0 skips caching)
     """
+    if ttl_sec <= 0:
+        return
+
+    _STATS["sets"] += 1
+    _L1.set(key, value, ttl_sec)
+
     if _USE_REDIS and _redis_client:
         try:
-            _redis_client.setex(key, ttl_sec, json.dumps(value))
-            return
+            _redis_client.setex(key, ttl_sec, json.dumps(value, default=str))
         except Exception as e:
-            print(f"[CACHE] ⚠️  Redis set failed, falling back to memory: {e}")
-            # Fall through to in-memory cache
-    
-    # In-memory cache fallback
-    _CACHE[key] = (time.time(), value)
+            _STATS["redis_errors"] += 1
+            print(f"[CACHE] ⚠️  Redis set failed, cached in memory only: {e}")
 
 
 def cache_clear(key: Optional[str] = None) -> None:
     """
     Clear cache entry or all cache.
-    
+
     Args:
         key: Specific key to clear, or None to clear all
     """
+    if key:
+        _L1.pop(key)
+    else:
+        _L1.clear()
+
     if _USE_REDIS and _redis_client:
         try:
             if key:
                 _redis_client.delete(key)
             else:
-                _redis_client.flushdb()
-            return
+                # Only drop our own keys - the Redis DB may be shared (Celery, rate limits)
+                for redis_key in _redis_client.scan_iter(match=f"mi:{KEY_VERSION}:*", count=500):
+                    _redis_client.delete(redis_key)
         except Exception as e:
-            print(f"[CACHE] ⚠️  Redis clear failed, falling back to memory: {e}")
-            # Fall through to in-memory cache
-    
-    # In-memory cache fallback
-    if key:
-        _CACHE.pop(key, None)
-    else:
-        _CACHE.clear()
+            _STATS["redis_errors"] += 1
+            print(f"[CACHE] ⚠️  Redis clear failed: {e}")
 
 
 def cache_size() -> int:
-    """Get current cache size."""
-    if _USE_REDIS and _redis_client:
-        try:
-            return _redis_client.dbsize()
-        except Exception as e:
-            print(f"[CACHE] ⚠️  Redis size check failed, falling back to memory: {e}")
-            # Fall through to in-memory cache
-    
-    # In-memory cache fallback
-    return len(_CACHE)
+    """Get current in-process cache size."""
+    return len(_L1)
+
+
+def cache_stats() -> Dict[str, Any]:
+    """
+    Get hit/miss/eviction counters for both cache layers.
+
+    Returns:
+        Counter snapshot plus derived hit ratio and layer info
+    """
+    stats: Dict[str, Any] = dict(_STATS)
+    lookups = stats["l1_hits"] + stats["l2_hits"] + stats["misses"]
+    stats["hit_ratio"] = round((stats["l1_hits"] + stats["l2_hits"]) / lookups, 4) if lookups else 0.0
+    stats["l1_size"] = len(_L1)
+    stats["l1_max_entries"] = _L1.max_entries
+    stats["redis_enabled"] = _USE_REDIS
+    return stats
+
+
+def _mileage_bucket(mileage: Any) -> Optional[int]:
+    """Round mileage down to the configured bucket size."""
+    try:
+        miles = int(float(str(mileage).replace(",", "")))
+    except (TypeError, ValueError):
+        return None
+    if miles < 0:
+        return None
+    return (miles // MILEAGE_BUCKET_SIZE) * MILEAGE_BUCKET_SIZE
 
 
 def _normalize_key(payload: Dict[str, Any]) -> str:
     """
     Create a stable cache key from a payload dict.
-    
+
     Args:
-        payload: Dictionary with make, model, year, mileage, location, etc.
-        
+        payload: Dictionary with make, model, year, trim, mileage, location, etc.
+
     Returns:
-        Normalized cache key string
+        Normalized cache key string, identical across processes
     """
-    # Sort keys for consistent hashing
+    year = payload.get("year")
+    try:
+        year = int(year) if year is not None else None
+    except (TypeError, ValueError):
+        year = None
+
     # Exclude price and other fields that shouldn't affect cache hit
     normalized = {
         "make": (payload.get("make") or "").lower().strip(),
         "model": (payload.get("model") or "").lower().strip(),
-        "year": payload.get("year"),
-        "mileage": payload.get("mileage"),
+        "trim": " ".join((payload.get("trim") or "").lower().split()),
+        "year": year,
+        "mileage_bucket": _mileage_bucket(payload.get("mileage")),
         "location": (payload.get("location") or "").lower().strip(),
         "title_status": (payload.get("title_status") or payload.get("titleStatus") or "clean").lower().strip(),
-        "analysis_type": payload.get("analysis_type", "comprehensive"),
+        "analysis_type": payload.get("analysis_type") or "comprehensive",
     }
-    
-    # Create hash-like key
-    key_str = json.dumps(normalized, sort_keys=True, separators=(',', ':'))
-    return f"mi:{hash(key_str)}"
 
+    # Sort keys for a canonical encoding, then content-hash it
+    key_str = json.dumps(normalized, sort_keys=True, separators=(',', ':'))
+    digest = hashlib.blake2b(key_str.encode("utf-8"), digest_size=16).hexdigest()
+    return f"mi:{KEY_VERSION}:{digest}"
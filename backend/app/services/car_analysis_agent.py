@@ -15,7 +15,7 @@ class CarAnalysisAgent:
     """Simplified car analysis agent for MVP"""
     
     def __init__(self):
-        self.openai_client = openai.OpenAI(api_key=settings.OPENAI_API_KEY) if settings.OPENAI_API_KEY else None
+        self.openai_client = openai.AsyncOpenAI(api_key=settings.OPENAI_API_KEY) if settings.OPENAI_API_KEY else None
     
     async def analyze_car_image(self, image_data: str, car_details: Dict[str, Any]) -> Dict[str, Any]:
         """Analyze car image and provide insights"""
@@ -27,7 +27,7 @@ class CarAnalysisAgent:
             prompt = self._create_analysis_prompt(car_details)
             
             # Analyze with GPT-4 Vision
-            response = self.openai_client.chat.completions.create(
+            response = await self.openai_client.chat.completions.create(
                 model="gpt-4o",
                 messages=[
                     {
@@ -194,7 +194,7 @@ class CarAnalysisAgent:
             Keep it under 200 words and include a call to action.
             """
             
-            response = self.openai_client.chat.completions.create(
+            response = await self.openai_client.chat.completions.create(
                 model="gpt-3.5-turbo",
                 messages=[{"role": "user", "content": prompt}],
                 max_tokens=300
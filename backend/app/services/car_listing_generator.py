@@ -16,7 +16,9 @@ import logging
 import random
 from typing import List, Dict, Any, Optional
 from datetime import datetime
-import httpx
+from app.services.http_clients import http_clients
+from app.services.image_preprocessing import preprocess_images
+from app.services.stage_dag import Stage, StageDAG
 from PIL import Image
 import io
 
@@ -48,6 +50,10 @@ class CarListingGenerator:
         """
         Generate a complete car listing using AI analysis
         
+        Stages run as a DAG (see ``_listing_pipeline``): independent stages run
+        concurrently, and a stage that fails or misses its deadline
+        (CAR_LISTING_STAGE_TIMEOUTS) degrades to its basic version.
+        
         Args:
             images: List of car image bytes
             car_details: Basic car information
@@ -57,48 +63,22 @@ class CarListingGenerator:
             Complete listing with analysis, pricing, and formatted text
         """
         try:
-            # Step 1: Analyze images with Gemini (primary) or OpenAI (fallback)
-            if not images or len(images) == 0:
-                # No images provided, use basic analysis
-                image_analysis = self._generate_basic_analysis(car_details)
-            elif self.gemini_api_key:
-                image_analysis = await self._analyze_images_with_gemini(images, car_details)
-            elif self.openai_api_key:
-                image_analysis = await self._analyze_images_with_openai(images, car_details)
-            else:
-                # Fallback to basic analysis
-                image_analysis = self._generate_basic_analysis(car_details)
-            
-            # Step 2: Get market intelligence with Gemini (primary)
-            if not images or len(images) == 0:
-                # No images provided, use basic market analysis
-                market_analysis = self._generate_basic_market_analysis(car_details, location)
-            elif self.gemini_api_key:
-                market_analysis = await self._get_market_intelligence(
-                    image_analysis, car_details, location
-                )
-            else:
-                # Fallback to basic market analysis
-                market_analysis = self._generate_basic_market_analysis(car_details, location)
-            
-            # Step 3: Generate pricing recommendations
-            pricing = await self._generate_pricing_recommendations(
-                image_analysis, market_analysis, car_details
-            )
-            
-            # Step 4: Create formatted listings for different platforms
-            listings = await self._generate_formatted_listings(
-                image_analysis, market_analysis, pricing, car_details
+            result = await self._listing_pipeline(car_details).run(
+                images=images or [], car_details=car_details, location=location
             )
+            values = result.values
+            _, image_preprocessing = values["preprocessed"]
             
             return {
                 "success": True,
                 "timestamp": datetime.now().isoformat(),
-                "image_analysis": image_analysis,
-                "market_analysis": market_analysis,
-                "pricing_recommendations": pricing,
-                "formatted_listings": listings,
-                "processing_time": 0.0,
+                "image_analysis": values["image_analysis"],
+                "market_analysis": values["market_analysis"],
+                "pricing_recommendations": values["pricing"],
+                "formatted_listings": values["formatted_listings"],
+                "image_preprocessing": image_preprocessing,
+                "processing_time": round(result.elapsed_ms / 1000, 3),
+                "stage_timings": result.timings_dict(),
                 "ai_provider": "Gemini" if self.gemini_api_key else "OpenAI" if self.openai_api_key else "Basic"
             }
             
@@ -110,6 +90,103 @@ class CarListingGenerator:
                 "timestamp": datetime.now().isoformat()
             }
     
+    def _listing_pipeline(self, car_details: Dict[str, Any]) -> StageDAG:
+        """
+        Stages of generate_car_listing. Market intelligence only waits for the
+        image analysis when car_details can't identify the vehicle on its own;
+        otherwise it runs alongside the vision call.
+        """
+        from app.core.config import settings
+        timeouts = settings.CAR_LISTING_STAGE_TIMEOUTS
+        identified = all(car_details.get(key) for key in ("make", "model", "year"))
+        market_inputs = ("preprocessed", "car_details", "location") if identified else \
+            ("preprocessed", "image_analysis", "car_details", "location")
+        
+        return StageDAG([
+            Stage("preprocessed", self._preprocess_stage, inputs=("images",)),
+            Stage(
+                "image_analysis", self._image_analysis_stage,
+                inputs=("preprocessed", "car_details"),
+                timeout=timeouts.get("image_analysis"),
+                fallback=lambda preprocessed, car_details: self._generate_basic_analysis(car_details),
+            ),
+            Stage(
+                "market_analysis", self._market_analysis_stage,
+                inputs=market_inputs,
+                timeout=timeouts.get("market_analysis"),
+                fallback=lambda car_details, location, **_: self._generate_basic_market_analysis(car_details, location),
+            ),
+            Stage(
+                "pricing", self._generate_pricing_recommendations,
+                inputs=("image_analysis", "market_analysis", "car_details"),
+            ),
+            Stage(
+                "formatted_listings", self._generate_formatted_listings,
+                inputs=("image_analysis", "market_analysis", "pricing", "car_details"),
+                timeout=timeouts.get("formatted_listings"),
+                fallback=self._fallback_formatted_listings,
+            ),
+        ])
+    
+    async def _preprocess_stage(self, images: List[bytes]):
+        """Orient, downscale and re-encode photos before any vision call"""
+        if not images:
+            return [], None
+        images, preprocess_stats = await preprocess_images(images)
+        return images, preprocess_stats.to_dict()
+    
+    async def _image_analysis_stage(self, preprocessed, car_details: Dict[str, Any]) -> Dict[str, Any]:
+        """Analyze images with Gemini (primary) or OpenAI (fallback)"""
+        images, _ = preprocessed
+        if not images:
+            # No images provided, use basic analysis
+            return self._generate_basic_analysis(car_details)
+        if self.gemini_api_key:
+            return await self._analyze_images_with_gemini(images, car_details)
+        if self.openai_api_key:
+            return await self._analyze_images_with_openai(images, car_details)
+        return self._generate_basic_analysis(car_details)
+    
+    async def _market_analysis_stage(
+        self,
+        preprocessed,
+        car_details: Dict[str, Any],
+        location: str,
+        image_analysis: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, Any]:
+        """Market intelligence with Gemini; basic analysis without photos or a Gemini key"""
+        images, _ = preprocessed
+        if not images or not self.gemini_api_key:
+            return self._generate_basic_market_analysis(car_details, location)
+        if image_analysis is None:
+            # Running alongside vision: describe the vehicle from the seller's details
+            image_analysis = {"condition": car_details["condition"]} if car_details.get("condition") else {}
+        return await self._get_market_intelligence(image_analysis, car_details, location)
+    
+    def _fallback_formatted_listings(
+        self,
+        image_analysis: Dict[str, Any],
+        market_analysis: Dict[str, Any],
+        pricing: Dict[str, Any],
+        car_details: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        """Template listing for every platform when AI copywriting fails or runs too long"""
+        listing_content = self._generate_fallback_listing(
+            image_analysis.get("make", car_details.get("make", "Unknown")),
+            image_analysis.get("model", car_details.get("model", "Unknown")),
+            image_analysis.get("year", car_details.get("year", "Unknown")),
+            image_analysis.get("mileage_estimate", car_details.get("mileage", "Unknown")),
+            image_analysis.get("features", []),
+            image_analysis.get("condition", "good"),
+            pricing
+        )
+        return {
+            "craigslist": listing_content,
+            "facebook_marketplace": listing_content,
+            "offerup": listing_content,
+            "autotrader": listing_content
+        }
+    
     async def _analyze_images_with_openai(
         self, 
         images: List[bytes], 
@@ -207,35 +284,35 @@ class CarListingGenerator:
             }
         ]
         
-        async with httpx.AsyncClient() as client:
-            response = await client.post(
-                f"{self.openai_base_url}/chat/completions",
-                headers={
-                    "Authorization": f"Bearer {self.openai_api_key}",
-                    "Content-Type": "application/json"
-                },
-                json={
-                    "model": "gpt-4o",
-                    "messages": messages,
-                    "max_tokens": 1500,
-                    "temperature": 0.7
-                },
-                timeout=60.0
-            )
-            
-            if response.status_code != 200:
-                raise Exception(f"OpenAI API error: {response.text}")
-            
-            result = response.json()
-            content = result["choices"][0]["message"]["content"]
-            
-            # Parse JSON response
-            try:
-                analysis = json.loads(content)
-                return analysis
-            except json.JSONDecodeError:
-                # Fallback: extract key information from text
-                return self._parse_analysis_text(content)
+        client = http_clients.httpx_client("openai")
+        response = await client.post(
+            f"{self.openai_base_url}/chat/completions",
+            headers={
+                "Authorization": f"Bearer {self.openai_api_key}",
+                "Content-Type": "application/json"
+            },
+            json={
+                "model": "gpt-4o",
+                "messages": messages,
+                "max_tokens": 1500,
+                "temperature": 0.7
+            },
+            timeout=60.0
+        )
+        
+        if response.status_code != 200:
+            raise Exception(f"OpenAI API error: {response.text}")
+        
+        result = response.json()
+        content = result["choices"][0]["message"]["content"]
+        
+        # Parse JSON response
+        try:
+            analysis = json.loads(content)
+            return analysis
+        except json.JSONDecodeError:
+            # Fallback: extract key information from text
+            return self._parse_analysis_text(content)
     
     async def _analyze_images_with_gemini(
         self,
@@ -289,34 +366,34 @@ class CarListingGenerator:
         }}
         """
         
-        async with httpx.AsyncClient() as client:
-            response = await client.post(
-                "https://generativelanguage.googleapis.com/v1beta/models/gemini-pro:generateContent?key={self.gemini_api_key}",
-                json={
-                    "contents": [{
-                        "parts": [{"text": prompt}]
-                    }],
-                    "generationConfig": {
-                        "maxOutputTokens": 1000,
-                        "temperature": 0.1
-                    }
-                },
-                timeout=60.0
-            )
-            
-            if response.status_code != 200:
-                raise Exception(f"Gemini API error: {response.text}")
-            
-            result = response.json()
-            content = result["candidates"][0]["content"]["parts"][0]["text"]
-            
-            # Parse JSON response
-            try:
-                analysis = json.loads(content)
-                return analysis
-            except json.JSONDecodeError:
-                # Fallback: extract key information from text
-                return self._parse_analysis_text(content)
+        client = http_clients.httpx_client("gemini")
+        response = await client.post(
+            "https://generativelanguage.googleapis.com/v1beta/models/gemini-pro:generateContent?key={self.gemini_api_key}",
+            json={
+                "contents": [{
+                    "parts": [{"text": prompt}]
+                }],
+                "generationConfig": {
+                    "maxOutputTokens": 1000,
+                    "temperature": 0.1
+                }
+            },
+            timeout=60.0
+        )
+        
+        if response.status_code != 200:
+            raise Exception(f"Gemini API error: {response.text}")
+        
+        result = response.json()
+        content = result["candidates"][0]["content"]["parts"][0]["text"]
+        
+        # Parse JSON response
+        try:
+            analysis = json.loads(content)
+            return analysis
+        except json.JSONDecodeError:
+            # Fallback: extract key information from text
+            return self._parse_analysis_text(content)
     
     async def _get_market_intelligence(
         self,
@@ -369,31 +446,31 @@ class CarListingGenerator:
         }}
         """
         
-        async with httpx.AsyncClient() as client:
-            response = await client.post(
-                "https://generativelanguage.googleapis.com/v1beta/models/gemini-pro:generateContent?key={self.gemini_api_key}",
-                json={
-                    "contents": [{
-                        "parts": [{"text": prompt}]
-                    }],
-                    "generationConfig": {
-                        "maxOutputTokens": 1000,
-                        "temperature": 0.1
-                    }
-                },
-                timeout=30.0
-            )
-            
-            if response.status_code != 200:
-                raise Exception(f"Gemini API error: {response.text}")
-            
-            result = response.json()
-            content = result["candidates"][0]["content"]["parts"][0]["text"]
-            
-            try:
-                return json.loads(content)
-            except json.JSONDecodeError:
-                return self._parse_market_text(content)
+        client = http_clients.httpx_client("gemini")
+        response = await client.post(
+            "https://generativelanguage.googleapis.com/v1beta/models/gemini-pro:generateContent?key={self.gemini_api_key}",
+            json={
+                "contents": [{
+                    "parts": [{"text": prompt}]
+                }],
+                "generationConfig": {
+                    "maxOutputTokens": 1000,
+                    "temperature": 0.1
+                }
+            },
+            timeout=30.0
+        )
+        
+        if response.status_code != 200:
+            raise Exception(f"Gemini API error: {response.text}")
+        
+        result = response.json()
+        content = result["candidates"][0]["content"]["parts"][0]["text"]
+        
+        try:
+            return json.loads(content)
+        except json.JSONDecodeError:
+            return self._parse_market_text(content)
     
     async def _get_market_intelligence_openai(
         self,
@@ -419,32 +496,32 @@ class CarListingGenerator:
         - negotiation_room (percentage)
         """
         
-        async with httpx.AsyncClient() as client:
-            response = await client.post(
-                f"{self.openai_base_url}/chat/completions",
-                headers={
-                    "Authorization": f"Bearer {self.openai_api_key}",
-                    "Content-Type": "application/json"
-                },
-                json={
-                    "model": "gpt-4o",
-                    "messages": [{"role": "user", "content": prompt}],
-                    "max_tokens": 500,
-                    "temperature": 0.1
-                },
-                timeout=30.0
-            )
-            
-            if response.status_code != 200:
-                raise Exception(f"OpenAI API error: {response.text}")
-            
-            result = response.json()
-            content = result["choices"][0]["message"]["content"]
-            
-            try:
-                return json.loads(content)
-            except json.JSONDecodeError:
-                return self._parse_market_text(content)
+        client = http_clients.httpx_client("openai")
+        response = await client.post(
+            f"{self.openai_base_url}/chat/completions",
+            headers={
+                "Authorization": f"Bearer {self.openai_api_key}",
+                "Content-Type": "application/json"
+            },
+            json={
+                "model": "gpt-4o",
+                "messages": [{"role": "user", "content": prompt}],
+                "max_tokens": 500,
+                "temperature": 0.1
+            },
+            timeout=30.0
+        )
+        
+        if response.status_code != 200:
+            raise Exception(f"OpenAI API error: {response.text}")
+        
+        result = response.json()
+        content = result["choices"][0]["message"]["content"]
+        
+        try:
+            return json.loads(content)
+        except json.JSONDecodeError:
+            return self._parse_market_text(content)
     
     async def _generate_pricing_recommendations(
         self,
@@ -567,29 +644,29 @@ class CarListingGenerator:
         Make this listing stand out and feel authentic to the {selected_style} approach.
         """
         
-        async with httpx.AsyncClient() as client:
-            response = await client.post(
-                f"{self.openai_base_url}/chat/completions",
-                headers={
-                    "Authorization": f"Bearer {self.openai_api_key}",
-                    "Content-Type": "application/json"
-                },
-                json={
-                    "model": "gpt-4o",
-                    "messages": [{"role": "user", "content": prompt}],
-                    "max_tokens": 1200,
-                    "temperature": 0.8
-                },
-                timeout=30.0
+        client = http_clients.httpx_client("openai")
+        response = await client.post(
+            f"{self.openai_base_url}/chat/completions",
+            headers={
+                "Authorization": f"Bearer {self.openai_api_key}",
+                "Content-Type": "application/json"
+            },
+            json={
+                "model": "gpt-4o",
+                "messages": [{"role": "user", "content": prompt}],
+                "max_tokens": 1200,
+                "temperature": 0.8
+            },
+            timeout=30.0
+        )
+        
+        if response.status_code != 200:
+            return self._generate_fallback_listing(
+                make, model, year, mileage, features, condition, pricing
             )
-            
-            if response.status_code != 200:
-                return self._generate_fallback_listing(
-                    make, model, year, mileage, features, condition, pricing
-                )
-            
-            result = response.json()
-            return result["choices"][0]["message"]["content"]
+        
+        result = response.json()
+        return result["choices"][0]["message"]["content"]
     
     def _generate_fallback_listing(
         self,
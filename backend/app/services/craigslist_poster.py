@@ -13,6 +13,8 @@ from dataclasses import dataclass
 from bs4 import BeautifulSoup
 import urllib.parse
 
+from app.services.http_clients import http_clients
+
 logger = logging.getLogger(__name__)
 
 @dataclass
@@ -49,7 +51,7 @@ class CraigslistPoster:
         return os.getenv(key)
     
     async def __aenter__(self):
-        self.session = aiohttp.ClientSession()
+        self.session = http_clients.aiohttp_session("craigslist")
         return self
     
     async def __aexit__(self, exc_type, exc_val, exc_tb):
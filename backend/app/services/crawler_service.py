@@ -0,0 +1,251 @@
+"""
+Long-lived, in-process Scrapy crawler service.
+
+Instead of a ``scrapy crawl`` subprocess (process start, reactor boot, settings
+load and a temp JSON file) per search, one Twisted reactor runs for the life of
+the app in a background thread, hosting every spider in ``accorria_scraper``.
+
+Crawl requests are queued to the reactor thread with ``callFromThread`` and run
+at most ``CRAWLER_MAX_CONCURRENT`` at a time. Items come back in memory: the
+``ItemSinkPipeline`` at the end of the item pipeline hands each finished item to
+the requesting coroutine's queue, so callers can stream results as they are
+scraped (``stream``) or collect them (``crawl``).
+"""
+
+import asyncio
+import logging
+import os
+import threading
+from dataclasses import dataclass, field
+from typing import Any, AsyncIterator, Dict, List, Optional
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+SCRAPY_SETTINGS_MODULE = "accorria_scraper.settings"
+
+_DONE = object()
+
+
+class CrawlerUnavailable(RuntimeError):
+    """Raised when Scrapy can't be hosted in this process (callers fall back to a subprocess)"""
+
+
+@dataclass
+class CrawlRequest:
+    """One queued crawl and the asyncio queue its items are delivered to"""
+    spider: str
+    kwargs: Dict[str, Any]
+    loop: asyncio.AbstractEventLoop
+    queue: asyncio.Queue
+    max_items: Optional[int] = None
+    crawler: Any = None
+    cancelled: bool = False
+    finished: bool = False
+    items: int = field(default=0)
+
+    def _deliver(self, entry: Any) -> None:
+        try:
+            self.loop.call_soon_threadsafe(self.queue.put_nowait, entry)
+        except RuntimeError:
+            # The requesting loop is gone; nobody is listening any more
+            self.cancelled = True
+
+    def emit(self, item: Dict[str, Any]) -> None:
+        """Called by ItemSinkPipeline (reactor thread) for every finished item"""
+        if not self.cancelled:
+            self.items += 1
+            self._deliver(item)
+
+    def finish(self, error: Optional[BaseException] = None) -> None:
+        self.finished = True
+        self._deliver(error if error is not None else _DONE)
+
+
+class CrawlerService:
+    """Hosts the Scrapy spiders on one reactor thread and runs queued crawl requests"""
+
+    def __init__(self, max_concurrent: int = 8):
+        self.max_concurrent = max_concurrent
+        self._thread: Optional[threading.Thread] = None
+        self._ready = threading.Event()
+        self._start_lock = threading.Lock()
+        self._start_error: Optional[BaseException] = None
+        self._reactor = None
+        self._runner = None
+        self._settings = None
+        self._slots = None
+        self.stats_counters: Dict[str, int] = {
+            "crawls": 0,
+            "failed": 0,
+            "cancelled": 0,
+            "items": 0,
+            "active": 0,
+            "queued": 0,
+        }
+
+    # ---- reactor thread ----
+
+    def _run_reactor(self) -> None:
+        try:
+            os.environ.setdefault("SCRAPY_SETTINGS_MODULE", SCRAPY_SETTINGS_MODULE)
+            from scrapy.utils.project import get_project_settings
+            from scrapy.utils.reactor import install_reactor
+
+            scrapy_settings = get_project_settings()
+            if scrapy_settings.get("TWISTED_REACTOR"):
+                install_reactor(scrapy_settings["TWISTED_REACTOR"])
+
+            from scrapy.crawler import CrawlerRunner
+            from twisted.internet import defer, reactor
+
+            self._settings = scrapy_settings
+            self._runner = CrawlerRunner(scrapy_settings)
+            self._slots = defer.DeferredSemaphore(self.max_concurrent)
+            self._reactor = reactor
+        except Exception as e:
+            self._start_error = e
+            self._ready.set()
+            return
+
+        reactor.callWhenRunning(self._ready.set)
+        reactor.run(installSignalHandlers=False)
+
+    def _dispatch(self, request: CrawlRequest) -> None:
+        self._slots.run(self._crawl, request)
+
+    def _crawl(self, request: CrawlRequest):
+        from scrapy.crawler import Crawler
+        from twisted.internet import defer
+        from twisted.python.failure import Failure
+
+        self.stats_counters["queued"] -= 1
+        if request.cancelled:
+            request.finish()
+            return defer.succeed(None)
+
+        try:
+            spidercls = self._runner.spider_loader.load(request.spider)
+        except KeyError:
+            request.finish(CrawlerUnavailable(f"Unknown spider: {request.spider}"))
+            return defer.succeed(None)
+
+        crawl_settings = self._settings.copy()
+        if request.max_items:
+            # Close the spider as soon as enough items are in, instead of crawling every page
+            crawl_settings.set("CLOSESPIDER_ITEMCOUNT", request.max_items, priority="cmdline")
+        crawler = Crawler(spidercls, crawl_settings)
+        request.crawler = crawler
+        self.stats_counters["active"] += 1
+
+        def done(result):
+            self.stats_counters["active"] -= 1
+            self.stats_counters["items"] += request.items
+            if isinstance(result, Failure):
+                error = result.value
+                self.stats_counters["failed"] += 1
+                logger.error(f"Crawl '{request.spider}' failed: {error}")
+                request.finish(error)
+            else:
+                self.stats_counters["crawls"] += 1
+                request.finish()
+            return None
+
+        d = self._runner.crawl(crawler, item_sink=request.emit, **request.kwargs)
+        d.addBoth(done)
+        return d
+
+    def _cancel(self, request: CrawlRequest) -> None:
+        if request.crawler is not None and not request.finished:
+            request.crawler.stop()
+
+    def _shutdown(self) -> None:
+        d = self._runner.stop()
+        d.addBoth(lambda _: self._reactor.stop())
+
+    # ---- asyncio side ----
+
+    async def start(self) -> None:
+        """Boot the reactor thread (once per process)."""
+        if self._thread is None:
+            with self._start_lock:
+                if self._thread is None:
+                    self._thread = threading.Thread(target=self._run_reactor, name="scrapy-reactor", daemon=True)
+                    self._thread.start()
+        if not self._ready.is_set():
+            await asyncio.to_thread(self._ready.wait, 30)
+        if self._start_error is not None:
+            raise CrawlerUnavailable(f"Scrapy can't run in-process: {self._start_error}")
+        if self._reactor is None:
+            raise CrawlerUnavailable("Scrapy reactor did not start")
+
+    async def stream(
+        self,
+        spider: str,
+        max_items: Optional[int] = None,
+        timeout: Optional[float] = None,
+        **spider_kwargs: Any,
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Run a spider and yield items as they pass the item pipeline.
+
+        Closing the iterator early stops the crawl.
+
+        Args:
+            spider: Spider name (e.g. "ebay_cars")
+            max_items: Stop the spider after this many items
+            timeout: Overall time limit in seconds (defaults to CRAWLER_TIMEOUT_SEC)
+            **spider_kwargs: Spider arguments (e.g. search_term, max_results)
+
+        Raises:
+            CrawlerUnavailable: Scrapy can't be hosted in this process
+            asyncio.TimeoutError: The crawl didn't finish in time
+        """
+        await self.start()
+        loop = asyncio.get_running_loop()
+        request = CrawlRequest(
+            spider=spider,
+            kwargs=spider_kwargs,
+            loop=loop,
+            queue=asyncio.Queue(),
+            max_items=max_items,
+        )
+        self.stats_counters["queued"] += 1
+        self._reactor.callFromThread(self._dispatch, request)
+
+        deadline = loop.time() + (timeout or settings.CRAWLER_TIMEOUT_SEC)
+        try:
+            while True:
+                entry = await asyncio.wait_for(request.queue.get(), timeout=max(0.0, deadline - loop.time()))
+                if entry is _DONE:
+                    return
+                if isinstance(entry, BaseException):
+                    raise entry
+                yield entry
+        finally:
+            if not request.finished:
+                request.cancelled = True
+                self.stats_counters["cancelled"] += 1
+                self._reactor.callFromThread(self._cancel, request)
+
+    async def crawl(self, spider: str, max_items: Optional[int] = None, timeout: Optional[float] = None, **spider_kwargs: Any) -> List[Dict[str, Any]]:
+        """Run a spider and return all of its items."""
+        return [item async for item in self.stream(spider, max_items=max_items, timeout=timeout, **spider_kwargs)]
+
+    async def stop(self) -> None:
+        """Stop running crawls and the reactor (app shutdown; the reactor can't be restarted)."""
+        if self._reactor is None or self._thread is None:
+            return
+        self._reactor.callFromThread(self._shutdown)
+        await asyncio.to_thread(self._thread.join, 10)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "running": self._reactor is not None and self._thread is not None and self._thread.is_alive(),
+            "max_concurrent": self.max_concurrent,
+            **self.stats_counters,
+        }
+
+
+crawler_service = CrawlerService(max_concurrent=settings.CRAWLER_MAX_CONCURRENT)
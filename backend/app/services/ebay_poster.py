@@ -13,6 +13,8 @@ from datetime import datetime
 from dataclasses import dataclass
 import xml.etree.ElementTree as ET
 
+from app.services.http_clients import http_clients
+
 logger = logging.getLogger(__name__)
 
 @dataclass
@@ -53,7 +55,7 @@ class eBayPoster:
         self.session: Optional[aiohttp.ClientSession] = None
     
     async def __aenter__(self):
-        self.session = aiohttp.ClientSession()
+        self.session = http_clients.aiohttp_session("ebay")
         return self
     
     async def __aexit__(self, exc_type, exc_val, exc_tb):
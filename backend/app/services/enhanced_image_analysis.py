@@ -26,7 +26,7 @@ class EnhancedImageAnalyzer:
         api_key = settings.OPENAI_API_KEY or os.getenv('OPENAI_API_KEY')
         if not api_key:
             raise ValueError("OpenAI API key not found")
-        self.client = openai.OpenAI(api_key=api_key)
+        self.client = openai.AsyncOpenAI(api_key=api_key)
         
     async def analyze_car_images(self, image_bytes: List[bytes], car_details: Dict[str, Any]) -> Dict[str, Any]:
         """
@@ -81,7 +81,7 @@ class EnhancedImageAnalyzer:
             user_prompt = f"""Analyze these {len(image_bytes)} car images and extract information. User provided: Make={car_details.get('make')}, Model={car_details.get('model')}, Year={car_details.get('year')}. Return only valid JSON."""
             
             # Make OpenAI API call
-            response = await self.client.chat.completions.acreate(
+            response = await self.client.chat.completions.create(
                 model="gpt-4o",
                 messages=[
                     {"role": "system", "content": system_prompt},
@@ -220,7 +220,7 @@ RULES:
         ]
         
         # Call OpenAI for Pass 1
-        response = self.client.chat.completions.create(
+        response = await self.client.chat.completions.create(
             model="gpt-4o-mini",
             messages=messages,
             temperature=0,
@@ -308,7 +308,7 @@ TEMPLATE RULES:
 - Output the finished post text only."""
         
         # Call OpenAI for Pass 2
-        response = self.client.chat.completions.create(
+        response = await self.client.chat.completions.create(
             model="gpt-4o-mini",
             messages=[
                 {"role": "system", "content": system_prompt},
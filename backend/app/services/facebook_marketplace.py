@@ -11,6 +11,8 @@ from typing import Dict, Any, List, Optional
 from datetime import datetime
 from dataclasses import dataclass
 
+from app.services.http_clients import http_clients
+
 logger = logging.getLogger(__name__)
 
 @dataclass
@@ -43,7 +45,7 @@ class FacebookMarketplaceAPI:
         self.session: Optional[aiohttp.ClientSession] = None
     
     async def __aenter__(self):
-        self.session = aiohttp.ClientSession()
+        self.session = http_clients.aiohttp_session("facebook")
         return self
     
     async def __aexit__(self, exc_type, exc_val, exc_tb):
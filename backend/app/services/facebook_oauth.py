@@ -17,6 +17,8 @@ import base64
 import hashlib
 import hmac
 
+from app.services.http_clients import http_clients
+
 logger = logging.getLogger(__name__)
 
 # Process-level store for OAuth state (fallback if Redis not available)
@@ -96,7 +98,7 @@ class FacebookOAuthService:
         # State is kept in module-level STATE_STORE
     
     async def __aenter__(self):
-        self.session = aiohttp.ClientSession()
+        self.session = http_clients.aiohttp_session("facebook")
         return self
     
     async def __aexit__(self, exc_type, exc_val, exc_tb):
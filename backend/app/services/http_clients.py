@@ -0,0 +1,378 @@
+"""
+Shared, pooled HTTP clients for all outbound API calls.
+
+Opening a new ``httpx.AsyncClient`` / ``aiohttp.ClientSession`` per call pays
+DNS + TCP + TLS setup every time. This module keeps one connection pool per
+upstream for the life of the app (created lazily, closed in the FastAPI
+``lifespan``), with per-upstream timeouts, keep-alive limits, HTTP/2 where
+available, and a retry budget so retries can't amplify an upstream outage.
+
+Usage:
+    from app.services.http_clients import http_clients
+
+    client = http_clients.httpx_client("gemini")
+    response = await http_clients.request("gemini", "POST", url, json=payload)
+
+    async with http_clients.aiohttp_session("ebay") as session:  # pooled connector
+        ...
+"""
+
+import asyncio
+import logging
+import random
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, Optional, Tuple
+
+import httpx
+
+from app.services.instrumentation import span
+
+logger = logging.getLogger(__name__)
+
+try:
+    import h2  # noqa: F401  (presence enables HTTP/2 in httpx)
+    _HTTP2_AVAILABLE = True
+except ImportError:
+    _HTTP2_AVAILABLE = False
+
+RETRYABLE_STATUS_CODES = (429, 500, 502, 503, 504)
+
+
+@dataclass
+class UpstreamConfig:
+    """Connection and retry policy for one upstream host"""
+    name: str
+    timeout: float = 30.0
+    connect_timeout: float = 5.0
+    max_connections: int = 20
+    max_keepalive: int = 10
+    keepalive_expiry: float = 30.0
+    http2: bool = False
+    max_retries: int = 2
+    retry_budget_ratio: float = 0.2  # retries allowed as a fraction of recent requests
+    verify_ssl: bool = True
+    headers: Dict[str, str] = field(default_factory=dict)
+
+
+DEFAULT_UPSTREAMS: Dict[str, UpstreamConfig] = {
+    "gemini": UpstreamConfig("gemini", timeout=60.0, max_connections=32, max_keepalive=16, http2=True),
+    "openai": UpstreamConfig("openai", timeout=60.0, max_connections=32, max_keepalive=16, http2=True),
+    "nhtsa": UpstreamConfig("nhtsa", timeout=10.0, max_connections=10, max_keepalive=5),
+    "scraper": UpstreamConfig(
+        "scraper",
+        timeout=30.0,
+        max_connections=20,
+        max_retries=1,
+        verify_ssl=False,  # Marketplace scraping tolerates bad certs (matches previous behaviour)
+        headers={
+            "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
+        },
+    ),
+    "scrapingbee": UpstreamConfig("scrapingbee", timeout=60.0, max_connections=10, max_retries=1),
+    "ebay": UpstreamConfig("ebay", timeout=30.0, max_connections=10, max_retries=0),
+    "facebook": UpstreamConfig("facebook", timeout=60.0, max_connections=10, max_retries=0),
+    "craigslist": UpstreamConfig("craigslist", timeout=60.0, max_connections=5, max_retries=0),
+    "valuation": UpstreamConfig("valuation", timeout=30.0, max_connections=10, max_retries=1),
+    "default": UpstreamConfig("default"),
+}
+
+
+class RetryBudget:
+    """
+    Caps retries to a fraction of recent request volume.
+
+    Within each window, retries are allowed while
+    ``retries < max(min_retries, ratio * requests)``.
+    """
+
+    def __init__(self, ratio: float, window_sec: float = 60.0, min_retries: int = 3):
+        self.ratio = ratio
+        self.window_sec = window_sec
+        self.min_retries = min_retries
+        self._window_start = time.monotonic()
+        self._requests = 0
+        self._retries = 0
+
+    def _roll(self) -> None:
+        now = time.monotonic()
+        if now - self._window_start >= self.window_sec:
+            self._window_start = now
+            self._requests = 0
+            self._retries = 0
+
+    def record_request(self) -> None:
+        self._roll()
+        self._requests += 1
+
+    def try_spend(self) -> bool:
+        self._roll()
+        if self._retries < max(self.min_retries, self.ratio * self._requests):
+            self._retries += 1
+            return True
+        return False
+
+
+class _InstrumentedTransport(httpx.AsyncBaseTransport):
+    """Times each request on an upstream's pool (to response headers) as an ``http.<upstream>`` span"""
+
+    def __init__(self, name: str, inner: httpx.AsyncBaseTransport):
+        self.name = name
+        self.inner = inner
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        with span(f"http.{self.name}", kind="upstream", method=request.method, host=request.url.host) as call:
+            response = await self.inner.handle_async_request(request)
+            call.set_attribute("status", response.status_code)
+            if response.status_code in RETRYABLE_STATUS_CODES:
+                call.fail(f"HTTP {response.status_code}")
+            return response
+
+    async def aclose(self) -> None:
+        await self.inner.aclose()
+
+
+class HTTPClientManager:
+    """App-wide registry of pooled outbound HTTP clients, one pool per upstream"""
+
+    def __init__(self, upstreams: Optional[Dict[str, UpstreamConfig]] = None):
+        self.upstreams: Dict[str, UpstreamConfig] = dict(upstreams or DEFAULT_UPSTREAMS)
+        # name -> (loop, client); clients are bound to the loop they were created on
+        self._httpx_clients: Dict[str, Tuple[asyncio.AbstractEventLoop, httpx.AsyncClient]] = {}
+        self._aiohttp_connectors: Dict[str, Tuple[asyncio.AbstractEventLoop, Any]] = {}
+        self._budgets: Dict[str, RetryBudget] = {}
+        self._counters: Dict[str, Dict[str, int]] = {}
+        self._closed = False
+
+    def _config(self, name: str) -> UpstreamConfig:
+        return self.upstreams.get(name) or self.upstreams["default"]
+
+    def _counter(self, name: str) -> Dict[str, int]:
+        if name not in self._counters:
+            self._counters[name] = {
+                "requests": 0,
+                "in_flight": 0,
+                "retries": 0,
+                "retries_denied": 0,
+                "errors": 0,
+            }
+        return self._counters[name]
+
+    def _budget(self, name: str) -> RetryBudget:
+        if name not in self._budgets:
+            self._budgets[name] = RetryBudget(self._config(name).retry_budget_ratio)
+        return self._budgets[name]
+
+    def httpx_client(self, name: str = "default") -> httpx.AsyncClient:
+        """
+        Get the shared httpx client for an upstream (created on first use).
+
+        Args:
+            name: Upstream name from ``DEFAULT_UPSTREAMS`` (unknown names use "default")
+        """
+        loop = asyncio.get_running_loop()
+        entry = self._httpx_clients.get(name)
+        if entry is not None:
+            client_loop, client = entry
+            if client_loop is loop and not client.is_closed:
+                return client
+
+        config = self._config(name)
+        transport = httpx.AsyncHTTPTransport(
+            http2=config.http2 and _HTTP2_AVAILABLE,
+            verify=config.verify_ssl,
+            retries=1,  # connect-level retry only; response retries go through the budget
+            limits=httpx.Limits(
+                max_connections=config.max_connections,
+                max_keepalive_connections=config.max_keepalive,
+                keepalive_expiry=config.keepalive_expiry,
+            ),
+        )
+        client = httpx.AsyncClient(
+            transport=_InstrumentedTransport(name, transport),
+            timeout=httpx.Timeout(config.timeout, connect=config.connect_timeout),
+            headers=config.headers or None,
+        )
+        self._httpx_clients[name] = (loop, client)
+        self._closed = False
+        return client
+
+    def _aiohttp_connector(self, name: str):
+        import aiohttp
+
+        loop = asyncio.get_running_loop()
+        entry = self._aiohttp_connectors.get(name)
+        if entry is not None:
+            connector_loop, connector = entry
+            if connector_loop is loop and not connector.closed:
+                return connector
+
+        config = self._config(name)
+        connector = aiohttp.TCPConnector(
+            limit=config.max_connections,
+            limit_per_host=config.max_connections,
+            keepalive_timeout=config.keepalive_expiry,
+            ttl_dns_cache=300,
+            ssl=config.verify_ssl,
+        )
+        self._aiohttp_connectors[name] = (loop, connector)
+        self._closed = False
+        return connector
+
+    def aiohttp_session(self, name: str = "default", **kwargs):
+        """
+        Create a lightweight aiohttp session on the upstream's shared connector.
+
+        Sessions keep their own cookies/headers (safe for per-user posters) but
+        reuse pooled connections. Closing the session leaves the pool open.
+        """
+        import aiohttp
+
+        config = self._config(name)
+        headers = {**config.headers, **kwargs.pop("headers", {})}
+        kwargs.setdefault("timeout", aiohttp.ClientTimeout(total=config.timeout, connect=config.connect_timeout))
+        return aiohttp.ClientSession(
+            connector=self._aiohttp_connector(name),
+            connector_owner=False,
+            headers=headers or None,
+            **kwargs,
+        )
+
+    async def request(
+        self,
+        name: str,
+        method: str,
+        url: str,
+        *,
+        retry_on_status: Tuple[int, ...] = RETRYABLE_STATUS_CODES,
+        **kwargs,
+    ) -> httpx.Response:
+        """
+        Send a request through the upstream's pooled client with budgeted retries.
+
+        Transient failures (transport errors, 429/5xx) are retried with
+        exponential backoff while the upstream's retry budget allows.
+
+        Raises:
+            httpx.HTTPError: if the final attempt fails at the transport level
+        """
+        config = self._config(name)
+        client = self.httpx_client(name)
+        budget = self._budget(name)
+        counters = self._counter(name)
+
+        attempt = 0
+        while True:
+            budget.record_request()
+            counters["requests"] += 1
+            counters["in_flight"] += 1
+            try:
+                response = await client.request(method, url, **kwargs)
+            except (httpx.TransportError, httpx.TimeoutException):
+                counters["errors"] += 1
+                if attempt >= config.max_retries or not self._spend_retry(budget, counters):
+                    raise
+                response = None
+            finally:
+                counters["in_flight"] -= 1
+
+            if response is not None:
+                if response.status_code not in retry_on_status or attempt >= config.max_retries:
+                    return response
+                if not self._spend_retry(budget, counters):
+                    return response
+                retry_after = response.headers.get("retry-after")
+            else:
+                retry_after = None
+
+            attempt += 1
+            await asyncio.sleep(self._backoff(attempt, retry_after))
+
+    @staticmethod
+    def _spend_retry(budget: RetryBudget, counters: Dict[str, int]) -> bool:
+        if budget.try_spend():
+            counters["retries"] += 1
+            return True
+        counters["retries_denied"] += 1
+        return False
+
+    @staticmethod
+    def _backoff(attempt: int, retry_after: Optional[str]) -> float:
+        if retry_after:
+            try:
+                return min(10.0, float(retry_after))
+            except ValueError:
+                pass
+        return min(10.0, 0.5 * (2 ** (attempt - 1))) * (0.5 + random.random() / 2)
+
+    async def startup(self) -> None:
+        """Mark the registry open; pools are created lazily on first use."""
+        self._closed = False
+        logger.info(
+            f"HTTP client registry ready ({len(self.upstreams)} upstreams, http2={'on' if _HTTP2_AVAILABLE else 'unavailable'})"
+        )
+
+    async def shutdown(self) -> None:
+        """Close every pool created on the current event loop."""
+        loop = asyncio.get_running_loop()
+        for name, (client_loop, client) in list(self._httpx_clients.items()):
+            if client_loop is loop:
+                try:
+                    await client.aclose()
+                except Exception as e:
+                    logger.warning(f"Error closing httpx client '{name}': {e}")
+                self._httpx_clients.pop(name, None)
+        for name, (connector_loop, connector) in list(self._aiohttp_connectors.items()):
+            if connector_loop is loop:
+                try:
+                    await connector.close()
+                except Exception as e:
+                    logger.warning(f"Error closing aiohttp connector '{name}': {e}")
+                self._aiohttp_connectors.pop(name, None)
+        self._closed = True
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Pool utilization and request counters per upstream.
+
+        Connection counts are read from httpcore/aiohttp internals when
+        available and reported as None otherwise.
+        """
+        result: Dict[str, Any] = {}
+        names = set(self._httpx_clients) | set(self._aiohttp_connectors) | set(self._counters)
+        for name in sorted(names):
+            config = self._config(name)
+            entry: Dict[str, Any] = {
+                "max_connections": config.max_connections,
+                "http2": config.http2 and _HTTP2_AVAILABLE,
+                **self._counter(name),
+            }
+            if name in self._httpx_clients:
+                _, client = self._httpx_clients[name]
+                transport = getattr(client, "_transport", None)
+                pool = getattr(getattr(transport, "inner", transport), "_pool", None)
+                connections = getattr(pool, "connections", None)
+                if connections is not None:
+                    idle = sum(1 for conn in connections if conn.is_idle())
+                    entry["httpx_connections"] = len(connections)
+                    entry["httpx_idle"] = idle
+                    entry["httpx_active"] = len(connections) - idle
+                    entry["utilization"] = round((len(connections) - idle) / config.max_connections, 3)
+                else:
+                    entry["httpx_connections"] = None
+            if name in self._aiohttp_connectors:
+                _, connector = self._aiohttp_connectors[name]
+                acquired = getattr(connector, "_acquired", None)
+                idle_conns = getattr(connector, "_conns", None)
+                entry["aiohttp_active"] = len(acquired) if acquired is not None else None
+                entry["aiohttp_idle"] = (
+                    sum(len(v) for v in idle_conns.values()) if idle_conns is not None else None
+                )
+                if acquired is not None:
+                    entry["utilization"] = round(len(acquired) / config.max_connections, 3)
+            result[name] = entry
+        return result
+
+
+# App-wide registry
+http_clients = HTTPClientManager()
@@ -20,6 +20,8 @@ import requests
 from google.cloud import vision
 from google.cloud.vision_v1 import types
 
+from app.services.image_preprocessing import preprocess_images
+
 logger = logging.getLogger(__name__)
 
 
@@ -93,6 +95,9 @@ class ImageAnalysisAgent:
         try:
             logger.info(f"Analyzing {len(images)} car images")
             
+            # Orient, downscale and strip metadata before sending anything upstream
+            images, _ = await preprocess_images(images)
+            
             if not self.client:
                 fallback_result = self._fallback_analysis(images)
                 return {
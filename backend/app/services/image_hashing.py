@@ -0,0 +1,141 @@
+"""
+Perceptual hashes for uploaded photos.
+
+Two 64-bit hashes are computed per image:
+
+- dHash: sign of horizontal gradients on a 9x8 grayscale thumbnail (cheap,
+  robust to re-compression and small resizes)
+- pHash: sign of the low-frequency 8x8 DCT block of a 32x32 grayscale
+  thumbnail (robust to brightness/contrast tweaks)
+
+Together they identify the same photo across re-uploads (re-encoded, resized,
+metadata stripped) and flag near-duplicate shots inside a single upload.
+Pure Pillow + Python; no numpy/scipy dependency.
+"""
+
+import io
+import logging
+import math
+from typing import Callable, List, Optional, Sequence, Tuple, TypeVar
+
+from PIL import Image, ImageOps
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+_PHASH_SIZE = 32
+_PHASH_LOW = 8
+
+# cos((2x + 1) * u * pi / 2N) for the 8 lowest frequencies, computed once
+_DCT_COS = [
+    [math.cos((2 * x + 1) * u * math.pi / (2 * _PHASH_SIZE)) for x in range(_PHASH_SIZE)]
+    for u in range(_PHASH_LOW)
+]
+
+
+def dhash(image: Image.Image) -> int:
+    """64-bit difference hash of a Pillow image."""
+    small = image.convert("L").resize((9, 8), Image.Resampling.LANCZOS)
+    pixels = list(small.getdata())
+    bits = 0
+    for row in range(8):
+        offset = row * 9
+        for col in range(8):
+            bits = (bits << 1) | (1 if pixels[offset + col] > pixels[offset + col + 1] else 0)
+    return bits
+
+
+def phash(image: Image.Image) -> int:
+    """64-bit DCT perceptual hash of a Pillow image."""
+    small = image.convert("L").resize((_PHASH_SIZE, _PHASH_SIZE), Image.Resampling.LANCZOS)
+    pixels = list(small.getdata())
+    rows = [pixels[r * _PHASH_SIZE:(r + 1) * _PHASH_SIZE] for r in range(_PHASH_SIZE)]
+
+    # Separable 2D DCT, keeping only the 8x8 low-frequency block
+    row_dct = [[sum(c * p for c, p in zip(_DCT_COS[u], row)) for u in range(_PHASH_LOW)] for row in rows]
+    coeffs = [
+        sum(_DCT_COS[v][y] * row_dct[y][u] for y in range(_PHASH_SIZE))
+        for v in range(_PHASH_LOW)
+        for u in range(_PHASH_LOW)
+    ]
+
+    # Median excluding the DC term, which only reflects overall brightness
+    median = sorted(coeffs[1:])[len(coeffs[1:]) // 2]
+    bits = 0
+    for value in coeffs:
+        bits = (bits << 1) | (1 if value > median else 0)
+    return bits
+
+
+def perceptual_hashes(image: Image.Image) -> Tuple[int, int]:
+    """(pHash, dHash) for an already-decoded image."""
+    return phash(image), dhash(image)
+
+
+def perceptual_hashes_from_bytes(data: bytes) -> Tuple[Optional[int], Optional[int]]:
+    """
+    (pHash, dHash) for encoded image bytes (blocking).
+
+    Returns (None, None) if the image can't be decoded.
+    """
+    try:
+        with Image.open(io.BytesIO(data)) as image:
+            image.draft("L", (_PHASH_SIZE * 4, _PHASH_SIZE * 4))  # fast JPEG downscale on decode
+            return perceptual_hashes(ImageOps.exif_transpose(image))
+    except Exception as e:
+        logger.warning(f"Perceptual hash skipped (could not decode): {e}")
+        return None, None
+
+
+def hamming_distance(a: int, b: int) -> int:
+    return bin(a ^ b).count("1")
+
+
+def format_hash(value: Optional[int]) -> Optional[str]:
+    return f"{value:016x}" if value is not None else None
+
+
+def collapse_near_duplicates(
+    items: Sequence[T],
+    get_hashes: Callable[[T], Tuple[Optional[int], Optional[int]]],
+    max_distance: int = 4,
+) -> Tuple[List[T], List[Tuple[int, int]]]:
+    """
+    Drop items whose photo is a near-duplicate of an earlier one.
+
+    Two photos are near-duplicates when both their pHash and dHash are within
+    ``max_distance`` bits. Items without hashes are always kept.
+
+    Args:
+        items: Images in upload order
+        get_hashes: Returns (pHash, dHash) for an item
+        max_distance: Max Hamming distance (out of 64) to treat as the same shot
+
+    Returns:
+        (kept items in order, [(dropped_index, kept_index), ...])
+    """
+    kept: List[T] = []
+    kept_hashes: List[Tuple[int, int, int]] = []  # (index, phash, dhash)
+    dropped: List[Tuple[int, int]] = []
+
+    for index, item in enumerate(items):
+        p_hash, d_hash = get_hashes(item)
+        if p_hash is None or d_hash is None:
+            kept.append(item)
+            continue
+        duplicate_of = next(
+            (
+                kept_index for kept_index, kept_p, kept_d in kept_hashes
+                if hamming_distance(p_hash, kept_p) <= max_distance
+                and hamming_distance(d_hash, kept_d) <= max_distance
+            ),
+            None,
+        )
+        if duplicate_of is not None:
+            dropped.append((index, duplicate_of))
+            continue
+        kept.append(item)
+        kept_hashes.append((index, p_hash, d_hash))
+
+    return kept, dropped
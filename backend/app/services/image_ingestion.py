@@ -0,0 +1,275 @@
+"""
+Image ingestion for vision endpoints.
+
+Reads each upload exactly once through a bounded buffer, base64-encodes it
+exactly once, and releases the raw bytes. The encoded payload is then shared
+by every consumer (Gemini inline_data parts, OpenAI image_url parts) and can
+be streamed straight into the outbound request body instead of being copied
+into a giant ``json.dumps`` string.
+
+Peak memory for an N-photo upload is therefore ~1x the base64 payload rather
+than raw bytes + two base64 copies + the serialized request body.
+"""
+
+import asyncio
+import base64
+import json
+import logging
+from dataclasses import dataclass
+from typing import Any, AsyncIterator, Dict, List, Optional, Sequence, Tuple
+
+from app.core.config import settings
+from app.services.image_hashing import collapse_near_duplicates, perceptual_hashes_from_bytes
+from app.services.image_preprocessing import (
+    PreprocessConfig,
+    PreprocessedImage,
+    PreprocessStats,
+    get_image_executor,
+    preprocess_image_bytes,
+)
+
+logger = logging.getLogger(__name__)
+
+READ_CHUNK_SIZE = 1024 * 1024  # 1 MB
+STREAM_CHUNK_SIZE = 64 * 1024  # 64 KB per outbound body chunk
+MAX_IMAGE_BYTES = 25 * 1024 * 1024  # 25 MB per photo
+MAX_TOTAL_BYTES = 200 * 1024 * 1024  # 200 MB per request
+
+
+class ImageTooLargeError(ValueError):
+    """Raised when an upload exceeds the per-image or per-request size limit"""
+
+
+@dataclass
+class IngestedImage:
+    """One uploaded image, base64-encoded once and shared by all consumers"""
+    filename: str
+    mime_type: str
+    size_bytes: int
+    b64: bytes  # ASCII base64 payload
+    original_size_bytes: int = 0  # size before preprocessing (== size_bytes if untouched)
+    phash: Optional[int] = None  # perceptual hashes; None if the image couldn't be decoded
+    dhash: Optional[int] = None
+
+    @property
+    def b64_str(self) -> str:
+        return self.b64.decode("ascii")
+
+    def to_gemini_part(self) -> Dict[str, Any]:
+        """Gemini ``inline_data`` part (for callers that still build dict payloads)."""
+        return {"inline_data": {"mime_type": self.mime_type, "data": self.b64_str}}
+
+    def to_openai_part(self) -> Dict[str, Any]:
+        """OpenAI vision ``image_url`` content part."""
+        return {
+            "type": "image_url",
+            "image_url": {"url": f"data:{self.mime_type};base64,{self.b64_str}"},
+        }
+
+
+async def read_upload_bounded(upload, max_bytes: int = MAX_IMAGE_BYTES) -> bytes:
+    """
+    Read an ``UploadFile`` once, in chunks, refusing anything over ``max_bytes``.
+
+    Args:
+        upload: FastAPI/Starlette ``UploadFile`` (anything with ``async read(size)``)
+        max_bytes: Size limit for this upload
+
+    Returns:
+        The file contents
+    """
+    buffer = bytearray()
+    while True:
+        chunk = await upload.read(READ_CHUNK_SIZE)
+        if not chunk:
+            break
+        if len(buffer) + len(chunk) > max_bytes:
+            raise ImageTooLargeError(
+                f"Image '{getattr(upload, 'filename', 'upload')}' exceeds {max_bytes // (1024 * 1024)} MB limit"
+            )
+        buffer += chunk
+    return bytes(buffer)
+
+
+def _detect_mime_type(data: bytes, declared: Optional[str]) -> str:
+    """Sniff the common photo formats; fall back to the declared type, then JPEG."""
+    if data[:3] == b"\xff\xd8\xff":
+        return "image/jpeg"
+    if data[:8] == b"\x89PNG\r\n\x1a\n":
+        return "image/png"
+    if data[:4] == b"RIFF" and data[8:12] == b"WEBP":
+        return "image/webp"
+    if data[4:12] in (b"ftypheic", b"ftypheix", b"ftypmif1", b"ftypmsf1"):
+        return "image/heic"
+    if declared and declared.startswith("image/"):
+        return declared
+    return "image/jpeg"
+
+
+def _preprocess_and_encode(raw: bytes, config: PreprocessConfig) -> Tuple[PreprocessedImage, bytes]:
+    """Worker-thread step: downscale/re-encode, then base64 the smaller payload."""
+    result = preprocess_image_bytes(raw, config)
+    return result, base64.b64encode(result.data)
+
+
+def _hash_and_encode(raw: bytes) -> Tuple[Optional[int], Optional[int], bytes]:
+    """Worker-thread step when preprocessing is off: perceptual hashes + base64."""
+    p_hash, d_hash = perceptual_hashes_from_bytes(raw)
+    return p_hash, d_hash, base64.b64encode(raw)
+
+
+async def ingest_uploads(
+    uploads: Sequence[Any],
+    max_image_bytes: int = MAX_IMAGE_BYTES,
+    max_total_bytes: int = MAX_TOTAL_BYTES,
+    preprocess: Optional[bool] = None,
+) -> List[IngestedImage]:
+    """
+    Read and encode every upload exactly once.
+
+    Args:
+        uploads: ``UploadFile`` objects from the request
+        max_image_bytes: Per-image size limit
+        max_total_bytes: Combined size limit for the request
+        preprocess: Downscale/re-encode on the image thread pool before encoding
+            (defaults to ``IMAGE_PREPROCESSING_ENABLED``)
+
+    Returns:
+        Encoded images in upload order (raw bytes are not retained)
+    """
+    if preprocess is None:
+        preprocess = settings.IMAGE_PREPROCESSING_ENABLED
+
+    ingested: List[IngestedImage] = []
+    pending = []
+    config = PreprocessConfig.from_settings() if preprocess else None
+    loop = asyncio.get_running_loop()
+    total = 0
+    for upload in uploads:
+        raw = await read_upload_bounded(upload, max_image_bytes)
+        total += len(raw)
+        if total > max_total_bytes:
+            raise ImageTooLargeError(f"Upload exceeds {max_total_bytes // (1024 * 1024)} MB total limit")
+        filename = getattr(upload, "filename", None) or f"image_{len(ingested) + len(pending)}"
+        # Start the CPU work now so it overlaps with reading the next upload
+        if preprocess:
+            future = loop.run_in_executor(get_image_executor(), _preprocess_and_encode, raw, config)
+            pending.append((filename, None, len(raw), future))
+        else:
+            mime_type = _detect_mime_type(raw, getattr(upload, "content_type", None))
+            future = loop.run_in_executor(get_image_executor(), _hash_and_encode, raw)
+            pending.append((filename, mime_type, len(raw), future))
+        del raw
+
+    for filename, mime_type, raw_size, future in pending:
+        if mime_type is None:
+            result, b64 = await future
+            ingested.append(IngestedImage(
+                filename=filename,
+                mime_type=result.mime_type if result.processed else _detect_mime_type(result.data, None),
+                size_bytes=len(result.data),
+                b64=b64,
+                original_size_bytes=result.original_bytes,
+                phash=result.phash,
+                dhash=result.dhash,
+            ))
+        else:
+            p_hash, d_hash, b64 = await future
+            ingested.append(IngestedImage(
+                filename=filename,
+                mime_type=mime_type,
+                size_bytes=raw_size,
+                b64=b64,
+                original_size_bytes=raw_size,
+                phash=p_hash,
+                dhash=d_hash,
+            ))
+    return ingested
+
+
+def dedupe_ingested(
+    images: Sequence[IngestedImage],
+    max_distance: Optional[int] = None,
+) -> Tuple[List[IngestedImage], List[Tuple[int, int]]]:
+    """
+    Collapse near-duplicate photos (burst shots, accidental re-selects) in one upload.
+
+    Args:
+        images: Ingested images in upload order
+        max_distance: Hamming distance threshold (defaults to ``IMAGE_DEDUP_MAX_DISTANCE``)
+
+    Returns:
+        (unique images in order, [(dropped_index, kept_index), ...])
+    """
+    if max_distance is None:
+        max_distance = settings.IMAGE_DEDUP_MAX_DISTANCE
+    if max_distance < 0:
+        return list(images), []
+    return collapse_near_duplicates(images, lambda image: (image.phash, image.dhash), max_distance)
+
+
+def ingestion_stats(images: Sequence[IngestedImage]) -> PreprocessStats:
+    """Bytes-in/bytes-out summary for a set of ingested images."""
+    return PreprocessStats(
+        images=len(images),
+        bytes_in=sum(image.original_size_bytes or image.size_bytes for image in images),
+        bytes_out=sum(image.size_bytes for image in images),
+    )
+
+
+class GeminiStreamingBody:
+    """
+    Streams a Gemini ``generateContent`` JSON body without materializing it.
+
+    Text parts are JSON-encoded up front (small); image payloads are yielded
+    directly from each image's shared base64 buffer in fixed-size chunks. The
+    exact ``Content-Length`` is known in advance, and the body can be iterated
+    again (e.g. when the HTTP client retries).
+
+    Usage:
+        body = GeminiStreamingBody([prompt], images, {"generationConfig": {...}})
+        await client.post(url, content=body, headers=body.headers)
+    """
+
+    def __init__(
+        self,
+        text_parts: Sequence[str],
+        images: Sequence[IngestedImage],
+        extra_fields: Optional[Dict[str, Any]] = None,
+        chunk_size: int = STREAM_CHUNK_SIZE,
+    ):
+        self.images = list(images)
+        self.chunk_size = chunk_size
+        self._prefix = ('{"contents":[{"parts":[' + ",".join(
+            json.dumps({"text": text}) for text in text_parts
+        )).encode("utf-8")
+        self._needs_leading_comma = bool(text_parts)
+        extra_json = json.dumps(extra_fields or {}, separators=(",", ":"))
+        self._suffix = ("]}]" + ("," + extra_json[1:-1] if extra_fields else "") + "}").encode("utf-8")
+
+    def _image_head(self, index: int, image: IngestedImage) -> bytes:
+        comma = "," if (index > 0 or self._needs_leading_comma) else ""
+        return f'{comma}{{"inline_data":{{"mime_type":{json.dumps(image.mime_type)},"data":"'.encode("utf-8")
+
+    _IMAGE_TAIL = b'"}}'
+
+    @property
+    def content_length(self) -> int:
+        length = len(self._prefix) + len(self._suffix)
+        for index, image in enumerate(self.images):
+            length += len(self._image_head(index, image)) + len(image.b64) + len(self._IMAGE_TAIL)
+        return length
+
+    @property
+    def headers(self) -> Dict[str, str]:
+        return {"Content-Type": "application/json", "Content-Length": str(self.content_length)}
+
+    async def __aiter__(self) -> AsyncIterator[bytes]:
+        yield self._prefix
+        for index, image in enumerate(self.images):
+            yield self._image_head(index, image)
+            payload = image.b64
+            for start in range(0, len(payload), self.chunk_size):
+                yield payload[start:start + self.chunk_size]
+            yield self._IMAGE_TAIL
+        yield self._suffix
@@ -0,0 +1,257 @@
+"""
+Server-side image preprocessing before vision API calls.
+
+Phone photos are typically 4-12 MB at 12+ megapixels; vision models downscale
+them internally anyway, so sending full resolution only costs upload time and
+tokens. Each image is:
+
+1. EXIF-orientation corrected (so sideways photos don't confuse the model)
+2. Resized so its longest edge is at most ``IMAGE_MAX_EDGE``
+3. Re-encoded as JPEG or WebP at ``IMAGE_QUALITY``
+4. Stripped of metadata (EXIF/GPS is never copied to the output)
+
+Pillow work is CPU-bound, so it runs in a bounded thread pool instead of on
+the event loop.
+"""
+
+import asyncio
+import io
+import logging
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import List, Optional, Tuple
+
+from PIL import Image, ImageOps
+
+from app.core.config import settings
+from app.services.image_hashing import perceptual_hashes
+
+logger = logging.getLogger(__name__)
+
+EXIF_ORIENTATION = 0x0112
+_OUTPUT_MIME_TYPES = {"JPEG": "image/jpeg", "WEBP": "image/webp"}
+
+# JPEG segments kept by strip_jpeg_metadata: APP0 (JFIF) and APP14 (Adobe colour transform)
+_JPEG_KEPT_APP_MARKERS = (0xE0, 0xEE)
+
+_executor: Optional[ThreadPoolExecutor] = None
+
+
+def get_image_executor() -> ThreadPoolExecutor:
+    """Shared thread pool for Pillow work (created on first use)."""
+    global _executor
+    if _executor is None:
+        workers = settings.IMAGE_PREPROCESS_WORKERS or min(4, os.cpu_count() or 1)
+        _executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="image-preprocess")
+    return _executor
+
+
+@dataclass
+class PreprocessConfig:
+    """How images are normalized before being sent upstream"""
+    max_edge: int = 1600
+    output_format: str = "JPEG"  # "JPEG" or "WEBP"
+    quality: int = 82
+
+    @classmethod
+    def from_settings(cls) -> "PreprocessConfig":
+        output_format = (settings.IMAGE_OUTPUT_FORMAT or "JPEG").upper()
+        if output_format not in _OUTPUT_MIME_TYPES:
+            logger.warning(f"Unsupported IMAGE_OUTPUT_FORMAT={output_format!r}, using JPEG")
+            output_format = "JPEG"
+        return cls(
+            max_edge=settings.IMAGE_MAX_EDGE,
+            output_format=output_format,
+            quality=settings.IMAGE_QUALITY,
+        )
+
+    @property
+    def mime_type(self) -> str:
+        return _OUTPUT_MIME_TYPES[self.output_format]
+
+
+@dataclass
+class PreprocessedImage:
+    """Result of preprocessing one image"""
+    data: bytes
+    mime_type: str
+    original_bytes: int
+    width: int
+    height: int
+    processed: bool  # False if the image couldn't be decoded and was passed through
+    phash: Optional[int] = None
+    dhash: Optional[int] = None
+
+    @property
+    def bytes_saved(self) -> int:
+        return self.original_bytes - len(self.data)
+
+
+@dataclass
+class PreprocessStats:
+    """Aggregate savings for a batch of images"""
+    images: int = 0
+    bytes_in: int = 0
+    bytes_out: int = 0
+    passthrough: int = 0
+    seconds: float = 0.0
+
+    @property
+    def bytes_saved(self) -> int:
+        return self.bytes_in - self.bytes_out
+
+    def to_dict(self) -> dict:
+        return {
+            "images": self.images,
+            "bytes_in": self.bytes_in,
+            "bytes_out": self.bytes_out,
+            "bytes_saved": self.bytes_saved,
+            "reduction_percent": round(100 * self.bytes_saved / self.bytes_in, 1) if self.bytes_in else 0.0,
+            "passthrough": self.passthrough,
+            "seconds": round(self.seconds, 3),
+        }
+
+    @classmethod
+    def from_results(cls, results: List[PreprocessedImage], seconds: float) -> "PreprocessStats":
+        return cls(
+            images=len(results),
+            bytes_in=sum(r.original_bytes for r in results),
+            bytes_out=sum(len(r.data) for r in results),
+            passthrough=sum(1 for r in results if not r.processed),
+            seconds=seconds,
+        )
+
+
+def strip_jpeg_metadata(data: bytes) -> Optional[bytes]:
+    """
+    Drop EXIF/GPS, XMP, IPTC, ICC and comment segments from a JPEG without re-encoding it.
+
+    Returns:
+        The stripped JPEG, or None if ``data`` isn't a well-formed JPEG
+    """
+    if data[:2] != b"\xff\xd8":
+        return None
+    output = bytearray(data[:2])
+    position = 2
+    while position + 4 <= len(data):
+        if data[position] != 0xFF:
+            return None
+        marker = data[position + 1]
+        if marker == 0xFF:  # fill byte
+            position += 1
+            continue
+        if marker == 0xDA:  # start of scan: entropy-coded data and the rest of the file follow
+            output += data[position:]
+            return bytes(output)
+        length = int.from_bytes(data[position + 2:position + 4], "big")
+        end = position + 2 + length
+        if length < 2 or end > len(data):
+            return None
+        is_metadata = (0xE0 <= marker <= 0xEF and marker not in _JPEG_KEPT_APP_MARKERS) or marker == 0xFE
+        if not is_metadata:
+            output += data[position:end]
+        position = end
+    return None
+
+
+def preprocess_image_bytes(data: bytes, config: Optional[PreprocessConfig] = None) -> PreprocessedImage:
+    """
+    Orient, downscale, re-encode and strip metadata from one image (blocking).
+    Perceptual hashes are computed from the oriented image while it's decoded.
+
+    Undecodable input (e.g. HEIC without a plugin) is returned unchanged.
+    """
+    config = config or PreprocessConfig.from_settings()
+    try:
+        with Image.open(io.BytesIO(data)) as source:
+            source_format = source.format
+            upright = source.getexif().get(EXIF_ORIENTATION, 1) == 1
+            image = ImageOps.exif_transpose(source)
+            if image.mode not in ("RGB", "L"):
+                image = image.convert("RGB")
+            image.thumbnail((config.max_edge, config.max_edge), Image.Resampling.LANCZOS)
+            unchanged = upright and image.size == source.size
+
+            output = io.BytesIO()
+            save_kwargs = {"quality": config.quality}
+            if config.output_format == "JPEG":
+                save_kwargs.update(optimize=True, progressive=True)
+            else:
+                save_kwargs.update(method=4)
+            # Pillow carries comment/ICC/XMP over from ``info`` unless told otherwise;
+            # clearing it (and passing no exif=) drops all metadata
+            image.info = {}
+            image.save(output, format=config.output_format, **save_kwargs)
+            p_hash, d_hash = perceptual_hashes(image)
+
+            # An already-compact JPEG that needed no rotation or resize: if the re-encode came
+            # out bigger, send the original pixels with its metadata segments cut out instead
+            stripped = strip_jpeg_metadata(data) if unchanged and source_format == "JPEG" else None
+            if stripped is not None and len(stripped) < output.tell():
+                return PreprocessedImage(
+                    data=stripped,
+                    mime_type="image/jpeg",
+                    original_bytes=len(data),
+                    width=image.width,
+                    height=image.height,
+                    processed=True,
+                    phash=p_hash,
+                    dhash=d_hash,
+                )
+
+            return PreprocessedImage(
+                data=output.getvalue(),
+                mime_type=config.mime_type,
+                original_bytes=len(data),
+                width=image.width,
+                height=image.height,
+                processed=True,
+                phash=p_hash,
+                dhash=d_hash,
+            )
+    except Exception as e:
+        logger.warning(f"Image preprocessing skipped (could not decode): {e}")
+        return PreprocessedImage(
+            data=data,
+            mime_type="image/jpeg",
+            original_bytes=len(data),
+            width=0,
+            height=0,
+            processed=False,
+        )
+
+
+async def preprocess_image(data: bytes, config: Optional[PreprocessConfig] = None) -> PreprocessedImage:
+    """Preprocess one image on the shared thread pool."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(get_image_executor(), preprocess_image_bytes, data, config)
+
+
+async def preprocess_images(
+    images: List[bytes],
+    config: Optional[PreprocessConfig] = None,
+) -> Tuple[List[bytes], PreprocessStats]:
+    """
+    Preprocess a batch of images concurrently on the shared thread pool.
+
+    Args:
+        images: Raw image bytes
+        config: Overrides for the settings-derived defaults
+
+    Returns:
+        (processed image bytes in input order, aggregate stats)
+    """
+    if not settings.IMAGE_PREPROCESSING_ENABLED or not images:
+        return images, PreprocessStats(images=len(images))
+
+    config = config or PreprocessConfig.from_settings()
+    start = time.perf_counter()
+    results = await asyncio.gather(*(preprocess_image(data, config) for data in images))
+    stats = PreprocessStats.from_results(list(results), time.perf_counter() - start)
+    logger.info(
+        f"Preprocessed {stats.images} images: {stats.bytes_in / 1e6:.1f} MB -> "
+        f"{stats.bytes_out / 1e6:.1f} MB in {stats.seconds:.2f}s"
+    )
+    return [r.data for r in results], stats
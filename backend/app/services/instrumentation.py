@@ -0,0 +1,402 @@
+"""
+Agent and upstream-call instrumentation: timing spans, latency histograms, error counters.
+
+Spans nest through a context variable, so an upstream call made anywhere under
+an agent run (Gemini/OpenAI/NHTSA over the pooled HTTP clients, Supabase and
+SDK calls through ``run_blocking``) becomes a child of that agent's span:
+
+    with span("gemini.generate", kind="upstream", model=model):
+        ...
+    async with span("market_lookup"):
+        ...
+
+Every finished span is observed into a Prometheus-style histogram keyed by
+span name, kind and owning agent, and counted as an error if it raised (or
+was marked failed). ``BaseAgent.execute`` wraps each run in an "agent" span.
+``metrics.render_prometheus()`` backs ``/metrics``; ``metrics.summary()``
+gives p50/p95/p99 estimates per agent and per stage.
+
+Finished spans can also be exported (AGENT_TRACE_EXPORT):
+- "file": one JSON object per span appended to AGENT_TRACE_FILE, written on a
+  background thread
+- "otel": OpenTelemetry SDK spans (if installed) with a console exporter
+  writing to AGENT_TRACE_FILE; falls back to "file" without the SDK
+"""
+
+import contextvars
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import threading
+import time
+import uuid
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Upper bounds (ms) of the latency buckets; the last bucket is +Inf
+LATENCY_BUCKETS_MS = (5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000, 30000, 60000)
+
+LabelKey = Tuple[Tuple[str, str], ...]
+
+
+class Histogram:
+    """Cumulative-bucket latency histogram (Prometheus layout)"""
+
+    def __init__(self, buckets: Tuple[float, ...] = LATENCY_BUCKETS_MS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.total = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        index = len(self.buckets)
+        for position, bound in enumerate(self.buckets):
+            if value <= bound:
+                index = position
+                break
+        self.counts[index] += 1
+        self.total += value
+        self.count += 1
+
+    def quantile(self, q: float) -> Optional[float]:
+        """Estimate by linear interpolation inside the bucket holding the q-th observation."""
+        if not self.count:
+            return None
+        rank = q * self.count
+        seen = 0
+        for position, bucket_count in enumerate(self.counts):
+            if seen + bucket_count >= rank and bucket_count:
+                lower = self.buckets[position - 1] if position > 0 else 0.0
+                if position == len(self.buckets):
+                    return float(lower)  # +Inf bucket: best we can say is "above the last bound"
+                upper = self.buckets[position]
+                return lower + (upper - lower) * (rank - seen) / bucket_count
+            seen += bucket_count
+        return float(self.buckets[-1])
+
+
+class MetricsRegistry:
+    """Histograms and counters keyed by metric name and labels"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._histograms: Dict[str, Dict[LabelKey, Histogram]] = {}
+        self._counters: Dict[str, Dict[LabelKey, float]] = {}
+        self._help: Dict[str, str] = {}
+
+    @staticmethod
+    def _key(labels: Dict[str, Any]) -> LabelKey:
+        return tuple(sorted((name, str(value)) for name, value in labels.items() if value is not None))
+
+    def observe(self, metric: str, value_ms: float, help_text: str = "", **labels: Any) -> None:
+        with self._lock:
+            series = self._histograms.setdefault(metric, {})
+            key = self._key(labels)
+            histogram = series.get(key)
+            if histogram is None:
+                histogram = series[key] = Histogram()
+            histogram.observe(value_ms)
+            if help_text:
+                self._help.setdefault(metric, help_text)
+
+    def inc(self, metric: str, amount: float = 1.0, help_text: str = "", **labels: Any) -> None:
+        with self._lock:
+            series = self._counters.setdefault(metric, {})
+            key = self._key(labels)
+            series[key] = series.get(key, 0.0) + amount
+            if help_text:
+                self._help.setdefault(metric, help_text)
+
+    def render_prometheus(self) -> str:
+        """Text exposition format."""
+        def label_text(key: LabelKey, extra: Tuple[Tuple[str, str], ...] = ()) -> str:
+            pairs = key + extra
+            if not pairs:
+                return ""
+            escaped = (value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n") for _, value in pairs)
+            return "{" + ",".join(f'{name}="{value}"' for (name, _), value in zip(pairs, escaped)) + "}"
+
+        lines: List[str] = []
+        with self._lock:
+            for metric, series in sorted(self._histograms.items()):
+                if metric in self._help:
+                    lines.append(f"# HELP {metric} {self._help[metric]}")
+                lines.append(f"# TYPE {metric} histogram")
+                for key, histogram in series.items():
+                    cumulative = 0
+                    for bound, bucket_count in zip(histogram.buckets, histogram.counts):
+                        cumulative += bucket_count
+                        lines.append(f"{metric}_bucket{label_text(key, (('le', str(bound)),))} {cumulative}")
+                    lines.append(f"{metric}_bucket{label_text(key, (('le', '+Inf'),))} {histogram.count}")
+                    lines.append(f"{metric}_sum{label_text(key)} {round(histogram.total, 3)}")
+                    lines.append(f"{metric}_count{label_text(key)} {histogram.count}")
+            for metric, series in sorted(self._counters.items()):
+                if metric in self._help:
+                    lines.append(f"# HELP {metric} {self._help[metric]}")
+                lines.append(f"# TYPE {metric} counter")
+                for key, value in series.items():
+                    lines.append(f"{metric}{label_text(key)} {value:g}")
+        return "\n".join(lines) + "\n"
+
+    def summary(self) -> Dict[str, Any]:
+        """Per-series count, mean and p50/p95/p99 estimates (ms), plus error counts."""
+        with self._lock:
+            result: Dict[str, Any] = {}
+            for metric, series in self._histograms.items():
+                result[metric] = [
+                    {
+                        **dict(key),
+                        "count": histogram.count,
+                        "mean_ms": round(histogram.total / histogram.count, 1) if histogram.count else None,
+                        "p50_ms": _round(histogram.quantile(0.5)),
+                        "p95_ms": _round(histogram.quantile(0.95)),
+                        "p99_ms": _round(histogram.quantile(0.99)),
+                    }
+                    for key, histogram in series.items()
+                ]
+                result[metric].sort(key=lambda entry: entry["p95_ms"] or 0, reverse=True)
+            for metric, series in self._counters.items():
+                result[metric] = [{**dict(key), "value": value} for key, value in series.items()]
+            return result
+
+
+def _round(value: Optional[float]) -> Optional[float]:
+    return round(value, 1) if value is not None else None
+
+
+metrics = MetricsRegistry()
+
+
+@dataclass
+class Span:
+    """One timed operation in a trace"""
+    name: str
+    kind: str = "internal"  # agent, upstream, blocking, internal
+    trace_id: str = ""
+    span_id: str = ""
+    parent_id: Optional[str] = None
+    agent: Optional[str] = None  # nearest enclosing agent
+    attributes: Dict[str, Any] = field(default_factory=dict)
+    started_at: float = 0.0  # epoch seconds
+    duration_ms: float = 0.0
+    status: str = "ok"  # ok, error
+    error: Optional[str] = None
+    _started: float = field(default=0.0, repr=False)
+    _otel: Any = field(default=None, repr=False)
+
+    def set_attribute(self, name: str, value: Any) -> None:
+        self.attributes[name] = value
+
+    def fail(self, error: str) -> None:
+        """Mark the span failed without raising (e.g. an agent returned success=False)."""
+        self.status = "error"
+        self.error = error
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "name": self.name,
+            "kind": self.kind,
+            "trace_id": self.trace_id,
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "agent": self.agent,
+            "started_at": self.started_at,
+            "duration_ms": round(self.duration_ms, 3),
+            "status": self.status,
+            "error": self.error,
+            "attributes": self.attributes,
+        }
+
+
+_current_span: contextvars.ContextVar[Optional[Span]] = contextvars.ContextVar("current_span", default=None)
+
+
+def current_span() -> Optional[Span]:
+    return _current_span.get()
+
+
+class span:
+    """
+    Time a block as a child of the current span (sync or async context manager).
+
+    Args:
+        name: Span name, e.g. "http.gemini" or "agent.scout_agent"
+        kind: agent, upstream, blocking or internal
+        **attributes: Extra span attributes (exported, not used as metric labels)
+    """
+
+    def __init__(self, name: str, kind: str = "internal", **attributes: Any):
+        self.name = name
+        self.kind = kind
+        self.attributes = attributes
+        self.span: Optional[Span] = None
+        self._token = None
+
+    def __enter__(self) -> Span:
+        parent = _current_span.get()
+        agent = self.attributes.get("agent") if self.kind == "agent" else (parent.agent if parent else None)
+        self.span = Span(
+            name=self.name,
+            kind=self.kind,
+            trace_id=parent.trace_id if parent else uuid.uuid4().hex,
+            span_id=uuid.uuid4().hex[:16],
+            parent_id=parent.span_id if parent else None,
+            agent=agent,
+            attributes=dict(self.attributes),
+            started_at=time.time(),
+            _started=time.perf_counter(),
+        )
+        if _exporter is not None:
+            _exporter.start(self.span, parent)
+        self._token = _current_span.set(self.span)
+        return self.span
+
+    def __exit__(self, exc_type, exc, tb) -> bool:
+        finished = self.span
+        finished.duration_ms = (time.perf_counter() - finished._started) * 1000
+        _current_span.reset(self._token)
+        if exc is not None:
+            finished.fail(str(exc) or exc_type.__name__)
+            finished.attributes.setdefault("exception", exc_type.__name__)
+        _finish(finished)
+        return False
+
+    async def __aenter__(self) -> Span:
+        return self.__enter__()
+
+    async def __aexit__(self, exc_type, exc, tb) -> bool:
+        return self.__exit__(exc_type, exc, tb)
+
+
+def _finish(finished: Span) -> None:
+    if settings.AGENT_METRICS_ENABLED:
+        if finished.kind == "agent":
+            metrics.observe("agent_execute_duration_ms", finished.duration_ms,
+                            "Agent execute() latency in milliseconds", agent=finished.agent)
+            if finished.status == "error":
+                metrics.inc("agent_errors_total", help_text="Failed agent runs",
+                            agent=finished.agent, error=finished.attributes.get("exception", "failed"))
+        else:
+            metrics.observe("span_duration_ms", finished.duration_ms,
+                            "Latency of stages and upstream calls in milliseconds",
+                            span=finished.name, kind=finished.kind, agent=finished.agent)
+            if finished.status == "error":
+                metrics.inc("span_errors_total", help_text="Failed stages and upstream calls",
+                            span=finished.name, kind=finished.kind, agent=finished.agent)
+    if _exporter is not None:
+        try:
+            _exporter.finish(finished)
+        except Exception as e:
+            logger.debug(f"Span export failed: {e}")
+
+
+# ---- exporters ----
+
+def _trace_file() -> str:
+    if settings.AGENT_TRACE_FILE:
+        return settings.AGENT_TRACE_FILE
+    backend_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    return os.path.join(backend_dir, "data", "agent_traces.jsonl")
+
+
+class FileSpanExporter:
+    """Appends finished spans as JSON lines; the file write happens on a listener thread"""
+
+    def __init__(self, path: str):
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        handler = logging.FileHandler(path, encoding="utf-8")
+        handler.setFormatter(logging.Formatter("%(message)s"))
+        self._queue: queue.Queue = queue.Queue(maxsize=10000)
+        self._listener = logging.handlers.QueueListener(self._queue, handler)
+        self._logger = logging.getLogger(f"{__name__}.spans")
+        self._logger.propagate = False
+        self._logger.handlers = [logging.handlers.QueueHandler(self._queue)]
+        self._logger.setLevel(logging.INFO)
+        self._listener.start()
+
+    def start(self, started: Span, parent: Optional[Span]) -> None:
+        pass
+
+    def finish(self, finished: Span) -> None:
+        try:
+            self._logger.info(json.dumps(finished.to_dict(), default=str))
+        except queue.Full:
+            pass  # never block the event loop on tracing
+
+    def shutdown(self) -> None:
+        self._listener.stop()
+
+
+class OpenTelemetrySpanExporter:
+    """Mirrors spans into the OpenTelemetry SDK, exported to a local file by the console exporter"""
+
+    def __init__(self, path: str):
+        from opentelemetry.sdk.resources import Resource
+        from opentelemetry.sdk.trace import TracerProvider
+        from opentelemetry.sdk.trace.export import BatchSpanProcessor, ConsoleSpanExporter
+
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self._file = open(path, "a", encoding="utf-8")
+        self._provider = TracerProvider(resource=Resource.create({"service.name": "accorria-agents"}))
+        self._provider.add_span_processor(BatchSpanProcessor(ConsoleSpanExporter(out=self._file)))
+        self._tracer = self._provider.get_tracer(__name__)
+
+    def start(self, started: Span, parent: Optional[Span]) -> None:
+        from opentelemetry import trace
+
+        context = trace.set_span_in_context(parent._otel) if parent is not None and parent._otel is not None else None
+        started._otel = self._tracer.start_span(
+            started.name,
+            context=context,
+            start_time=int(started.started_at * 1e9),
+            attributes={"span.kind": started.kind, **{k: str(v) for k, v in started.attributes.items()}},
+        )
+
+    def finish(self, finished: Span) -> None:
+        from opentelemetry.trace import Status, StatusCode
+
+        otel_span = finished._otel
+        if otel_span is None:
+            return
+        for name, value in finished.attributes.items():
+            otel_span.set_attribute(name, str(value))
+        if finished.agent:
+            otel_span.set_attribute("agent", finished.agent)
+        if finished.status == "error":
+            otel_span.set_status(Status(StatusCode.ERROR, finished.error))
+        otel_span.end(end_time=int((finished.started_at + finished.duration_ms / 1000) * 1e9))
+
+    def shutdown(self) -> None:
+        self._provider.shutdown()
+        self._file.close()
+
+
+def _create_exporter():
+    mode = (settings.AGENT_TRACE_EXPORT or "none").lower()
+    if mode == "none":
+        return None
+    path = _trace_file()
+    if mode == "otel":
+        try:
+            return OpenTelemetrySpanExporter(path)
+        except ImportError:
+            logger.warning("opentelemetry-sdk is not installed; writing agent spans as JSON lines instead")
+    logger.info(f"Exporting agent spans to {path}")
+    return FileSpanExporter(path)
+
+
+_exporter = _create_exporter()
+
+
+def shutdown_exporter() -> None:
+    """Flush and close the span exporter (app shutdown)."""
+    global _exporter
+    if _exporter is not None:
+        _exporter.shutdown()
+        _exporter = None
@@ -0,0 +1,351 @@
+"""
+Local key-image selection before paid vision calls.
+
+Sellers upload 10-30 photos, many of them near-identical exterior angles.
+Vision models don't need all of them: a handful covering the front and rear
+(make/model/year, trim badges), the dashboard/odometer (features, mileage), the
+interior (condition) and close-ups (damage, badges) carries nearly all the signal.
+
+Each photo is classified and scored on the CPU from cheap Pillow features
+(exposure, saturation, edge density, sky in the top band, bright-screen
+highlights on a dark background, red taillight pixels, colour histogram). If an ONNX classifier is
+configured (``IMAGE_SELECTOR_MODEL_PATH``) and ``onnxruntime`` is installed,
+its category probabilities replace the heuristic classification.
+
+Selection then covers each category in priority order, and fills the
+remaining slots with the sharpest, best-exposed photos that look least like
+the ones already picked, preferring categories still under their
+``CATEGORY_QUOTAS`` share (so three front angles don't crowd out the rear). The first upload (usually the seller's cover shot)
+is always kept, and the selection is returned in upload order.
+"""
+
+import asyncio
+import base64
+import io
+import logging
+import math
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from PIL import Image, ImageChops, ImageFilter, ImageOps, ImageStat
+
+from app.core.config import settings
+from app.services.image_ingestion import IngestedImage
+from app.services.image_preprocessing import get_image_executor
+
+logger = logging.getLogger(__name__)
+
+# Categories in coverage priority order
+CATEGORIES = ("front", "rear", "dashboard", "interior", "detail")
+# Photos per category the fill step takes before it moves on to other categories
+CATEGORY_QUOTAS = {"front": 2, "rear": 2, "dashboard": 1, "interior": 2, "detail": 3}
+# Share of strongly red pixels that looks like taillights rather than a red car body
+TAILLIGHT_RED_FRACTION = (0.001, 0.12)
+
+_THUMB_SIZE = 96
+_HIST_BINS = 4  # per RGB channel -> 64-bin colour histogram
+
+
+@dataclass
+class ImageFeatures:
+    """Cheap per-photo features used for classification and scoring"""
+    index: int
+    decodable: bool = True
+    aspect: float = 1.0
+    brightness: float = 0.0  # 0-1
+    contrast: float = 0.0  # luminance stddev, 0-1
+    saturation: float = 0.0  # 0-1
+    edge_density: float = 0.0  # 0-1
+    sky_score: float = 0.0  # bright, bluish/low-saturation top band vs. rest
+    highlight_fraction: float = 0.0  # share of very bright pixels
+    dark_fraction: float = 0.0  # share of very dark pixels
+    red_fraction: float = 0.0  # share of strongly red pixels (taillights)
+    histogram: List[float] = field(default_factory=list)
+
+
+@dataclass
+class KeyImageSelection:
+    """Which photos to send upstream, and why"""
+    indices: List[int]  # selected upload indices, in upload order
+    categories: Dict[int, str]  # upload index -> detected category
+    scores: Dict[int, float]  # upload index -> informativeness score
+    classifier: str  # "heuristic" or "onnx"
+
+    @property
+    def coverage(self) -> Dict[str, int]:
+        counts = {category: 0 for category in CATEGORIES}
+        for index in self.indices:
+            category = self.categories.get(index)
+            if category in counts:
+                counts[category] += 1
+        return counts
+
+    def to_dict(self, total_images: int) -> dict:
+        return {
+            "total_images": total_images,
+            "selected_images": len(self.indices),
+            "selected_indices": self.indices,
+            "coverage": self.coverage,
+            "classifier": self.classifier,
+        }
+
+
+def _red_fraction(hsv: Image.Image) -> float:
+    """Share of saturated, lit red pixels (lamp lenses, not dark red shadows)."""
+    hue, saturation, value = hsv.split()
+    mask = ImageChops.multiply(
+        ImageChops.multiply(hue.point(lambda h: 255 if h <= 10 or h >= 245 else 0), saturation.point(lambda s: 255 if s > 150 else 0)),
+        value.point(lambda v: 255 if v > 120 else 0),
+    )
+    return ImageStat.Stat(mask).mean[0] / 255
+
+
+def extract_features(data: bytes, index: int = 0) -> ImageFeatures:
+    """Decode a small thumbnail of one photo and compute its features (blocking)."""
+    try:
+        with Image.open(io.BytesIO(data)) as image:
+            image.draft("RGB", (_THUMB_SIZE * 2, _THUMB_SIZE * 2))  # fast JPEG downscale on decode
+            image = ImageOps.exif_transpose(image).convert("RGB")
+            aspect = image.width / image.height if image.height else 1.0
+            image.thumbnail((_THUMB_SIZE, _THUMB_SIZE), Image.Resampling.BILINEAR)
+    except Exception as e:
+        logger.warning(f"Key-image features skipped for image {index} (could not decode): {e}")
+        return ImageFeatures(index=index, decodable=False)
+
+    gray = image.convert("L")
+    gray_stat = ImageStat.Stat(gray)
+    hsv = image.convert("HSV")
+    hsv_stat = ImageStat.Stat(hsv)
+    edge_stat = ImageStat.Stat(gray.filter(ImageFilter.FIND_EDGES))
+
+    luminance_hist = gray.histogram()
+    pixel_count = max(1, gray.width * gray.height)
+
+    # Sky: the top quarter of outdoor shots is brighter and less saturated than the rest
+    band = max(1, gray.height // 4)
+    top = image.crop((0, 0, image.width, band))
+    rest = image.crop((0, band, image.width, image.height))
+    top_hsv, rest_hsv = ImageStat.Stat(top.convert("HSV")), ImageStat.Stat(rest.convert("HSV"))
+    top_r, _, top_b = ImageStat.Stat(top).mean
+    sky_score = (
+        (top_hsv.mean[2] - rest_hsv.mean[2]) / 255
+        + max(0.0, (top_b - top_r) / 255)
+        + (0.1 if top_hsv.mean[2] > 150 else 0.0)
+    )
+
+    # Coarse, normalized RGB histogram for diversity scoring
+    quantized = image.resize((32, 32)).getdata()
+    step = 256 // _HIST_BINS
+    histogram = [0.0] * (_HIST_BINS ** 3)
+    for r, g, b in quantized:
+        histogram[(r // step) * _HIST_BINS * _HIST_BINS + (g // step) * _HIST_BINS + (b // step)] += 1
+    total = float(len(quantized)) or 1.0
+
+    return ImageFeatures(
+        index=index,
+        aspect=aspect,
+        brightness=gray_stat.mean[0] / 255,
+        contrast=gray_stat.stddev[0] / 128,
+        saturation=hsv_stat.mean[1] / 255,
+        edge_density=min(1.0, edge_stat.mean[0] / 64),
+        sky_score=sky_score,
+        highlight_fraction=sum(luminance_hist[230:]) / pixel_count,
+        dark_fraction=sum(luminance_hist[:40]) / pixel_count,
+        red_fraction=_red_fraction(hsv),
+        histogram=[count / total for count in histogram],
+    )
+
+
+def _exterior_view(features: ImageFeatures) -> str:
+    """Rear shots show small clusters of red taillight; other exterior shots count as front."""
+    low, high = TAILLIGHT_RED_FRACTION
+    return "rear" if low <= features.red_fraction <= high else "front"
+
+
+def classify_heuristic(features: ImageFeatures) -> Tuple[str, float]:
+    """
+    Guess the photo category from its features.
+
+    Returns:
+        (category, confidence 0-1)
+    """
+    if not features.decodable:
+        return "detail", 0.0
+
+    # Dashboard: mostly dark cabin with small bright screen/cluster highlights and lots of edges
+    if features.dark_fraction > 0.35 and features.highlight_fraction > 0.01 and features.edge_density > 0.25:
+        return "dashboard", min(1.0, 0.5 + features.dark_fraction / 2)
+
+    # Exterior: open sky in the top band, or bright, well-lit wide shot
+    if features.sky_score > 0.15 or (features.brightness > 0.5 and features.aspect >= 1.2 and features.edge_density < 0.35):
+        return _exterior_view(features), min(1.0, 0.5 + features.sky_score)
+
+    # Close-ups (damage, tyres, badges, VIN plates): busy texture, little context
+    if features.edge_density > 0.45 or features.aspect < 0.8:
+        return "detail", 0.5
+
+    # Dim, low-sky shots are usually the cabin
+    if features.brightness < 0.45:
+        return "interior", 0.6
+    return _exterior_view(features), 0.4
+
+
+class _OnnxClassifier:
+    """
+    Optional ONNX photo classifier.
+
+    Contract: float32 input of shape (1, 3, 224, 224), RGB scaled to 0-1;
+    output logits/probabilities of shape (1, len(CATEGORIES)) in ``CATEGORIES`` order.
+    """
+
+    def __init__(self, model_path: str):
+        import numpy as np
+        import onnxruntime as ort
+
+        self._np = np
+        self._session = ort.InferenceSession(model_path, providers=["CPUExecutionProvider"])
+        self._input_name = self._session.get_inputs()[0].name
+
+    def classify(self, data: bytes) -> Tuple[str, float]:
+        np = self._np
+        with Image.open(io.BytesIO(data)) as image:
+            image.draft("RGB", (448, 448))
+            image = ImageOps.exif_transpose(image).convert("RGB").resize((224, 224), Image.Resampling.BILINEAR)
+            tensor = np.asarray(image, dtype=np.float32).transpose(2, 0, 1)[None] / 255.0
+        logits = self._session.run(None, {self._input_name: tensor})[0][0]
+        exp = np.exp(logits - logits.max())
+        probs = exp / exp.sum()
+        best = int(probs.argmax())
+        return CATEGORIES[best], float(probs[best])
+
+
+_onnx_classifier: Optional[_OnnxClassifier] = None
+_onnx_checked = False
+
+
+def _get_onnx_classifier() -> Optional[_OnnxClassifier]:
+    """Load the configured ONNX model once; None when unset or unavailable."""
+    global _onnx_classifier, _onnx_checked
+    if _onnx_checked:
+        return _onnx_classifier
+    _onnx_checked = True
+    model_path = settings.IMAGE_SELECTOR_MODEL_PATH
+    if not model_path:
+        return None
+    try:
+        _onnx_classifier = _OnnxClassifier(model_path)
+        logger.info(f"Key-image selector using ONNX model {model_path}")
+    except Exception as e:
+        logger.warning(f"ONNX key-image classifier unavailable, using heuristics: {e}")
+        _onnx_classifier = None
+    return _onnx_classifier
+
+
+def _quality_score(features: ImageFeatures) -> float:
+    """Sharp, well-exposed photos score higher."""
+    if not features.decodable:
+        return 0.0
+    exposure = 1.0 - min(1.0, abs(features.brightness - 0.5) * 2)
+    return 0.45 * min(1.0, features.edge_density * 2) + 0.35 * min(1.0, features.contrast * 2) + 0.2 * exposure
+
+
+def _histogram_distance(a: List[float], b: List[float]) -> float:
+    """Hellinger distance between two normalized histograms (0 = identical, 1 = disjoint)."""
+    if not a or not b:
+        return 1.0
+    bc = sum(math.sqrt(x * y) for x, y in zip(a, b))
+    return math.sqrt(max(0.0, 1.0 - bc))
+
+
+def select_key_images_sync(images: Sequence[bytes], max_images: int = 6) -> KeyImageSelection:
+    """
+    Pick the most informative subset of photos (blocking; run off the event loop).
+
+    Args:
+        images: Encoded photos in upload order
+        max_images: Upper bound on the subset size (<= 0 keeps every photo)
+
+    Returns:
+        The selection, with indices in upload order
+    """
+    if max_images <= 0 or len(images) <= max_images:
+        # Nothing to drop - skip the decode work entirely
+        return KeyImageSelection(list(range(len(images))), {}, {}, "skipped")
+
+    onnx = _get_onnx_classifier()
+    features = [extract_features(data, index) for index, data in enumerate(images)]
+
+    categories: Dict[int, str] = {}
+    for feature, data in zip(features, images):
+        category = None
+        if onnx is not None and feature.decodable:
+            try:
+                category, _ = onnx.classify(data)
+            except Exception as e:
+                logger.warning(f"ONNX classification failed for image {feature.index}: {e}")
+        categories[feature.index] = category or classify_heuristic(feature)[0]
+
+    scores = {feature.index: round(_quality_score(feature), 4) for feature in features}
+    classifier = "onnx" if onnx is not None else "heuristic"
+
+    by_index = {feature.index: feature for feature in features}
+    # Photos we couldn't decode carry no category or quality signal; they only fill leftover slots
+    decodable = [feature.index for feature in features if feature.decodable]
+    selected: List[int] = [decodable[0] if decodable else 0]  # the seller's cover shot
+
+    # 1) Coverage: best photo of each category not yet represented
+    for category in CATEGORIES:
+        if len(selected) >= max_images:
+            break
+        if any(categories[index] == category for index in selected):
+            continue
+        candidates = [index for index in decodable if categories[index] == category and index not in selected]
+        if candidates:
+            selected.append(max(candidates, key=lambda index: scores[index]))
+
+    # 2) Fill: quality weighted by how different the photo looks from what's already picked,
+    #    from categories still under their quota while there are any
+    while len(selected) < max_images:
+        remaining = [index for index in decodable if index not in selected]
+        if not remaining:
+            undecodable = [feature.index for feature in features if not feature.decodable and feature.index not in selected]
+            selected.extend(undecodable[:max_images - len(selected)])
+            break
+        picked = Counter(categories[index] for index in selected)
+        under_quota = [index for index in remaining if picked[categories[index]] < CATEGORY_QUOTAS.get(categories[index], 1)]
+
+        def gain(index: int) -> float:
+            novelty = min(_histogram_distance(by_index[index].histogram, by_index[s].histogram) for s in selected)
+            return scores[index] * (0.3 + novelty)
+
+        selected.append(max(under_quota or remaining, key=gain))
+
+    return KeyImageSelection(sorted(selected), categories, scores, classifier)
+
+
+async def select_key_images(images: Sequence[bytes], max_images: int = 6) -> KeyImageSelection:
+    """Run :func:`select_key_images_sync` on the shared image thread pool."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(get_image_executor(), select_key_images_sync, list(images), max_images)
+
+
+async def select_key_ingested_images(
+    images: Sequence[IngestedImage],
+    max_images: int,
+) -> Tuple[List[IngestedImage], KeyImageSelection]:
+    """
+    Key-image selection for already-ingested uploads (e.g. ``/enhanced-analyze``).
+
+    Returns:
+        (selected images in upload order, the selection)
+    """
+    if max_images <= 0 or len(images) <= max_images:
+        return list(images), KeyImageSelection(list(range(len(images))), {}, {}, "skipped")
+
+    def run() -> KeyImageSelection:
+        return select_key_images_sync([base64.b64decode(image.b64) for image in images], max_images)
+
+    loop = asyncio.get_running_loop()
+    selection = await loop.run_in_executor(get_image_executor(), run)
+    return [images[index] for index in selection.indices], selection
@@ -0,0 +1,536 @@
+"""
+Local columnar store of scraped listings, used for comps and deal scoring.
+
+Listings from ``RealCarScraper``, ``ScrapingBeeService`` and the Scrapy
+spiders are normalized and kept as Parquet files, hive-partitioned by
+make/model/year:
+
+    <LISTINGS_STORE_PATH>/make_key=honda/model_key=civic/year=2018/part-*.parquet
+
+A comp query only opens the directory for one make/model, prunes years
+through the partition column and filters mileage in Arrow, so the answer
+comes from local data in milliseconds instead of a re-scrape.
+
+Writes are buffered in memory and flushed as one small file per partition
+(``LISTINGS_STORE_FLUSH_ROWS``). A partition with more than
+``LISTINGS_STORE_COMPACT_FILES`` files is compacted into one, keeping the
+latest row per listing and dropping rows older than
+``LISTINGS_STORE_RETENTION_DAYS``.
+
+Radius: listings rarely carry coordinates. Rows that do are matched by
+great-circle distance; otherwise the radius falls back to the ZIP3 area
+(for radii up to ``ZIP3_MAX_RADIUS_MILES``) or the state.
+
+pyarrow is optional; without it the store is disabled and callers keep
+their previous behaviour.
+"""
+
+import asyncio
+import hashlib
+import logging
+import math
+import os
+import re
+import threading
+import time
+import uuid
+from collections import defaultdict
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Union
+
+from app.core.config import settings
+from app.services.async_adapters import run_blocking
+
+logger = logging.getLogger(__name__)
+
+EARTH_RADIUS_MILES = 3958.8
+ZIP3_MAX_RADIUS_MILES = 100
+
+US_STATES = {
+    "alabama": "AL", "alaska": "AK", "arizona": "AZ", "arkansas": "AR", "california": "CA",
+    "colorado": "CO", "connecticut": "CT", "delaware": "DE", "district of columbia": "DC",
+    "florida": "FL", "georgia": "GA", "hawaii": "HI", "idaho": "ID", "illinois": "IL",
+    "indiana": "IN", "iowa": "IA", "kansas": "KS", "kentucky": "KY", "louisiana": "LA",
+    "maine": "ME", "maryland": "MD", "massachusetts": "MA", "michigan": "MI", "minnesota": "MN",
+    "mississippi": "MS", "missouri": "MO", "montana": "MT", "nebraska": "NE", "nevada": "NV",
+    "new hampshire": "NH", "new jersey": "NJ", "new mexico": "NM", "new york": "NY",
+    "north carolina": "NC", "north dakota": "ND", "ohio": "OH", "oklahoma": "OK", "oregon": "OR",
+    "pennsylvania": "PA", "rhode island": "RI", "south carolina": "SC", "south dakota": "SD",
+    "tennessee": "TN", "texas": "TX", "utah": "UT", "vermont": "VT", "virginia": "VA",
+    "washington": "WA", "west virginia": "WV", "wisconsin": "WI", "wyoming": "WY",
+}
+STATE_CODES = set(US_STATES.values())
+
+_ZIP_RE = re.compile(r"\b(\d{5})(?:-\d{4})?\b")
+_STATE_CODE_RE = re.compile(r"\b([A-Z]{2})\b")
+
+def _arrow():
+    """Import pyarrow lazily; None when it isn't installed."""
+    try:
+        import pyarrow as pa
+        import pyarrow.compute as pc
+        import pyarrow.dataset as ds
+        import pyarrow.parquet as pq
+    except ImportError:
+        return None
+    return pa, pc, ds, pq
+
+
+def _schema(pa):
+    # Stored columns; the partition columns make_key/model_key/year live in the path
+    return pa.schema([
+        ("listing_key", pa.string()),
+        ("source", pa.string()),
+        ("url", pa.string()),
+        ("title", pa.string()),
+        ("make", pa.string()),
+        ("model", pa.string()),
+        ("trim", pa.string()),
+        ("price", pa.int64()),
+        ("mileage", pa.int64()),
+        ("condition", pa.string()),
+        ("location", pa.string()),
+        ("state", pa.string()),
+        ("zip", pa.string()),
+        ("zip3", pa.string()),
+        ("latitude", pa.float64()),
+        ("longitude", pa.float64()),
+        ("vin", pa.string()),
+        ("deal_score", pa.float64()),
+        ("scraped_at", pa.float64()),
+    ])
+
+
+def partition_key(value: Any) -> str:
+    """Directory-safe make/model key: "Land Rover" -> "land-rover", "F-150" -> "f-150"."""
+    return re.sub(r"[^a-z0-9]+", "-", str(value or "").lower()).strip("-")
+
+
+def parse_location(location: Optional[str]) -> Dict[str, Optional[str]]:
+    """
+    Pull state and ZIP out of a free-text location.
+
+    "Detroit, MI 48239" -> {"state": "MI", "zip": "48239", "zip3": "482"}
+    "Houston, Texas, United States" -> {"state": "TX", "zip": None, "zip3": None}
+    """
+    text = str(location or "")
+    zip_match = _ZIP_RE.search(text)
+    zip_code = zip_match.group(1) if zip_match else None
+
+    state = None
+    # The state comes last in "City, ST 12345"; earlier capitals may be words like "IN STOCK"
+    for code in reversed(_STATE_CODE_RE.findall(text)):
+        if code in STATE_CODES:
+            state = code
+            break
+    if state is None:
+        lowered = text.lower()
+        # Longest names first so "west virginia" wins over "virginia"
+        for name in sorted(US_STATES, key=len, reverse=True):
+            if re.search(rf"\b{name}\b", lowered):
+                state = US_STATES[name]
+                break
+
+    return {"state": state, "zip": zip_code, "zip3": zip_code[:3] if zip_code else None}
+
+
+def _int_or_none(value: Any) -> Optional[int]:
+    if value is None or value == "":
+        return None
+    try:
+        number = int(float(re.sub(r"[^\d.]", "", str(value)) or "nan"))
+    except ValueError:
+        return None
+    return number or None
+
+
+def _float_or_none(value: Any) -> Optional[float]:
+    try:
+        number = float(value)
+    except (TypeError, ValueError):
+        return None
+    return None if math.isnan(number) else number
+
+
+def _timestamp(value: Any) -> float:
+    if isinstance(value, (int, float)) and value > 0:
+        return float(value)
+    if isinstance(value, str) and value:
+        try:
+            return datetime.fromisoformat(value.replace("Z", "+00:00")).timestamp()
+        except ValueError:
+            pass
+    return time.time()
+
+
+def _listing_key(listing: Dict[str, Any], source: str) -> str:
+    if listing.get("listing_key"):
+        return str(listing["listing_key"])
+    from accorria_scraper.dedup_index import listing_keys
+
+    # Synthetic ids like "ebay_sb_0" are positions in one response, not listing ids
+    keys = listing_keys({"source": source, "url": listing.get("url"), "vin": listing.get("vin"),
+                         "listing_id": listing.get("listing_id")})
+    if keys:
+        return keys[0]
+    content = f"{source}|{listing.get('title')}|{listing.get('price')}|{listing.get('location')}"
+    return "hash:" + hashlib.blake2b(content.encode("utf-8"), digest_size=12).hexdigest()
+
+
+def normalize_listing(listing: Dict[str, Any], source: Optional[str] = None) -> Optional[Dict[str, Any]]:
+    """
+    Normalize a scraped listing dict into a store row.
+
+    Returns:
+        The row (with make_key/model_key/year for partitioning), or None when
+        make, model, year or a price is missing
+    """
+    make = str(listing.get("make") or "").strip()
+    model = str(listing.get("model") or "").strip()
+    year = _int_or_none(listing.get("year"))
+    price = _int_or_none(listing.get("price"))
+    if not make or not model or not year or not (1900 < year < 2100) or not price:
+        return None
+
+    source = str(source or listing.get("source") or "unknown")
+    location = str(listing.get("location") or "")
+    where = parse_location(location)
+    return {
+        "make_key": partition_key(make),
+        "model_key": partition_key(model),
+        "year": year,
+        "listing_key": _listing_key(listing, source),
+        "source": source,
+        "url": listing.get("url") or None,
+        "title": listing.get("title") or None,
+        "make": make,
+        "model": model,
+        "trim": listing.get("trim") or None,
+        "price": price,
+        "mileage": _int_or_none(listing.get("mileage")),
+        "condition": listing.get("condition") or None,
+        "location": location or None,
+        "state": where["state"],
+        "zip": where["zip"],
+        "zip3": where["zip3"],
+        "latitude": _float_or_none(listing.get("latitude")),
+        "longitude": _float_or_none(listing.get("longitude")),
+        "vin": (listing.get("vin") or "").strip().upper() or None,
+        "deal_score": _float_or_none(listing.get("deal_score")),
+        "scraped_at": _timestamp(listing.get("scraped_at")),
+    }
+
+
+class ListingsStore:
+    """Parquet listings store partitioned by make/model/year"""
+
+    def __init__(
+        self,
+        path: str,
+        flush_rows: int = 200,
+        compact_files: int = 16,
+        retention_days: float = 90,
+    ):
+        self.path = Path(path)
+        self.flush_rows = flush_rows
+        self.compact_files = compact_files
+        self.retention_sec = retention_days * 24 * 3600
+        self._pending: Dict[Tuple[str, str, int], List[Dict[str, Any]]] = defaultdict(list)
+        self._pending_rows = 0
+        self._pending_lock = threading.Lock()
+        self._write_lock = threading.Lock()
+        self._flush_task: Optional[asyncio.Task] = None
+        self._arrow = _arrow() if settings.LISTINGS_STORE_ENABLED else None
+        if settings.LISTINGS_STORE_ENABLED and self._arrow is None:
+            logger.warning("pyarrow is not installed; the local listings store is disabled")
+        self.stats_counters: Dict[str, int] = {
+            "ingested": 0,
+            "skipped": 0,
+            "flushed_rows": 0,
+            "files_written": 0,
+            "compactions": 0,
+            "queries": 0,
+        }
+
+    @property
+    def available(self) -> bool:
+        return self._arrow is not None
+
+    # ---- writes ----
+
+    def add(self, listings: Iterable[Dict[str, Any]], source: Optional[str] = None) -> int:
+        """
+        Buffer scraped listings for the store; flushes in the background once enough are pending.
+
+        Args:
+            listings: Listing dicts as returned by the scrapers
+            source: Source name when the listings don't carry one
+
+        Returns:
+            Number of listings accepted
+        """
+        if not self.available:
+            return 0
+        accepted = 0
+        with self._pending_lock:
+            for listing in listings or []:
+                row = normalize_listing(listing, source)
+                if row is None:
+                    self.stats_counters["skipped"] += 1
+                    continue
+                partition = (row.pop("make_key"), row.pop("model_key"), row.pop("year"))
+                self._pending[partition].append(row)
+                accepted += 1
+            self._pending_rows += accepted
+            self.stats_counters["ingested"] += accepted
+            due = self._pending_rows >= self.flush_rows
+        if due:
+            self._schedule_flush()
+        return accepted
+
+    def _schedule_flush(self) -> None:
+        if self._flush_task is not None and not self._flush_task.done():
+            return
+        try:
+            self._flush_task = asyncio.get_running_loop().create_task(self.flush())
+        except RuntimeError:
+            # No event loop (e.g. called from a script) - write inline
+            self._flush_sync()
+
+    async def flush(self) -> None:
+        """Write buffered listings to Parquet."""
+        if self.available and self._pending_rows:
+            await run_blocking(self._flush_sync, pool="listings_store")
+
+    def _flush_sync(self) -> None:
+        with self._pending_lock:
+            pending, self._pending = self._pending, defaultdict(list)
+            self._pending_rows = 0
+        if not pending:
+            return
+
+        pa, _, _, pq = self._arrow
+        schema = _schema(pa)
+        with self._write_lock:
+            for (make_key, model_key, year), rows in pending.items():
+                directory = self._partition_dir(make_key, model_key, year)
+                try:
+                    directory.mkdir(parents=True, exist_ok=True)
+                    table = pa.Table.from_pylist(rows, schema=schema)
+                    pq.write_table(table, str(directory / f"part-{int(time.time())}-{uuid.uuid4().hex}.parquet"))
+                    self.stats_counters["flushed_rows"] += len(rows)
+                    self.stats_counters["files_written"] += 1
+                    if len(list(directory.glob("part-*.parquet"))) > self.compact_files:
+                        self._compact(directory)
+                except Exception as e:
+                    logger.error(f"Failed to write listings partition {directory}: {e}")
+
+    def _partition_dir(self, make_key: str, model_key: str, year: int) -> Path:
+        return self.path / f"make_key={make_key}" / f"model_key={model_key}" / f"year={year}"
+
+    def _compact(self, directory: Path) -> None:
+        """Rewrite a partition as one file: latest row per listing, nothing past retention."""
+        pa, pc, _, pq = self._arrow
+        files = sorted(directory.glob("part-*.parquet"))
+        table = pa.concat_tables([pq.read_table(str(f)) for f in files])
+        table = table.filter(pc.greater_equal(table["scraped_at"], time.time() - self.retention_sec))
+        table = self._latest_per_listing(table)
+
+        compacted = directory / f"part-{int(time.time())}-{uuid.uuid4().hex}.parquet"
+        tmp = directory / f".{compacted.name}.tmp"
+        pq.write_table(table, str(tmp))
+        os.replace(tmp, compacted)
+        for f in files:
+            try:
+                f.unlink()
+            except FileNotFoundError:
+                pass
+        self.stats_counters["compactions"] += 1
+
+    def _latest_per_listing(self, table):
+        """Keep the most recent row for each listing_key."""
+        pa, pc, _, _ = self._arrow
+        if table.num_rows == 0:
+            return table
+        order = pc.sort_indices(table, sort_keys=[("listing_key", "ascending"), ("scraped_at", "descending")])
+        table = table.take(order)
+        keys = table["listing_key"].combine_chunks()
+        first = pc.not_equal(keys.slice(1), keys.slice(0, len(keys) - 1))
+        mask = pa.concat_arrays([pa.array([True]), first.fill_null(True)])
+        return table.filter(mask)
+
+    # ---- queries ----
+
+    async def comparables(
+        self,
+        make: str,
+        model: str,
+        year: Union[int, str, None] = None,
+        mileage: Union[int, str, None] = None,
+        year_window: int = 2,
+        mileage_band: Optional[int] = None,
+        location: Optional[str] = None,
+        radius_miles: Optional[float] = None,
+        latitude: Optional[float] = None,
+        longitude: Optional[float] = None,
+        limit: int = 50,
+    ) -> List[Dict[str, Any]]:
+        """
+        Comparable listings from local data: same make/model, year within
+        ``year_window``, mileage within ``mileage_band`` and inside the radius.
+
+        Args:
+            make: Vehicle make
+            model: Vehicle model
+            year: Target year (no year filter when omitted or unparseable; form strings like "2018" are fine)
+            mileage: Target mileage (no mileage filter when omitted or unparseable, e.g. "Unknown"; "123,456" is fine)
+            year_window: Years either side of ``year``
+            mileage_band: Miles either side of ``mileage`` (defaults to LISTINGS_STORE_MILEAGE_BAND)
+            location: Free-text location ("Detroit, MI 48239") for the radius filter
+            radius_miles: Search radius (no location filter when omitted)
+            latitude: Search centre, when known
+            longitude: Search centre, when known
+            limit: Maximum comps returned, closest year/mileage first
+
+        Returns:
+            Listing dicts (newest row per listing); empty when the store is unavailable
+        """
+        if not self.available or not make or not model:
+            return []
+        year, mileage = _int_or_none(year), _int_or_none(mileage)
+        await self.flush()
+        return await run_blocking(
+            self._comparables_sync,
+            make, model, year, mileage, year_window,
+            settings.LISTINGS_STORE_MILEAGE_BAND if mileage_band is None else mileage_band,
+            location, radius_miles, latitude, longitude, limit,
+            pool="listings_store",
+        )
+
+    def _comparables_sync(self, make, model, year, mileage, year_window, mileage_band,
+                          location, radius_miles, latitude, longitude, limit) -> List[Dict[str, Any]]:
+        pa, pc, ds, _ = self._arrow
+        self.stats_counters["queries"] += 1
+        directory = self.path / f"make_key={partition_key(make)}" / f"model_key={partition_key(model)}"
+        if not directory.is_dir():
+            return []
+
+        expression = ds.field("scraped_at") >= time.time() - self.retention_sec
+        if year:
+            expression &= (ds.field("year") >= int(year) - year_window) & (ds.field("year") <= int(year) + year_window)
+        if mileage and mileage_band:
+            low, high = max(0, int(mileage) - mileage_band), int(mileage) + mileage_band
+            # Listings without a mileage still count; they sort after the ones that match
+            expression &= ds.field("mileage").is_null() | ((ds.field("mileage") >= low) & (ds.field("mileage") <= high))
+
+        for attempt in range(2):
+            try:
+                dataset = ds.dataset(
+                    str(directory),
+                    format="parquet",
+                    partitioning=ds.partitioning(pa.schema([("year", pa.int32())]), flavor="hive"),
+                )
+                table = dataset.to_table(filter=expression)
+                break
+            except Exception as e:
+                # A compaction replaced files under us - rediscover once
+                if attempt:
+                    logger.error(f"Listings store query failed for {make} {model}: {e}")
+                    return []
+
+        if radius_miles:
+            table = self._within_radius(table, location, radius_miles, latitude, longitude)
+        table = self._latest_per_listing(table)
+        if table.num_rows == 0:
+            return []
+
+        # Closest comps first: year distance, then mileage distance, then newest
+        rows = table.to_pylist()
+        rows.sort(key=lambda row: (
+            abs(row["year"] - year) if year else 0,
+            abs((row["mileage"] or 0) - mileage) if mileage else 0,
+            -row["scraped_at"],
+        ))
+        return rows[:limit]
+
+    def _within_radius(self, table, location, radius_miles, latitude, longitude):
+        """Great-circle distance where coordinates exist, else the ZIP3 area or state."""
+        pa, pc, _, _ = self._arrow
+        where = parse_location(location)
+        has_center = latitude is not None and longitude is not None
+        if not has_center and not where["zip3"] and not where["state"]:
+            return table
+
+        if where["zip3"] and radius_miles <= ZIP3_MAX_RADIUS_MILES:
+            region = pc.or_kleene(
+                pc.equal(table["zip3"], where["zip3"]),
+                pc.and_kleene(pc.is_null(table["zip3"]), pc.equal(table["state"], where["state"] or "")),
+            )
+        elif where["state"]:
+            region = pc.equal(table["state"], where["state"])
+        else:
+            region = pa.chunked_array([pa.array([False] * table.num_rows, type=pa.bool_())])
+        mask = region.fill_null(False)
+
+        if has_center:
+            to_rad = math.pi / 180
+            lat1, lon1 = latitude * to_rad, longitude * to_rad
+            lat2 = pc.multiply(table["latitude"], to_rad)
+            lon2 = pc.multiply(table["longitude"], to_rad)
+            half_dlat = pc.divide(pc.subtract(lat2, lat1), 2.0)
+            half_dlon = pc.divide(pc.subtract(lon2, lon1), 2.0)
+            a = pc.add(
+                pc.power(pc.sin(half_dlat), 2),
+                pc.multiply(pc.multiply(pc.cos(lat2), math.cos(lat1)), pc.power(pc.sin(half_dlon), 2)),
+            )
+            distance = pc.multiply(pc.asin(pc.sqrt(a)), 2 * EARTH_RADIUS_MILES)
+            within = pc.less_equal(distance, float(radius_miles))
+            # Rows with coordinates are judged by distance; the rest by region
+            mask = pc.if_else(pc.is_null(table["latitude"]), mask, within.fill_null(False))
+
+        return table.filter(mask)
+
+    # ---- summaries ----
+
+    def price_summary(self, comps: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Count, mean and price quartiles of a set of comps."""
+        prices = sorted(row["price"] for row in comps if row.get("price"))
+        if not prices:
+            return {"count": 0}
+
+        def quantile(q: float) -> float:
+            position = (len(prices) - 1) * q
+            low = int(position)
+            high = min(low + 1, len(prices) - 1)
+            return prices[low] + (prices[high] - prices[low]) * (position - low)
+
+        return {
+            "count": len(prices),
+            "mean": round(sum(prices) / len(prices)),
+            "p25": round(quantile(0.25)),
+            "median": round(quantile(0.5)),
+            "p75": round(quantile(0.75)),
+            "min": prices[0],
+            "max": prices[-1],
+        }
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "available": self.available,
+            "path": str(self.path),
+            "pending_rows": self._pending_rows,
+            **self.stats_counters,
+        }
+
+
+def _default_path() -> str:
+    return settings.LISTINGS_STORE_PATH or str(Path(__file__).resolve().parents[2] / "data" / "listings")
+
+
+listings_store = ListingsStore(
+    _default_path(),
+    flush_rows=settings.LISTINGS_STORE_FLUSH_ROWS,
+    compact_files=settings.LISTINGS_STORE_COMPACT_FILES,
+    retention_days=settings.LISTINGS_STORE_RETENTION_DAYS,
+)
@@ -5,14 +5,46 @@ Real Car Scraper - Gets actual live data from marketplaces
 import aiohttp
 import asyncio
 import logging
-from typing import List, Dict, Any, Optional
+from dataclasses import dataclass, field
+from typing import AsyncIterator, List, Dict, Any, Optional
 from datetime import datetime
 import re
 from bs4 import BeautifulSoup
 import json
 
+from app.core.config import settings
+from app.services.http_clients import http_clients
+from app.services.listings_store import listings_store
+
 logger = logging.getLogger(__name__)
 
+# Deal source name -> RealCarScraper method
+DEAL_SOURCES = {
+    "ebay_motors": "scrape_ebay_motors",
+    "cargurus": "scrape_cargurus",
+    "google_search": "scrape_google_car_listings",
+}
+
+
+@dataclass
+class SourceResult:
+    """Outcome of one source in a fan-out"""
+    source: str
+    deals: List[Dict[str, Any]] = field(default_factory=list)
+    status: str = "ok"  # ok, timeout, error
+    elapsed_ms: float = 0.0
+    error: Optional[str] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "source": self.source,
+            "status": self.status,
+            "count": len(self.deals),
+            "elapsed_ms": round(self.elapsed_ms, 1),
+            "error": self.error,
+        }
+
+
 class RealCarScraper:
     """
     Real scraper that gets live car data from multiple sources
@@ -20,26 +52,17 @@ class RealCarScraper:
     
     def __init__(self):
         self.session: Optional[aiohttp.ClientSession] = None
-        self.headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-        }
-        # SSL context to handle certificate issues
-        import ssl
-        self.ssl_context = ssl.create_default_context()
-        self.ssl_context.check_hostname = False
-        self.ssl_context.verify_mode = ssl.CERT_NONE
     
     async def __aenter__(self):
-        import aiohttp
-        connector = aiohttp.TCPConnector(ssl=self.ssl_context)
-        self.session = aiohttp.ClientSession(headers=self.headers, connector=connector)
+        # Pooled "scraper" connector: browser User-Agent, certificate checks off
+        self.session = http_clients.aiohttp_session("scraper")
         return self
     
     async def __aexit__(self, exc_type, exc_val, exc_tb):
         if self.session:
             await self.session.close()
     
-    async def scrape_ebay_motors(self, search_term: str, max_results: int = 20) -> List[Dict[str, Any]]:
+    async def scrape_ebay_motors(self, search_term: str, max_results: int = 20, raise_errors: bool = False) -> List[Dict[str, Any]]:
         """
         Scrape real eBay Motors listings with actual vehicle posting URLs
         """
@@ -58,6 +81,8 @@ class RealCarScraper:
             async with self.session.get(base_url, params=params) as response:
                 if response.status != 200:
                     logger.error(f"eBay request failed: {response.status}")
+                    if raise_errors:
+                        raise RuntimeError(f"HTTP {response.status}")
                     return []
                 
                 html = await response.text()
@@ -134,9 +159,11 @@ class RealCarScraper:
                 
         except Exception as e:
             logger.error(f"eBay scraping error: {e}")
+            if raise_errors:
+                raise
             return []
     
-    async def scrape_cargurus(self, search_term: str, max_results: int = 20) -> List[Dict[str, Any]]:
+    async def scrape_cargurus(self, search_term: str, max_results: int = 20, raise_errors: bool = False) -> List[Dict[str, Any]]:
         """
         Scrape CarGurus listings
         """
@@ -154,6 +181,8 @@ class RealCarScraper:
             async with self.session.get(base_url, params=params) as response:
                 if response.status != 200:
                     logger.error(f"CarGurus request failed: {response.status}")
+                    if raise_errors:
+                        raise RuntimeError(f"HTTP {response.status}")
                     return []
                 
                 html = await response.text()
@@ -212,9 +241,11 @@ class RealCarScraper:
                 
         except Exception as e:
             logger.error(f"CarGurus scraping error: {e}")
+            if raise_errors:
+                raise
             return []
     
-    async def scrape_cars_com(self, search_term: str, max_results: int = 20) -> List[Dict[str, Any]]:
+    async def scrape_cars_com(self, search_term: str, max_results: int = 20, raise_errors: bool = False) -> List[Dict[str, Any]]:
         """
         Scrape Cars.com listings with actual vehicle posting URLs
         """
@@ -233,6 +264,8 @@ class RealCarScraper:
             async with self.session.get(base_url, params=params) as response:
                 if response.status != 200:
                     logger.error(f"Cars.com request failed: {response.status}")
+                    if raise_errors:
+                        raise RuntimeError(f"HTTP {response.status}")
                     return []
                 
                 html = await response.text()
@@ -303,9 +336,11 @@ class RealCarScraper:
                 
         except Exception as e:
             logger.error(f"Cars.com scraping error: {e}")
+            if raise_errors:
+                raise
             return []
     
-    async def scrape_google_car_listings(self, search_term: str, max_results: int = 20) -> List[Dict[str, Any]]:
+    async def scrape_google_car_listings(self, search_term: str, max_results: int = 20, raise_errors: bool = False) -> List[Dict[str, Any]]:
         """
         Scrape Google search results for car listings from various marketplaces
         """
@@ -324,6 +359,8 @@ class RealCarScraper:
             async with self.session.get(base_url, params=params) as response:
                 if response.status != 200:
                     logger.error(f"Google search request failed: {response.status}")
+                    if raise_errors:
+                        raise RuntimeError(f"HTTP {response.status}")
                     return []
                 
                 html = await response.text()
@@ -399,8 +436,58 @@ class RealCarScraper:
                 
         except Exception as e:
             logger.error(f"Google search scraping error: {e}")
+            if raise_errors:
+                raise
             return []
     
+    async def fan_out(
+        self,
+        search_term: str,
+        max_results_per_source: int,
+        sources: Optional[List[str]] = None,
+        timeout: Optional[float] = None,
+    ) -> AsyncIterator[SourceResult]:
+        """
+        Query sources concurrently and yield each one's results as soon as it finishes
+        
+        Every source has its own deadline (DEALS_SOURCE_TIMEOUTS, else ``timeout`` /
+        DEALS_SOURCE_TIMEOUT_SEC); a slow or failing source yields an empty
+        result with status "timeout"/"error" instead of holding up the others.
+        
+        Args:
+            search_term: Search term for cars
+            max_results_per_source: Result limit passed to each scraper
+            sources: Source names from DEAL_SOURCES (default: all)
+            timeout: Default per-source deadline in seconds
+        """
+        loop = asyncio.get_running_loop()
+        default_timeout = timeout or settings.DEALS_SOURCE_TIMEOUT_SEC
+        
+        async def run(source: str) -> SourceResult:
+            started = loop.time()
+            deadline = settings.DEALS_SOURCE_TIMEOUTS.get(source, default_timeout)
+            try:
+                scrape = getattr(self, DEAL_SOURCES[source])
+                # Let failures surface so the source reports "error" instead of an empty "ok"
+                deals = await asyncio.wait_for(scrape(search_term, max_results_per_source, raise_errors=True), timeout=deadline)
+                listings_store.add(deals or [])
+                return SourceResult(source, deals or [], "ok", (loop.time() - started) * 1000)
+            except asyncio.TimeoutError:
+                logger.warning(f"Deal source {source} missed its {deadline}s deadline")
+                return SourceResult(source, [], "timeout", (loop.time() - started) * 1000, f"No response within {deadline}s")
+            except Exception as e:
+                logger.error(f"Deal source {source} failed: {e}")
+                return SourceResult(source, [], "error", (loop.time() - started) * 1000, str(e))
+        
+        tasks = [asyncio.create_task(run(source)) for source in (sources or list(DEAL_SOURCES))]
+        try:
+            for finished in asyncio.as_completed(tasks):
+                yield await finished
+        finally:
+            # Consumer went away (client disconnect) - stop the remaining scrapes
+            for task in tasks:
+                task.cancel()
+    
     async def scrape_all_sources(self, search_term: str, max_results_per_source: int = 5) -> List[Dict[str, Any]]:
         """
         Scrape all available sources and return combined results with direct listing URLs
@@ -423,6 +510,9 @@ class RealCarScraper:
                 elif isinstance(result_set, Exception):
                     logger.error(f"Scraping task failed: {result_set}")
             
+            # Keep everything scraped for local comps, not just the top results returned
+            listings_store.add(all_results)
+            
             # Sort by deal score (best deals first)
             all_results.sort(key=lambda x: x.get('deal_score', 0), reverse=True)
             
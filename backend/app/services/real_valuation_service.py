@@ -8,8 +8,83 @@ from typing import Dict, Any, Optional
 from datetime import datetime
 import json
 
+from app.core.config import settings
+from app.services.http_clients import http_clients
+from app.services.listings_store import listings_store
+
 logger = logging.getLogger(__name__)
 
+# Base market values by make/model/year/condition (we'll enhance with real APIs)
+BASE_MARKET_VALUES = {
+    "Honda": {
+        "Civic": {
+            2015: {"excellent": 12000, "good": 10500, "fair": 9000, "poor": 7500},
+            2016: {"excellent": 13500, "good": 12000, "fair": 10500, "poor": 9000},
+            2017: {"excellent": 15000, "good": 13500, "fair": 12000, "poor": 10500},
+            2018: {"excellent": 16500, "good": 15000, "fair": 13500, "poor": 12000},
+            2019: {"excellent": 18000, "good": 16500, "fair": 15000, "poor": 13500},
+            2020: {"excellent": 19500, "good": 18000, "fair": 16500, "poor": 15000}
+        },
+        "CR-V": {
+            2014: {"excellent": 20000, "good": 17500, "fair": 15000, "poor": 12500},
+            2015: {"excellent": 22000, "good": 19500, "fair": 17000, "poor": 14500},
+            2016: {"excellent": 24000, "good": 21500, "fair": 19000, "poor": 16500},
+            2017: {"excellent": 26000, "good": 23500, "fair": 21000, "poor": 18500},
+            2018: {"excellent": 28000, "good": 25500, "fair": 23000, "poor": 20500},
+            2019: {"excellent": 30000, "good": 27500, "fair": 25000, "poor": 22500}
+        }
+    },
+    "Toyota": {
+        "Camry": {
+            2018: {"excellent": 25000, "good": 22000, "fair": 19500, "poor": 17000},
+            2019: {"excellent": 27000, "good": 24000, "fair": 21500, "poor": 19000},
+            2020: {"excellent": 29000, "good": 26000, "fair": 23500, "poor": 21000},
+            2021: {"excellent": 31000, "good": 28000, "fair": 25500, "poor": 23000},
+            2022: {"excellent": 33000, "good": 30000, "fair": 27500, "poor": 25000}
+        },
+        "Corolla": {
+            2018: {"excellent": 20000, "good": 17500, "fair": 15000, "poor": 12500},
+            2019: {"excellent": 22000, "good": 19500, "fair": 17000, "poor": 14500},
+            2020: {"excellent": 24000, "good": 21500, "fair": 19000, "poor": 16500},
+            2021: {"excellent": 26000, "good": 23500, "fair": 21000, "poor": 18500}
+        }
+    },
+    "Ford": {
+        "F-150": {
+            2012: {"excellent": 18000, "good": 14500, "fair": 12000, "poor": 9500},
+            2013: {"excellent": 20000, "good": 16500, "fair": 14000, "poor": 11500},
+            2014: {"excellent": 22000, "good": 18500, "fair": 16000, "poor": 13500},
+            2015: {"excellent": 24000, "good": 20500, "fair": 18000, "poor": 15500},
+            2016: {"excellent": 26000, "good": 22500, "fair": 20000, "poor": 17500}
+        },
+        "Mustang": {
+            2018: {"excellent": 28000, "good": 25000, "fair": 22000, "poor": 19000},
+            2019: {"excellent": 30000, "good": 27000, "fair": 24000, "poor": 21000},
+            2020: {"excellent": 32000, "good": 29000, "fair": 26000, "poor": 23000}
+        }
+    },
+    "BMW": {
+        "3 Series": {
+            2016: {"excellent": 32000, "good": 26500, "fair": 22000, "poor": 17500},
+            2017: {"excellent": 35000, "good": 29500, "fair": 25000, "poor": 20500},
+            2018: {"excellent": 38000, "good": 32500, "fair": 28000, "poor": 23500},
+            2019: {"excellent": 41000, "good": 35500, "fair": 31000, "poor": 26500}
+        },
+        "X3": {
+            2018: {"excellent": 35000, "good": 30000, "fair": 25000, "poor": 20000},
+            2019: {"excellent": 38000, "good": 33000, "fair": 28000, "poor": 23000},
+            2020: {"excellent": 41000, "good": 36000, "fair": 31000, "poor": 26000}
+        }
+    }
+}
+
+# Value, deal-score and risk factors; shared with the vectorized batch scorer (app/utils/batch_deal_scoring.py)
+CONDITION_VALUE_FACTORS = {"excellent": 1.1, "good": 1.0, "fair": 0.9, "poor": 0.7}
+LOCATION_VALUE_FACTORS = {"California": 1.15, "New York": 1.1, "Texas": 0.95, "Florida": 0.98}
+CONDITION_DEAL_SCORES = {"excellent": 0.9, "good": 0.7, "fair": 0.5, "poor": 0.3}
+CONDITION_RISKS = {"excellent": 0.0, "good": 0.1, "fair": 0.3, "poor": 0.5}
+LUXURY_BRANDS = ["BMW", "Mercedes", "Audi", "Lexus", "Porsche"]
+
 class RealValuationService:
     """
     Real valuation service using actual market data
@@ -17,72 +92,10 @@ class RealValuationService:
     
     def __init__(self):
         self.session: Optional[aiohttp.ClientSession] = None
-        # Base market values (we'll enhance with real APIs)
-        self.market_data = {
-            "Honda": {
-                "Civic": {
-                    2015: {"excellent": 12000, "good": 10500, "fair": 9000, "poor": 7500},
-                    2016: {"excellent": 13500, "good": 12000, "fair": 10500, "poor": 9000},
-                    2017: {"excellent": 15000, "good": 13500, "fair": 12000, "poor": 10500},
-                    2018: {"excellent": 16500, "good": 15000, "fair": 13500, "poor": 12000},
-                    2019: {"excellent": 18000, "good": 16500, "fair": 15000, "poor": 13500},
-                    2020: {"excellent": 19500, "good": 18000, "fair": 16500, "poor": 15000}
-                },
-                "CR-V": {
-                    2014: {"excellent": 20000, "good": 17500, "fair": 15000, "poor": 12500},
-                    2015: {"excellent": 22000, "good": 19500, "fair": 17000, "poor": 14500},
-                    2016: {"excellent": 24000, "good": 21500, "fair": 19000, "poor": 16500},
-                    2017: {"excellent": 26000, "good": 23500, "fair": 21000, "poor": 18500},
-                    2018: {"excellent": 28000, "good": 25500, "fair": 23000, "poor": 20500},
-                    2019: {"excellent": 30000, "good": 27500, "fair": 25000, "poor": 22500}
-                }
-            },
-            "Toyota": {
-                "Camry": {
-                    2018: {"excellent": 25000, "good": 22000, "fair": 19500, "poor": 17000},
-                    2019: {"excellent": 27000, "good": 24000, "fair": 21500, "poor": 19000},
-                    2020: {"excellent": 29000, "good": 26000, "fair": 23500, "poor": 21000},
-                    2021: {"excellent": 31000, "good": 28000, "fair": 25500, "poor": 23000},
-                    2022: {"excellent": 33000, "good": 30000, "fair": 27500, "poor": 25000}
-                },
-                "Corolla": {
-                    2018: {"excellent": 20000, "good": 17500, "fair": 15000, "poor": 12500},
-                    2019: {"excellent": 22000, "good": 19500, "fair": 17000, "poor": 14500},
-                    2020: {"excellent": 24000, "good": 21500, "fair": 19000, "poor": 16500},
-                    2021: {"excellent": 26000, "good": 23500, "fair": 21000, "poor": 18500}
-                }
-            },
-            "Ford": {
-                "F-150": {
-                    2012: {"excellent": 18000, "good": 14500, "fair": 12000, "poor": 9500},
-                    2013: {"excellent": 20000, "good": 16500, "fair": 14000, "poor": 11500},
-                    2014: {"excellent": 22000, "good": 18500, "fair": 16000, "poor": 13500},
-                    2015: {"excellent": 24000, "good": 20500, "fair": 18000, "poor": 15500},
-                    2016: {"excellent": 26000, "good": 22500, "fair": 20000, "poor": 17500}
-                },
-                "Mustang": {
-                    2018: {"excellent": 28000, "good": 25000, "fair": 22000, "poor": 19000},
-                    2019: {"excellent": 30000, "good": 27000, "fair": 24000, "poor": 21000},
-                    2020: {"excellent": 32000, "good": 29000, "fair": 26000, "poor": 23000}
-                }
-            },
-            "BMW": {
-                "3 Series": {
-                    2016: {"excellent": 32000, "good": 26500, "fair": 22000, "poor": 17500},
-                    2017: {"excellent": 35000, "good": 29500, "fair": 25000, "poor": 20500},
-                    2018: {"excellent": 38000, "good": 32500, "fair": 28000, "poor": 23500},
-                    2019: {"excellent": 41000, "good": 35500, "fair": 31000, "poor": 26500}
-                },
-                "X3": {
-                    2018: {"excellent": 35000, "good": 30000, "fair": 25000, "poor": 20000},
-                    2019: {"excellent": 38000, "good": 33000, "fair": 28000, "poor": 23000},
-                    2020: {"excellent": 41000, "good": 36000, "fair": 31000, "poor": 26000}
-                }
-            }
-        }
+        self.market_data = BASE_MARKET_VALUES
     
     async def __aenter__(self):
-        self.session = aiohttp.ClientSession()
+        self.session = http_clients.aiohttp_session("valuation")
         return self
     
     async def __aexit__(self, exc_type, exc_val, exc_tb):
@@ -218,24 +231,11 @@ class RealValuationService:
                 adjusted_value *= 0.8  # Very high mileage penalty
         
         # Condition adjustment
-        condition_factors = {
-            "excellent": 1.1,
-            "good": 1.0,
-            "fair": 0.9,
-            "poor": 0.7
-        }
-        adjusted_value *= condition_factors.get(condition, 1.0)
+        adjusted_value *= CONDITION_VALUE_FACTORS.get(condition, 1.0)
         
         # Location adjustment
         location = car_data.get("location", "")
-        location_factors = {
-            "California": 1.15,
-            "New York": 1.1,
-            "Texas": 0.95,
-            "Florida": 0.98
-        }
-        
-        for state, factor in location_factors.items():
+        for state, factor in LOCATION_VALUE_FACTORS.items():
             if state in location:
                 adjusted_value *= factor
                 break
@@ -243,10 +243,32 @@ class RealValuationService:
         return adjusted_value
     
     async def _get_comparables(self, car_data: Dict[str, Any]) -> list:
-        """Get comparable listings"""
+        """Get comparable listings (local listings store first, generated otherwise)"""
         try:
-            # In a real implementation, this would query actual marketplace data
-            # For now, generate realistic comparables
+            local = await listings_store.comparables(
+                car_data.get("make", ""),
+                car_data.get("model", ""),
+                year=car_data.get("year"),
+                mileage=car_data.get("mileage"),
+                location=car_data.get("location"),
+                radius_miles=car_data.get("radius_miles"),
+                limit=10,
+            )
+            if len(local) >= settings.LISTINGS_STORE_MIN_COMPS:
+                return [
+                    {
+                        "year": comp["year"],
+                        "price": comp["price"],
+                        "mileage": comp["mileage"],
+                        "location": comp["location"],
+                        "condition": comp["condition"] or "unknown",
+                        "source": comp["source"],
+                        "url": comp["url"],
+                    }
+                    for comp in local
+                ]
+            
+            # Not enough local data - generate realistic comparables
             make = car_data.get("make", "")
             model = car_data.get("model", "")
             year = car_data.get("year", 0)
@@ -293,13 +315,11 @@ class RealValuationService:
         
         # Condition risk
         condition = car_data.get("condition", "good")
-        condition_risks = {"excellent": 0.0, "good": 0.1, "fair": 0.3, "poor": 0.5}
-        risk_factors += condition_risks.get(condition, 0.2)
+        risk_factors += CONDITION_RISKS.get(condition, 0.2)
         
         # Luxury brand risk
         make = car_data.get("make", "")
-        luxury_brands = ["BMW", "Mercedes", "Audi", "Lexus", "Porsche"]
-        if make in luxury_brands:
+        if make in LUXURY_BRANDS:
             risk_factors += 0.2
         
         return min(risk_factors, 1.0)
@@ -315,8 +335,7 @@ class RealValuationService:
         
         # Condition factor (30% weight)
         condition = car_data.get("condition", "good")
-        condition_scores = {"excellent": 0.9, "good": 0.7, "fair": 0.5, "poor": 0.3}
-        condition_score = condition_scores.get(condition, 0.5)
+        condition_score = CONDITION_DEAL_SCORES.get(condition, 0.5)
         
         # Mileage factor (20% weight)
         mileage = car_data.get("mileage", 0)
@@ -0,0 +1,66 @@
+"""
+Shared async Redis client.
+
+One ``redis.asyncio`` client per event loop (the API has one loop; Celery
+workers run each task under its own ``asyncio.run``), configured from
+REDIS_HOST / REDIS_PORT / REDIS_PASSWORD like the sync cache client. When
+Redis is unreachable, callers get None and fall back to process-local
+behaviour; the connection is retried after ``_REDIS_RETRY_SEC``.
+"""
+
+import asyncio
+import os
+import time
+from typing import Any, Dict, Optional
+
+_REDIS_RETRY_SEC = 60
+
+# id(loop) -> (loop, client)
+_clients: Dict[int, Any] = {}
+_failed_at = 0.0
+
+
+async def get_async_redis() -> Optional[Any]:
+    """Return this loop's async Redis client, or None when Redis isn't reachable."""
+    global _failed_at
+
+    loop = asyncio.get_running_loop()
+    entry = _clients.get(id(loop))
+    if entry is not None and entry[0] is loop:
+        return entry[1]
+    if _failed_at and time.monotonic() - _failed_at < _REDIS_RETRY_SEC:
+        return None
+
+    try:
+        import redis.asyncio as aioredis
+        client = aioredis.Redis(
+            host=os.getenv("REDIS_HOST", "localhost"),
+            port=int(os.getenv("REDIS_PORT", 6379)),
+            password=os.getenv("REDIS_PASSWORD"),
+            decode_responses=True,
+            socket_connect_timeout=2,
+        )
+        await client.ping()
+    except Exception as e:
+        _failed_at = time.monotonic()
+        print(f"[REDIS] ⚠️  Redis not available: {e}")
+        return None
+    _failed_at = 0.0
+
+    # Drop clients whose loop has gone away (finished Celery tasks)
+    for key, (client_loop, _) in list(_clients.items()):
+        if client_loop.is_closed():
+            _clients.pop(key, None)
+    _clients[id(loop)] = (loop, client)
+    return client
+
+
+async def close_async_redis() -> None:
+    """Close the current loop's client (call before the loop shuts down)."""
+    loop = asyncio.get_running_loop()
+    entry = _clients.pop(id(loop), None)
+    if entry is not None:
+        try:
+            await entry[1].close()
+        except Exception:
+            pass
@@ -12,6 +12,10 @@ from typing import List, Dict, Any, Optional
 from datetime import datetime
 from pathlib import Path
 
+from app.core.config import settings
+from app.services.crawler_service import CrawlerUnavailable, crawler_service
+from app.services.listings_store import listings_store
+
 logger = logging.getLogger(__name__)
 
 
@@ -71,66 +75,60 @@ class ScrapingService:
     
     async def _run_ebay_spider(self, search_term: str, max_results: int) -> List[Dict[str, Any]]:
         """Run eBay spider and return results"""
-        try:
-            logger.info(f"Running eBay spider for: {search_term}")
-            
-            # Create temporary output file
-            output_file = os.path.join(self.temp_dir, f"ebay_results_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json")
-            
-            # Build scrapy command
-            cmd = [
-                'scrapy', 'crawl', 'ebay_cars',
-                '-a', f'search_term={search_term}',
-                '-a', f'max_results={max_results}',
-                '-o', output_file,
-                '-s', 'LOG_LEVEL=INFO'
-            ]
-            
-            # Run spider
-            process = await asyncio.create_subprocess_exec(
-                *cmd,
-                cwd=self.scrapy_project_path,
-                stdout=asyncio.subprocess.PIPE,
-                stderr=asyncio.subprocess.PIPE
-            )
-            
-            stdout, stderr = await process.communicate()
-            
-            if process.returncode != 0:
-                logger.error(f"eBay spider failed: {stderr.decode()}")
-                return []
-            
-            # Read results from output file
-            if os.path.exists(output_file):
-                with open(output_file, 'r', encoding='utf-8') as f:
-                    results = json.load(f)
-                
-                # Clean up temp file
-                os.remove(output_file)
-                
-                logger.info(f"eBay spider found {len(results)} results")
-                return results
-            else:
-                logger.warning("eBay spider output file not found")
-                return []
-                
-        except Exception as e:
-            logger.error(f"Error running eBay spider: {e}")
-            return []
+        return await self._run_spider('ebay_cars', 'eBay', search_term, max_results)
     
     async def _run_cargurus_spider(self, search_term: str, max_results: int) -> List[Dict[str, Any]]:
         """Run CarGurus spider and return results"""
+        return await self._run_spider('cargurus_cars', 'CarGurus', search_term, max_results)
+    
+    async def _run_spider(self, spider_name: str, label: str, search_term: str, max_results: int) -> List[Dict[str, Any]]:
+        """
+        Run a spider on the shared in-process crawler, falling back to a subprocess
+        
+        Args:
+            spider_name: Scrapy spider name (e.g. "ebay_cars")
+            label: Source name for logs
+            search_term: Search term passed to the spider
+            max_results: Maximum number of items
+        """
+        logger.info(f"Running {label} spider for: {search_term}")
+        if settings.CRAWLER_IN_PROCESS:
+            try:
+                results = await crawler_service.crawl(
+                    spider_name,
+                    max_items=max_results,
+                    search_term=search_term,
+                    max_results=max_results,
+                    emit_unchanged=True  # searches want every match, not just new/changed listings
+                )
+                logger.info(f"{label} spider found {len(results)} results")
+                listings_store.add(results)
+                return results
+            except CrawlerUnavailable as e:
+                logger.warning(f"In-process crawler unavailable, using scrapy subprocess: {e}")
+            except asyncio.TimeoutError:
+                logger.error(f"{label} spider timed out after {settings.CRAWLER_TIMEOUT_SEC}s")
+                return []
+            except Exception as e:
+                logger.error(f"Error running {label} spider: {e}")
+                return []
+        
+        results = await self._run_spider_subprocess(spider_name, label, search_term, max_results)
+        listings_store.add(results)
+        return results
+    
+    async def _run_spider_subprocess(self, spider_name: str, label: str, search_term: str, max_results: int) -> List[Dict[str, Any]]:
+        """Run a spider with `scrapy crawl` in a subprocess (one reactor per search)"""
         try:
-            logger.info(f"Running CarGurus spider for: {search_term}")
-            
             # Create temporary output file
-            output_file = os.path.join(self.temp_dir, f"cargurus_results_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json")
+            output_file = os.path.join(self.temp_dir, f"{spider_name}_results_{datetime.now().strftime('%Y%m%d_%H%M%S_%f')}.json")
             
             # Build scrapy command
             cmd = [
-                'scrapy', 'crawl', 'cargurus_cars',
+                'scrapy', 'crawl', spider_name,
                 '-a', f'search_term={search_term}',
                 '-a', f'max_results={max_results}',
+                '-a', 'emit_unchanged=1',
                 '-o', output_file,
                 '-s', 'LOG_LEVEL=INFO'
             ]
@@ -146,7 +144,7 @@ class ScrapingService:
             stdout, stderr = await process.communicate()
             
             if process.returncode != 0:
-                logger.error(f"CarGurus spider failed: {stderr.decode()}")
+                logger.error(f"{label} spider failed: {stderr.decode()}")
                 return []
             
             # Read results from output file
@@ -157,14 +155,14 @@ class ScrapingService:
                 # Clean up temp file
                 os.remove(output_file)
                 
-                logger.info(f"CarGurus spider found {len(results)} results")
+                logger.info(f"{label} spider found {len(results)} results")
                 return results
             else:
-                logger.warning("CarGurus spider output file not found")
+                logger.warning(f"{label} spider output file not found")
                 return []
                 
         except Exception as e:
-            logger.error(f"Error running CarGurus spider: {e}")
+            logger.error(f"Error running {label} spider: {e}")
             return []
     
     async def get_spider_status(self) -> Dict[str, Any]:
@@ -177,7 +175,8 @@ class ScrapingService:
             'cargurus_spider': {
                 'status': 'ready',
                 'description': 'CarGurus car listings spider with 404 fallback'
-            }
+            },
+            'crawler': crawler_service.stats()
         }
     
     async def test_spider(self, spider_name: str, search_term: str = "2015 Honda Civic") -> Dict[str, Any]:
@@ -9,6 +9,9 @@ from typing import List, Dict, Any, Optional
 from datetime import datetime
 import json
 
+from app.services.http_clients import http_clients
+from app.services.listings_store import listings_store
+
 logger = logging.getLogger(__name__)
 
 class ScrapingBeeService:
@@ -22,7 +25,7 @@ class ScrapingBeeService:
         self.session: Optional[aiohttp.ClientSession] = None
     
     async def __aenter__(self):
-        self.session = aiohttp.ClientSession()
+        self.session = http_clients.aiohttp_session("scrapingbee")
         return self
     
     async def __aexit__(self, exc_type, exc_val, exc_tb):
@@ -239,6 +242,9 @@ class ScrapingBeeService:
                 elif isinstance(result_set, Exception):
                     logger.error(f"ScrapingBee task failed: {result_set}")
             
+            # Keep everything scraped for local comps, not just the top results returned
+            listings_store.add(all_results)
+            
             # Sort by deal score (best deals first)
             all_results.sort(key=lambda x: x.get('deal_score', 0), reverse=True)
             
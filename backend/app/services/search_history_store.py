@@ -0,0 +1,247 @@
+"""
+Persistent market-search history.
+
+Rows live in the ``search_history`` table on the app database (async
+SQLAlchemy: the local SQLite file by default, Postgres/Supabase when
+DATABASE_URL points there). Reads are keyset-paginated over the
+``(user_id, timestamp, id)`` index, newest first:
+
+    items, next_cursor = await search_history_store.page(user_id, limit=20)
+    more, next_cursor = await search_history_store.page(user_id, limit=20, cursor=next_cursor)
+
+Each page is one index range scan, so its cost doesn't grow with the size of
+the history. Only compact summaries of the search results are stored (capped
+at SEARCH_HISTORY_MAX_RESULTS, selected fields). Rows older than
+SEARCH_HISTORY_TTL_DAYS are pruned in the background, at most once every
+SEARCH_HISTORY_PRUNE_INTERVAL_SEC.
+"""
+
+import asyncio
+import base64
+import logging
+import time
+import uuid
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy import and_, delete, or_, select
+
+from app.core.config import settings
+from app.core.database import AsyncSessionLocal, async_engine
+from app.models.search_history import Base, SearchHistoryEntry
+
+logger = logging.getLogger(__name__)
+
+# Listing fields kept in each stored result summary
+RESULT_SUMMARY_FIELDS = (
+    "id", "title", "price", "year", "make", "model", "trim", "mileage",
+    "location", "source", "url", "deal_score",
+)
+MAX_TEXT_CHARS = 300
+
+
+class InvalidCursor(ValueError):
+    """A pagination cursor that wasn't produced by ``page``"""
+
+
+def encode_cursor(timestamp: datetime, search_id: str) -> str:
+    raw = f"{timestamp.isoformat()}|{search_id}".encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, str]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+        timestamp, search_id = raw.split("|", 1)
+        return datetime.fromisoformat(timestamp), search_id
+    except (ValueError, UnicodeDecodeError) as e:
+        raise InvalidCursor(f"Invalid cursor: {cursor!r}") from e
+
+
+def _compact_value(value: Any) -> Any:
+    if isinstance(value, str) and len(value) > MAX_TEXT_CHARS:
+        return value[:MAX_TEXT_CHARS]
+    return value
+
+
+def compact_results(results: Optional[List[Dict[str, Any]]]) -> List[Dict[str, Any]]:
+    """The first SEARCH_HISTORY_MAX_RESULTS listings, reduced to RESULT_SUMMARY_FIELDS."""
+    compact = []
+    for result in (results or [])[:settings.SEARCH_HISTORY_MAX_RESULTS]:
+        if isinstance(result, dict):
+            compact.append({
+                name: _compact_value(result[name])
+                for name in RESULT_SUMMARY_FIELDS
+                if result.get(name) is not None
+            })
+    return compact
+
+
+def compact_summary(summary: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    """Scalar summary fields and one level of scalar sub-fields (e.g. price ranges)."""
+    scalar = (str, int, float, bool)
+    compact: Dict[str, Any] = {}
+    for name, value in (summary or {}).items():
+        if value is None or isinstance(value, scalar):
+            compact[name] = _compact_value(value)
+        elif isinstance(value, dict):
+            compact[name] = {
+                key: _compact_value(item) for key, item in value.items()
+                if item is None or isinstance(item, scalar)
+            }
+    return compact
+
+
+class SearchHistoryStore:
+    """Saved searches with keyset-paginated, per-user newest-first reads"""
+
+    def __init__(self):
+        self._table_ready = False
+        self._table_lock: Optional[asyncio.Lock] = None
+        self._last_prune = 0.0
+        self._prune_task: Optional[asyncio.Task] = None
+        self.stats_counters: Dict[str, int] = {"saved": 0, "pages": 0, "pruned": 0}
+
+    async def _ensure_table(self) -> None:
+        if self._table_ready:
+            return
+        if self._table_lock is None:
+            self._table_lock = asyncio.Lock()
+        async with self._table_lock:
+            if not self._table_ready:
+                async with async_engine.begin() as conn:
+                    await conn.run_sync(Base.metadata.create_all)
+                self._table_ready = True
+
+    def _user_filter(self, user_id: Optional[str]):
+        if user_id is None:
+            return SearchHistoryEntry.user_id.is_(None)
+        return SearchHistoryEntry.user_id == user_id
+
+    async def add(
+        self,
+        search_term: str,
+        location: Optional[str],
+        radius: Optional[int],
+        results: Optional[List[Dict[str, Any]]] = None,
+        summary: Optional[Dict[str, Any]] = None,
+        user_id: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """
+        Save a search.
+
+        Returns:
+            The stored entry (compacted) as a dict
+        """
+        await self._ensure_table()
+        entry = SearchHistoryEntry(
+            id=f"search_{uuid.uuid4().hex}",
+            user_id=user_id,
+            search_term=search_term[:200],
+            location=location,
+            radius=radius,
+            result_count=len(results or []),
+            results=compact_results(results),
+            summary=compact_summary(summary),
+            timestamp=datetime.utcnow(),
+        )
+        async with AsyncSessionLocal() as session:
+            session.add(entry)
+            await session.commit()
+        self.stats_counters["saved"] += 1
+        self._schedule_prune()
+        return entry.to_dict()
+
+    async def page(
+        self,
+        user_id: Optional[str],
+        limit: int = 20,
+        cursor: Optional[str] = None,
+    ) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+        """
+        One page of a user's history, newest first.
+
+        Args:
+            user_id: Owner (None for anonymous searches)
+            limit: Page size
+            cursor: ``next_cursor`` from the previous page
+
+        Returns:
+            (entries, next_cursor); next_cursor is None on the last page
+
+        Raises:
+            InvalidCursor: ``cursor`` is malformed
+        """
+        await self._ensure_table()
+        query = select(SearchHistoryEntry).where(self._user_filter(user_id))
+        if cursor:
+            before_timestamp, before_id = decode_cursor(cursor)
+            query = query.where(or_(
+                SearchHistoryEntry.timestamp < before_timestamp,
+                and_(SearchHistoryEntry.timestamp == before_timestamp, SearchHistoryEntry.id < before_id),
+            ))
+        query = query.order_by(SearchHistoryEntry.timestamp.desc(), SearchHistoryEntry.id.desc()).limit(limit + 1)
+
+        async with AsyncSessionLocal() as session:
+            rows = list((await session.execute(query)).scalars())
+        self.stats_counters["pages"] += 1
+
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            next_cursor = encode_cursor(rows[-1].timestamp, rows[-1].id)
+        return [row.to_dict() for row in rows], next_cursor
+
+    async def get(self, search_id: str) -> Optional[Dict[str, Any]]:
+        await self._ensure_table()
+        async with AsyncSessionLocal() as session:
+            row = await session.get(SearchHistoryEntry, search_id)
+        return row.to_dict() if row is not None else None
+
+    async def delete(self, search_id: str) -> bool:
+        """Delete a search; False if it didn't exist."""
+        await self._ensure_table()
+        async with AsyncSessionLocal() as session:
+            result = await session.execute(delete(SearchHistoryEntry).where(SearchHistoryEntry.id == search_id))
+            await session.commit()
+        return result.rowcount > 0
+
+    async def prune(self, now: Optional[datetime] = None) -> int:
+        """Delete entries older than SEARCH_HISTORY_TTL_DAYS; returns how many were removed."""
+        await self._ensure_table()
+        self._last_prune = time.monotonic()
+        cutoff = (now or datetime.utcnow()) - timedelta(days=settings.SEARCH_HISTORY_TTL_DAYS)
+        async with AsyncSessionLocal() as session:
+            result = await session.execute(delete(SearchHistoryEntry).where(SearchHistoryEntry.timestamp < cutoff))
+            await session.commit()
+        removed = result.rowcount or 0
+        self.stats_counters["pruned"] += removed
+        if removed:
+            logger.info("Pruned %s search history entries older than %s", removed, cutoff.isoformat())
+        return removed
+
+    def _schedule_prune(self) -> None:
+        if settings.SEARCH_HISTORY_TTL_DAYS <= 0:
+            return
+        if time.monotonic() - self._last_prune < settings.SEARCH_HISTORY_PRUNE_INTERVAL_SEC:
+            return
+        if self._prune_task is not None and not self._prune_task.done():
+            return
+        self._last_prune = time.monotonic()
+        self._prune_task = asyncio.get_running_loop().create_task(self._prune_quietly())
+
+    async def _prune_quietly(self) -> None:
+        try:
+            await self.prune()
+        except Exception as e:
+            logger.warning("Search history pruning failed: %s", e)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            **self.stats_counters,
+            "ttl_days": settings.SEARCH_HISTORY_TTL_DAYS,
+            "max_results_per_entry": settings.SEARCH_HISTORY_MAX_RESULTS,
+        }
+
+
+search_history_store = SearchHistoryStore()
@@ -0,0 +1,160 @@
+"""
+Single-flight request coalescing for expensive upstream calls.
+
+When several requests need the same upstream result at the same time (e.g. a
+Gemini grounding search for a popular year/make/model), only one call is
+issued and every concurrent caller awaits its result.
+
+- Within a process: callers share one asyncio task per key.
+- Across workers: a Redis lock (SET NX PX) with a short lease elects a leader;
+  other workers poll for the leader's published result instead of calling
+  upstream themselves. If Redis is unavailable, coalescing is process-local.
+"""
+
+import asyncio
+import hashlib
+import json
+import uuid
+from typing import Any, Awaitable, Callable, Dict
+
+from app.services.redis_client import get_async_redis
+
+# Compare-and-delete so a leader never releases a lock it no longer owns
+_RELEASE_LOCK_SCRIPT = """
+if redis.call('get', KEYS[1]) == ARGV[1] then
+    return redis.call('del', KEYS[1])
+end
+return 0
+"""
+
+def normalize_flight_key(query: str) -> str:
+    """Case/whitespace-insensitive, process-stable key for a query string."""
+    normalized = " ".join((query or "").lower().split())
+    return hashlib.blake2b(normalized.encode("utf-8"), digest_size=16).hexdigest()
+
+
+class SingleFlight:
+    """
+    Coalesce concurrent calls that share a key into a single upstream call.
+
+    Usage:
+        flight = SingleFlight("gemini-grounding")
+        result = await flight.do(query, lambda: call_upstream(query))
+    """
+
+    def __init__(
+        self,
+        namespace: str,
+        lease_sec: float = 60.0,
+        wait_timeout: float = 50.0,
+        poll_interval: float = 0.25,
+        result_ttl: int = 30,
+    ):
+        """
+        Args:
+            namespace: Prefix for Redis keys (one per upstream/operation)
+            lease_sec: Redis lock lease; should exceed the upstream call timeout
+            wait_timeout: Max time a cross-worker follower waits for the leader
+            poll_interval: How often followers check for the leader's result
+            result_ttl: How long a published result stays readable by followers
+        """
+        self.namespace = namespace
+        self.lease_sec = lease_sec
+        self.wait_timeout = wait_timeout
+        self.poll_interval = poll_interval
+        self.result_ttl = result_ttl
+        self._inflight: Dict[str, "asyncio.Task[Any]"] = {}
+        self.stats: Dict[str, int] = {
+            "calls": 0,
+            "upstream_calls": 0,
+            "coalesced_local": 0,
+            "coalesced_remote": 0,
+            "follower_fallbacks": 0,
+        }
+
+    async def do(self, key: str, fn: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Run ``fn`` once per key across all concurrent callers.
+
+        Cancelling one caller (e.g. via ``asyncio.wait_for``) does not cancel
+        the shared call that other callers are waiting on.
+
+        Args:
+            key: Raw key (normalized internally)
+            fn: Zero-arg coroutine factory performing the upstream call
+
+        Returns:
+            The result of ``fn`` (from this or another caller/worker)
+        """
+        self.stats["calls"] += 1
+        flight_key = normalize_flight_key(key)
+
+        task = self._inflight.get(flight_key)
+        if task is None:
+            task = asyncio.ensure_future(self._lead_or_follow(flight_key, fn))
+            self._inflight[flight_key] = task
+            task.add_done_callback(lambda _t, k=flight_key: self._inflight.pop(k, None))
+        else:
+            self.stats["coalesced_local"] += 1
+
+        return await asyncio.shield(task)
+
+    async def _run_upstream(self, fn: Callable[[], Awaitable[Any]]) -> Any:
+        self.stats["upstream_calls"] += 1
+        return await fn()
+
+    async def _lead_or_follow(self, flight_key: str, fn: Callable[[], Awaitable[Any]]) -> Any:
+        redis = await get_async_redis()
+        if redis is None:
+            return await self._run_upstream(fn)
+
+        lock_key = f"sf:{self.namespace}:lock:{flight_key}"
+        result_key = f"sf:{self.namespace}:result:{flight_key}"
+        token = uuid.uuid4().hex
+
+        try:
+            acquired = await redis.set(lock_key, token, nx=True, px=int(self.lease_sec * 1000))
+        except Exception as e:
+            print(f"[SINGLE-FLIGHT] ⚠️  Redis lock failed, calling upstream directly: {e}")
+            return await self._run_upstream(fn)
+
+        if acquired:
+            try:
+                result = await self._run_upstream(fn)
+                try:
+                    await redis.set(result_key, json.dumps({"value": result}, default=str), ex=self.result_ttl)
+                except Exception as e:
+                    print(f"[SINGLE-FLIGHT] ⚠️  Could not publish result: {e}")
+                return result
+            finally:
+                try:
+                    await redis.eval(_RELEASE_LOCK_SCRIPT, 1, lock_key, token)
+                except Exception:
+                    pass  # Lease expiry releases it anyway
+
+        # Another worker is leading - wait for its result
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.wait_timeout
+        try:
+            while loop.time() < deadline:
+                cached = await redis.get(result_key)
+                if cached is not None:
+                    self.stats["coalesced_remote"] += 1
+                    return json.loads(cached)["value"]
+                if not await redis.exists(lock_key):
+                    # Leader finished or died without publishing - re-check once, then go ourselves
+                    cached = await redis.get(result_key)
+                    if cached is not None:
+                        self.stats["coalesced_remote"] += 1
+                        return json.loads(cached)["value"]
+                    break
+                await asyncio.sleep(self.poll_interval)
+        except Exception as e:
+            print(f"[SINGLE-FLIGHT] ⚠️  Redis wait failed, calling upstream directly: {e}")
+
+        self.stats["follower_fallbacks"] += 1
+        return await self._run_upstream(fn)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Snapshot of coalescing counters."""
+        return {"namespace": self.namespace, "inflight": len(self._inflight), **self.stats}
@@ -13,6 +13,8 @@ from typing import List, Dict, Any, Optional
 from datetime import datetime
 import re
 
+from app.services.key_image_selector import select_key_images
+
 logger = logging.getLogger(__name__)
 
 
@@ -56,7 +58,7 @@ class SmartImageAnalysis:
         """Use enhanced analyzer on key images only"""
         
         # Prioritize images for analysis (max 6 images to save tokens)
-        key_images = self._select_key_images(image_files, max_images=6)
+        key_images, selection = await self._select_key_images(image_files, max_images=6)
         
         logger.info(f"Analyzing {len(key_images)} key images out of {len(image_files)} total")
         
@@ -68,7 +70,8 @@ class SmartImageAnalysis:
             "total_images": len(image_files),
             "analyzed_images": len(key_images),
             "token_savings": f"{((len(image_files) - len(key_images)) / len(image_files) * 100):.1f}%",
-            "analysis_strategy": "enhanced_key_images"
+            "analysis_strategy": "enhanced_key_images",
+            "key_image_selection": selection.to_dict(len(image_files))
         }
         
         return analysis_result
@@ -149,22 +152,26 @@ class SmartImageAnalysis:
         
         return analysis_result
     
-    def _select_key_images(self, image_files: List[bytes], max_images: int = 6) -> List[bytes]:
+    async def _select_key_images(self, image_files: List[bytes], max_images: int = 6):
         """
         Select key images for analysis based on priority:
-        1. Front/back images (make/model/year)
-        2. Dashboard images (features/technology)
+        1. Exterior images (make/model/year, overall condition)
+        2. Dashboard images (features/technology, odometer)
         3. Interior images (condition/features)
-        4. Exterior images (overall condition)
-        """
+        4. Close-ups (damage, badges)
+        
+        Classification runs locally on the CPU (see key_image_selector), so no
+        paid vision call is spent on photos that get dropped.
         
-        # For now, just take the first max_images
-        # In the future, we could add image classification to identify key images
-        selected_images = image_files[:max_images]
+        Returns:
+            (selected image bytes in upload order, KeyImageSelection)
+        """
+        selection = await select_key_images(image_files, max_images=max_images)
+        selected_images = [image_files[index] for index in selection.indices]
         
-        logger.info(f"Selected {len(selected_images)} key images for analysis")
+        logger.info(f"Selected {len(selected_images)} key images for analysis: {selection.coverage}")
         
-        return selected_images
+        return selected_images, selection
     
     def _get_fallback_analysis(self, car_details: Dict[str, Any]) -> Dict[str, Any]:
         """Fallback analysis when everything fails"""
@@ -0,0 +1,184 @@
+"""
+Small declarative DAG executor for multi-stage async pipelines.
+
+Each ``Stage`` names the values it needs (pipeline inputs or other stages'
+outputs) and receives them as keyword arguments. Stages whose inputs are ready
+run concurrently, so a pipeline takes as long as its longest dependency path
+rather than the sum of its stages.
+
+A stage can have a deadline and a ``fallback``: on timeout or error the
+fallback's value is used instead (the stage is marked "degraded") and the
+pipeline carries on. A required stage without a fallback that fails aborts
+the run with ``StageFailed``; an optional one yields None.
+
+Usage:
+    dag = StageDAG([
+        Stage("vision", analyze_images, inputs=("images",), timeout=45, fallback=basic_analysis),
+        Stage("market", market_lookup, inputs=("car_details",)),
+        Stage("pricing", price, inputs=("vision", "market")),
+    ])
+    result = await dag.run(images=images, car_details=details)
+    result.values["pricing"], result.timings_dict()
+"""
+
+import asyncio
+import inspect
+import logging
+import time
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Sequence
+
+logger = logging.getLogger(__name__)
+
+
+class StageFailed(Exception):
+    """A required stage failed and had no fallback"""
+
+    def __init__(self, stage: str, error: str):
+        super().__init__(f"Stage '{stage}' failed: {error}")
+        self.stage = stage
+        self.error = error
+
+
+@dataclass
+class Stage:
+    """One pipeline step"""
+    name: str
+    fn: Callable[..., Awaitable[Any]]  # called with its inputs as keyword arguments
+    inputs: Sequence[str] = ()
+    timeout: Optional[float] = None
+    fallback: Optional[Callable[..., Any]] = None  # same kwargs; sync or async
+    required: bool = True
+
+
+@dataclass
+class StageTiming:
+    """When a stage ran, for how long, and how it ended"""
+    name: str
+    status: str = "ok"  # ok, degraded, timeout, error, skipped
+    started_ms: float = 0.0  # offset from the start of the run
+    elapsed_ms: float = 0.0
+    error: Optional[str] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "stage": self.name,
+            "status": self.status,
+            "started_ms": round(self.started_ms, 1),
+            "elapsed_ms": round(self.elapsed_ms, 1),
+            "error": self.error,
+        }
+
+
+@dataclass
+class DAGResult:
+    """Stage outputs by name, with per-stage timings"""
+    values: Dict[str, Any]
+    timings: List[StageTiming] = field(default_factory=list)
+    elapsed_ms: float = 0.0
+
+    def timings_dict(self) -> List[Dict[str, Any]]:
+        return [timing.to_dict() for timing in self.timings]
+
+
+class StageDAG:
+    """Runs stages as soon as their inputs are available"""
+
+    def __init__(self, stages: Sequence[Stage]):
+        self.stages = {}
+        for stage in stages:
+            if stage.name in self.stages:
+                raise ValueError(f"Duplicate stage '{stage.name}'")
+            self.stages[stage.name] = stage
+        self.order = self._topological_order()
+
+    def _topological_order(self) -> List[str]:
+        order: List[str] = []
+        state: Dict[str, str] = {}
+
+        def visit(name: str, path: List[str]) -> None:
+            if state.get(name) == "done":
+                return
+            if state.get(name) == "visiting":
+                raise ValueError(f"Stage cycle: {' -> '.join(path + [name])}")
+            state[name] = "visiting"
+            for dependency in self.stages[name].inputs:
+                if dependency in self.stages:
+                    visit(dependency, path + [name])
+            state[name] = "done"
+            order.append(name)
+
+        for name in self.stages:
+            visit(name, [])
+        return order
+
+    async def run(self, **inputs: Any) -> DAGResult:
+        """
+        Run every stage.
+
+        Args:
+            **inputs: Pipeline inputs; every stage input that isn't a stage name must be given here
+
+        Returns:
+            DAGResult with the pipeline inputs and all stage outputs in ``values``
+
+        Raises:
+            StageFailed: A required stage without a fallback failed
+        """
+        for stage in self.stages.values():
+            missing = [name for name in stage.inputs if name not in self.stages and name not in inputs]
+            if missing:
+                raise ValueError(f"Stage '{stage.name}' needs missing inputs: {', '.join(missing)}")
+
+        started = time.perf_counter()
+        values: Dict[str, Any] = dict(inputs)
+        timings = {name: StageTiming(name, status="skipped") for name in self.order}
+        tasks: Dict[str, asyncio.Task] = {}
+
+        async def run_stage(stage: Stage) -> Any:
+            # Dependencies were scheduled first (topological order); a failed required one propagates
+            for dependency in stage.inputs:
+                if dependency in tasks:
+                    await tasks[dependency]
+            kwargs = {name: values[name] for name in stage.inputs}
+            timing = timings[stage.name]
+            stage_started = time.perf_counter()
+            timing.started_ms = (stage_started - started) * 1000
+            try:
+                result = stage.fn(**kwargs)
+                value = await asyncio.wait_for(result, timeout=stage.timeout) if stage.timeout else await result
+                timing.status = "ok"
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                timed_out = isinstance(e, asyncio.TimeoutError)
+                timing.status = "timeout" if timed_out else "error"
+                timing.error = f"No result within {stage.timeout}s" if timed_out else (str(e) or type(e).__name__)
+                logger.warning(f"Stage {stage.name} {timing.status}: {timing.error}")
+                if stage.fallback is not None:
+                    value = stage.fallback(**kwargs)
+                    if inspect.isawaitable(value):
+                        value = await value
+                    timing.status = "degraded"
+                elif stage.required:
+                    timing.elapsed_ms = (time.perf_counter() - stage_started) * 1000
+                    raise StageFailed(stage.name, timing.error)
+                else:
+                    value = None
+            timing.elapsed_ms = (time.perf_counter() - stage_started) * 1000
+            values[stage.name] = value
+            return value
+
+        for name in self.order:
+            tasks[name] = asyncio.create_task(run_stage(self.stages[name]))
+        try:
+            await asyncio.gather(*tasks.values())
+        finally:
+            for task in tasks.values():
+                task.cancel()
+
+        return DAGResult(
+            values=values,
+            timings=[timings[name] for name in self.order],
+            elapsed_ms=(time.perf_counter() - started) * 1000,
+        )
@@ -10,6 +10,7 @@ from datetime import datetime
 import os
 from supabase import create_client, Client
 from app.core.config import settings
+from app.services.async_adapters import supabase_execute
 
 logger = logging.getLogger(__name__)
 
@@ -73,7 +74,7 @@ class SupabaseService:
             }
             
             # Insert into car_analyses table
-            result = self.client.table("car_analyses").insert(car_analysis_record).execute()
+            result = await supabase_execute(self.client.table("car_analyses").insert(car_analysis_record))
             
             logger.info(f"✅ Car analysis saved to Supabase: {result.data}")
             
@@ -109,7 +110,7 @@ class SupabaseService:
                     "message": "Supabase not configured, returning mock data"
                 }
             
-            result = self.client.table("car_analyses").select("*").eq("id", analysis_id).execute()
+            result = await supabase_execute(self.client.table("car_analyses").select("*").eq("id", analysis_id))
             
             if result.data:
                 return {
@@ -163,7 +164,7 @@ class SupabaseService:
             }
             
             # Insert into car_listings table
-            result = self.client.table("car_listings").insert(listing_record).execute()
+            result = await supabase_execute(self.client.table("car_listings").insert(listing_record))
             
             logger.info(f"✅ Car listing saved to Supabase: {result.data}")
             
@@ -0,0 +1,45 @@
+"""
+Celery tasks (picked up by ``celery_app.autodiscover_tasks(['app.services', ...])``).
+
+Each task runs its coroutine under a fresh event loop and closes the pooled
+HTTP clients and Redis client bound to that loop before it exits.
+"""
+
+import asyncio
+
+from app.celery import celery_app
+from app.services.http_clients import http_clients
+from app.services.redis_client import close_async_redis
+
+
+async def _run_analysis_job(job_id: str) -> None:
+    # Imported lazily: the analysis lives in the API module and pulls in the full app
+    from app.api.v1.enhanced_analysis import run_enhanced_analysis_job
+
+    try:
+        await run_enhanced_analysis_job(job_id)
+    finally:
+        await http_clients.shutdown()
+        await close_async_redis()
+
+
+@celery_app.task(name="enhanced_analysis.run_job", acks_late=True, ignore_result=True)
+def run_enhanced_analysis_job_task(job_id: str) -> None:
+    """Run a queued /enhanced-analyze job; progress and result go to the job store."""
+    asyncio.run(_run_analysis_job(job_id))
+
+
+async def _run_bulk_listing_job(job_id: str) -> None:
+    from app.services.bulk_listing_jobs import run_job
+
+    try:
+        await run_job(job_id)
+    finally:
+        await http_clients.shutdown()
+        await close_async_redis()
+
+
+@celery_app.task(name="inventory.bulk_generate_listings", acks_late=True, ignore_result=True)
+def run_bulk_listing_job_task(job_id: str) -> None:
+    """Run (or resume) a bulk inventory listing job; progress goes to the job store."""
+    asyncio.run(_run_bulk_listing_job(job_id))
@@ -15,6 +15,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, update
 from app.services.ebay_poster import eBayPoster, eBayListingData
 from app.models.user_platform_connection import UserPlatformConnection
+from app.services.http_clients import http_clients
 from cryptography.fernet import Fernet
 
 logger = logging.getLogger(__name__)
@@ -41,7 +42,7 @@ class UsereBayPoster:
         self.session: Optional[aiohttp.ClientSession] = None
     
     async def __aenter__(self):
-        self.session = aiohttp.ClientSession()
+        self.session = http_clients.aiohttp_session("ebay")
         return self
     
     async def __aexit__(self, exc_type, exc_val, exc_tb):
@@ -15,6 +15,7 @@ from sqlalchemy import select, update
 from app.services.facebook_marketplace import FacebookMarketplaceAPI, FacebookListingData
 from app.services.facebook_oauth import FacebookOAuthService, get_facebook_oauth_config
 from app.models.user_platform_connection import UserPlatformConnection
+from app.services.http_clients import http_clients
 from cryptography.fernet import Fernet
 import os
 
@@ -45,7 +46,7 @@ class UserFacebookPoster:
         self.session: Optional[aiohttp.ClientSession] = None
     
     async def __aenter__(self):
-        self.session = aiohttp.ClientSession()
+        self.session = http_clients.aiohttp_session("facebook")
         return self
     
     async def __aexit__(self, exc_type, exc_val, exc_tb):
@@ -8,6 +8,8 @@ import httpx
 from typing import Optional, Dict, Any, List
 import logging
 
+from app.services.http_clients import http_clients
+
 logger = logging.getLogger(__name__)
 
 
@@ -16,7 +18,6 @@ class VINDecoder:
     
     def __init__(self):
         self.nhtsa_base_url = "https://vpic.nhtsa.dot.gov/api/vehicles"
-        self.session = httpx.AsyncClient(timeout=10.0)
     
     async def decode_vin(self, vin: str) -> Optional[Dict[str, Any]]:
         """
@@ -45,7 +46,7 @@ class VINDecoder:
             # NHTSA VIN Decoder API
             url = f"{self.nhtsa_base_url}/DecodeVin/{vin_clean}?format=json"
             
-            response = await self.session.get(url)
+            response = await http_clients.request("nhtsa", "GET", url)
             response.raise_for_status()
             data = response.json()
             
@@ -159,8 +160,8 @@ class VINDecoder:
         return features
     
     async def close(self):
-        """Close the HTTP session"""
-        await self.session.aclose()
+        """No-op: the pooled NHTSA client is owned and closed by the app-wide registry"""
+        return None
 
 
 # Singleton instance
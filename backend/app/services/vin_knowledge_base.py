@@ -10,6 +10,7 @@ import logging
 from typing import Optional, Dict, List, Any
 from datetime import datetime
 import json
+from app.services.async_adapters import supabase_execute
 
 logger = logging.getLogger(__name__)
 
@@ -60,11 +61,10 @@ class VINKnowledgeBase:
                 return None
             
             # Query knowledge base
-            response = self.supabase.table('vin_knowledge_base') \
+            response = await supabase_execute(self.supabase.table('vin_knowledge_base') \
                 .select('*') \
                 .eq('vin', vin_clean) \
-                .maybe_single() \
-                .execute()
+                .maybe_single())
             
             if response.data:
                 # Update last_used_date and usage_count
@@ -183,10 +183,9 @@ class VINKnowledgeBase:
             
             if existing:
                 # Update existing record
-                response = self.supabase.table('vin_knowledge_base') \
+                response = await supabase_execute(self.supabase.table('vin_knowledge_base') \
                     .update(data) \
-                    .eq('vin', vin_clean) \
-                    .execute()
+                    .eq('vin', vin_clean))
                 logger.info(f"✅ Updated VIN {vin_clean} in knowledge base")
                 print(f"[VIN-KB] ✅ Updated VIN {vin_clean} in knowledge base: {len(all_features)} features")
             else:
@@ -195,9 +194,8 @@ class VINKnowledgeBase:
                 data['last_used_date'] = datetime.utcnow().isoformat()
                 data['usage_count'] = 1
                 
-                response = self.supabase.table('vin_knowledge_base') \
-                    .insert(data) \
-                    .execute()
+                response = await supabase_execute(self.supabase.table('vin_knowledge_base') \
+                    .insert(data))
                 logger.info(f"✅ Stored new VIN {vin_clean} in knowledge base")
                 print(f"[VIN-KB] ✅ Stored new VIN {vin_clean} in knowledge base: {len(all_features)} features")
                 if response.data:
@@ -219,13 +217,12 @@ class VINKnowledgeBase:
         
         try:
             vin_clean = vin.upper().strip()
-            self.supabase.table('vin_knowledge_base') \
+            await supabase_execute(self.supabase.table('vin_knowledge_base') \
                 .update({
                     'last_used_date': datetime.utcnow().isoformat(),
                     'updated_at': datetime.utcnow().isoformat()
                 }) \
-                .eq('vin', vin_clean) \
-                .execute()
+                .eq('vin', vin_clean))
         except Exception as e:
             logger.warning(f"Could not update usage stats for VIN {vin}: {e}")
     
@@ -259,9 +256,8 @@ class VINKnowledgeBase:
             if year:
                 query = query.eq('year', year)
             
-            response = query.order('last_used_date', desc=True) \
-                .limit(10) \
-                .execute()
+            response = await supabase_execute(query.order('last_used_date', desc=True) \
+                .limit(10))
             
             if response.data:
                 logger.info(f"Found {len(response.data)} similar VINs for {make} {model} {year or ''}")
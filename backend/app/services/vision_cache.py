@@ -0,0 +1,73 @@
+"""
+Content-addressed cache for vision analysis results.
+
+Sellers often re-submit the same photo set while tweaking price or
+description. The vision result only depends on the photos and the prompt, so
+it is cached under a key built from:
+
+- the sorted perceptual hashes of the (deduplicated) image set, so re-encoded
+  or re-ordered uploads of the same photos still hit
+- the vision model name and prompt version
+- a digest of the rendered prompt (it embeds user-entered make/model/etc.)
+
+Storage goes through the shared two-tier cache (in-process LRU + Redis).
+"""
+
+import hashlib
+import json
+from typing import Any, Optional, Sequence
+
+from app.core.config import settings
+from app.services.cache import cache_get, cache_set
+from app.services.image_hashing import format_hash
+from app.services.image_ingestion import IngestedImage
+
+KEY_PREFIX = "vision:v1"
+
+
+def _image_fingerprint(image: IngestedImage) -> str:
+    """Perceptual hashes when available, exact content hash otherwise."""
+    if image.phash is not None and image.dhash is not None:
+        return f"p{format_hash(image.phash)}d{format_hash(image.dhash)}"
+    return "b" + hashlib.blake2b(image.b64, digest_size=16).hexdigest()
+
+
+def vision_cache_key(
+    images: Sequence[IngestedImage],
+    prompt: str,
+    model: str,
+    prompt_version: str,
+) -> str:
+    """
+    Build the cache key for a vision call.
+
+    Args:
+        images: Images actually sent to the model
+        prompt: Rendered prompt text
+        model: Vision model name
+        prompt_version: Bumped whenever the prompt template or output schema changes
+
+    Returns:
+        Cache key, identical across processes
+    """
+    payload = {
+        "images": sorted(_image_fingerprint(image) for image in images),
+        "model": model,
+        "prompt_version": prompt_version,
+        "prompt": hashlib.blake2b(prompt.encode("utf-8"), digest_size=16).hexdigest(),
+    }
+    key_str = json.dumps(payload, sort_keys=True, separators=(',', ':'))
+    digest = hashlib.blake2b(key_str.encode("utf-8"), digest_size=16).hexdigest()
+    return f"{KEY_PREFIX}:{digest}"
+
+
+def get_cached_vision_result(key: str) -> Optional[Any]:
+    """Cached vision result for ``key``, or None (also None when caching is disabled)."""
+    if settings.VISION_CACHE_TTL_SEC <= 0:
+        return None
+    return cache_get(key)
+
+
+def set_cached_vision_result(key: str, value: Any) -> None:
+    """Store a successful vision result for ``VISION_CACHE_TTL_SEC`` seconds."""
+    cache_set(key, value, ttl_sec=settings.VISION_CACHE_TTL_SEC)
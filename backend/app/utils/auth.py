@@ -82,6 +82,21 @@ def get_optional_user(request: Request) -> Optional[Dict[str, Any]]:
     except HTTPException:
         return None
 
+def decode_bearer_token(request: Request) -> Optional[Dict[str, Any]]:
+    """
+    Payload of a valid Supabase bearer token, or None.
+
+    Never raises and never falls back to the development mock user, so it is
+    safe to call on every request (e.g. to key rate limits by user).
+    """
+    auth_header = request.headers.get("Authorization") or ""
+    if not SUPABASE_JWT_SECRET or not auth_header.startswith("Bearer "):
+        return None
+    try:
+        return jwt.decode(auth_header[len("Bearer "):].strip(), SUPABASE_JWT_SECRET, algorithms=["HS256"])
+    except JWTError:
+        return None
+
 def get_current_user_id(request: Request) -> str:
     """
     Get the current user ID from the JWT token.
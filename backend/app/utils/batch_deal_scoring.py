@@ -0,0 +1,230 @@
+"""
+Batch deal scoring for scraped listing feeds.
+
+Scores N listings at once with NumPy, using the same formulas as the one-deal
+paths:
+
+- market value: the feed's own ``market_value`` if present, else the
+  RealValuationService base table with its mileage/condition/location
+  adjustments, else the shared pricing rules (``batch_valuation.value_batch``)
+- ``deal_score``, ``risk_score``, ``recommendation`` and ``market_position``
+  as in ``RealValuationService``
+- ``feed_score`` (price per year of age, mileage, popular brands) as in the
+  scraper's ``CleaningPipeline._calculate_deal_score``
+
+String lookups (base table, condition, location, brand) run once per distinct
+value; everything else is array math, so a sweep of tens of thousands of
+listings scores in tens of milliseconds.
+
+Numeric fields may be strings like "$12,500". A listing whose price, year,
+mileage or market_value can't be parsed is flagged in ``invalid`` and left out
+of the ranking; the rest of the feed is still scored.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+
+from app.services.real_valuation_service import (
+    BASE_MARKET_VALUES,
+    CONDITION_DEAL_SCORES,
+    CONDITION_RISKS,
+    CONDITION_VALUE_FACTORS,
+    LOCATION_VALUE_FACTORS,
+    LUXURY_BRANDS,
+)
+from app.utils.batch_valuation import _columns, _Distinct, _parse_numbers, _text, value_batch
+from app.utils.pricing_rules import POPULAR_BRANDS
+
+# Listing fields echoed back with each score so callers can join results
+IDENTITY_FIELDS = ("id", "listing_id", "url", "title", "source", "make", "model", "year", "price")
+
+MARKET_VALUE_SOURCES = np.array(["feed", "base_table", "pricing_rules"])
+
+
+@dataclass
+class BatchDealScores:
+    """Per-listing score arrays (all of length N), in input order"""
+    market_value: np.ndarray
+    market_value_source: np.ndarray
+    potential_profit: np.ndarray
+    profit_margin: np.ndarray
+    deal_score: np.ndarray
+    risk_score: np.ndarray
+    feed_score: np.ndarray
+    recommendation: np.ndarray
+    market_position: np.ndarray
+    invalid: np.ndarray
+    identity: Dict[str, Sequence[Any]]
+
+    def __len__(self) -> int:
+        return len(self.deal_score)
+
+    def ranking(self, min_score: float = 0.0, limit: Optional[int] = None) -> np.ndarray:
+        """Row indices best deal first (ties: lower risk, then input order), skipping invalid rows."""
+        order = np.lexsort((np.arange(len(self)), self.risk_score, -self.deal_score))
+        order = order[~self.invalid[order]]
+        if min_score > 0:
+            order = order[self.deal_score[order] >= min_score]
+        return order[:limit] if limit is not None else order
+
+    def columns(self, rows: Optional[np.ndarray] = None) -> Dict[str, List[Any]]:
+        """Identity fields and scores as plain lists for ``rows`` (default: all, input order)."""
+        rows = np.arange(len(self)) if rows is None else rows
+        index = rows.tolist()
+        result = {name: [_plain(values[row]) for row in index] for name, values in self.identity.items()}
+        scores = {
+            "estimated_market_value": np.round(self.market_value[rows]),
+            "market_value_source": self.market_value_source[rows],
+            "potential_profit": np.round(self.potential_profit[rows]),
+            "profit_margin": np.round(self.profit_margin[rows], 1),
+            "deal_score": self.deal_score[rows],
+            "risk_score": np.round(self.risk_score[rows], 2),
+            "feed_score": np.round(self.feed_score[rows], 2),
+            "recommendation": self.recommendation[rows],
+            "market_position": self.market_position[rows],
+        }
+        result.update({name: array.tolist() for name, array in scores.items()})
+        return result
+
+    def to_records(self, rows: Optional[np.ndarray] = None) -> List[Dict[str, Any]]:
+        """One JSON-friendly dict per listing for ``rows`` (default: all, input order)."""
+        columns = self.columns(rows)
+        names = list(columns)
+        return [dict(zip(names, values)) for values in zip(*columns.values())]
+
+
+def _plain(value: Any) -> Any:
+    """NumPy scalars to Python scalars for JSON."""
+    return value.item() if isinstance(value, np.generic) else value
+
+
+def _counts(column: Optional[Sequence[Any]], n: int) -> np.ndarray:
+    """Length of each list value (urgency indicators); non-lists count as 0."""
+    if column is None:
+        return np.zeros(n, dtype=np.float64)
+    return np.array(
+        [len(value) if value is not None and not isinstance(value, (str, bytes)) and hasattr(value, "__len__") else 0
+         for value in column],
+        dtype=np.float64,
+    )
+
+
+def score_batch(listings: Any, current_year: Optional[int] = None) -> BatchDealScores:
+    """
+    Score a batch of listings.
+
+    Args:
+        listings: DataFrame, mapping of column -> sequence/array, or list of dicts.
+            Columns: price, make, model, year, mileage, and optionally condition,
+            location, title_status, trim, features, urgency_indicators, market_value
+        current_year: Year to age vehicles against (defaults to this year)
+
+    Returns:
+        BatchDealScores with per-listing arrays in input order
+    """
+    columns = _columns(listings)
+    n = len(next(iter(columns.values()))) if columns else 0
+    current_year = current_year or datetime.now().year
+
+    make = _text(columns.get("make"), n)
+    model = _text(columns.get("model"), n)
+    location = _text(columns.get("location"), n)
+    condition = _text(columns.get("condition"), n)
+    condition = np.where(condition == "", "good", condition)
+    price, bad_price = _parse_numbers(columns.get("price"), n)
+    year, bad_year = _parse_numbers(columns.get("year"), n)
+    mileage, bad_mileage = _parse_numbers(columns.get("mileage"), n)
+    given_value, bad_value = _parse_numbers(columns.get("market_value"), n)
+    invalid = bad_price | bad_year | bad_mileage | bad_value
+
+    makes, conditions = _Distinct(make), _Distinct(condition)
+
+    # Market value: feed value, else base table + RealValuationService._apply_adjustments, else pricing rules
+    vehicle = _Distinct.pair(_Distinct.pair(_Distinct.pair(makes, _Distinct(model)), _Distinct(year.astype(np.int64))), conditions)
+    base_value = vehicle.map(
+        lambda make_value, model_value, year_value, condition_value:
+            BASE_MARKET_VALUES.get(make_value, {}).get(model_value, {}).get(int(year_value), {}).get(condition_value) or 0.0
+    )
+    mileage_factor = np.where(
+        mileage > 0,
+        np.select([mileage < 50000, mileage < 100000, mileage < 150000], [1.1, 1.0, 0.9], 0.8),
+        1.0,
+    )
+    location_factor = _Distinct(location).map(
+        lambda value: next((factor for state, factor in LOCATION_VALUE_FACTORS.items() if state in value), 1.0)
+    )
+    table_value = base_value * mileage_factor * conditions.map(lambda value: CONDITION_VALUE_FACTORS.get(value, 1.0)) * location_factor
+
+    source = np.where(given_value > 0, 0, np.where(table_value > 0, 1, 2))
+    market_value = np.where(source == 0, given_value, table_value)
+    if (source == 2).any():
+        rules_value = value_batch(
+            {**columns, "make": make, "model": model, "year": year, "mileage": mileage, "location": location},
+            current_year=current_year,
+        ).value
+        market_value = np.where(source == 2, rules_value, market_value)
+
+    # Profit (RealValuationService.get_valuation)
+    priced = price > 0
+    safe_price = np.where(priced, price, 1.0)
+    potential_profit = np.where(priced, market_value - price, 0.0)
+    profit_margin = np.where(priced, potential_profit / safe_price * 100, 0.0)
+
+    # Deal score (RealValuationService._calculate_deal_score)
+    profit_score = np.minimum((market_value - price) / safe_price * 2, 1.0)
+    condition_score = conditions.map(lambda value: CONDITION_DEAL_SCORES.get(value, 0.5))
+    mileage_score = np.select([mileage < 50000, mileage < 100000, mileage < 150000], [0.9, 0.7, 0.5], 0.3)
+    urgency_score = np.minimum(_counts(columns.get("urgency_indicators"), n) * 0.2, 1.0)
+    deal_score = profit_score * 0.4 + condition_score * 0.3 + mileage_score * 0.2 + urgency_score * 0.1
+    deal_score = np.where(priced & (market_value > 0), np.round(deal_score, 2), 0.0)
+
+    # Risk (RealValuationService._assess_risk)
+    age = current_year - year
+    risk = np.select([mileage > 150000, mileage > 100000], [0.3, 0.2], 0.0)
+    risk = risk + np.select([age > 10, age > 5], [0.2, 0.1], 0.0)
+    risk = risk + conditions.map(lambda value: CONDITION_RISKS.get(value, 0.2))
+    risk = risk + makes.map(lambda value: value in LUXURY_BRANDS, dtype=bool) * 0.2
+    risk_score = np.minimum(risk, 1.0)
+
+    # Feed score (CleaningPipeline._calculate_deal_score)
+    aged = priced & (year > 0) & (age > 0)
+    price_per_year = np.where(aged, price / np.where(aged, age, 1), np.inf)
+    feed = 0.5 + np.select([price_per_year < 2000, price_per_year < 3000, price_per_year < 4000], [0.3, 0.2, 0.1], 0.0)
+    feed = feed + np.where(
+        mileage > 0,
+        np.select([mileage < 30000, mileage < 60000, mileage < 100000, mileage > 150000], [0.3, 0.2, 0.1, -0.1], 0.0),
+        0.0,
+    )
+    feed = feed + makes.map(lambda value: value.lower() in POPULAR_BRANDS, dtype=bool) * 0.05
+    feed_score = np.clip(feed, 0.0, 1.0)
+
+    recommendation = np.select(
+        [(deal_score >= 0.8) & (risk_score <= 0.3), (deal_score >= 0.6) & (risk_score <= 0.5), deal_score >= 0.4],
+        ["STRONG_BUY", "BUY", "CONSIDER"],
+        "PASS",
+    )
+    market_position = np.select(
+        [~priced | (market_value <= 0), price < market_value * 0.8, price < market_value * 0.95, price <= market_value * 1.05],
+        ["UNKNOWN", "UNDERVALUED", "GOOD_VALUE", "MARKET_PRICE"],
+        "OVERPRICED",
+    )
+
+    identity = {name: columns[name] for name in IDENTITY_FIELDS if name in columns}
+    return BatchDealScores(
+        market_value=market_value,
+        market_value_source=MARKET_VALUE_SOURCES[source],
+        potential_profit=potential_profit,
+        profit_margin=profit_margin,
+        deal_score=deal_score,
+        risk_score=risk_score,
+        feed_score=feed_score,
+        recommendation=recommendation,
+        market_position=market_position,
+        invalid=invalid,
+        identity=identity,
+    )
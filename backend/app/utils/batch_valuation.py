@@ -0,0 +1,269 @@
+"""
+Batch valuation over the shared pricing rules.
+
+Values N vehicles at once as NumPy array operations instead of one car at a
+time. String rules (make/model base prices, trim keywords, reliability tiers,
+feature keywords, regions) are evaluated once per *distinct* value with the
+scalar helpers in ``pricing_rules`` and scattered back through the inverse
+index of ``np.unique``; everything numeric (depreciation brackets, low-mileage
+premium, tiered mileage penalties, title multipliers, Midwest discounts) is
+computed on whole arrays. A dealer inventory of thousands of units has only a
+few dozen distinct makes/models/trims, so revaluation costs milliseconds.
+
+The per-vehicle value follows the same steps as the single-car path:
+
+    fallback clean-title price (depreciation, trim, retention, low-mileage cap)
+    x (1 + mileage penalty) x (1 + feature bonus) x title multiplier
+    x (1 - Midwest discount)
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Mapping, Optional, Sequence, Tuple
+
+import numpy as np
+
+from app.utils.pricing_rules import (
+    DEPRECIATION_SCHEDULE,
+    LOW_MILEAGE_PREMIUM_CAPS,
+    LOW_MILEAGE_PREMIUM_THRESHOLD,
+    MALIBU_MARKET_AVERAGE,
+    MALIBU_MARKET_AVERAGE_MIN_AGE,
+    MILEAGE_PENALTIES,
+    MILEAGE_THRESHOLDS,
+    TITLE_STATUS_MULTIPLIERS,
+    calculate_feature_bonus,
+    detect_trim_tier,
+    get_base_new_price,
+    get_midwest_base_discount,
+    get_reliability_tier,
+    get_trim_adjustment_percent,
+    get_value_retention_multiplier,
+    is_midwest_location,
+    normalize_title_status,
+)
+
+DEFAULT_YEAR = 2015  # same default as the single-car fallback
+TIER_INDEX = {tier: index for index, tier in enumerate(MILEAGE_THRESHOLDS)}
+TIER_NAMES = np.array(list(MILEAGE_THRESHOLDS))
+
+# thresholds[tier_index] -> mileage where each penalty step begins
+_THRESHOLD_TABLE = np.array([MILEAGE_THRESHOLDS[tier] for tier in MILEAGE_THRESHOLDS], dtype=np.float64)
+_PENALTY_TABLE = np.array(MILEAGE_PENALTIES, dtype=np.float64)
+
+
+@dataclass
+class BatchValuation:
+    """Per-vehicle valuation arrays (all of length N)"""
+    value: np.ndarray
+    low: np.ndarray
+    high: np.ndarray
+    base_price: np.ndarray
+    trim_percent: np.ndarray
+    mileage_penalty_percent: np.ndarray
+    feature_bonus_percent: np.ndarray
+    title_multiplier: np.ndarray
+    regional_discount_percent: np.ndarray
+    reliability_tier: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.value)
+
+    def to_records(self) -> List[Dict[str, Any]]:
+        """One JSON-friendly dict per vehicle, in input order."""
+        columns = {
+            "estimated_value": np.round(self.value),
+            "value_low": np.round(self.low),
+            "value_high": np.round(self.high),
+            "base_price": np.round(self.base_price),
+            "trim_percent": self.trim_percent,
+            "mileage_penalty_percent": self.mileage_penalty_percent,
+            "feature_bonus_percent": self.feature_bonus_percent,
+            "title_multiplier": self.title_multiplier,
+            "regional_discount_percent": self.regional_discount_percent,
+        }
+        lists = {name: array.tolist() for name, array in columns.items()}
+        tiers = self.reliability_tier.tolist()
+        return [
+            {**{name: values[i] for name, values in lists.items()}, "reliability_tier": tiers[i]}
+            for i in range(len(self))
+        ]
+
+
+def _columns(vehicles: Any) -> Dict[str, Sequence[Any]]:
+    """Accept a DataFrame, a mapping of column -> sequence/array, or a list of vehicle dicts."""
+    if hasattr(vehicles, "columns") and hasattr(vehicles, "to_dict"):
+        return {str(name): vehicles[name].to_numpy() for name in vehicles.columns}
+    if isinstance(vehicles, Mapping):
+        return dict(vehicles)
+    records = list(vehicles)
+    names = {key for record in records for key in record}
+    return {name: [record.get(name) for record in records] for name in names}
+
+
+def _text(column: Optional[Sequence[Any]], n: int) -> np.ndarray:
+    if column is None:
+        return np.full(n, "", dtype=str)
+    if isinstance(column, np.ndarray) and column.dtype.kind == "U":
+        return column
+    return np.array(["" if value is None or value != value else str(value) for value in column], dtype=str)
+
+
+def _parse_number(value: Any) -> float:
+    """A number, or a string like "$12,500"; NaN if missing or unparseable."""
+    if isinstance(value, str):
+        value = value.replace("$", "").replace(",", "").strip()
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return np.nan
+
+
+def _parse_numbers(column: Optional[Sequence[Any]], n: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Numeric column with missing and unparseable values as 0.
+
+    Returns:
+        (values, invalid) where invalid marks values that were present but not numbers
+    """
+    if column is None:
+        return np.zeros(n, dtype=np.float64), np.zeros(n, dtype=bool)
+    array = np.asarray(column)
+    if array.dtype.kind in "iuf":
+        return np.nan_to_num(array.astype(np.float64), nan=0.0), np.zeros(len(array), dtype=bool)
+    missing = np.array([value is None or value != value or (isinstance(value, str) and not value.strip()) for value in array], dtype=bool)
+    values = np.array([_parse_number(value) for value in array], dtype=np.float64)
+    invalid = np.isnan(values) & ~missing
+    return np.nan_to_num(values, nan=0.0), invalid
+
+
+def _numbers(column: Optional[Sequence[Any]], n: int) -> np.ndarray:
+    """Numeric column with missing and unparseable values as 0."""
+    return _parse_numbers(column, n)[0]
+
+
+class _Distinct:
+    """Distinct values (or value pairs) of string columns and the inverse index back to the rows"""
+
+    def __init__(self, keys: np.ndarray):
+        values, self.inverse = np.unique(keys, return_inverse=True)
+        self.values = [(str(value),) for value in values]
+
+    @classmethod
+    def pair(cls, left: "_Distinct", right: "_Distinct") -> "_Distinct":
+        """Distinct (left, right) combinations, factorized on integer codes instead of joined strings."""
+        width = len(right.values)
+        codes, inverse = np.unique(left.inverse * width + right.inverse, return_inverse=True)
+        pairs = cls.__new__(cls)
+        pairs.values = [left.values[code // width] + right.values[code % width] for code in codes.tolist()]
+        pairs.inverse = inverse
+        return pairs
+
+    def map(self, fn: Callable[..., Any], dtype=np.float64) -> np.ndarray:
+        """Evaluate ``fn`` once per distinct value and scatter the results back to every row."""
+        table = np.array([fn(*value) for value in self.values], dtype=dtype)
+        return table[self.inverse]
+
+
+def value_batch(vehicles: Any, current_year: Optional[int] = None) -> BatchValuation:
+    """
+    Value a batch of vehicles with the shared pricing rules.
+
+    Args:
+        vehicles: DataFrame, mapping of column -> sequence/array, or list of dicts.
+            Columns: make, model, year, mileage, and optionally trim,
+            title_status, location, features (list of feature strings per vehicle)
+        current_year: Year to age vehicles against (defaults to this year)
+
+    Returns:
+        BatchValuation with per-vehicle arrays in input order
+    """
+    columns = _columns(vehicles)
+    n = len(next(iter(columns.values()))) if columns else 0
+    current_year = current_year or datetime.now().year
+
+    make = _text(columns.get("make"), n)
+    model = _text(columns.get("model"), n)
+    trim = _text(columns.get("trim"), n)
+    title = _text(columns.get("title_status"), n)
+    location = _text(columns.get("location"), n)
+    year = _numbers(columns.get("year"), n)
+    mileage = _numbers(columns.get("mileage"), n)
+
+    # Depreciation from the new price, by age bracket
+    year = np.where(year > 0, year, DEFAULT_YEAR)
+    age = current_year - year
+    makes, models = _Distinct(make), _Distinct(model)
+    make_model = _Distinct.pair(makes, models)
+    base_new = make_model.map(get_base_new_price)
+    brackets = [age >= min_age for min_age, _, _ in DEPRECIATION_SCHEDULE]
+    per_year = np.select(brackets, [rate for _, rate, _ in DEPRECIATION_SCHEDULE], DEPRECIATION_SCHEDULE[-1][1])
+    floor = np.select(brackets, [price_floor for _, _, price_floor in DEPRECIATION_SCHEDULE], DEPRECIATION_SCHEDULE[-1][2])
+    base_price = np.maximum(floor, base_new - age * per_year)
+    is_malibu = models.map(lambda value: "malibu" in value.lower(), dtype=bool)
+    base_price = np.where(is_malibu & (age >= MALIBU_MARKET_AVERAGE_MIN_AGE), MALIBU_MARKET_AVERAGE, base_price)
+
+    # Trim tier uplift (keyword tables), then make/model value retention
+    def trim_percent_for(trim_value: str, model_value: str) -> float:
+        tier, matches = detect_trim_tier(trim_value)
+        return get_trim_adjustment_percent(tier, len(matches) or (1 if trim_value else 0), trim_value, model_value)
+
+    trim_percent = _Distinct.pair(_Distinct(trim), models).map(trim_percent_for)
+    base_price = base_price * (1 + trim_percent)
+    base_price = base_price * make_model.map(get_value_retention_multiplier)
+
+    # Low-mileage premium on 5+ year old vehicles, capped by age
+    cap = np.select([age >= min_age for min_age, _ in LOW_MILEAGE_PREMIUM_CAPS],
+                    [max_premium for _, max_premium in LOW_MILEAGE_PREMIUM_CAPS], 0.0)
+    low_mileage = (mileage > 0) & (mileage < LOW_MILEAGE_PREMIUM_THRESHOLD)
+    premium = np.where(
+        low_mileage,
+        np.minimum(cap, (LOW_MILEAGE_PREMIUM_THRESHOLD - mileage) / LOW_MILEAGE_PREMIUM_THRESHOLD * cap),
+        0.0,
+    )
+    base_price = base_price * (1 + premium)
+
+    # Tiered mileage penalty: number of the tier's thresholds at or below the mileage
+    tier_index = makes.map(
+        lambda value: TIER_INDEX.get(get_reliability_tier(value or None), TIER_INDEX["tier_b"]), dtype=np.intp
+    )
+    steps = (mileage[:, None] >= _THRESHOLD_TABLE[tier_index]).sum(axis=1)
+    mileage_penalty = np.where(mileage > 0, _PENALTY_TABLE[np.minimum(steps, len(_PENALTY_TABLE) - 1)], 0.0)
+
+    # Feature bonus (keyword categories, capped)
+    if columns.get("features") is not None:
+        feature_keys = np.array(
+            ["\x1f".join(f for f in (features if features is not None else ()) if isinstance(f, str))
+             for features in columns["features"]],
+            dtype=str,
+        )
+        feature_bonus = _Distinct(feature_keys).map(lambda key: calculate_feature_bonus(key.split("\x1f") if key else [])[0])
+    else:
+        feature_bonus = np.zeros(n, dtype=np.float64)
+
+    # Title status multiplier
+    title_multiplier = _Distinct(title).map(
+        lambda value: TITLE_STATUS_MULTIPLIERS.get(normalize_title_status(value or None), 1.0)
+    )
+
+    # Midwest discount: vehicle type, plus -3% at 150k scaling to -7% at 200k+
+    midwest = _Distinct(location).map(is_midwest_location, dtype=bool)
+    type_discount = make_model.map(lambda make_value, model_value: get_midwest_base_discount(make_value, model_value)[0])
+    mileage_discount = np.where(mileage > 150000, np.minimum(0.07, 0.03 + (mileage - 150000) / 50000 * 0.04), 0.0)
+    regional_discount = np.where(midwest, type_discount + mileage_discount, 0.0)
+
+    value = base_price * (1 + mileage_penalty) * (1 + feature_bonus) * title_multiplier * (1 - regional_discount)
+    return BatchValuation(
+        value=value,
+        low=value * 0.8,
+        high=value * 1.2,
+        base_price=base_price,
+        trim_percent=trim_percent,
+        mileage_penalty_percent=mileage_penalty,
+        feature_bonus_percent=feature_bonus,
+        title_multiplier=title_multiplier,
+        regional_discount_percent=regional_discount,
+        reliability_tier=TIER_NAMES[tier_index],
+    )
@@ -313,3 +313,154 @@ def calculate_feature_bonus(features: List[str]) -> Tuple[float, List[Dict[str,
 
     return round(total_percent, 4), breakdown, cap_applied
 
+
+
+# Title status multipliers (rebuilt -30%, salvage -47% to -50%)
+TITLE_STATUS_MULTIPLIERS: Dict[str, float] = {
+    "clean": 1.0,
+    "rebuilt": 0.70,   # Rebuilt title = -30% reduction
+    "salvage": 0.515,  # Salvage title = -47% to -50% reduction (avg -48.5%)
+    "junk": 0.3,       # 70% reduction
+    "parts": 0.2       # 80% reduction
+}
+
+# Depreciation brackets: (minimum age, $ per year, price floor), oldest first
+DEPRECIATION_SCHEDULE: List[Tuple[int, float, float]] = [
+    (8, 1300, 3000),  # Older vehicles depreciate faster: ~$1200-1500 per year
+    (5, 1000, 4000),  # 5-7 year old: ~$1000 per year
+    (0, 800, 5000),   # Newer vehicles: ~$800 per year
+]
+
+# 10+ year old Malibus start from the AutoTrader market average instead of depreciation
+MALIBU_MARKET_AVERAGE = 7748
+MALIBU_MARKET_AVERAGE_MIN_AGE = 10
+
+# Low-mileage premium for 5+ year old vehicles: below this mileage, capped by age
+LOW_MILEAGE_PREMIUM_THRESHOLD = 20000
+LOW_MILEAGE_PREMIUM_CAPS: List[Tuple[int, float]] = [(8, 0.10), (5, 0.15)]  # (minimum age, max premium)
+
+# Detroit/Michigan Midwest discount curve (applied last, after trim, mileage and title)
+MIDWEST_LOCATION_TERMS = ["detroit", "michigan", "mi", "flint", "redford", "warren", "troy", "dearborn"]
+LUXURY_BRANDS = ["bmw", "mercedes", "mercedes-benz", "audi", "lexus", "infiniti", "acura", "cadillac", "lincoln", "porsche", "jaguar", "land rover"]
+MIDWEST_TRUCK_TERMS = ["truck", "pickup", "f-150", "f150", "silverado", "ram", "tundra", "tacoma", "ranger", "colorado"]
+MIDWEST_SUV_TERMS = ["suv", "explorer", "escape", "cr-v", "rav4", "highlander", "pilot", "pathfinder", "tahoe", "suburban", "yukon", "escalade"]
+MIDWEST_COUPE_TERMS = ["coupe", "camaro", "mustang", "challenger", "charger"]
+
+# Brands with a small deal-score boost (scraper CleaningPipeline and the batch deal scorer)
+POPULAR_BRANDS = ["toyota", "honda", "subaru", "mazda"]
+
+
+def get_base_new_price(make: Optional[str], model: Optional[str]) -> float:
+    """What a make/model cost new (starting point for the depreciation curve)."""
+    make_lower = (make or "").lower()
+    model_lower = (model or "").lower()
+
+    if "jeep" in make_lower:
+        if "wrangler" in model_lower:
+            return 30000  # Wranglers cost more new
+        if "compass" in model_lower:
+            return 22000  # Compass was cheaper new
+        return 25000
+    if "honda" in make_lower:
+        if "accord" in model_lower:
+            if "sport" in model_lower or "ex" in model_lower:
+                return 26000  # Sport/EX trim was more expensive
+            return 23000  # Accord base price when new
+        if "civic" in model_lower:
+            return 20000
+        return 25000
+    if "toyota" in make_lower:
+        if "camry" in model_lower:
+            return 24000
+        return 25000
+    if "chevrolet" in make_lower or "chevy" in make_lower:
+        if "malibu" in model_lower:
+            if "ltz" in model_lower or "premier" in model_lower:
+                return 28000  # Higher trims cost more new
+            return 23000  # Malibu base price when new
+        if "silverado" in model_lower:
+            return 30000
+        if "equinox" in model_lower:
+            return 24000
+        return 25000
+    if "bmw" in make_lower or "mercedes" in make_lower:
+        return 40000
+    return 25000  # Conservative base for average car
+
+
+def get_depreciation_bracket(vehicle_age: int) -> Tuple[int, float, float]:
+    """(minimum age, $ per year, price floor) of the bracket a vehicle age falls in."""
+    for bracket in DEPRECIATION_SCHEDULE:
+        if vehicle_age >= bracket[0]:
+            return bracket
+    return DEPRECIATION_SCHEDULE[-1]
+
+
+def get_value_retention_multiplier(make: Optional[str], model: Optional[str]) -> float:
+    """Make/model value retention adjustment applied after depreciation."""
+    make_lower = (make or "").lower()
+    model_lower = (model or "").lower()
+
+    if "jeep" in make_lower and "wrangler" in model_lower:
+        return 1.2  # Wranglers hold value well
+    if "toyota" in make_lower or "honda" in make_lower:
+        return 1.05  # Reliable brands hold value
+    if "chevrolet" in make_lower or "chevy" in make_lower:
+        if "malibu" in model_lower:
+            return 1.0  # Malibu holds average value
+        return 0.98  # Other Chevys slightly below average
+    if "jeep" in make_lower and "compass" in model_lower:
+        return 0.95  # Compass doesn't hold value as well
+    return 1.0
+
+
+def calculate_low_mileage_premium_percent(mileage: Optional[int], vehicle_age: int) -> Tuple[float, float]:
+    """
+    Premium for unusually low mileage on a 5+ year old vehicle, capped by age
+    so low mileage can't restore the original MSRP.
+
+    Returns:
+        premium: fraction to add (0.0 when not applicable)
+        cap: the age-based maximum that applied (0.0 when not applicable)
+    """
+    if not mileage or mileage >= LOW_MILEAGE_PREMIUM_THRESHOLD:
+        return 0.0, 0.0
+    for min_age, max_premium in LOW_MILEAGE_PREMIUM_CAPS:
+        if vehicle_age >= min_age:
+            premium = min(max_premium, (LOW_MILEAGE_PREMIUM_THRESHOLD - mileage) / LOW_MILEAGE_PREMIUM_THRESHOLD * max_premium)
+            return premium, max_premium
+    return 0.0, 0.0
+
+
+def is_midwest_location(location: Optional[str]) -> bool:
+    """Whether the Detroit/Michigan discount curve applies to a location."""
+    location_lower = (location or "").lower()
+    return any(term in location_lower for term in MIDWEST_LOCATION_TERMS)
+
+
+def get_midwest_base_discount(make: Optional[str], model: Optional[str]) -> Tuple[float, str]:
+    """
+    Midwest discount by vehicle type.
+
+    Returns:
+        discount: fraction to take off (e.g. 0.175)
+        category: "luxury", "truck/suv", "coupe" or "sedan"
+    """
+    make_lower = (make or "").lower()
+    model_lower = (model or "").lower()
+    if any(brand in make_lower for brand in LUXURY_BRANDS):
+        return 0.25, "luxury"  # -20% to -30% (average -25%)
+    if any(term in model_lower for term in MIDWEST_TRUCK_TERMS):
+        return 0.075, "truck/suv"  # -5% to -10% (average -7.5%)
+    if any(term in model_lower for term in MIDWEST_SUV_TERMS):
+        return 0.075, "truck/suv"
+    if any(term in model_lower for term in MIDWEST_COUPE_TERMS):
+        return 0.10, "coupe"
+    return 0.175, "sedan"  # -15% to -20% (average -17.5%)
+
+
+def calculate_midwest_mileage_discount(mileage: Optional[int]) -> float:
+    """Additional Midwest discount above 150k miles: -3% at 150k scaling to -7% at 200k+."""
+    if mileage and mileage > 150000:
+        return min(0.07, 0.03 + ((mileage - 150000) / 50000) * 0.04)
+    return 0.0
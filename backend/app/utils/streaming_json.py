@@ -0,0 +1,144 @@
+"""
+Incremental extraction of string fields from a streamed JSON object.
+
+LLM JSON-mode responses arrive token by token, and ``json.loads`` needs the
+whole document. ``StreamingJSONFieldExtractor`` scans the chunks as they arrive
+and emits the decoded text of selected top-level string fields (e.g.
+``listing_text``) the moment each character is available. Escape sequences,
+including ``\\uXXXX`` and surrogate pairs split across chunks, are handled.
+The full document is still accumulated for the final ``json.loads``.
+"""
+
+from __future__ import annotations
+
+from typing import Iterable, List, Optional, Tuple
+
+_SIMPLE_ESCAPES = {
+    '"': '"',
+    "\\": "\\",
+    "/": "/",
+    "b": "\b",
+    "f": "\f",
+    "n": "\n",
+    "r": "\r",
+    "t": "\t",
+}
+
+
+class StreamingJSONFieldExtractor:
+    """
+    Emit decoded text for chosen top-level string fields while JSON streams in.
+
+    Usage:
+        extractor = StreamingJSONFieldExtractor(["listing_text"])
+        for chunk in stream:
+            for field, text in extractor.feed(chunk):
+                send(field, text)
+        result = json.loads(extractor.document)
+    """
+
+    def __init__(self, fields: Iterable[str]):
+        self.fields = set(fields)
+        self._parts: List[str] = []
+
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+        self._unicode: Optional[str] = None  # hex digits collected after \u
+        self._high_surrogate: Optional[int] = None
+
+        self._string_is_key = False
+        self._string_buffer: List[str] = []  # only for keys (small)
+        self._last_key: Optional[str] = None
+        self._expect_key = False
+        self._streaming_field: Optional[str] = None
+
+    @property
+    def document(self) -> str:
+        """Everything fed so far."""
+        return "".join(self._parts)
+
+    def feed(self, chunk: str) -> List[Tuple[str, str]]:
+        """
+        Consume the next chunk of the JSON document.
+
+        Returns:
+            [(field, decoded_text), ...] for text that became available in this chunk
+        """
+        self._parts.append(chunk)
+        out: List[Tuple[str, str]] = []
+        pending: List[str] = []
+
+        for char in chunk:
+            if self._in_string:
+                decoded = self._consume_string_char(char)
+                if decoded is None:
+                    if not self._in_string and self._streaming_field is not None:
+                        # Closing quote of a streamed field
+                        if pending:
+                            out.append((self._streaming_field, "".join(pending)))
+                            pending = []
+                        self._streaming_field = None
+                    continue
+                if self._streaming_field is not None:
+                    pending.append(decoded)
+                elif self._string_is_key:
+                    self._string_buffer.append(decoded)
+                continue
+
+            if char == '"':
+                self._in_string = True
+                self._string_is_key = self._depth == 1 and self._expect_key
+                self._string_buffer = []
+                if not self._string_is_key and self._depth == 1 and self._last_key in self.fields:
+                    self._streaming_field = self._last_key
+            elif char in "{[":
+                self._depth += 1
+                self._expect_key = char == "{" and self._depth == 1
+            elif char in "}]":
+                self._depth -= 1
+            elif char == ",":
+                if self._depth == 1:
+                    self._expect_key = True
+                    self._last_key = None
+            elif char == ":":
+                if self._depth == 1:
+                    self._expect_key = False
+
+        if pending and self._streaming_field is not None:
+            out.append((self._streaming_field, "".join(pending)))
+        return out
+
+    def _consume_string_char(self, char: str) -> Optional[str]:
+        """Advance the in-string state; returns decoded text or None if nothing to emit."""
+        if self._unicode is not None:
+            self._unicode += char
+            if len(self._unicode) < 4:
+                return None
+            code = int(self._unicode, 16)
+            self._unicode = None
+            if 0xD800 <= code <= 0xDBFF:
+                self._high_surrogate = code
+                return None
+            if 0xDC00 <= code <= 0xDFFF and self._high_surrogate is not None:
+                code = 0x10000 + ((self._high_surrogate - 0xD800) << 10) + (code - 0xDC00)
+            self._high_surrogate = None
+            return chr(code)
+
+        if self._escape:
+            self._escape = False
+            if char == "u":
+                self._unicode = ""
+                return None
+            return _SIMPLE_ESCAPES.get(char, char)
+
+        if char == "\\":
+            self._escape = True
+            return None
+        if char == '"':
+            self._in_string = False
+            if self._string_is_key:
+                self._last_key = "".join(self._string_buffer)
+                self._string_is_key = False
+            return None
+        return char
@@ -0,0 +1,20 @@
+-- Saved market searches (app/models/search_history.py)
+-- Created automatically on first use when DATABASE_URL points at SQLite; run this on Postgres/Supabase.
+
+CREATE TABLE IF NOT EXISTS search_history (
+    id VARCHAR(64) PRIMARY KEY,
+    user_id VARCHAR(255),
+    search_term VARCHAR(200) NOT NULL,
+    location VARCHAR(200),
+    radius INTEGER,
+    result_count INTEGER DEFAULT 0,
+    results JSON DEFAULT '[]',
+    summary JSON DEFAULT '{}',
+    timestamp TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP
+);
+
+-- Newest-first history pages per user (keyset pagination on timestamp, id)
+CREATE INDEX IF NOT EXISTS ix_search_history_user_timestamp ON search_history (user_id, timestamp, id);
+
+-- TTL pruning (DELETE ... WHERE timestamp < cutoff)
+CREATE INDEX IF NOT EXISTS ix_search_history_timestamp ON search_history (timestamp);